@@ -0,0 +1,39 @@
+"""add knowledge chunk content hashes
+
+Revision ID: 20261017_0006
+Revises: 20261017_0005
+Create Date: 2026-10-17 14:00:00
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0006"
+down_revision = "20261017_0005"
+branch_labels = None
+depends_on = None
+
+
+def _execute_sql_file(path: Path) -> None:
+    bind = op.get_bind()
+    sql_text = path.read_text(encoding="utf-8")
+
+    statements = [statement.strip() for statement in sql_text.split(";") if statement.strip()]
+    for statement in statements:
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    project_root = Path(__file__).resolve().parents[2]
+    sql_path = project_root / "sql" / "migrations" / "0006_knowledge_chunk_hash.up.sql"
+    _execute_sql_file(sql_path)
+
+
+def downgrade() -> None:
+    project_root = Path(__file__).resolve().parents[2]
+    sql_path = project_root / "sql" / "migrations" / "0006_knowledge_chunk_hash.down.sql"
+    _execute_sql_file(sql_path)
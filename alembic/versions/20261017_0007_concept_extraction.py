@@ -0,0 +1,52 @@
+"""add materialized concept extraction
+
+Revision ID: 20261017_0007
+Revises: 20261017_0006
+Create Date: 2026-10-17 16:00:00
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0007"
+down_revision = "20261017_0006"
+branch_labels = None
+depends_on = None
+
+
+def _execute_sql_file(path: Path) -> None:
+    bind = op.get_bind()
+    sql_text = path.read_text(encoding="utf-8")
+
+    for statement in _split_statements(sql_text):
+        bind.exec_driver_sql(statement)
+
+
+def _split_statements(sql_text: str) -> list[str]:
+    """Split on ``;`` except inside ``$$``-quoted bodies such as ``DO`` blocks."""
+    statements: list[str] = []
+    current: list[str] = []
+    for part in sql_text.split(";"):
+        current.append(part)
+        if ";".join(current).count("$$") % 2 == 0:
+            statement = ";".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+    return statements
+
+
+def upgrade() -> None:
+    project_root = Path(__file__).resolve().parents[2]
+    sql_path = project_root / "sql" / "migrations" / "0007_concept_extraction.up.sql"
+    _execute_sql_file(sql_path)
+
+
+def downgrade() -> None:
+    project_root = Path(__file__).resolve().parents[2]
+    sql_path = project_root / "sql" / "migrations" / "0007_concept_extraction.down.sql"
+    _execute_sql_file(sql_path)
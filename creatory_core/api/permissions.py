@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from creatory_core.db.models import Conversation, Thread, WorkspaceMembership
+from creatory_core.db.models import Conversation, KnowledgeSource, Thread, WorkspaceMembership
 
 
 async def ensure_workspace_member(
@@ -45,3 +45,19 @@ async def ensure_thread_in_conversation(
     if thread is None or thread.conversation_id != conversation_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
     return thread
+
+
+async def ensure_knowledge_source_member(
+    db: AsyncSession,
+    source_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> KnowledgeSource:
+    source = await db.get(KnowledgeSource, source_id)
+    if source is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Knowledge source not found",
+        )
+
+    await ensure_workspace_member(db, source.workspace_id, user_id)
+    return source
@@ -6,6 +6,7 @@ from creatory_core.api.routes.auth import router as auth_router
 from creatory_core.api.routes.conversations import router as conversations_router
 from creatory_core.api.routes.health import router as health_router
 from creatory_core.api.routes.knowledge import router as knowledge_router
+from creatory_core.api.routes.knowledge_uploads import router as knowledge_uploads_router
 from creatory_core.api.routes.mcp import router as mcp_router
 from creatory_core.api.routes.orchestration import router as orchestration_router
 from creatory_core.api.routes.providers import router as providers_router
@@ -23,4 +24,5 @@ api_router.include_router(mcp_router)
 api_router.include_router(providers_router)
 api_router.include_router(assets_router)
 api_router.include_router(knowledge_router)
+api_router.include_router(knowledge_uploads_router)
 api_router.include_router(orchestration_router)
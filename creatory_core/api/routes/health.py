@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.db.session import get_db_session
+from creatory_core.services.job_queue import get_job_queue
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -23,3 +27,25 @@ async def ready(db: AsyncSession = Depends(get_db_session)) -> dict[str, str]:
             detail="Database unavailable",
         ) from None
     return {"status": "ready"}
+
+
+@router.get("/jobs")
+async def jobs(request: Request) -> dict[str, Any]:
+    """Job queue depth, plus wait times when this process runs a consumer.
+
+    The probe is unauthenticated, so it reports aggregates only: no workspace ids or
+    per-workspace figures, which go to the worker logs instead.
+    """
+    queue = get_job_queue()
+    try:
+        depth = await queue.depth()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue unavailable",
+        ) from None
+    payload: dict[str, Any] = {"backend": queue.name, "depth": asdict(depth)}
+    consumer = getattr(request.app.state, "job_consumer", None)
+    if consumer is not None:
+        payload["consumer"] = {"active": consumer.active, **consumer.metrics.totals()}
+    return payload
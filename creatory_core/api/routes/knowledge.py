@@ -1,26 +1,196 @@
+import asyncio
 import uuid
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.api.deps import get_current_user
-from creatory_core.api.permissions import ensure_workspace_member
-from creatory_core.db.models import KnowledgeChunk, KnowledgeSource, User
+from creatory_core.api.permissions import (
+    ensure_knowledge_source_member,
+    ensure_workspace_member,
+)
+from creatory_core.core.config import settings
+from creatory_core.db.models import (
+    IngestStatus,
+    KnowledgeChunk,
+    KnowledgeSource,
+    SourceType,
+    User,
+)
 from creatory_core.db.session import get_db_session
-from creatory_core.rag.hybrid import HybridRAGService, render_cited_answer
+from creatory_core.providers.base import ProviderKind
+from creatory_core.providers.service import get_provider_spec_or_none
+from creatory_core.rag.chunking import chunk_text
+from creatory_core.rag.filters import RetrievalFilter
+from creatory_core.rag.hybrid import (
+    HybridRAGService,
+    RetrievalOutcome,
+    RetrievedContext,
+    context_snippets,
+    render_cited_answer,
+)
+from creatory_core.rag.ingest import ChunkIngestPipeline, ChunkInput, reserve_chunk_indexes
+from creatory_core.rag.packing import PackedContext, context_token_budget, pack_contexts
+from creatory_core.rag.streaming import (
+    ByteCounter,
+    StreamTooLargeError,
+    batched,
+    chunk_text_stream,
+    decode_utf8,
+    read_pieces,
+)
 from creatory_core.schemas.knowledge import (
+    KnowledgeBatchQueryRequest,
+    KnowledgeBatchQueryResponse,
+    KnowledgeCacheStats,
+    KnowledgeChunkBatchCreateRequest,
     KnowledgeChunkCreateRequest,
+    KnowledgeChunkingOptions,
     KnowledgeChunkRead,
     KnowledgeCitation,
+    KnowledgeHighlight,
+    KnowledgeIngestAccepted,
+    KnowledgePackedContext,
+    KnowledgePackedPassage,
+    KnowledgeQueryFilters,
+    KnowledgeQueryOptions,
     KnowledgeQueryRequest,
     KnowledgeQueryResponse,
     KnowledgeSourceCreateRequest,
     KnowledgeSourceRead,
 )
+from creatory_core.services.ingest_jobs import (
+    enqueue_ingest,
+    fail_unqueued_ingest,
+    stage_ingest,
+)
+from creatory_core.services.job_queue import JobQueueUnavailable
 
 router = APIRouter(prefix="/knowledge", tags=["knowledge"])
 rag_service = HybridRAGService()
+ingest_pipeline = ChunkIngestPipeline(
+    rag_service.embedder,
+    batch_size=settings.rag_embedding_batch_size,
+    index_registry=rag_service.index_registry,
+    result_cache=rag_service.result_cache,
+)
+
+
+def retrieval_filter(filters: KnowledgeQueryFilters | None) -> RetrievalFilter | None:
+    if filters is None:
+        return None
+    if (
+        filters.created_after is not None
+        and filters.created_before is not None
+        and filters.created_after >= filters.created_before
+    ):
+        raise HTTPException(status_code=422, detail="created_after must precede created_before")
+    return RetrievalFilter(
+        source_types=tuple(filters.source_types),
+        source_ids=tuple(filters.source_ids),
+        created_after=filters.created_after,
+        created_before=filters.created_before,
+        source_metadata=filters.source_metadata,
+        chunk_metadata=filters.chunk_metadata,
+        chunk_metadata_keys=tuple(filters.chunk_metadata_keys),
+    )
+
+
+def pack_for_provider(contexts: list[RetrievedContext], provider_slug: str) -> PackedContext:
+    """Pack retrieved chunks into the prompt budget of an LLM provider from the catalog."""
+    spec = get_provider_spec_or_none(provider_slug)
+    if spec is None or spec.kind != ProviderKind.LLM:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Unknown LLM provider slug",
+        )
+    budget = context_token_budget(
+        spec,
+        max_tokens=settings.rag_context_max_tokens,
+        window_share=settings.rag_context_window_share,
+    )
+    return pack_contexts(contexts, token_budget=budget)
+
+
+def chunking_window(options: KnowledgeChunkingOptions) -> dict[str, int]:
+    """Resolve chunker options against the configured defaults."""
+    max_tokens = options.max_tokens or settings.rag_chunk_max_tokens
+    overlap_tokens = (
+        settings.rag_chunk_overlap_tokens
+        if options.overlap_tokens is None
+        else options.overlap_tokens
+    )
+    if overlap_tokens >= max_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="overlap_tokens must be smaller than max_tokens",
+        )
+    return {"max_tokens": max_tokens, "overlap_tokens": overlap_tokens}
+
+
+async def _chunk_content(content: str, window: dict[str, int]) -> list[ChunkInput]:
+    chunks = await asyncio.to_thread(chunk_text, content, **window)
+    return [
+        ChunkInput(
+            content=chunk.content,
+            token_count=chunk.token_count,
+            metadata_json=chunk.metadata_json,
+        )
+        for chunk in chunks
+    ]
+
+
+async def _queue_ingest(
+    db: AsyncSession,
+    source: KnowledgeSource,
+    chunks: list[ChunkInput],
+) -> int:
+    start_index = await reserve_chunk_indexes(db, source.id, len(chunks))
+    source.ingest_status = IngestStatus.PENDING.value
+    source.ingest_claimed_at = datetime.now(UTC)
+    batch = stage_ingest(db, source, chunks, start_index=start_index)
+    await db.commit()
+
+    try:
+        await enqueue_ingest(batch, workspace_id=source.workspace_id)
+    except JobQueueUnavailable as exc:
+        await fail_unqueued_ingest(db, source, batch)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    return start_index
+
+
+async def _create_source_with_content(
+    db: AsyncSession,
+    source: KnowledgeSource,
+    content: str | None,
+    options: KnowledgeChunkingOptions,
+) -> KnowledgeSource:
+    window = chunking_window(options)
+    db.add(source)
+    await db.flush()
+
+    chunks = await _chunk_content(content, window) if content else []
+    if chunks:
+        await _queue_ingest(db, source, chunks)
+    else:
+        await db.commit()
+
+    await db.refresh(source)
+    await rag_service.invalidate_workspace(source.workspace_id)
+    return source
 
 
 @router.post("/sources", response_model=KnowledgeSourceRead, status_code=status.HTTP_201_CREATED)
@@ -37,12 +207,63 @@ async def create_source(
         uri=payload.uri,
         title=payload.title,
         metadata_json=payload.metadata_json,
-        ingest_status="ready",
+        ingest_status=IngestStatus.PENDING.value,
+        created_by=current_user.id,
+    )
+    source = await _create_source_with_content(db, source, payload.content, payload.chunking)
+    return KnowledgeSourceRead.model_validate(source)
+
+
+@router.post(
+    "/sources:upload",
+    response_model=KnowledgeSourceRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_source(
+    workspace_id: uuid.UUID = Form(...),
+    file: UploadFile = File(...),
+    source_type: SourceType = Form(default=SourceType.FILE),
+    title: str | None = Form(default=None),
+    uri: str | None = Form(default=None),
+    max_tokens: int | None = Form(default=None, ge=16, le=4096),
+    overlap_tokens: int | None = Form(default=None, ge=0, le=1024),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> KnowledgeSourceRead:
+    """Create a source from a multipart file, chunking it as it is read.
+
+    The upload is decoded, chunked and written in embedding-sized batches like
+    ``PUT /sources/{id}/content``, so memory is bounded by one batch, not the file.
+    """
+    window = chunking_window(
+        KnowledgeChunkingOptions(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    )
+    await ensure_workspace_member(db, workspace_id, current_user.id)
+
+    source = KnowledgeSource(
+        workspace_id=workspace_id,
+        source_type=source_type,
+        uri=uri,
+        title=title or file.filename,
+        metadata_json={"filename": file.filename, "content_type": file.content_type},
+        ingest_status=IngestStatus.PENDING.value,
         created_by=current_user.id,
     )
     db.add(source)
-    await db.commit()
+    await db.flush()
+
+    body = ByteCounter(read_pieces(file), max_bytes=settings.rag_stream_max_bytes)
+    batches = batched(chunk_text_stream(decode_utf8(body), **window), ingest_pipeline.batch_size)
+    try:
+        await ingest_pipeline.ingest_stream(db, source, batches)
+    except StreamTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exc),
+        ) from exc
+
     await db.refresh(source)
+    await rag_service.invalidate_workspace(source.workspace_id)
     return KnowledgeSourceRead.model_validate(source)
 
 
@@ -80,32 +301,62 @@ async def create_chunk(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
 ) -> KnowledgeChunkRead:
-    source = await db.get(KnowledgeSource, source_id)
-    if source is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Knowledge source not found",
-        )
+    source = await ensure_knowledge_source_member(db, source_id, current_user.id)
+    start_index = await reserve_chunk_indexes(db, source.id, 1)
+    await db.commit()
+
+    (chunk,) = await ingest_pipeline.write_batch(
+        db,
+        source,
+        [
+            ChunkInput(
+                content=payload.content,
+                token_count=payload.token_count,
+                metadata_json=payload.metadata_json,
+            )
+        ],
+        start_index=start_index,
+    )
+    if source.ingest_status == IngestStatus.PENDING.value:
+        source.ingest_status = IngestStatus.READY.value
+    await db.commit()
+    rag_service.index_chunk(source, chunk)
+    await rag_service.invalidate_workspace(source.workspace_id)
+    return KnowledgeChunkRead.model_validate(chunk)
 
-    await ensure_workspace_member(db, source.workspace_id, current_user.id)
 
-    next_index = await db.scalar(
-        select(func.coalesce(func.max(KnowledgeChunk.chunk_index), -1) + 1).where(
-            KnowledgeChunk.source_id == source.id
-        )
+@router.post(
+    "/sources/{source_id}/chunks:batch",
+    response_model=KnowledgeIngestAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_chunks_batch(
+    source_id: uuid.UUID,
+    payload: KnowledgeChunkBatchCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> KnowledgeIngestAccepted:
+    source = await ensure_knowledge_source_member(db, source_id, current_user.id)
+
+    start_index = await _queue_ingest(
+        db,
+        source,
+        [
+            ChunkInput(
+                content=item.content,
+                token_count=item.token_count,
+                metadata_json=item.metadata_json,
+            )
+            for item in payload.chunks
+        ],
     )
 
-    chunk = KnowledgeChunk(
+    return KnowledgeIngestAccepted(
         source_id=source.id,
-        chunk_index=int(next_index),
-        content=payload.content,
-        token_count=payload.token_count,
-        metadata_json=payload.metadata_json,
+        ingest_status=source.ingest_status,
+        chunks_queued=len(payload.chunks),
+        first_chunk_index=start_index,
     )
-    db.add(chunk)
-    await db.commit()
-    await db.refresh(chunk)
-    return KnowledgeChunkRead.model_validate(chunk)
 
 
 @router.get("/sources/{source_id}/chunks", response_model=list[KnowledgeChunkRead])
@@ -116,13 +367,7 @@ async def list_chunks(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
 ) -> list[KnowledgeChunkRead]:
-    source = await db.get(KnowledgeSource, source_id)
-    if source is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Knowledge source not found",
-        )
-    await ensure_workspace_member(db, source.workspace_id, current_user.id)
+    source = await ensure_knowledge_source_member(db, source_id, current_user.id)
 
     rows = (
         await db.scalars(
@@ -136,6 +381,64 @@ async def list_chunks(
     return [KnowledgeChunkRead.model_validate(row) for row in rows]
 
 
+def _query_response(
+    query: str,
+    outcome: RetrievalOutcome,
+    options: KnowledgeQueryOptions,
+) -> KnowledgeQueryResponse:
+    contexts = outcome.contexts
+    snippets = context_snippets(query, contexts, max_chars=options.snippet_chars)
+
+    citations = [
+        KnowledgeCitation(
+            index=item.citation_index,
+            chunk_id=item.chunk_id,
+            source_id=item.source_id,
+            source_title=item.source_title,
+            score=item.score,
+            content=None if options.snippet_only else item.content,
+            snippet=snippet.text,
+            snippet_start=snippet.start,
+            snippet_end=snippet.end,
+            highlights=[
+                KnowledgeHighlight(start=start, end=end) for start, end in snippet.highlights
+            ],
+        )
+        for item, snippet in zip(contexts, snippets, strict=True)
+    ]
+
+    context = None
+    if options.provider_slug is not None:
+        packed = pack_for_provider(contexts, options.provider_slug)
+        context = KnowledgePackedContext(
+            provider_slug=options.provider_slug,
+            token_budget=packed.token_budget,
+            tokens_used=packed.tokens_used,
+            text=packed.render(),
+            passages=[
+                KnowledgePackedPassage(
+                    index=item.citation_index,
+                    source_id=item.source_id,
+                    source_title=item.source_title,
+                    chunk_ids=list(item.chunk_ids),
+                    score=item.score,
+                    token_count=item.token_count,
+                )
+                for item in packed.passages
+            ],
+            dropped_chunk_ids=packed.dropped_chunk_ids,
+        )
+
+    return KnowledgeQueryResponse(
+        query=query,
+        answer_preview=render_cited_answer(query, contexts, snippets=snippets),
+        citations=citations,
+        context=context,
+        timings_ms=outcome.timings_ms,
+        cached=outcome.cached,
+    )
+
+
 @router.post("/query", response_model=KnowledgeQueryResponse)
 async def query_knowledge(
     payload: KnowledgeQueryRequest,
@@ -144,27 +447,72 @@ async def query_knowledge(
 ) -> KnowledgeQueryResponse:
     await ensure_workspace_member(db, payload.workspace_id, current_user.id)
 
-    contexts = await rag_service.retrieve(
+    outcome = await rag_service.search(
         db,
         payload.workspace_id,
         payload.query,
         top_k=payload.top_k,
+        mode=payload.mode,
+        filters=retrieval_filter(payload.filters),
     )
+    return _query_response(payload.query, outcome, payload)
 
-    citations = [
-        KnowledgeCitation(
-            index=item.citation_index,
-            chunk_id=item.chunk_id,
-            source_id=item.source_id,
-            source_title=item.source_title,
-            score=item.score,
-            content=item.content,
+
+@router.post("/query:batch", response_model=KnowledgeBatchQueryResponse)
+async def query_knowledge_batch(
+    payload: KnowledgeBatchQueryRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> KnowledgeBatchQueryResponse:
+    """Answer several queries with one membership check and one load of workspace state."""
+    if len(payload.queries) > settings.rag_batch_max_queries:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.rag_batch_max_queries} queries per batch",
         )
-        for item in contexts
-    ]
+    await ensure_workspace_member(db, payload.workspace_id, current_user.id)
 
-    return KnowledgeQueryResponse(
-        query=payload.query,
-        answer_preview=render_cited_answer(payload.query, contexts),
-        citations=citations,
+    outcomes = await rag_service.search_many(
+        db,
+        payload.workspace_id,
+        payload.queries,
+        top_k=payload.top_k,
+        mode=payload.mode,
+        filters=retrieval_filter(payload.filters),
+    )
+    return KnowledgeBatchQueryResponse(
+        results=[
+            _query_response(query, outcome, payload)
+            for query, outcome in zip(payload.queries, outcomes, strict=True)
+        ]
+    )
+
+
+@router.get("/cache/stats", response_model=KnowledgeCacheStats)
+async def query_cache_stats(
+    workspace_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> KnowledgeCacheStats:
+    """Query cache hit rates for one workspace, as counted by this API process."""
+    await ensure_workspace_member(db, workspace_id, current_user.id)
+
+    cache = rag_service.result_cache
+    if cache is None:
+        return KnowledgeCacheStats(enabled=False)
+    counts = cache.stats.for_workspace(workspace_id)
+    stats = KnowledgeCacheStats(
+        enabled=True,
+        backend=cache.stats.backend,
+        hits=counts.hits,
+        misses=counts.misses,
+        hit_rate=counts.hit_rate,
     )
+    semantic = rag_service.semantic_cache
+    if semantic is not None:
+        semantic_counts = semantic.stats.for_workspace(workspace_id)
+        stats.semantic_enabled = True
+        stats.semantic_hits = semantic_counts.hits
+        stats.semantic_misses = semantic_counts.misses
+        stats.semantic_entries = semantic.workspace_entries(workspace_id)
+    return stats
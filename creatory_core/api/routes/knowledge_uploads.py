@@ -0,0 +1,82 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from creatory_core.api.deps import get_current_user
+from creatory_core.api.permissions import ensure_knowledge_source_member
+from creatory_core.api.routes.knowledge import chunking_window, ingest_pipeline
+from creatory_core.core.config import settings
+from creatory_core.db.models import User
+from creatory_core.db.session import get_db_session
+from creatory_core.rag.ingest import IngestMode, ReingestResult, claim_source
+from creatory_core.rag.streaming import (
+    ByteCounter,
+    StreamTooLargeError,
+    batched,
+    chunk_text_stream,
+    decode_utf8,
+)
+from creatory_core.schemas.knowledge import KnowledgeChunkingOptions, KnowledgeStreamIngestResult
+
+router = APIRouter(prefix="/knowledge", tags=["knowledge"])
+
+
+@router.put(
+    "/sources/{source_id}/content",
+    response_model=KnowledgeStreamIngestResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def stream_source_content(
+    source_id: uuid.UUID,
+    request: Request,
+    max_tokens: int | None = Query(default=None, ge=16, le=4096),
+    overlap_tokens: int | None = Query(default=None, ge=0, le=1024),
+    mode: IngestMode = Query(default=IngestMode.APPEND),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> KnowledgeStreamIngestResult:
+    """Ingest a raw UTF-8 request body of any size as it arrives.
+
+    The body is decoded, chunked and written in embedding-sized batches, so API
+    worker memory is bounded by one batch rather than the document size.
+
+    ``mode=replace`` re-ingests the source: chunks are diffed by content hash against
+    the stored ones, so only new content is embedded and removed content deleted.
+    """
+    window = chunking_window(
+        KnowledgeChunkingOptions(max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+    )
+    source = await ensure_knowledge_source_member(db, source_id, current_user.id)
+    claimed = await claim_source(
+        db, source.id, stale_after_seconds=settings.rag_ingest_claim_stale_seconds
+    )
+    if not claimed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Knowledge source ingest already in progress",
+        )
+
+    body = ByteCounter(request.stream(), max_bytes=settings.rag_stream_max_bytes)
+    batches = batched(chunk_text_stream(decode_utf8(body), **window), ingest_pipeline.batch_size)
+    try:
+        if mode == IngestMode.REPLACE:
+            result = await ingest_pipeline.reingest_stream(db, source, batches)
+        else:
+            first_chunk_index, inserted = await ingest_pipeline.ingest_stream(db, source, batches)
+            result = ReingestResult(first_chunk_index=first_chunk_index, inserted=inserted)
+    except StreamTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exc),
+        ) from exc
+
+    return KnowledgeStreamIngestResult(
+        source_id=source.id,
+        ingest_status=source.ingest_status,
+        bytes_read=body.bytes_read,
+        chunks_written=result.inserted,
+        first_chunk_index=result.first_chunk_index,
+        chunks_unchanged=result.unchanged,
+        chunks_deleted=result.deleted,
+    )
@@ -1,4 +1,5 @@
 import uuid
+from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
@@ -7,7 +8,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.api.deps import get_current_user
 from creatory_core.api.permissions import ensure_workspace_member
-from creatory_core.db.models import MCPServer, MCPTool, RunStatus, ToolInvocation, User
+from creatory_core.db.models import (
+    AgentRun,
+    Conversation,
+    MCPServer,
+    MCPTool,
+    RunStatus,
+    Task,
+    ToolInvocation,
+    User,
+)
 from creatory_core.db.session import get_db_session
 from creatory_core.schemas.mcp import (
     MCPServerCreateRequest,
@@ -17,6 +27,7 @@ from creatory_core.schemas.mcp import (
     ToolInvocationRead,
 )
 from creatory_core.services.mcp_registry import MCPRegistryLoadError, load_registry_manifest
+from creatory_core.services.run_events import emit, get_run_event_bus
 
 router = APIRouter(prefix="/mcp", tags=["mcp"])
 
@@ -135,6 +146,7 @@ async def list_tools(
 async def invoke_tool(
     tool_id: uuid.UUID,
     payload: dict,
+    task_id: uuid.UUID | None = Query(default=None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
 ) -> ToolInvocationRead:
@@ -148,8 +160,13 @@ async def invoke_tool(
 
     await ensure_workspace_member(db, server.workspace_id, current_user.id)
 
+    run = None
+    if task_id is not None:
+        run = await _run_for_task(db, task_id, server.workspace_id)
+
+    started_at = datetime.now(UTC)
     invocation = ToolInvocation(
-        task_id=None,
+        task_id=task_id,
         workflow_run_step_id=None,
         mcp_tool_id=tool.id,
         request_json=payload,
@@ -160,14 +177,49 @@ async def invoke_tool(
             "message": "Invocation executed through framework mock runtime.",
         },
         status=RunStatus.SUCCEEDED,
+        started_at=started_at,
+        ended_at=datetime.now(UTC),
     )
     db.add(invocation)
     await db.commit()
     await db.refresh(invocation)
 
+    if run is not None:
+        await emit(
+            get_run_event_bus(),
+            run.id,
+            "tool",
+            {
+                "run_id": str(run.id),
+                "task_id": str(task_id),
+                "invocation_id": str(invocation.id),
+                "tool": tool.tool_name,
+                "status": invocation.status.value,
+                "at": invocation.ended_at.isoformat(),
+            },
+            task_id=task_id,
+        )
     return ToolInvocationRead.model_validate(invocation)
 
 
+async def _run_for_task(
+    db: AsyncSession,
+    task_id: uuid.UUID,
+    workspace_id: uuid.UUID,
+) -> AgentRun:
+    task = await db.get(Task, task_id)
+    run = await db.get(AgentRun, task.agent_run_id) if task is not None else None
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    conversation = await db.get(Conversation, run.conversation_id) if run.conversation_id else None
+    if conversation is None or conversation.workspace_id != workspace_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Task and tool must belong to the same workspace",
+        )
+    return run
+
+
 @router.get("/registry/manifest")
 async def get_registry_manifest(
     current_user: User = Depends(get_current_user),
@@ -4,23 +4,48 @@ import uuid
 from datetime import UTC, datetime
 from typing import AsyncGenerator
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
 from creatory_core.api.deps import get_current_user
 from creatory_core.api.permissions import ensure_conversation_member, ensure_thread_in_conversation
-from creatory_core.db.models import AgentRun, Task, User
-from creatory_core.db.session import get_db_session
+from creatory_core.api.routes.knowledge import pack_for_provider, rag_service
+from creatory_core.api.sse import (
+    SSE_HEADERS,
+    end_when_stored_run_ends,
+    replay,
+    sse_response,
+    stored_status,
+)
+from creatory_core.core.config import settings
+from creatory_core.db.models import AgentRun, Conversation, RunStatus, Task, User
+from creatory_core.db.session import get_db_session, get_session_factory
+from creatory_core.providers.router import route_for_task
+from creatory_core.rag.packing import PackedContext
 from creatory_core.schemas.agent import AgentRunRead, TaskRead
 from creatory_core.schemas.conversation import MessageRead
-from creatory_core.schemas.orchestrator import ChatRunRequest, ChatRunResponse
+from creatory_core.schemas.orchestrator import (
+    ChatRunRequest,
+    ChatRunResponse,
+    QueuedChatRunResponse,
+)
 from creatory_core.services.circuit_breaker import CircuitBreakerTriggered
-from creatory_core.services.director import run_director_turn
+from creatory_core.services.director import DirectorTurn, knowledge_json, run_director_turn
+from creatory_core.services.job_queue import (
+    JobKind,
+    JobQueueUnavailable,
+    enqueue_run,
+    fail_unqueued_run,
+)
+from creatory_core.services.run_events import get_run_event_bus
 
 router = APIRouter(prefix="/orchestration", tags=["orchestration"])
 
+_ACTIVE_STATUSES = {RunStatus.QUEUED, RunStatus.RUNNING}
+
 
 @router.post(
     "/conversations/{conversation_id}/threads/{thread_id}/chat",
@@ -36,6 +61,7 @@ async def run_chat_turn(
 ) -> ChatRunResponse:
     conversation = await ensure_conversation_member(db, conversation_id, current_user.id)
     thread = await ensure_thread_in_conversation(db, thread_id, conversation.id)
+    knowledge = await _turn_knowledge(db, conversation, payload)
 
     try:
         result = await run_director_turn(
@@ -44,6 +70,7 @@ async def run_chat_turn(
             conversation=conversation,
             thread=thread,
             payload=payload,
+            knowledge=knowledge,
         )
     except CircuitBreakerTriggered as exc:
         raise HTTPException(
@@ -59,6 +86,120 @@ async def run_chat_turn(
     )
 
 
+@router.post(
+    "/conversations/{conversation_id}/threads/{thread_id}/chat/queued",
+    response_model=QueuedChatRunResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def queue_chat_turn(
+    conversation_id: uuid.UUID,
+    thread_id: uuid.UUID,
+    payload: ChatRunRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> QueuedChatRunResponse:
+    """Record a queued Director turn and hand it to the worker.
+
+    The run is visible (and streamable) immediately; progress follows on
+    ``/runs/{run_id}/stream``.
+    """
+    conversation = await ensure_conversation_member(db, conversation_id, current_user.id)
+    thread = await ensure_thread_in_conversation(db, thread_id, conversation.id)
+    knowledge = await _turn_knowledge(db, conversation, payload)
+
+    turn = DirectorTurn(db, conversation, thread, payload, knowledge_json(knowledge))
+    try:
+        run = await turn.start(current_user, status=RunStatus.QUEUED)
+    except CircuitBreakerTriggered as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    await db.commit()
+
+    try:
+        job = await enqueue_run(
+            run, JobKind.DIRECTOR_TURN, workspace_id=conversation.workspace_id
+        )
+    except JobQueueUnavailable as exc:
+        # The run is already committed as queued; nothing will ever pick it up.
+        await fail_unqueued_run(db, run)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    return QueuedChatRunResponse(
+        job_id=job.id,
+        user_message=MessageRead.model_validate(turn.user_message),
+        agent_run=AgentRunRead.model_validate(run),
+    )
+
+
+@router.post("/conversations/{conversation_id}/threads/{thread_id}/chat/stream")
+async def stream_chat_turn(
+    conversation_id: uuid.UUID,
+    thread_id: uuid.UUID,
+    payload: ChatRunRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> StreamingResponse:
+    """Run a Director turn and stream its events as they are produced.
+
+    Emits ``run`` (start/final), ``task``, ``text`` (pieces of the assistant text) and
+    ``message`` events carrying run event bus ids, so a dropped client can resume on
+    ``/runs/{run_id}/stream`` with ``Last-Event-ID``. The turn runs on its own
+    session because the response body outlives the request-scoped one.
+    """
+    conversation = await ensure_conversation_member(db, conversation_id, current_user.id)
+    thread = await ensure_thread_in_conversation(db, thread_id, conversation.id)
+    knowledge = await _turn_knowledge(db, conversation, payload)
+    await db.close()
+
+    session = get_session_factory()()
+    turn = DirectorTurn(session, conversation, thread, payload, knowledge_json(knowledge))
+    try:
+        # Started before responding so a rejected turn is still a plain 400.
+        await turn.start(current_user)
+    except CircuitBreakerTriggered as exc:
+        await session.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except BaseException:
+        await session.close()
+        raise
+    events = turn.events()
+
+    async def close_turn() -> None:
+        await events.aclose()
+        await session.close()
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        try:
+            async for event in events:
+                yield event.to_sse()
+        finally:
+            await close_turn()
+
+    # The background task also runs when the client leaves before the body starts,
+    # where the generator's ``finally`` never would; closing twice is harmless.
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(close_turn),
+    )
+
+
+async def _turn_knowledge(
+    db: AsyncSession,
+    conversation: Conversation,
+    payload: ChatRunRequest,
+) -> PackedContext | None:
+    if not payload.knowledge_top_k:
+        return None
+    # Ground the turn in workspace knowledge, packed for the paid refinement model.
+    contexts = await rag_service.retrieve(
+        db, conversation.workspace_id, payload.prompt, top_k=payload.knowledge_top_k
+    )
+    routing = route_for_task(payload.prompt, prefer_local=False)
+    return pack_for_provider(contexts, routing.refine_provider)
+
+
 @router.get("/runs/{run_id}", response_model=AgentRunRead)
 async def get_run(
     run_id: uuid.UUID,
@@ -99,9 +240,18 @@ async def list_run_tasks(
 @router.get("/runs/{run_id}/stream")
 async def stream_run(
     run_id: uuid.UUID,
+    last_event_id: str | None = Header(default=None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session),
 ) -> StreamingResponse:
+    """Follow a run's events live from the run event bus.
+
+    Access is checked once per connection; after that events come from the bus
+    fan-out without database queries. ``Last-Event-ID`` resumes after that event.
+    Finished runs replay the bus history, or the stored tasks once it has expired.
+    While idle, a live stream re-reads the run's status now and then, so it still
+    ends when the run executes where this process's bus cannot see it.
+    """
     run = await db.get(AgentRun, run_id)
     if run is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
@@ -109,6 +259,26 @@ async def stream_run(
     if run.conversation_id is not None:
         await ensure_conversation_member(db, run.conversation_id, current_user.id)
 
+    bus = get_run_event_bus()
+    if run.status in _ACTIVE_STATUSES:
+        # Give the connection back to the pool: a live viewer needs no database.
+        await db.close()
+        events = bus.subscribe(
+            run.id, after=last_event_id, heartbeat_seconds=settings.run_events_heartbeat_seconds
+        )
+        return sse_response(
+            end_when_stored_run_ends(
+                events,
+                run.id,
+                stored_status(AgentRun, run.id),
+                check_seconds=settings.run_events_status_check_seconds,
+            )
+        )
+
+    history = await bus.history(run.id, after=last_event_id)
+    if history or last_event_id:
+        return sse_response(replay(history))
+
     tasks = (
         await db.scalars(
             select(Task).where(Task.agent_run_id == run.id).order_by(Task.created_at.asc())
@@ -148,3 +318,4 @@ async def stream_run(
         yield f"event: run\ndata: {json.dumps(final_payload)}\n\n"
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
+
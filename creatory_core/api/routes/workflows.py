@@ -1,13 +1,17 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.api.deps import get_current_user
 from creatory_core.api.permissions import ensure_conversation_member, ensure_workspace_member
+from creatory_core.api.sse import end_when_stored_run_ends, replay, sse_response, stored_status
+from creatory_core.core.config import settings
 from creatory_core.db.models import (
+    RunStatus,
     User,
     WorkflowEdge,
     WorkflowNode,
@@ -17,17 +21,31 @@ from creatory_core.db.models import (
 )
 from creatory_core.db.session import get_db_session
 from creatory_core.schemas.workflow import (
+    QueuedWorkflowRunResponse,
     WorkflowEdgeRead,
     WorkflowNodeRead,
     WorkflowRunCreateRequest,
     WorkflowRunDetail,
+    WorkflowRunRead,
     WorkflowRunStepRead,
     WorkflowTemplateCreateRequest,
     WorkflowTemplateDetail,
     WorkflowTemplateRead,
 )
 from creatory_core.services.circuit_breaker import CircuitBreakerTriggered
-from creatory_core.services.workflow_runner import run_workflow
+from creatory_core.services.job_queue import (
+    JobKind,
+    JobQueueUnavailable,
+    enqueue_run,
+    fail_unqueued_run,
+)
+from creatory_core.services.run_events import get_run_event_bus
+from creatory_core.services.workflow_dag import WorkflowGraph, WorkflowGraphError
+from creatory_core.services.workflow_runner import (
+    create_workflow_run,
+    run_workflow,
+    stored_run_events,
+)
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
@@ -92,34 +110,37 @@ async def create_template(
         definition_json=payload.definition_json,
         created_by=current_user.id,
     )
+    nodes = [
+        WorkflowNode(
+            node_key=node.node_key,
+            type=node.type,
+            config_json=node.config_json,
+            position_x=node.position_x,
+            position_y=node.position_y,
+        )
+        for node in payload.nodes
+    ]
+    edges = [
+        WorkflowEdge(
+            source_node_key=edge.source_node_key,
+            target_node_key=edge.target_node_key,
+            condition_expr=edge.condition_expr,
+            metadata_json=edge.metadata_json,
+        )
+        for edge in payload.edges
+    ]
+    try:
+        WorkflowGraph.build(nodes, edges)
+    except WorkflowGraphError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
     db.add(template)
     await db.flush()
 
-    db.add_all(
-        [
-            WorkflowNode(
-                template_id=template.id,
-                node_key=node.node_key,
-                type=node.type,
-                config_json=node.config_json,
-                position_x=node.position_x,
-                position_y=node.position_y,
-            )
-            for node in payload.nodes
-        ]
-    )
-    db.add_all(
-        [
-            WorkflowEdge(
-                template_id=template.id,
-                source_node_key=edge.source_node_key,
-                target_node_key=edge.target_node_key,
-                condition_expr=edge.condition_expr,
-                metadata_json=edge.metadata_json,
-            )
-            for edge in payload.edges
-        ]
-    )
+    for item in (*nodes, *edges):
+        item.template_id = template.id
+    db.add_all(nodes)
+    db.add_all(edges)
 
     try:
         await db.commit()
@@ -197,7 +218,7 @@ async def run_template(
             conversation_id=payload.conversation_id,
             input_json=payload.input_json,
         )
-    except CircuitBreakerTriggered as exc:
+    except (CircuitBreakerTriggered, WorkflowGraphError) as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exc),
@@ -208,6 +229,55 @@ async def run_template(
     return response
 
 
+@router.post(
+    "/templates/{template_id}/run/queued",
+    response_model=QueuedWorkflowRunResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def queue_template_run(
+    template_id: uuid.UUID,
+    payload: WorkflowRunCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> QueuedWorkflowRunResponse:
+    template = await _template_for_user_or_404(db, template_id, current_user.id)
+
+    if payload.conversation_id is not None:
+        conversation = await ensure_conversation_member(
+            db,
+            payload.conversation_id,
+            current_user.id,
+        )
+        if conversation.workspace_id != template.workspace_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Conversation and template must belong to the same workspace",
+            )
+
+    workflow_run = await create_workflow_run(
+        db,
+        template,
+        current_user.id,
+        payload.conversation_id,
+        payload.input_json,
+        status=RunStatus.QUEUED,
+    )
+    await db.commit()
+    try:
+        job = await enqueue_run(
+            workflow_run, JobKind.WORKFLOW_RUN, workspace_id=template.workspace_id
+        )
+    except JobQueueUnavailable as exc:
+        # The run is already committed as queued; nothing will ever pick it up.
+        await fail_unqueued_run(db, workflow_run)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    return QueuedWorkflowRunResponse(
+        job_id=job.id, workflow_run=WorkflowRunRead.model_validate(workflow_run)
+    )
+
+
 @router.get("/runs/{workflow_run_id}", response_model=WorkflowRunDetail)
 async def get_run(
     workflow_run_id: uuid.UUID,
@@ -265,3 +335,62 @@ async def list_run_steps(
         )
     ).all()
     return [WorkflowRunStepRead.model_validate(step) for step in steps]
+
+
+@router.get("/runs/{workflow_run_id}/stream")
+async def stream_run(
+    workflow_run_id: uuid.UUID,
+    last_event_id: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> StreamingResponse:
+    """Follow a workflow run's events live from the run event bus.
+
+    Like the agent run stream: ``Last-Event-ID`` resumes after that event, idle live
+    streams re-check the stored status, and finished runs replay the bus history or,
+    once it has expired, the stored steps.
+    """
+    workflow_run = await db.get(WorkflowRun, workflow_run_id)
+    if workflow_run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow run not found")
+
+    template = await db.get(WorkflowTemplate, workflow_run.template_id)
+    if template is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow template not found",
+        )
+    await ensure_workspace_member(db, template.workspace_id, current_user.id)
+
+    bus = get_run_event_bus()
+    if workflow_run.status in {RunStatus.QUEUED, RunStatus.RUNNING}:
+        await db.close()
+        events = bus.subscribe(
+            workflow_run.id,
+            after=last_event_id,
+            heartbeat_seconds=settings.run_events_heartbeat_seconds,
+        )
+        return sse_response(
+            end_when_stored_run_ends(
+                events,
+                workflow_run.id,
+                stored_status(WorkflowRun, workflow_run.id),
+                check_seconds=settings.run_events_status_check_seconds,
+            )
+        )
+
+    history = await bus.history(workflow_run.id, after=last_event_id)
+    if history or last_event_id:
+        await db.close()
+        return sse_response(replay(history))
+
+    # The bus history has expired: rebuild the events from the stored steps.
+    steps = (
+        await db.scalars(
+            select(WorkflowRunStep)
+            .where(WorkflowRunStep.workflow_run_id == workflow_run.id)
+            .order_by(WorkflowRunStep.started_at.asc().nulls_last())
+        )
+    ).all()
+    await db.close()
+    return sse_response(replay(stored_run_events(workflow_run, steps)))
@@ -1,14 +1,29 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.api.deps import get_current_user
+from creatory_core.api.permissions import ensure_workspace_member
+from creatory_core.api.routes.knowledge import rag_service
+from creatory_core.core.config import settings
 from creatory_core.core.utils import slugify
-from creatory_core.db.models import MembershipRole, User, Workspace, WorkspaceMembership
+from creatory_core.db.models import (
+    KnowledgeChunk,
+    KnowledgeSource,
+    MembershipRole,
+    User,
+    Workspace,
+    WorkspaceMembership,
+)
 from creatory_core.db.session import get_db_session
-from creatory_core.schemas.workspace import WorkspaceCreateRequest, WorkspaceRead
+from creatory_core.rag.fulltext import search_config_exists
+from creatory_core.schemas.workspace import (
+    WorkspaceCreateRequest,
+    WorkspaceRead,
+    WorkspaceUpdateRequest,
+)
 from creatory_core.services.workspace_bootstrap import bootstrap_workspace_defaults
 
 router = APIRouter(prefix="/workspaces", tags=["workspaces"])
@@ -28,6 +43,15 @@ async def _generate_unique_slug(db: AsyncSession, source: str) -> str:
     return candidate
 
 
+async def _validated_search_config(db: AsyncSession, name: str) -> str:
+    if not await search_config_exists(db, name):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown text search configuration: {name}",
+        )
+    return name
+
+
 @router.post("", response_model=WorkspaceRead, status_code=status.HTTP_201_CREATED)
 async def create_workspace(
     payload: WorkspaceCreateRequest,
@@ -37,7 +61,16 @@ async def create_workspace(
     slug_source = payload.slug or payload.name
     slug = await _generate_unique_slug(db, slug_source)
 
-    workspace = Workspace(name=payload.name, slug=slug, owner_id=current_user.id)
+    search_config = await _validated_search_config(
+        db, payload.search_config or settings.rag_default_search_config
+    )
+
+    workspace = Workspace(
+        name=payload.name,
+        slug=slug,
+        owner_id=current_user.id,
+        search_config=search_config,
+    )
     db.add(workspace)
     await db.flush()
 
@@ -93,3 +126,47 @@ async def get_workspace(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
 
     return WorkspaceRead.model_validate(workspace)
+
+
+@router.patch("/{workspace_id}", response_model=WorkspaceRead)
+async def update_workspace(
+    workspace_id: uuid.UUID,
+    payload: WorkspaceUpdateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> WorkspaceRead:
+    membership = await ensure_workspace_member(db, workspace_id, current_user.id)
+    if membership.role not in {MembershipRole.OWNER, MembershipRole.ADMIN}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only workspace owners and admins can update workspace settings",
+        )
+
+    workspace = await db.get(Workspace, workspace_id)
+    if workspace is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
+
+    if payload.name is not None:
+        workspace.name = payload.name
+
+    search_config_changed = (
+        payload.search_config is not None and payload.search_config != workspace.search_config
+    )
+    if search_config_changed:
+        workspace.search_config = await _validated_search_config(db, payload.search_config)
+        # Re-stamping the config regenerates each chunk's search_vector in place.
+        await db.execute(
+            update(KnowledgeChunk)
+            .where(
+                KnowledgeChunk.source_id.in_(
+                    select(KnowledgeSource.id).where(KnowledgeSource.workspace_id == workspace_id)
+                )
+            )
+            .values(search_config=payload.search_config)
+        )
+
+    await db.commit()
+    await db.refresh(workspace)
+    if search_config_changed:
+        await rag_service.invalidate_workspace(workspace_id)
+    return WorkspaceRead.model_validate(workspace)
@@ -0,0 +1,78 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from datetime import UTC, datetime
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from creatory_core.db.models import AgentRun, RunStatus, WorkflowRun
+from creatory_core.db.session import get_session_factory
+from creatory_core.services.run_events import RunEvent
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_ACTIVE_STATUSES = frozenset({RunStatus.QUEUED, RunStatus.RUNNING})
+
+StatusLoader = Callable[[], Awaitable[RunStatus | None]]
+
+
+async def replay(events: list[RunEvent]) -> AsyncIterator[RunEvent | None]:
+    for event in events:
+        yield event
+
+
+def stored_status(model: type[AgentRun] | type[WorkflowRun], run_id: UUID) -> StatusLoader:
+    """Read a run's status in a short-lived session, for long-lived streams."""
+
+    async def load() -> RunStatus | None:
+        async with get_session_factory()() as db:
+            return await db.scalar(select(model.status).where(model.id == run_id))
+
+    return load
+
+
+async def end_when_stored_run_ends(
+    events: AsyncIterator[RunEvent | None],
+    run_id: UUID,
+    load_status: StatusLoader,
+    *,
+    check_seconds: float,
+) -> AsyncIterator[RunEvent | None]:
+    """Pass a live subscription through, checking the stored status while it is idle.
+
+    The in-memory bus only sees runs executed in this process, so a run a worker or
+    another API process executes would otherwise stream heartbeats forever. At most
+    every ``check_seconds`` an idle tick reads the run's status, and once it has
+    ended (or the run is gone) a final event closes the stream.
+    """
+    loop = asyncio.get_running_loop()
+    checked_at = loop.time()
+    async with contextlib.aclosing(events):
+        async for event in events:
+            yield event
+            if event is not None or loop.time() - checked_at < check_seconds:
+                continue
+            checked_at = loop.time()
+            run_status = await load_status()
+            if run_status in _ACTIVE_STATUSES:
+                continue
+            if run_status is not None:
+                payload = {
+                    "run_id": str(run_id),
+                    "status": run_status.value,
+                    "at": datetime.now(UTC).isoformat(),
+                    "stage": "final",
+                }
+                yield RunEvent(run_id=run_id, event_type="run", payload=payload)
+            return
+
+
+def sse_response(events: AsyncIterator[RunEvent | None]) -> StreamingResponse:
+    async def event_stream() -> AsyncGenerator[str, None]:
+        async for event in events:
+            # An idle tick becomes an SSE comment that keeps proxies from closing the stream.
+            yield event.to_sse() if event is not None else ": keep-alive\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -34,6 +34,78 @@ class Settings(BaseSettings):
         alias="DIRECTOR_DEFAULT_AGENT_SLUG",
     )
     circuit_breaker_max_steps: int = Field(default=15, alias="CIRCUIT_BREAKER_MAX_STEPS")
+    run_events_backend: str = Field(default="memory", alias="RUN_EVENTS_BACKEND")
+    run_events_max_events: int = Field(default=1000, alias="RUN_EVENTS_MAX_EVENTS")
+    run_events_ttl_seconds: int = Field(default=3600, alias="RUN_EVENTS_TTL_SECONDS")
+    run_events_heartbeat_seconds: float = Field(default=15.0, alias="RUN_EVENTS_HEARTBEAT_SECONDS")
+    run_events_status_check_seconds: float = Field(
+        default=30.0, alias="RUN_EVENTS_STATUS_CHECK_SECONDS"
+    )
+    job_queue_backend: str = Field(default="memory", alias="JOB_QUEUE_BACKEND")
+    job_queue_concurrency: int = Field(default=4, alias="JOB_QUEUE_CONCURRENCY")
+    job_queue_visibility_timeout_seconds: float = Field(
+        default=300.0, alias="JOB_QUEUE_VISIBILITY_TIMEOUT_SECONDS"
+    )
+    job_queue_max_attempts: int = Field(default=5, alias="JOB_QUEUE_MAX_ATTEMPTS")
+    job_queue_retry_base_seconds: float = Field(default=2.0, alias="JOB_QUEUE_RETRY_BASE_SECONDS")
+    job_queue_retry_max_seconds: float = Field(default=300.0, alias="JOB_QUEUE_RETRY_MAX_SECONDS")
+    job_queue_poll_seconds: float = Field(default=1.0, alias="JOB_QUEUE_POLL_SECONDS")
+    job_queue_workspace_max_concurrency: int = Field(
+        default=2, alias="JOB_QUEUE_WORKSPACE_MAX_CONCURRENCY"
+    )
+    job_queue_workspace_weights: dict[str, float] = Field(
+        default_factory=dict, alias="JOB_QUEUE_WORKSPACE_WEIGHTS"
+    )
+    job_queue_metrics_interval_seconds: float = Field(
+        default=60.0, alias="JOB_QUEUE_METRICS_INTERVAL_SECONDS"
+    )
+    worker_processes: int = Field(default=1, alias="WORKER_PROCESSES")
+    workflow_max_concurrency: int = Field(default=4, alias="WORKFLOW_MAX_CONCURRENCY")
+    workflow_step_batch_size: int = Field(default=16, alias="WORKFLOW_STEP_BATCH_SIZE")
+    rag_index_refresh_seconds: int = Field(default=300, alias="RAG_INDEX_REFRESH_SECONDS")
+    rag_index_max_workspaces: int = Field(default=256, alias="RAG_INDEX_MAX_WORKSPACES")
+    rag_retrieval_mode: str = Field(default="lexical", alias="RAG_RETRIEVAL_MODE")
+    rag_lexical_backend: str = Field(default="memory", alias="RAG_LEXICAL_BACKEND")
+    rag_lexical_scorer: str = Field(default="python", alias="RAG_LEXICAL_SCORER")
+    rag_default_search_config: str = Field(default="simple", alias="RAG_DEFAULT_SEARCH_CONFIG")
+    rag_ivfflat_probes: int = Field(default=10, alias="RAG_IVFFLAT_PROBES")
+    rag_ivfflat_iterative_scan: str = Field(
+        default="relaxed_order", alias="RAG_IVFFLAT_ITERATIVE_SCAN"
+    )
+    rag_fusion_method: str = Field(default="rrf", alias="RAG_FUSION_METHOD")
+    rag_rrf_k: int = Field(default=60, alias="RAG_RRF_K")
+    rag_batch_max_queries: int = Field(default=16, alias="RAG_BATCH_MAX_QUERIES")
+    rag_candidate_multiplier: int = Field(default=4, alias="RAG_CANDIDATE_MULTIPLIER")
+    rag_dense_weight: float = Field(default=0.5, alias="RAG_DENSE_WEIGHT")
+    rag_graph_weight: float = Field(default=0.5, alias="RAG_GRAPH_WEIGHT")
+    rag_max_query_concepts: int = Field(default=16, alias="RAG_MAX_QUERY_CONCEPTS")
+    rag_graph_hops: int = Field(default=2, alias="RAG_GRAPH_HOPS")
+    rag_reranker: str = Field(default="off", alias="RAG_RERANKER")
+    rag_reranker_model: str = Field(
+        default="cross-encoder/ms-marco-MiniLM-L-6-v2", alias="RAG_RERANKER_MODEL"
+    )
+    rag_rerank_candidates: int = Field(default=20, alias="RAG_RERANK_CANDIDATES")
+    rag_rerank_budget_ms: float = Field(default=150.0, alias="RAG_RERANK_BUDGET_MS")
+    rag_context_max_tokens: int = Field(default=3000, alias="RAG_CONTEXT_MAX_TOKENS")
+    rag_context_window_share: float = Field(default=0.25, alias="RAG_CONTEXT_WINDOW_SHARE")
+    rag_concept_batch_size: int = Field(default=500, alias="RAG_CONCEPT_BATCH_SIZE")
+    rag_concept_max_phrases: int = Field(default=8, alias="RAG_CONCEPT_MAX_PHRASES")
+    rag_concept_interval_seconds: int = Field(default=15, alias="RAG_CONCEPT_INTERVAL_SECONDS")
+    rag_query_cache_backend: str = Field(default="memory", alias="RAG_QUERY_CACHE_BACKEND")
+    rag_query_cache_ttl_seconds: int = Field(default=300, alias="RAG_QUERY_CACHE_TTL_SECONDS")
+    rag_query_cache_max_entries: int = Field(default=2048, alias="RAG_QUERY_CACHE_MAX_ENTRIES")
+    rag_semantic_cache_enabled: bool = Field(default=False, alias="RAG_SEMANTIC_CACHE_ENABLED")
+    rag_semantic_cache_threshold: float = Field(default=0.92, alias="RAG_SEMANTIC_CACHE_THRESHOLD")
+    rag_semantic_cache_max_entries: int = Field(default=256, alias="RAG_SEMANTIC_CACHE_MAX_ENTRIES")
+    rag_embedding_provider: str = Field(default="hashing", alias="RAG_EMBEDDING_PROVIDER")
+    rag_embedding_model: str = Field(default="", alias="RAG_EMBEDDING_MODEL")
+    rag_embedding_batch_size: int = Field(default=64, alias="RAG_EMBEDDING_BATCH_SIZE")
+    rag_chunk_max_tokens: int = Field(default=256, alias="RAG_CHUNK_MAX_TOKENS")
+    rag_chunk_overlap_tokens: int = Field(default=32, alias="RAG_CHUNK_OVERLAP_TOKENS")
+    rag_stream_max_bytes: int = Field(default=268435456, alias="RAG_STREAM_MAX_BYTES")
+    rag_ingest_claim_stale_seconds: int = Field(
+        default=3600, alias="RAG_INGEST_CLAIM_STALE_SECONDS"
+    )
 
     cors_origins: list[str] = Field(default_factory=list, alias="CORS_ORIGINS")
 
@@ -2,11 +2,16 @@ import enum
 import uuid
 from datetime import datetime
 
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    Computed,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Identity,
     Index,
     Integer,
     Numeric,
@@ -14,8 +19,9 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, REGCONFIG, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from creatory_core.db.base import Base
@@ -63,6 +69,14 @@ class SourceType(str, enum.Enum):
     VIDEO = "video"
 
 
+class IngestStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    EMBEDDING = "embedding"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class AssetType(str, enum.Enum):
     IMAGE = "image"
     VIDEO = "video"
@@ -84,6 +98,9 @@ class TransportType(str, enum.Enum):
     SSE = "sse"
 
 
+EMBEDDING_DIMENSIONS = 1536
+
+
 def _enum_values(enum_cls: type[enum.Enum]) -> list[str]:
     return [item.value for item in enum_cls]
 
@@ -116,6 +133,9 @@ class Workspace(Base):
     owner_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
     )
+    search_config: Mapped[str] = mapped_column(
+        REGCONFIG, nullable=False, default="simple", server_default="simple"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -589,6 +609,11 @@ class ToolInvocation(Base):
 
 class KnowledgeSource(Base):
     __tablename__ = "knowledge_sources"
+    __table_args__ = (
+        Index("idx_knowledge_sources_workspace_type", "workspace_id", "source_type"),
+        Index("idx_knowledge_sources_workspace_created_at", "workspace_id", "created_at"),
+        Index("idx_knowledge_sources_metadata", "metadata_json", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -606,7 +631,13 @@ class KnowledgeSource(Base):
     uri: Mapped[str | None] = mapped_column(Text, nullable=True)
     title: Mapped[str | None] = mapped_column(String, nullable=True)
     metadata_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
-    ingest_status: Mapped[str] = mapped_column(String, nullable=False, default="pending")
+    ingest_status: Mapped[str] = mapped_column(
+        String, nullable=False, default=IngestStatus.PENDING.value
+    )
+    next_chunk_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ingest_claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     created_by: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
     )
@@ -620,6 +651,14 @@ class KnowledgeChunk(Base):
     __table_args__ = (
         UniqueConstraint("source_id", "chunk_index", name="uq_knowledge_chunks_source_index"),
         Index("idx_chunks_source", "source_id"),
+        Index("idx_chunks_search_vector", "search_vector", postgresql_using="gin"),
+        Index("idx_chunks_metadata", "metadata_json", postgresql_using="gin"),
+        Index("idx_chunks_ingest_seq", "ingest_seq"),
+        Index(
+            "idx_chunks_concepts_pending",
+            "ingest_seq",
+            postgresql_where=text("concepts_extracted_at IS NULL"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -628,8 +667,62 @@ class KnowledgeChunk(Base):
     )
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
     token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     metadata_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    search_config: Mapped[str] = mapped_column(
+        REGCONFIG, nullable=False, default="simple", server_default="simple"
+    )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector(search_config, content)", persisted=True),
+        deferred=True,
+    )
+    ingest_seq: Mapped[int] = mapped_column(BigInteger, Identity(), nullable=False)
+    concepts_extracted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class KnowledgeIngestBatch(Base):
+    __tablename__ = "knowledge_ingest_batches"
+    __table_args__ = (Index("idx_ingest_batches_source", "source_id"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("knowledge_sources.id", ondelete="CASCADE"), nullable=False
+    )
+    start_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    chunks_json: Mapped[list[dict]] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class ChunkEmbedding(Base):
+    __tablename__ = "chunk_embeddings"
+    __table_args__ = (
+        Index(
+            "idx_chunk_embeddings_ivfflat",
+            "embedding",
+            postgresql_using="ivfflat",
+            postgresql_with={"lists": 100},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        Index("idx_chunk_embeddings_model_hash", "model_name", "content_hash"),
+    )
+
+    chunk_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("knowledge_chunks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    model_name: Mapped[str] = mapped_column(Text, nullable=False)
+    embedding: Mapped[list[float]] = mapped_column(Vector(EMBEDDING_DIMENSIONS), nullable=False)
+    content_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
 
 
 class ConceptNode(Base):
@@ -645,12 +738,22 @@ class ConceptNode(Base):
     concept_key: Mapped[str] = mapped_column(String, nullable=False)
     label: Mapped[str] = mapped_column(String, nullable=False)
     node_type: Mapped[str] = mapped_column(String, nullable=False)
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     metadata_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
 
 
 class ConceptEdge(Base):
     __tablename__ = "concept_edges"
-    __table_args__ = (Index("idx_concept_edges_src_dst", "src_concept_id", "dst_concept_id"),)
+    __table_args__ = (
+        Index("idx_concept_edges_src_dst", "src_concept_id", "dst_concept_id"),
+        UniqueConstraint(
+            "workspace_id",
+            "src_concept_id",
+            "dst_concept_id",
+            "relation_type",
+            name="uq_concept_edges_pair",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -664,12 +767,39 @@ class ConceptEdge(Base):
     )
     relation_type: Mapped[str] = mapped_column(String, nullable=False)
     weight: Mapped[float] = mapped_column(Numeric(6, 4), nullable=False, default=1.0)
+    co_occurrences: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     metadata_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
 
+class ChunkConcept(Base):
+    __tablename__ = "knowledge_chunk_concepts"
+    __table_args__ = (Index("idx_chunk_concepts_concept", "concept_id"),)
+
+    chunk_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("knowledge_chunks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    concept_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("concept_nodes.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    weight: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)
+
+
+class ConceptExtractionState(Base):
+    __tablename__ = "concept_extraction_state"
+
+    job_name: Mapped[str] = mapped_column(String, primary_key=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class MediaAsset(Base):
     __tablename__ = "media_assets"
 
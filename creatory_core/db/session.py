@@ -25,6 +25,11 @@ def _ensure_session_factory() -> async_sessionmaker[AsyncSession]:
     return AsyncSessionLocal
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that outlives a request, e.g. background ingestion."""
+    return _ensure_session_factory()
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     session_factory = _ensure_session_factory()
     async with session_factory() as session:
@@ -1,11 +1,55 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from creatory_core.api.router import api_router
+from creatory_core.api.routes.knowledge import ingest_pipeline
 from creatory_core.core.config import settings
+from creatory_core.db.session import get_session_factory
+from creatory_core.services.job_queue import build_job_consumer
+from creatory_core.services.run_jobs import run_job_handlers
+
+logger = logging.getLogger("creatory.api")
+
+
+def _warn_if_query_cache_is_process_local() -> None:
+    shared = settings.api_workers > 1 or settings.job_queue_backend == "redis"
+    if settings.rag_query_cache_backend == "memory" and shared:
+        # Each process then has its own cache: a knowledge write in one process only
+        # reaches the others' cached results by TTL, and stats cover one process.
+        logger.warning(
+            "RAG_QUERY_CACHE_BACKEND=memory is per process; with several API workers or "
+            "a separate job worker, set RAG_QUERY_CACHE_BACKEND=redis"
+        )
+
+
+@contextlib.asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    _warn_if_query_cache_is_process_local()
+    consumer_task = None
+    if settings.job_queue_backend == "memory":
+        # The in-memory queue is only visible to this process, so it runs its own consumer,
+        # ingesting through the routes' pipeline so new chunks reach the live indexes.
+        consumer = build_job_consumer(
+            run_job_handlers(get_session_factory(), ingest_pipeline=ingest_pipeline)
+        )
+        application.state.job_consumer = consumer
+        consumer_task = asyncio.create_task(consumer.run_forever())
+    try:
+        yield
+    finally:
+        if consumer_task is not None:
+            consumer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await consumer_task
+
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 cors_origins = settings.cors_origins
 cors_origin_regex = None
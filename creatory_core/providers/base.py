@@ -28,6 +28,7 @@ class ProviderSpec:
     default_model: str | None = None
     default_endpoint: str | None = None
     supports_streaming: bool = False
+    context_window_tokens: int | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
@@ -12,6 +12,7 @@ DEFAULT_PROVIDER_CATALOG: tuple[ProviderSpec, ...] = (
         default_model="gpt-4.1-mini",
         default_endpoint="https://api.openai.com/v1",
         supports_streaming=True,
+        context_window_tokens=1_047_576,
     ),
     ProviderSpec(
         slug="anthropic",
@@ -21,6 +22,7 @@ DEFAULT_PROVIDER_CATALOG: tuple[ProviderSpec, ...] = (
         default_model="claude-3-7-sonnet-latest",
         default_endpoint="https://api.anthropic.com",
         supports_streaming=True,
+        context_window_tokens=200_000,
     ),
     ProviderSpec(
         slug="gemini",
@@ -30,6 +32,7 @@ DEFAULT_PROVIDER_CATALOG: tuple[ProviderSpec, ...] = (
         default_model="gemini-2.0-flash",
         default_endpoint="https://generativelanguage.googleapis.com",
         supports_streaming=True,
+        context_window_tokens=1_048_576,
     ),
     ProviderSpec(
         slug="ollama",
@@ -39,6 +42,7 @@ DEFAULT_PROVIDER_CATALOG: tuple[ProviderSpec, ...] = (
         default_model="llama3.2",
         default_endpoint="http://localhost:11434",
         supports_streaming=True,
+        context_window_tokens=8_192,
     ),
     ProviderSpec(
         slug="vllm",
@@ -48,6 +52,7 @@ DEFAULT_PROVIDER_CATALOG: tuple[ProviderSpec, ...] = (
         default_model="meta-llama/Llama-3.1-8B-Instruct",
         default_endpoint="http://localhost:8001/v1",
         supports_streaming=True,
+        context_window_tokens=131_072,
     ),
     ProviderSpec(
         slug="flux",
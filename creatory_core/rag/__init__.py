@@ -1,5 +1,121 @@
 """Hybrid RAG helpers for creator memory retrieval."""
 
-from creatory_core.rag.hybrid import HybridRAGService, RetrievedContext, render_cited_answer
+from creatory_core.rag.bm25 import BM25FScorer, BM25Parameters, FieldParameters
+from creatory_core.rag.cache import (
+    InMemoryQueryCacheBackend,
+    QueryResultCache,
+    RedisQueryCacheBackend,
+)
+from creatory_core.rag.chunking import StreamingChunker, TextChunk, chunk_stream, chunk_text
+from creatory_core.rag.concepts import ConceptExtractionJob, KeyPhrase, extract_key_phrases
+from creatory_core.rag.dense import DenseRetriever
+from creatory_core.rag.embeddings import (
+    Embedder,
+    HashingEmbedder,
+    SentenceTransformerEmbedder,
+    build_embedder,
+)
+from creatory_core.rag.filters import CandidateSet, RetrievalFilter
+from creatory_core.rag.fulltext import PostgresFullTextRetriever
+from creatory_core.rag.fusion import FusionMethod, reciprocal_rank_fusion, weighted_score_fusion
+from creatory_core.rag.graph import ConceptGraph, ConceptGraphRegistry, build_concept_graph
+from creatory_core.rag.hybrid import (
+    HybridRAGService,
+    LexicalBackend,
+    RetrievalMode,
+    RetrievalOutcome,
+    RetrievedContext,
+    context_snippets,
+    render_cited_answer,
+)
+from creatory_core.rag.index import InvertedIndex, WorkspaceIndexRegistry, token_spans, tokenize
+from creatory_core.rag.ingest import (
+    ChunkDiff,
+    ChunkIngestPipeline,
+    ChunkInput,
+    IngestMode,
+    ReingestResult,
+)
+from creatory_core.rag.packing import (
+    PackedContext,
+    PackedPassage,
+    context_token_budget,
+    pack_contexts,
+)
+from creatory_core.rag.rerank import (
+    CrossEncoderReranker,
+    Reranker,
+    TermOverlapReranker,
+    build_reranker,
+    rerank_contexts,
+)
+from creatory_core.rag.semantic_cache import (
+    HyperplaneHasher,
+    SemanticQueryCache,
+    SemanticQueryIndex,
+)
+from creatory_core.rag.snippets import Snippet, extract_snippet
+from creatory_core.rag.vectorized import TermMatrix, VectorizedBM25FScorer, build_lexical_scorer
 
-__all__ = ["HybridRAGService", "RetrievedContext", "render_cited_answer"]
+__all__ = [
+    "BM25FScorer",
+    "BM25Parameters",
+    "CandidateSet",
+    "ChunkDiff",
+    "ChunkIngestPipeline",
+    "ChunkInput",
+    "ConceptExtractionJob",
+    "ConceptGraph",
+    "ConceptGraphRegistry",
+    "CrossEncoderReranker",
+    "DenseRetriever",
+    "Embedder",
+    "FieldParameters",
+    "FusionMethod",
+    "HashingEmbedder",
+    "HybridRAGService",
+    "HyperplaneHasher",
+    "InMemoryQueryCacheBackend",
+    "IngestMode",
+    "InvertedIndex",
+    "KeyPhrase",
+    "LexicalBackend",
+    "PackedContext",
+    "PackedPassage",
+    "PostgresFullTextRetriever",
+    "QueryResultCache",
+    "RedisQueryCacheBackend",
+    "ReingestResult",
+    "Reranker",
+    "RetrievalFilter",
+    "RetrievalMode",
+    "RetrievalOutcome",
+    "RetrievedContext",
+    "SemanticQueryCache",
+    "SemanticQueryIndex",
+    "SentenceTransformerEmbedder",
+    "Snippet",
+    "StreamingChunker",
+    "TermMatrix",
+    "TermOverlapReranker",
+    "TextChunk",
+    "VectorizedBM25FScorer",
+    "WorkspaceIndexRegistry",
+    "build_concept_graph",
+    "build_embedder",
+    "build_lexical_scorer",
+    "build_reranker",
+    "chunk_stream",
+    "chunk_text",
+    "context_snippets",
+    "context_token_budget",
+    "extract_key_phrases",
+    "extract_snippet",
+    "pack_contexts",
+    "reciprocal_rank_fusion",
+    "render_cited_answer",
+    "rerank_contexts",
+    "token_spans",
+    "tokenize",
+    "weighted_score_fusion",
+]
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from creatory_core.rag.index import CONTENT_FIELD, TITLE_FIELD, InvertedIndex
+
+if TYPE_CHECKING:
+    from creatory_core.rag.filters import CandidateSet
+
+
+@dataclass(frozen=True)
+class FieldParameters:
+    weight: float = 1.0
+    b: float = 0.75
+
+
+@dataclass(frozen=True)
+class BM25Parameters:
+    k1: float = 1.2
+    fields: dict[str, FieldParameters] = field(
+        default_factory=lambda: {
+            CONTENT_FIELD: FieldParameters(weight=1.0, b=0.75),
+            TITLE_FIELD: FieldParameters(weight=2.0, b=0.5),
+        }
+    )
+
+
+def _scope(index: InvertedIndex, candidates: CandidateSet | None) -> list[UUID] | None:
+    """The in-scope chunks of the index, when listing them beats checking each posting."""
+    if candidates is None:
+        return None
+    if candidates.chunk_ids is not None:
+        return list(candidates.chunk_ids)
+    size = sum(len(index.source_chunk_ids(source_id)) for source_id in candidates.source_ids)
+    if size >= len(index):
+        return None
+    return [
+        chunk_id
+        for source_id in candidates.source_ids
+        for chunk_id in index.source_chunk_ids(source_id)
+    ]
+
+
+def _scoped_postings(
+    postings: Mapping[UUID, int],
+    scope: list[UUID] | None,
+    candidates: CandidateSet | None,
+    index: InvertedIndex,
+) -> Iterator[tuple[UUID, int]]:
+    """Postings of in-scope chunks, walking whichever of postings and scope is shorter."""
+    if scope is not None and len(scope) < len(postings):
+        for chunk_id in scope:
+            frequency = postings.get(chunk_id)
+            if frequency is not None:
+                yield chunk_id, frequency
+        return
+    for chunk_id, frequency in postings.items():
+        if candidates is None:
+            yield chunk_id, frequency
+            continue
+        chunk = index.chunk(chunk_id)
+        if chunk is not None and candidates.allows(chunk_id, chunk.source_id):
+            yield chunk_id, frequency
+
+
+class BM25FScorer:
+    """BM25F over the per-field postings kept by ``InvertedIndex``.
+
+    Term frequencies are length-normalised per field, combined with the field weights
+    and saturated once with ``k1``. All corpus statistics come from the index, so a
+    query only touches the postings of its own terms.
+    """
+
+    def __init__(self, parameters: BM25Parameters | None = None) -> None:
+        self.parameters = parameters or BM25Parameters()
+
+    def idf(self, index: InvertedIndex, token: str) -> float:
+        document_count = len(index)
+        document_frequency = index.document_frequency(token)
+        return math.log(
+            1.0 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5)
+        )
+
+    def score(
+        self,
+        index: InvertedIndex,
+        query_tokens: Iterable[str],
+        candidates: CandidateSet | None = None,
+    ) -> dict[UUID, float]:
+        """BM25F scores; with ``candidates`` only those chunks are ever scored."""
+        scores: dict[UUID, float] = {}
+        if not len(index):
+            return scores
+
+        average_lengths = {
+            name: index.average_length(name) or 1.0 for name in self.parameters.fields
+        }
+        k1 = self.parameters.k1
+        scope = _scope(index, candidates)
+
+        for token in set(query_tokens):
+            if not index.document_frequency(token):
+                continue
+
+            pseudo_frequencies: dict[UUID, float] = {}
+            for name, field_parameters in self.parameters.fields.items():
+                average_length = average_lengths[name]
+                for chunk_id, frequency in _scoped_postings(
+                    index.postings(token, name), scope, candidates, index
+                ):
+                    chunk = index.chunk(chunk_id)
+                    if chunk is None:
+                        continue
+                    normaliser = (
+                        1.0
+                        - field_parameters.b
+                        + field_parameters.b * (chunk.lengths.get(name, 0) / average_length)
+                    )
+                    pseudo_frequencies[chunk_id] = pseudo_frequencies.get(chunk_id, 0.0) + (
+                        field_parameters.weight * frequency / normaliser
+                    )
+
+            idf = self.idf(index, token)
+            for chunk_id, pseudo_frequency in pseudo_frequencies.items():
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * (
+                    pseudo_frequency / (k1 + pseudo_frequency)
+                )
+
+        return scores
+
+    def top_k(
+        self,
+        index: InvertedIndex,
+        query_tokens: Iterable[str],
+        limit: int,
+        candidates: CandidateSet | None = None,
+    ) -> list[tuple[UUID, float]]:
+        scores = self.score(index, query_tokens, candidates)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+from uuid import UUID
+
+_KEY_PREFIX = "creatory:rag"
+
+
+class QueryCacheBackend(Protocol):
+    name: str
+
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None: ...
+
+    async def version(self, workspace_id: UUID) -> int: ...
+
+    async def bump_version(self, workspace_id: UUID) -> int: ...
+
+
+class InMemoryQueryCacheBackend:
+    """Process-local LRU with per-entry TTL. Suitable for a single API worker."""
+
+    name = "memory"
+
+    def __init__(self, *, max_entries: int = 2048) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._versions: dict[UUID, int] = {}
+
+    async def get(self, key: str) -> str | None:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def version(self, workspace_id: UUID) -> int:
+        return self._versions.get(workspace_id, 0)
+
+    async def bump_version(self, workspace_id: UUID) -> int:
+        version = self._versions.get(workspace_id, 0) + 1
+        self._versions[workspace_id] = version
+        return version
+
+
+class RedisQueryCacheBackend:
+    """Redis-backed cache shared by every API worker; needs the ``redis`` extra."""
+
+    name = "redis"
+
+    def __init__(self, redis_url: str) -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - depends on optional extra
+            raise RuntimeError(
+                "Redis query cache requires the 'redis' package: pip install creatory[redis]"
+            ) from exc
+        self._client = redis_asyncio.from_url(redis_url, decode_responses=True)
+
+    async def get(self, key: str) -> str | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self._client.set(key, value, ex=ttl_seconds)
+
+    async def version(self, workspace_id: UUID) -> int:
+        value = await self._client.get(f"{_KEY_PREFIX}:version:{workspace_id}")
+        return int(value or 0)
+
+    async def bump_version(self, workspace_id: UUID) -> int:
+        return int(await self._client.incr(f"{_KEY_PREFIX}:version:{workspace_id}"))
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of this process, in total and for recently active workspaces."""
+
+    backend: str
+    hits: int = 0
+    misses: int = 0
+    max_workspaces: int = 1024
+    _workspaces: OrderedDict[UUID, CacheStats] = field(
+        default_factory=OrderedDict, repr=False, compare=False
+    )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def record(self, workspace_id: UUID, *, hit: bool) -> None:
+        workspace = self._workspaces.get(workspace_id)
+        if workspace is None:
+            workspace = self._workspaces[workspace_id] = CacheStats(backend=self.backend)
+            while len(self._workspaces) > self.max_workspaces:
+                self._workspaces.popitem(last=False)
+        self._workspaces.move_to_end(workspace_id)
+        for stats in (self, workspace):
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+
+    def for_workspace(self, workspace_id: UUID) -> CacheStats:
+        return self._workspaces.get(workspace_id) or CacheStats(backend=self.backend)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class QueryResultCache:
+    """Caches JSON-able retrieval results per (workspace, normalized query, top_k, variant).
+
+    Keys embed a per-workspace version counter; bumping it on every knowledge write
+    makes all earlier entries for that workspace unreachable at once.
+    """
+
+    def __init__(self, backend: QueryCacheBackend, *, ttl_seconds: int = 300) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats(backend=backend.name)
+
+    async def version(self, workspace_id: UUID) -> int:
+        """The workspace's current version, to pin one lookup-and-store to.
+
+        A retrieval reads it once before looking up and passes it back to ``set``, so
+        results computed while a knowledge write bumps the version are stored under
+        the old, already unreachable version instead of passing for fresh ones.
+        """
+        return await self.backend.version(workspace_id)
+
+    async def _key(
+        self,
+        workspace_id: UUID,
+        query: str,
+        top_k: int,
+        variant: str,
+        version: int | None,
+    ) -> str:
+        if version is None:
+            version = await self.backend.version(workspace_id)
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{_KEY_PREFIX}:query:{workspace_id}:{version}:{variant}:{top_k}:{digest}"
+
+    async def get(
+        self,
+        workspace_id: UUID,
+        query: str,
+        *,
+        top_k: int,
+        variant: str = "",
+        version: int | None = None,
+    ) -> list[dict[str, Any]] | None:
+        items = await self.peek(workspace_id, query, top_k=top_k, variant=variant, version=version)
+        self.stats.record(workspace_id, hit=items is not None)
+        return items
+
+    async def peek(
+        self,
+        workspace_id: UUID,
+        query: str,
+        *,
+        top_k: int,
+        variant: str = "",
+        version: int | None = None,
+    ) -> list[dict[str, Any]] | None:
+        """Like ``get`` but without counting towards the hit/miss stats."""
+        key = await self._key(workspace_id, query, top_k, variant, version)
+        payload = await self.backend.get(key)
+        return json.loads(payload) if payload is not None else None
+
+    async def set(
+        self,
+        workspace_id: UUID,
+        query: str,
+        items: list[dict[str, Any]],
+        *,
+        top_k: int,
+        variant: str = "",
+        version: int | None = None,
+    ) -> None:
+        key = await self._key(workspace_id, query, top_k, variant, version)
+        await self.backend.set(key, json.dumps(items), self.ttl_seconds)
+
+    async def invalidate_workspace(self, workspace_id: UUID) -> None:
+        await self.backend.bump_version(workspace_id)
+
+
+def build_query_cache(
+    backend: str,
+    *,
+    redis_url: str,
+    ttl_seconds: int,
+    max_entries: int,
+) -> QueryResultCache | None:
+    if backend == "off":
+        return None
+    if backend == "redis":
+        return QueryResultCache(RedisQueryCacheBackend(redis_url), ttl_seconds=ttl_seconds)
+    return QueryResultCache(
+        InMemoryQueryCacheBackend(max_entries=max_entries),
+        ttl_seconds=ttl_seconds,
+    )
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+_WORD_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_HEADING_PATTERN = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+_BLOCK_SPLIT_PATTERN = re.compile(r"\n\s*\n")
+_TRAILING_WORD_PATTERN = re.compile(r"\S*\Z")
+# Ends a word that a hard split cut short: it is joined to the next without a space.
+_GLUE = "\x00"
+
+TokenCounter = Callable[[str], int]
+
+
+def _regex_token_count(text: str) -> int:
+    return len(_WORD_TOKEN_PATTERN.findall(text))
+
+
+@lru_cache(maxsize=1)
+def default_token_counter() -> TokenCounter:
+    """BPE token counts via ``tiktoken`` when installed, else a word/punctuation count."""
+    try:
+        import tiktoken
+    except ImportError:
+        return _regex_token_count
+
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str) -> int:
+    return default_token_counter()(text)
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    content: str
+    token_count: int
+    metadata_json: dict = field(default_factory=dict)
+
+
+class StreamingChunker:
+    """Incremental text splitter with token windows, overlap and heading boundaries.
+
+    Text may be fed in arbitrary pieces. Only complete blocks (paragraphs separated by
+    blank lines, or markdown headings) are processed; the unfinished tail is held
+    back until more text or ``finish()`` arrives, so memory stays bounded by one
+    window plus one block.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_tokens: int = 256,
+        overlap_tokens: int = 32,
+        token_counter: TokenCounter | None = None,
+        max_pending_chars: int = 65536,
+    ) -> None:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be in [0, max_tokens)")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self._count = token_counter or count_tokens
+        self.max_pending_chars = max_pending_chars
+        self._pending = ""
+        self._words: list[str] = []
+        self._word_tokens: list[int] = []
+        self._window_tokens = 0
+        self._fresh_words = 0
+        self._heading: str | None = None
+
+    def feed(self, text: str) -> Iterator[TextChunk]:
+        self._pending += text
+        blocks = _BLOCK_SPLIT_PATTERN.split(self._pending)
+        self._pending = blocks.pop()
+        for block in blocks:
+            yield from self._consume_block(block)
+
+        if len(self._pending) > self.max_pending_chars:
+            # One very long paragraph: consume it word by word, holding back only a
+            # possibly incomplete trailing word. A trailing word longer than the cap
+            # (CJK, base64, minified code) is cut by characters, and the consumed part
+            # is glued to the held-back rest so the chunks keep the text verbatim.
+            tail = _TRAILING_WORD_PATTERN.search(self._pending).group()
+            if len(tail) > self.max_pending_chars:
+                tail = tail[-max(1, self.max_pending_chars // 2) :]
+            head = self._pending[: len(self._pending) - len(tail)]
+            self._pending = tail
+            yield from self._consume_block(head, closes_paragraph=False)
+            if not head[-1].isspace() and self._words:
+                self._words[-1] += _GLUE
+
+    def finish(self) -> Iterator[TextChunk]:
+        if self._pending.strip():
+            yield from self._consume_block(self._pending)
+        self._pending = ""
+        yield from self._flush(keep_overlap=False)
+
+    def _consume_block(self, block: str, *, closes_paragraph: bool = True) -> Iterator[TextChunk]:
+        lines = block.strip().splitlines()
+        if not lines:
+            return
+
+        heading = _HEADING_PATTERN.match(lines[0])
+        if heading is not None:
+            # A heading closes the current section; overlap never crosses sections.
+            yield from self._flush(keep_overlap=False)
+            self._heading = heading.group(1)
+            lines = lines[1:]
+
+        for word in " ".join(lines).split():
+            pieces = list(self._pieces(word, self._count(word) or 1))
+            for position, (piece, tokens) in enumerate(pieces, start=1):
+                if position < len(pieces):
+                    piece += _GLUE
+                if self._fresh_words and self._window_tokens + tokens > self.max_tokens:
+                    yield from self._flush(keep_overlap=True)
+                self._words.append(piece)
+                self._word_tokens.append(tokens)
+                self._window_tokens += tokens
+                self._fresh_words += 1
+
+        if closes_paragraph and self._words:
+            # Paragraph boundary: keep words of one paragraph on the same line.
+            self._words[-1] += "\n"
+
+    def _pieces(self, word: str, tokens: int) -> Iterator[tuple[str, int]]:
+        """Split a word longer than one window by characters into window-sized pieces."""
+        if tokens <= self.max_tokens or len(word) == 1:
+            yield word, tokens
+            return
+        size = max(1, len(word) * self.max_tokens // tokens)
+        for start in range(0, len(word), size):
+            piece = word[start : start + size]
+            yield from self._pieces(piece, self._count(piece) or 1)
+
+    def _flush(self, *, keep_overlap: bool) -> Iterator[TextChunk]:
+        if self._fresh_words:
+            content = (
+                " ".join(self._words)
+                .replace(_GLUE + " ", "")
+                .replace(_GLUE, "")
+                .replace("\n ", "\n\n")
+                .strip()
+            )
+            metadata = {"heading": self._heading} if self._heading else {}
+            yield TextChunk(
+                content=content,
+                token_count=self._count(content),
+                metadata_json=metadata,
+            )
+
+        if not keep_overlap or not self.overlap_tokens:
+            self._words, self._word_tokens, self._window_tokens = [], [], 0
+            self._fresh_words = 0
+            return
+
+        kept_tokens = 0
+        keep_from = len(self._words)
+        while keep_from > 0:
+            tokens = self._word_tokens[keep_from - 1]
+            if kept_tokens + tokens > self.overlap_tokens:
+                break
+            keep_from -= 1
+            kept_tokens += tokens
+        self._words = self._words[keep_from:]
+        self._word_tokens = self._word_tokens[keep_from:]
+        self._window_tokens = kept_tokens
+        self._fresh_words = 0
+
+
+def chunk_text(text: str, **options: Any) -> list[TextChunk]:
+    chunker = StreamingChunker(**options)
+    return [*chunker.feed(text), *chunker.finish()]
+
+
+def chunk_stream(pieces: Iterable[str], **options: Any) -> Iterator[TextChunk]:
+    chunker = StreamingChunker(**options)
+    for piece in pieces:
+        yield from chunker.feed(piece)
+    yield from chunker.finish()
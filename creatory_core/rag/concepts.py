@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import combinations
+from uuid import UUID
+
+from sqlalchemy import Integer, Select, Update, column, delete, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from creatory_core.db.models import (
+    ChunkConcept,
+    ConceptEdge,
+    ConceptExtractionState,
+    ConceptNode,
+    KnowledgeChunk,
+    KnowledgeSource,
+)
+
+logger = logging.getLogger("creatory.rag.concepts")
+
+CONCEPT_NODE_TYPE = "key_phrase"
+CO_OCCURRENCE_RELATION = "co_occurs"
+
+_STOPWORDS = frozenset(
+    """
+    about above after again against all also and any are because been before being below
+    between both but can could did does doing down during each few for from further had
+    has have having her here hers herself him himself his how into its itself just more
+    most myself nor not now off once only other our ours ourselves out over own same she
+    should some such than that the their theirs them themselves then there these they
+    this those through too under until very was were what when where which while who
+    whom why will with would you your yours yourself yourselves get got make made use
+    used using like one two new many much may might must shall via per
+    """.split()
+)
+_FRAGMENT_SPLIT = re.compile(r"[^\w\s'-]+")
+_WORD_PATTERN = re.compile(r"[\w'-]+")
+# Multi-row VALUES stay well below asyncpg's 32767 bind parameter limit.
+_ROWS_PER_STATEMENT = 1000
+
+
+@dataclass(frozen=True)
+class KeyPhrase:
+    key: str
+    label: str
+    score: float
+
+
+def _candidate_phrases(text: str, max_words: int) -> Iterator[tuple[str, ...]]:
+    for fragment in _FRAGMENT_SPLIT.split(text.lower()):
+        run: list[str] = []
+        for raw in _WORD_PATTERN.findall(fragment):
+            word = raw.strip("'-")
+            if len(word) > 2 and word not in _STOPWORDS and not word.isdigit():
+                run.append(word)
+                continue
+            for start in range(0, len(run), max_words):
+                yield tuple(run[start : start + max_words])
+            run = []
+        for start in range(0, len(run), max_words):
+            yield tuple(run[start : start + max_words])
+
+
+def extract_key_phrases(
+    text: str,
+    *,
+    max_phrases: int = 8,
+    max_words: int = 3,
+) -> list[KeyPhrase]:
+    """RAKE-style key phrases: stopword-delimited runs scored by word degree/frequency.
+
+    Words that appear inside longer phrases get a higher degree, so multi-word terms
+    ("retention curve") outrank their parts while frequent filler words do not.
+    Words shorter than three characters are dropped, matching ``index.tokenize``.
+    """
+    phrases = list(_candidate_phrases(text, max_words))
+    if not phrases:
+        return []
+
+    frequency: Counter[str] = Counter()
+    degree: Counter[str] = Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+
+    scored: dict[tuple[str, ...], float] = {}
+    for phrase in phrases:
+        if phrase not in scored:
+            scored[phrase] = sum(degree[word] / frequency[word] for word in phrase)
+    ranked = sorted(scored.items(), key=lambda item: (-item[1], item[0]))[:max_phrases]
+    return [
+        KeyPhrase(key="-".join(phrase), label=" ".join(phrase), score=score)
+        for phrase, score in ranked
+    ]
+
+
+def co_occurrence_pairs(chunk_concepts: Sequence[Sequence[UUID]]) -> Counter[tuple[UUID, UUID]]:
+    """Count chunks shared by each concept pair; pairs are ordered so each edge is stored once."""
+    pairs: Counter[tuple[UUID, UUID]] = Counter()
+    for concept_ids in chunk_concepts:
+        unique = sorted(set(concept_ids), key=str)
+        pairs.update(combinations(unique, 2))
+    return pairs
+
+
+def co_occurrence_weight(shared: int, left_count: int, right_count: int) -> float:
+    """Ochiai coefficient: shared chunks over the geometric mean of each concept's chunks."""
+    if shared <= 0 or left_count <= 0 or right_count <= 0:
+        return 0.0
+    return round(min(1.0, shared / math.sqrt(left_count * right_count)), 4)
+
+
+def _batches(rows: Sequence[dict], size: int = _ROWS_PER_STATEMENT) -> Iterator[Sequence[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+@dataclass
+class ExtractionRun:
+    chunks: int = 0
+    concepts: int = 0
+    links: int = 0
+    edges: int = 0
+
+
+def pending_chunks_statement(batch_size: int) -> Select:
+    """Oldest chunks whose concepts have not been extracted yet."""
+    return (
+        select(
+            KnowledgeChunk.id,
+            KnowledgeChunk.content,
+            KnowledgeChunk.ingest_seq,
+            KnowledgeSource.workspace_id,
+        )
+        .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
+        .where(KnowledgeChunk.concepts_extracted_at.is_(None))
+        .order_by(KnowledgeChunk.ingest_seq)
+        .limit(batch_size)
+    )
+
+
+def edge_decrement_statement(pairs: Sequence[tuple[UUID, UUID, int]]) -> Update:
+    """Subtract ``(src, dst, shared)`` co-occurrences, returning what each edge has left."""
+    deltas = values(
+        column("src", PGUUID(as_uuid=True)),
+        column("dst", PGUUID(as_uuid=True)),
+        column("delta", Integer),
+        name="deltas",
+    ).data(list(pairs))
+    return (
+        update(ConceptEdge)
+        .where(
+            ConceptEdge.src_concept_id == deltas.c.src,
+            ConceptEdge.dst_concept_id == deltas.c.dst,
+            ConceptEdge.relation_type == CO_OCCURRENCE_RELATION,
+        )
+        .values(co_occurrences=ConceptEdge.co_occurrences - deltas.c.delta)
+        .returning(
+            ConceptEdge.id,
+            ConceptEdge.src_concept_id,
+            ConceptEdge.dst_concept_id,
+            ConceptEdge.co_occurrences,
+        )
+    )
+
+
+async def _lock_extraction_state(db: AsyncSession, job_name: str) -> ConceptExtractionState:
+    await db.execute(
+        insert(ConceptExtractionState).values(job_name=job_name).on_conflict_do_nothing()
+    )
+    return await db.scalar(
+        select(ConceptExtractionState)
+        .where(ConceptExtractionState.job_name == job_name)
+        .with_for_update()
+    )
+
+
+async def _bump_chunk_counts(db: AsyncSession, increments: Counter[UUID]) -> dict[UUID, int]:
+    counts: dict[UUID, int] = {}
+    items = list(increments.items())
+    for start in range(0, len(items), _ROWS_PER_STATEMENT):
+        deltas = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("delta", Integer),
+            name="deltas",
+        ).data(items[start : start + _ROWS_PER_STATEMENT])
+        updated = await db.execute(
+            update(ConceptNode)
+            .where(ConceptNode.id == deltas.c.id)
+            .values(chunk_count=ConceptNode.chunk_count + deltas.c.delta)
+            .returning(ConceptNode.id, ConceptNode.chunk_count)
+        )
+        counts.update(updated.tuples())
+    return counts
+
+
+async def _refresh_edge_weights(
+    db: AsyncSession,
+    edges: Sequence[tuple[UUID, UUID, UUID, int]],
+    chunk_counts: dict[UUID, int],
+) -> None:
+    # Weights of the given edges are refreshed from current counts; other edges keep
+    # the weight computed when they last changed.
+    weights = [
+        {
+            "id": edge_id,
+            "weight": co_occurrence_weight(shared, chunk_counts[src], chunk_counts[dst]),
+        }
+        for edge_id, src, dst, shared in edges
+    ]
+    if weights:
+        await db.execute(update(ConceptEdge), weights)
+
+
+async def release_chunk_concepts(db: AsyncSession, chunk_ids: Sequence[UUID]) -> None:
+    """Take chunks about to be deleted out of node counts and edge co-occurrences.
+
+    Call it in the transaction that deletes the chunks; their links then go with them
+    through ``ON DELETE CASCADE``. Edges left without co-occurrences are removed. The
+    extraction state row is locked, so this serializes with a running extraction.
+    """
+    if not chunk_ids:
+        return
+    await _lock_extraction_state(db, ConceptExtractionJob.name)
+    concepts_by_chunk: dict[UUID, list[UUID]] = {}
+    for start in range(0, len(chunk_ids), _ROWS_PER_STATEMENT):
+        links = await db.execute(
+            select(ChunkConcept.chunk_id, ChunkConcept.concept_id).where(
+                ChunkConcept.chunk_id.in_(chunk_ids[start : start + _ROWS_PER_STATEMENT])
+            )
+        )
+        for chunk_id, concept_id in links.tuples():
+            concepts_by_chunk.setdefault(chunk_id, []).append(concept_id)
+    if not concepts_by_chunk:
+        return
+
+    removed = Counter(
+        concept_id for concept_ids in concepts_by_chunk.values() for concept_id in concept_ids
+    )
+    chunk_counts = await _bump_chunk_counts(
+        db, Counter({concept_id: -count for concept_id, count in removed.items()})
+    )
+    pairs = [
+        (src, dst, shared)
+        for (src, dst), shared in co_occurrence_pairs(list(concepts_by_chunk.values())).items()
+    ]
+    remaining: list[tuple[UUID, UUID, UUID, int]] = []
+    emptied: list[UUID] = []
+    for start in range(0, len(pairs), _ROWS_PER_STATEMENT):
+        updated = await db.execute(
+            edge_decrement_statement(pairs[start : start + _ROWS_PER_STATEMENT])
+        )
+        for edge_id, src, dst, shared in updated.tuples():
+            if shared > 0:
+                remaining.append((edge_id, src, dst, shared))
+            else:
+                emptied.append(edge_id)
+    for start in range(0, len(emptied), _ROWS_PER_STATEMENT):
+        await db.execute(
+            delete(ConceptEdge).where(
+                ConceptEdge.id.in_(emptied[start : start + _ROWS_PER_STATEMENT])
+            )
+        )
+    await _refresh_edge_weights(db, remaining, chunk_counts)
+
+
+class ConceptExtractionJob:
+    """Materializes concept nodes, chunk links and co-occurrence edges from new chunks.
+
+    Chunks still missing ``concepts_extracted_at`` are consumed in ``ingest_seq``
+    order and stamped once processed. A sequence high-water mark would skip chunks
+    whose identity value was drawn before, but committed after, a later one. The
+    ``concept_extraction_state`` row is locked for the run, so concurrent workers
+    serialize instead of double-processing; the row carries no other state. Links
+    are inserted with ``ON CONFLICT DO NOTHING`` and only newly inserted links feed
+    node counts and edge co-occurrences, so re-running over the same chunks is a
+    no-op. A chunk is processed once, in one transaction, so all of its links are new
+    together and every pair of its concepts is counted. Deleting chunks goes through
+    ``release_chunk_concepts``, which takes them back out of the counts.
+    """
+
+    name = "concept-extraction"
+
+    def __init__(self, *, batch_size: int = 500, max_phrases: int = 8) -> None:
+        self.batch_size = batch_size
+        self.max_phrases = max_phrases
+
+    async def run_once(self, db: AsyncSession) -> ExtractionRun:
+        state = await _lock_extraction_state(db, self.name)
+        rows = (await db.execute(pending_chunks_statement(self.batch_size))).all()
+        run = ExtractionRun(chunks=len(rows))
+        if not rows:
+            await db.commit()
+            return run
+
+        phrases = await asyncio.to_thread(
+            lambda: [
+                extract_key_phrases(content, max_phrases=self.max_phrases)
+                for _, content, _, _ in rows
+            ]
+        )
+        by_workspace: dict[UUID, dict[UUID, list[KeyPhrase]]] = {}
+        for (chunk_id, _, _, workspace_id), chunk_phrases in zip(rows, phrases, strict=True):
+            if chunk_phrases:
+                by_workspace.setdefault(workspace_id, {})[chunk_id] = chunk_phrases
+
+        for workspace_id, chunk_phrases in by_workspace.items():
+            await self._materialize(db, workspace_id, chunk_phrases, run)
+
+        extracted_at = datetime.now(UTC)
+        chunk_ids = [row.id for row in rows]
+        for start in range(0, len(chunk_ids), _ROWS_PER_STATEMENT):
+            await db.execute(
+                update(KnowledgeChunk)
+                .where(KnowledgeChunk.id.in_(chunk_ids[start : start + _ROWS_PER_STATEMENT]))
+                .values(concepts_extracted_at=extracted_at)
+            )
+        state.updated_at = extracted_at
+        await db.commit()
+        logger.info(
+            "concept extraction batch",
+            extra={
+                "chunks": run.chunks,
+                "concepts": run.concepts,
+                "links": run.links,
+                "edges": run.edges,
+            },
+        )
+        return run
+
+    async def _materialize(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        chunk_phrases: dict[UUID, list[KeyPhrase]],
+        run: ExtractionRun,
+    ) -> None:
+        labels = {
+            phrase.key: phrase.label for phrases in chunk_phrases.values() for phrase in phrases
+        }
+        node_rows = [
+            {
+                "workspace_id": workspace_id,
+                "concept_key": key,
+                "label": label,
+                "node_type": CONCEPT_NODE_TYPE,
+            }
+            for key, label in labels.items()
+        ]
+        for batch in _batches(node_rows):
+            await db.execute(insert(ConceptNode).values(batch).on_conflict_do_nothing())
+        concept_ids = dict(
+            (
+                await db.execute(
+                    select(ConceptNode.concept_key, ConceptNode.id).where(
+                        ConceptNode.workspace_id == workspace_id,
+                        ConceptNode.concept_key.in_(labels),
+                    )
+                )
+            ).all()
+        )
+        run.concepts += len(concept_ids)
+
+        link_rows: list[dict] = []
+        for chunk_id, phrases in chunk_phrases.items():
+            top_score = phrases[0].score or 1.0
+            link_rows.extend(
+                {
+                    "chunk_id": chunk_id,
+                    "concept_id": concept_ids[phrase.key],
+                    "weight": round(phrase.score / top_score, 4),
+                }
+                for phrase in phrases
+            )
+        new_links: list[tuple[UUID, UUID]] = []
+        for batch in _batches(link_rows):
+            inserted = await db.execute(
+                insert(ChunkConcept)
+                .values(batch)
+                .on_conflict_do_nothing()
+                .returning(ChunkConcept.chunk_id, ChunkConcept.concept_id)
+            )
+            new_links.extend(inserted.tuples())
+        run.links += len(new_links)
+        if not new_links:
+            return
+
+        chunk_counts = await _bump_chunk_counts(
+            db, Counter(concept_id for _, concept_id in new_links)
+        )
+        concepts_by_chunk: dict[UUID, list[UUID]] = {}
+        for chunk_id, concept_id in new_links:
+            concepts_by_chunk.setdefault(chunk_id, []).append(concept_id)
+        pairs = co_occurrence_pairs(list(concepts_by_chunk.values()))
+        run.edges += await self._upsert_edges(db, workspace_id, pairs, chunk_counts)
+
+    async def _upsert_edges(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        pairs: Counter[tuple[UUID, UUID]],
+        chunk_counts: dict[UUID, int],
+    ) -> int:
+        edge_rows = [
+            {
+                "workspace_id": workspace_id,
+                "src_concept_id": src,
+                "dst_concept_id": dst,
+                "relation_type": CO_OCCURRENCE_RELATION,
+                "co_occurrences": shared,
+                "weight": 0,
+            }
+            for (src, dst), shared in pairs.items()
+        ]
+        upserted_edges: list[tuple[UUID, UUID, UUID, int]] = []
+        for batch in _batches(edge_rows):
+            statement = insert(ConceptEdge).values(batch)
+            upserted = await db.execute(
+                statement.on_conflict_do_update(
+                    constraint="uq_concept_edges_pair",
+                    set_={
+                        "co_occurrences": ConceptEdge.co_occurrences
+                        + statement.excluded.co_occurrences
+                    },
+                ).returning(
+                    ConceptEdge.id,
+                    ConceptEdge.src_concept_id,
+                    ConceptEdge.dst_concept_id,
+                    ConceptEdge.co_occurrences,
+                )
+            )
+            upserted_edges.extend(upserted.tuples())
+        await _refresh_edge_weights(db, upserted_edges, chunk_counts)
+        return len(upserted_edges)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from uuid import UUID
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from creatory_core.db.models import ChunkEmbedding, KnowledgeChunk, KnowledgeSource
+from creatory_core.rag.embeddings import Embedder
+from creatory_core.rag.filters import RetrievalFilter
+
+logger = logging.getLogger("creatory.rag.dense")
+
+
+class DenseRetriever:
+    """ANN search over ``chunk_embeddings`` using the pgvector ivfflat index.
+
+    ``probes`` trades recall for latency: it is the number of ivfflat lists scanned
+    per query. The index covers every workspace, so the workspace and filter
+    predicates only apply after the scan; ``iterative_scan`` (pgvector 0.8+) makes
+    ivfflat keep probing further lists until ``limit`` rows pass them instead of
+    returning whatever the first ``probes`` lists held. Both are applied with
+    ``set_config(..., is_local => true)`` so they only affect the current transaction.
+    """
+
+    def __init__(
+        self, embedder: Embedder, *, probes: int = 10, iterative_scan: str = "relaxed_order"
+    ) -> None:
+        self.embedder = embedder
+        self.probes = probes
+        self.iterative_scan = iterative_scan
+
+    def statement(
+        self,
+        workspace_id: UUID,
+        query_vector: list[float],
+        *,
+        limit: int,
+        filters: RetrievalFilter | None = None,
+    ) -> Select:
+        distance = ChunkEmbedding.embedding.cosine_distance(query_vector)
+        statement = (
+            select(ChunkEmbedding.chunk_id, distance.label("distance"))
+            .join(KnowledgeChunk, ChunkEmbedding.chunk_id == KnowledgeChunk.id)
+            .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
+            .where(
+                KnowledgeSource.workspace_id == workspace_id,
+                ChunkEmbedding.model_name == self.embedder.model_name,
+            )
+            .order_by(distance)
+            .limit(limit)
+        )
+        return filters.apply(statement) if filters is not None else statement
+
+    def scan_settings(self) -> Select:
+        return select(
+            func.set_config("ivfflat.probes", str(self.probes), True),
+            func.set_config("ivfflat.iterative_scan", self.iterative_scan, True),
+        )
+
+    async def search(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        query: str,
+        *,
+        limit: int,
+        filters: RetrievalFilter | None = None,
+        query_vector: list[float] | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """``query_vector`` skips embedding when the caller already embedded ``query``."""
+        if query_vector is None:
+            query_vector = (await self.embedder.embed([query]))[0]
+        if not any(query_vector):
+            return []
+
+        await db.execute(self.scan_settings())
+        rows = (
+            await db.execute(
+                self.statement(workspace_id, query_vector, limit=limit, filters=filters)
+            )
+        ).all()
+        if len(rows) < limit:
+            # Either the scope holds fewer embedded chunks, or the scan gave up early.
+            logger.info(
+                "dense search returned fewer candidates than requested",
+                extra={
+                    "workspace_id": str(workspace_id),
+                    "requested": limit,
+                    "returned": len(rows),
+                },
+            )
+        # A relaxed iterative scan may return rows slightly out of distance order.
+        rows.sort(key=lambda row: row.distance)
+        return [(row.chunk_id, 1.0 - float(row.distance)) for row in rows]
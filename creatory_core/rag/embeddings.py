@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+from collections.abc import Sequence
+from typing import Protocol
+
+from creatory_core.db.models import EMBEDDING_DIMENSIONS
+from creatory_core.rag.index import tokenize
+
+
+class Embedder(Protocol):
+    model_name: str
+    dimensions: int
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]: ...
+
+
+class HashingEmbedder:
+    """Deterministic feature-hashing embedder for offline use and tests.
+
+    Each token is hashed into a signed bucket and the result is L2-normalised, so
+    texts sharing vocabulary land close together under cosine distance.
+    """
+
+    model_name = "local-hashing-v1"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS) -> None:
+        self.dimensions = dimensions
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        return [self.embed_one(text) for text in texts]
+
+    def embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for token in tokenize(text):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "big") % self.dimensions
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0.0:
+            return vector
+        return [value / norm for value in vector]
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model run in a worker thread; needs the ``rerank`` extra.
+
+    The model must produce ``EMBEDDING_DIMENSIONS``-wide vectors to fit the
+    ``chunk_embeddings`` column.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:  # pragma: no cover - depends on optional extra
+            raise RuntimeError(
+                "Sentence-transformer embeddings require 'sentence-transformers': "
+                "pip install creatory[rerank]"
+            ) from exc
+        self._model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+        if self.dimensions != EMBEDDING_DIMENSIONS:
+            raise RuntimeError(
+                f"Embedding model {model_name!r} produces {self.dimensions} dimensions; "
+                f"chunk_embeddings stores {EMBEDDING_DIMENSIONS}"
+            )
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        vectors = await asyncio.to_thread(
+            self._model.encode, list(texts), normalize_embeddings=True
+        )
+        return [[float(value) for value in vector] for vector in vectors]
+
+
+def build_embedder(name: str, *, model_name: str) -> Embedder:
+    if name == "sentence-transformers":
+        return SentenceTransformerEmbedder(model_name)
+    return HashingEmbedder()
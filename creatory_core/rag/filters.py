@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from creatory_core.db.models import KnowledgeChunk, KnowledgeSource, SourceType
+
+
+@dataclass(frozen=True)
+class CandidateSet:
+    """Chunks a filtered query may score, resolved once per query from indexed predicates.
+
+    ``source_ids`` is always set; ``chunk_ids`` only when a chunk-level predicate
+    (chunk metadata) narrows the sources further.
+    """
+
+    source_ids: frozenset[UUID]
+    chunk_ids: frozenset[UUID] | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.source_ids) and (self.chunk_ids is None or bool(self.chunk_ids))
+
+    def allows(self, chunk_id: UUID, source_id: UUID | None) -> bool:
+        """``source_id`` may be ``None`` only when ``chunk_ids`` was resolved."""
+        if self.chunk_ids is not None:
+            return chunk_id in self.chunk_ids
+        return source_id in self.source_ids
+
+
+@dataclass(frozen=True)
+class RetrievalFilter:
+    """Scope for a knowledge query, expressed as predicates the database can index.
+
+    Source predicates use btree indexes on ``knowledge_sources`` (workspace with
+    ``source_type`` or ``created_at``); metadata containment (``@>``) and key
+    presence (``?&``) use GIN indexes on the ``metadata_json`` columns.
+    """
+
+    source_types: tuple[SourceType, ...] = ()
+    source_ids: tuple[UUID, ...] = ()
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    source_metadata: Mapping[str, Any] = field(default_factory=dict)
+    chunk_metadata: Mapping[str, Any] = field(default_factory=dict)
+    chunk_metadata_keys: tuple[str, ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.source_predicates() or self.chunk_predicates())
+
+    def source_predicates(self) -> list[ColumnElement[bool]]:
+        predicates: list[ColumnElement[bool]] = []
+        if self.source_types:
+            predicates.append(KnowledgeSource.source_type.in_(self.source_types))
+        if self.source_ids:
+            predicates.append(KnowledgeSource.id.in_(self.source_ids))
+        if self.created_after is not None:
+            predicates.append(KnowledgeSource.created_at >= self.created_after)
+        if self.created_before is not None:
+            predicates.append(KnowledgeSource.created_at < self.created_before)
+        if self.source_metadata:
+            predicates.append(KnowledgeSource.metadata_json.contains(dict(self.source_metadata)))
+        return predicates
+
+    def chunk_predicates(self) -> list[ColumnElement[bool]]:
+        predicates: list[ColumnElement[bool]] = []
+        if self.chunk_metadata:
+            predicates.append(KnowledgeChunk.metadata_json.contains(dict(self.chunk_metadata)))
+        if self.chunk_metadata_keys:
+            predicates.append(KnowledgeChunk.metadata_json.has_all(list(self.chunk_metadata_keys)))
+        return predicates
+
+    def apply(self, statement: Select) -> Select:
+        """Add every predicate to a statement that already joins chunks to sources."""
+        predicates = [*self.source_predicates(), *self.chunk_predicates()]
+        return statement.where(*predicates) if predicates else statement
+
+    def cache_key(self) -> str:
+        if self.is_empty:
+            return ""
+        payload = {
+            "source_types": sorted(item.value for item in self.source_types),
+            "source_ids": sorted(str(item) for item in self.source_ids),
+            "created_after": self.created_after.isoformat() if self.created_after else None,
+            "created_before": self.created_before.isoformat() if self.created_before else None,
+            "source_metadata": self.source_metadata,
+            "chunk_metadata": self.chunk_metadata,
+            "chunk_metadata_keys": sorted(self.chunk_metadata_keys),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()[:16]
+
+    async def resolve(self, db: AsyncSession, workspace_id: UUID) -> CandidateSet:
+        """Resolve the scope to ids before any scoring happens.
+
+        Chunk ids are loaded only when a chunk-level predicate narrows the sources;
+        signals that cannot map a chunk to its source check their own hits with
+        ``admit`` instead.
+        """
+        source_ids = frozenset(
+            (
+                await db.scalars(
+                    select(KnowledgeSource.id).where(
+                        KnowledgeSource.workspace_id == workspace_id,
+                        *self.source_predicates(),
+                    )
+                )
+            ).all()
+        )
+        chunk_predicates = self.chunk_predicates()
+        if not source_ids or not chunk_predicates:
+            return CandidateSet(source_ids=source_ids)
+
+        chunk_ids = frozenset(
+            (
+                await db.scalars(
+                    select(KnowledgeChunk.id)
+                    .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
+                    .where(
+                        KnowledgeSource.workspace_id == workspace_id,
+                        *self.source_predicates(),
+                        *chunk_predicates,
+                    )
+                )
+            ).all()
+        )
+        return CandidateSet(source_ids=source_ids, chunk_ids=chunk_ids)
+
+    def admit_statement(self, workspace_id: UUID, chunk_ids: Iterable[UUID]) -> Select:
+        return self.apply(
+            select(KnowledgeChunk.id)
+            .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
+            .where(
+                KnowledgeSource.workspace_id == workspace_id,
+                KnowledgeChunk.id.in_(list(chunk_ids)),
+            )
+        )
+
+    async def admit(
+        self, db: AsyncSession, workspace_id: UUID, chunk_ids: Iterable[UUID]
+    ) -> frozenset[UUID]:
+        """The given chunks that are in scope, checked by primary key in one statement."""
+        chunk_ids = list(chunk_ids)
+        if not chunk_ids:
+            return frozenset()
+        return frozenset((await db.scalars(self.admit_statement(workspace_id, chunk_ids))).all())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from creatory_core.db.models import KnowledgeChunk, KnowledgeSource, Workspace
+from creatory_core.rag.filters import RetrievalFilter
+
+# ts_rank_cd normalization 32 maps rank into [0, 1) as rank / (rank + 1).
+_RANK_NORMALIZATION = 32
+
+
+class PostgresFullTextRetriever:
+    """Lexical retrieval pushed into Postgres.
+
+    Matches the generated ``knowledge_chunks.search_vector`` column through its GIN
+    index and ranks with ``ts_rank_cd``, so filtering, scoring and top-k all happen
+    in the database. The query is parsed with the workspace's ``search_config``,
+    the same text search configuration its chunks were indexed with.
+    """
+
+    def __init__(self, *, normalization: int = _RANK_NORMALIZATION) -> None:
+        self.normalization = normalization
+
+    def statement(
+        self,
+        workspace_id: UUID,
+        query: str,
+        *,
+        limit: int,
+        filters: RetrievalFilter | None = None,
+    ) -> Select:
+        # A scalar subquery is planned as an InitPlan: evaluated once, so the tsquery
+        # is a constant for the GIN index scan.
+        search_config = (
+            select(Workspace.search_config).where(Workspace.id == workspace_id).scalar_subquery()
+        )
+        tsquery = func.websearch_to_tsquery(search_config, query)
+        rank = func.ts_rank_cd(KnowledgeChunk.search_vector, tsquery, self.normalization)
+        statement = (
+            select(KnowledgeChunk.id, rank.label("rank"))
+            .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
+            .where(
+                KnowledgeSource.workspace_id == workspace_id,
+                KnowledgeChunk.search_vector.op("@@")(tsquery),
+            )
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+        return filters.apply(statement) if filters is not None else statement
+
+    async def search(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        query: str,
+        *,
+        limit: int,
+        filters: RetrievalFilter | None = None,
+    ) -> list[tuple[UUID, float]]:
+        statement = self.statement(workspace_id, query, limit=limit, filters=filters)
+        rows = (await db.execute(statement)).all()
+        return [(chunk_id, float(chunk_rank)) for chunk_id, chunk_rank in rows]
+
+
+async def search_config_exists(db: AsyncSession, name: str) -> bool:
+    """Whether ``name`` is an installed text search configuration."""
+    return (
+        await db.scalar(
+            text("SELECT 1 FROM pg_catalog.pg_ts_config WHERE cfgname = :name"),
+            {"name": name},
+        )
+    ) is not None
+
+
+async def workspace_search_config(db: AsyncSession, workspace_id: UUID) -> str:
+    return await db.scalar(select(Workspace.search_config).where(Workspace.id == workspace_id))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import time
+from collections.abc import Awaitable, Mapping, Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+RankedList = Sequence[tuple[UUID, float]]
+
+
+class FusionMethod(str, enum.Enum):
+    RRF = "rrf"
+    WEIGHTED = "weighted"
+
+
+@dataclass(frozen=True)
+class SignalResult:
+    name: str
+    ranked: list[tuple[UUID, float]]
+    elapsed_ms: float
+
+
+async def _timed(name: str, awaitable: Awaitable[list[tuple[UUID, float]]]) -> SignalResult:
+    started = time.perf_counter()
+    ranked = await awaitable
+    return SignalResult(
+        name=name,
+        ranked=ranked,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+async def gather_signals(
+    signals: Mapping[str, Awaitable[list[tuple[UUID, float]]]],
+) -> dict[str, SignalResult]:
+    """Run retrievers concurrently; each result carries its own wall-clock timing.
+
+    Retrievers that wait on I/O should be listed first so their queries are in
+    flight while in-memory retrievers score.
+    """
+    results = await asyncio.gather(*(_timed(name, item) for name, item in signals.items()))
+    return {result.name: result for result in results}
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, RankedList],
+    *,
+    k: int = 60,
+    weights: Mapping[str, float] | None = None,
+) -> dict[UUID, float]:
+    """Weighted RRF: sum of ``weight / (k + rank)`` over every list a chunk appears in."""
+    fused: dict[UUID, float] = {}
+    for name, ranked in rankings.items():
+        weight = 1.0 if weights is None else weights.get(name, 1.0)
+        if weight <= 0:
+            continue
+        for rank, (chunk_id, _score) in enumerate(ranked, start=1):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + weight / (k + rank)
+    return fused
+
+
+def weighted_score_fusion(
+    rankings: Mapping[str, RankedList],
+    *,
+    weights: Mapping[str, float] | None = None,
+) -> dict[UUID, float]:
+    """Sum of per-signal scores after scaling each list by its own maximum."""
+    fused: dict[UUID, float] = {}
+    for name, ranked in rankings.items():
+        weight = 1.0 if weights is None else weights.get(name, 1.0)
+        if weight <= 0 or not ranked:
+            continue
+        top_score = max(score for _, score in ranked)
+        if top_score <= 0:
+            continue
+        for chunk_id, score in ranked:
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + weight * score / top_score
+    return fused
+
+
+def fuse(
+    rankings: Mapping[str, RankedList],
+    *,
+    method: FusionMethod = FusionMethod.RRF,
+    k: int = 60,
+    weights: Mapping[str, float] | None = None,
+) -> dict[UUID, float]:
+    if method == FusionMethod.WEIGHTED:
+        return weighted_score_fusion(rankings, weights=weights)
+    return reciprocal_rank_fusion(rankings, k=k, weights=weights)
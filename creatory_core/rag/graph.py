@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from creatory_core.db.models import ChunkConcept, ConceptEdge, ConceptNode
+from creatory_core.rag.index import InvertedIndex, tokenize
+from creatory_core.rag.workspace_cache import WorkspaceCache
+
+
+@dataclass(frozen=True)
+class ConceptRecord:
+    id: UUID
+    concept_key: str
+    label: str
+    chunk_ids: tuple[UUID, ...] = ()
+
+
+@dataclass(frozen=True)
+class EdgeRecord:
+    src_concept_id: UUID
+    dst_concept_id: UUID
+    weight: float
+
+
+class ConceptGraph:
+    """Immutable per-workspace concept graph in CSR form.
+
+    Concepts are addressed by dense ordinals. ``indptr``/``indices``/``weights`` hold the
+    (symmetrised) ``ConceptEdge`` adjacency, ``token_index`` maps label tokens to
+    concept ordinals and ``concept_chunks`` maps each concept to the chunks that
+    mention it. Activation and boosting only touch the neighbourhood of the seeds.
+    """
+
+    def __init__(
+        self,
+        concept_ids: Sequence[UUID],
+        concept_terms: Sequence[tuple[str, ...]],
+        indptr: array,
+        indices: array,
+        weights: array,
+        concept_chunks: Sequence[tuple[UUID, ...]],
+    ) -> None:
+        self.concept_ids = concept_ids
+        self.concept_terms = concept_terms
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.concept_chunks = concept_chunks
+        self.token_index: dict[str, list[int]] = {}
+        for ordinal, terms in enumerate(concept_terms):
+            for token in set(terms):
+                self.token_index.setdefault(token, []).append(ordinal)
+
+    def __len__(self) -> int:
+        return len(self.concept_ids)
+
+    def seeds(self, query_tokens: Iterable[str]) -> dict[int, float]:
+        """Concepts matched by the query, weighted by the share of their terms it covers."""
+        query_set = set(query_tokens)
+        hits: dict[int, int] = {}
+        for token in query_set:
+            for ordinal in self.token_index.get(token, ()):
+                hits[ordinal] = hits.get(ordinal, 0) + 1
+        return {
+            ordinal: count / len(set(self.concept_terms[ordinal]))
+            for ordinal, count in hits.items()
+        }
+
+    def activate(
+        self,
+        seeds: dict[int, float],
+        *,
+        hops: int = 2,
+        decay: float = 0.5,
+        max_frontier: int = 64,
+    ) -> dict[int, float]:
+        activation = dict(seeds)
+        frontier = heapq.nlargest(max_frontier, seeds.items(), key=lambda item: item[1])
+        for _ in range(hops):
+            spread: dict[int, float] = {}
+            for ordinal, energy in frontier:
+                for position in range(self.indptr[ordinal], self.indptr[ordinal + 1]):
+                    neighbour = self.indices[position]
+                    spread[neighbour] = (
+                        spread.get(neighbour, 0.0) + energy * self.weights[position] * decay
+                    )
+            if not spread:
+                break
+            for ordinal, energy in spread.items():
+                if energy > activation.get(ordinal, 0.0):
+                    activation[ordinal] = energy
+            frontier = heapq.nlargest(max_frontier, spread.items(), key=lambda item: item[1])
+        return activation
+
+    def chunk_scores(self, activation: dict[int, float]) -> dict[UUID, float]:
+        scores: dict[UUID, float] = {}
+        for ordinal, energy in activation.items():
+            for chunk_id in self.concept_chunks[ordinal]:
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + energy
+        return scores
+
+
+def _concept_terms(concept: ConceptRecord) -> tuple[str, ...]:
+    terms = tokenize(concept.label)
+    if not terms:
+        terms = tokenize(concept.concept_key.replace("-", " ").replace("_", " "))
+    return tuple(terms)
+
+
+def _mentioning_chunks(index: InvertedIndex, terms: tuple[str, ...]) -> tuple[UUID, ...]:
+    """Chunks whose content contains every term of the concept label."""
+    if not terms:
+        return ()
+    postings = sorted((index.postings(token) for token in set(terms)), key=len)
+    if not postings[0]:
+        return ()
+    shared = set(postings[0])
+    for other in postings[1:]:
+        shared.intersection_update(other)
+        if not shared:
+            return ()
+    return tuple(shared)
+
+
+def build_concept_graph(
+    concepts: Sequence[ConceptRecord],
+    edges: Iterable[EdgeRecord],
+    index: InvertedIndex | None = None,
+) -> ConceptGraph:
+    ordinals = {concept.id: ordinal for ordinal, concept in enumerate(concepts)}
+    neighbours: list[dict[int, float]] = [{} for _ in concepts]
+    for edge in edges:
+        src = ordinals.get(edge.src_concept_id)
+        dst = ordinals.get(edge.dst_concept_id)
+        if src is None or dst is None or src == dst:
+            continue
+        # Spread in both directions; keep the strongest parallel edge.
+        for a, b in ((src, dst), (dst, src)):
+            if edge.weight > neighbours[a].get(b, 0.0):
+                neighbours[a][b] = edge.weight
+
+    indptr = array("l", [0])
+    indices = array("l")
+    weights = array("d")
+    for adjacency in neighbours:
+        for neighbour, weight in adjacency.items():
+            indices.append(neighbour)
+            weights.append(weight)
+        indptr.append(len(indices))
+
+    concept_terms = [_concept_terms(concept) for concept in concepts]
+    concept_chunks: list[tuple[UUID, ...]] = []
+    for concept, terms in zip(concepts, concept_terms, strict=True):
+        linked = set(concept.chunk_ids)
+        if index is not None:
+            linked.update(_mentioning_chunks(index, terms))
+        concept_chunks.append(tuple(linked))
+
+    return ConceptGraph(
+        concept_ids=[concept.id for concept in concepts],
+        concept_terms=concept_terms,
+        indptr=indptr,
+        indices=indices,
+        weights=weights,
+        concept_chunks=concept_chunks,
+    )
+
+
+def _linked_chunk_ids(metadata_json: dict | None) -> tuple[UUID, ...]:
+    raw = (metadata_json or {}).get("chunk_ids") or []
+    linked: list[UUID] = []
+    for value in raw:
+        try:
+            linked.append(UUID(str(value)))
+        except ValueError:
+            continue
+    return tuple(linked)
+
+
+class ConceptGraphRegistry:
+    """Caches one ``ConceptGraph`` for each of the ``max_workspaces`` most recent workspaces.
+
+    A graph is rebuilt in the background when it is older than ``refresh_seconds`` or
+    when the lexical index it was linked against has been replaced; the previous
+    graph keeps answering until then.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_seconds: float = 300.0,
+        max_workspaces: int = 256,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self._graphs = WorkspaceCache(
+            refresh_seconds=refresh_seconds,
+            max_workspaces=max_workspaces,
+            session_factory=session_factory,
+        )
+
+    async def get(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        index: InvertedIndex | None = None,
+    ) -> ConceptGraph:
+        return await self._graphs.get(
+            db,
+            workspace_id,
+            lambda session: self._load(session, workspace_id, index),
+            tag=index,
+        )
+
+    def invalidate(self, workspace_id: UUID) -> None:
+        self._graphs.invalidate(workspace_id)
+
+    async def _load(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        index: InvertedIndex | None,
+    ) -> ConceptGraph:
+        node_rows = (
+            await db.execute(
+                select(
+                    ConceptNode.id,
+                    ConceptNode.concept_key,
+                    ConceptNode.label,
+                    ConceptNode.metadata_json,
+                ).where(ConceptNode.workspace_id == workspace_id)
+            )
+        ).all()
+        edge_rows = (
+            await db.execute(
+                select(
+                    ConceptEdge.src_concept_id,
+                    ConceptEdge.dst_concept_id,
+                    ConceptEdge.weight,
+                ).where(ConceptEdge.workspace_id == workspace_id)
+            )
+        ).all()
+
+        link_rows = (
+            await db.execute(
+                select(ChunkConcept.concept_id, ChunkConcept.chunk_id)
+                .join(ConceptNode, ChunkConcept.concept_id == ConceptNode.id)
+                .where(ConceptNode.workspace_id == workspace_id)
+            )
+        ).all()
+        links: dict[UUID, list[UUID]] = {}
+        for concept_id, chunk_id in link_rows:
+            links.setdefault(concept_id, []).append(chunk_id)
+
+        concepts = [
+            ConceptRecord(
+                id=concept_id,
+                concept_key=concept_key,
+                label=label,
+                chunk_ids=(*_linked_chunk_ids(metadata_json), *links.get(concept_id, ())),
+            )
+            for concept_id, concept_key, label, metadata_json in node_rows
+        ]
+        edges = [
+            EdgeRecord(src_concept_id=src, dst_concept_id=dst, weight=float(weight))
+            for src, dst, weight in edge_rows
+        ]
+        return build_concept_graph(concepts, edges, index)
@@ -1,13 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+import asyncio
+import enum
+import heapq
+import time
+from collections.abc import Awaitable, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from creatory_core.db.models import ConceptNode, KnowledgeChunk, KnowledgeSource
+from creatory_core.core.config import settings
+from creatory_core.db.models import KnowledgeChunk, KnowledgeSource
+from creatory_core.rag.bm25 import BM25FScorer
+from creatory_core.rag.cache import QueryResultCache, build_query_cache
+from creatory_core.rag.dense import DenseRetriever
+from creatory_core.rag.embeddings import Embedder, build_embedder
+from creatory_core.rag.filters import CandidateSet, RetrievalFilter
+from creatory_core.rag.fulltext import PostgresFullTextRetriever
+from creatory_core.rag.fusion import FusionMethod, fuse, gather_signals
+from creatory_core.rag.graph import ConceptGraph, ConceptGraphRegistry
+from creatory_core.rag.index import InvertedIndex, WorkspaceIndexRegistry, tokenize
+from creatory_core.rag.rerank import Reranker, build_reranker, rerank_contexts
+from creatory_core.rag.semantic_cache import SemanticQueryCache, build_semantic_cache
+from creatory_core.rag.snippets import Snippet, extract_snippet
+from creatory_core.rag.vectorized import build_lexical_scorer
+from creatory_core.schemas.knowledge import RetrievalMode
+
+LEXICAL_SIGNAL = "lexical"
+DENSE_SIGNAL = "dense"
+GRAPH_SIGNAL = "graph"
+
+
+class LexicalBackend(str, enum.Enum):
+    MEMORY = "memory"
+    POSTGRES = "postgres"
 
 
 @dataclass(frozen=True)
@@ -18,10 +47,109 @@ class RetrievedContext:
     content: str
     score: float
     citation_index: int
+    chunk_index: int | None = None
+
+
+@dataclass(frozen=True)
+class RetrievalOutcome:
+    contexts: list[RetrievedContext]
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    cached: bool = False
+
+
+def _context_to_cache(item: RetrievedContext) -> dict[str, Any]:
+    return {**asdict(item), "chunk_id": str(item.chunk_id), "source_id": str(item.source_id)}
+
+
+def _context_from_cache(item: dict[str, Any]) -> RetrievedContext:
+    return RetrievedContext(
+        **{**item, "chunk_id": UUID(item["chunk_id"]), "source_id": UUID(item["source_id"])}
+    )
+
+
+async def _holding(
+    lock: asyncio.Lock,
+    awaitable: Awaitable[list[tuple[UUID, float]]],
+) -> list[tuple[UUID, float]]:
+    async with lock:
+        return await awaitable
+
+
+def _source_of(index: InvertedIndex | None, chunk_id: UUID) -> UUID | None:
+    chunk = index.chunk(chunk_id) if index is not None else None
+    return chunk.source_id if chunk is not None else None
 
 
 class HybridRAGService:
-    """Bootstrap hybrid retrieval: lexical chunk ranking + concept graph boost."""
+    """Hybrid retrieval: lexical, dense and concept-graph signals fused by rank."""
+
+    def __init__(
+        self,
+        index_registry: WorkspaceIndexRegistry | None = None,
+        scorer: BM25FScorer | None = None,
+        embedder: Embedder | None = None,
+        graph_registry: ConceptGraphRegistry | None = None,
+        result_cache: QueryResultCache | None = None,
+        reranker: Reranker | None = None,
+        semantic_cache: SemanticQueryCache | None = None,
+        *,
+        default_mode: RetrievalMode | None = None,
+        lexical_backend: LexicalBackend | None = None,
+        fusion_method: FusionMethod | None = None,
+        dense_weight: float | None = None,
+        graph_weight: float | None = None,
+    ) -> None:
+        self.index_registry = index_registry or WorkspaceIndexRegistry(
+            refresh_seconds=settings.rag_index_refresh_seconds,
+            max_workspaces=settings.rag_index_max_workspaces,
+        )
+        self.graph_registry = graph_registry or ConceptGraphRegistry(
+            refresh_seconds=settings.rag_index_refresh_seconds,
+            max_workspaces=settings.rag_index_max_workspaces,
+        )
+        self.scorer = scorer or build_lexical_scorer(settings.rag_lexical_scorer)
+        self.result_cache = result_cache or build_query_cache(
+            settings.rag_query_cache_backend,
+            redis_url=settings.redis_url,
+            ttl_seconds=settings.rag_query_cache_ttl_seconds,
+            max_entries=settings.rag_query_cache_max_entries,
+        )
+        self.semantic_cache = semantic_cache or build_semantic_cache(
+            self.result_cache,
+            enabled=settings.rag_semantic_cache_enabled,
+            threshold=settings.rag_semantic_cache_threshold,
+            max_entries=settings.rag_semantic_cache_max_entries,
+        )
+        self.reranker = reranker or build_reranker(
+            settings.rag_reranker, model_name=settings.rag_reranker_model
+        )
+        self.embedder = embedder or build_embedder(
+            settings.rag_embedding_provider, model_name=settings.rag_embedding_model
+        )
+        self.dense_retriever = DenseRetriever(
+            self.embedder,
+            probes=settings.rag_ivfflat_probes,
+            iterative_scan=settings.rag_ivfflat_iterative_scan,
+        )
+        self.fulltext_retriever = PostgresFullTextRetriever()
+        self.default_mode = default_mode or RetrievalMode(settings.rag_retrieval_mode)
+        self.lexical_backend = lexical_backend or LexicalBackend(settings.rag_lexical_backend)
+        self.fusion_method = fusion_method or FusionMethod(settings.rag_fusion_method)
+        self.signal_weights = {
+            LEXICAL_SIGNAL: 1.0,
+            DENSE_SIGNAL: settings.rag_dense_weight if dense_weight is None else dense_weight,
+            GRAPH_SIGNAL: settings.rag_graph_weight if graph_weight is None else graph_weight,
+        }
+
+    def index_chunk(self, source: KnowledgeSource, chunk: KnowledgeChunk) -> None:
+        self.index_registry.add_chunk(source, chunk)
+
+    async def invalidate_workspace(self, workspace_id: UUID) -> None:
+        """Drop cached query results after any knowledge write in the workspace."""
+        if self.result_cache is not None:
+            await self.result_cache.invalidate_workspace(workspace_id)
+        if self.semantic_cache is not None:
+            self.semantic_cache.invalidate_workspace(workspace_id)
 
     async def retrieve(
         self,
@@ -30,101 +158,412 @@ class HybridRAGService:
         query: str,
         *,
         top_k: int = 5,
+        mode: RetrievalMode | None = None,
+        filters: RetrievalFilter | None = None,
     ) -> list[RetrievedContext]:
-        normalized_query = query.strip().lower()
-        if not normalized_query:
-            return []
+        outcome = await self.search(
+            db, workspace_id, query, top_k=top_k, mode=mode, filters=filters
+        )
+        return outcome.contexts
+
+    async def search(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        query: str,
+        *,
+        top_k: int = 5,
+        mode: RetrievalMode | None = None,
+        filters: RetrievalFilter | None = None,
+    ) -> RetrievalOutcome:
+        (outcome,) = await self.search_many(
+            db, workspace_id, [query], top_k=top_k, mode=mode, filters=filters
+        )
+        return outcome
+
+    async def search_many(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        queries: Sequence[str],
+        *,
+        top_k: int = 5,
+        mode: RetrievalMode | None = None,
+        filters: RetrievalFilter | None = None,
+    ) -> list[RetrievalOutcome]:
+        """Run several queries against one load of the workspace state.
+
+        The index, concept graph and filter candidates are loaded once, query
+        embeddings are computed in one embedder call, and every query's results are
+        hydrated with a single chunk fetch. Repeated queries are answered once, and
+        with a semantic cache a near-paraphrase of an answered query reuses its results.
+        Outcomes are returned in input order; shared stages report the same timing.
+        """
+        mode = mode or self.default_mode
+        if filters is not None and filters.is_empty:
+            filters = None
+        candidate_limit = top_k * settings.rag_candidate_multiplier
+        # With a reranker the first stage over-fetches and the second stage trims.
+        first_stage_k = top_k
+        cache_variant = mode.value
+        if self.reranker is not None:
+            first_stage_k = max(top_k, settings.rag_rerank_candidates)
+            candidate_limit = max(candidate_limit, first_stage_k)
+            cache_variant = f"{cache_variant}:{self.reranker.name}"
+        if filters is not None:
+            cache_variant = f"{cache_variant}:{filters.cache_key()}"
+
+        normalized = [query.strip().lower() for query in queries]
+        outcomes: dict[str, RetrievalOutcome] = {"": RetrievalOutcome(contexts=[])}
+        timings: dict[str, dict[str, float]] = {}
+        # Lookups and stores share one version, read before retrieval starts.
+        cache_version: int | None = None
+        if self.result_cache is not None:
+            cache_version = await self.result_cache.version(workspace_id)
+        for normalized_query in dict.fromkeys(normalized):
+            if normalized_query in outcomes:
+                continue
+            timings[normalized_query] = {}
+            if self.result_cache is not None:
+                started = time.perf_counter()
+                cached = await self.result_cache.get(
+                    workspace_id,
+                    normalized_query,
+                    top_k=top_k,
+                    variant=cache_variant,
+                    version=cache_version,
+                )
+                timings[normalized_query]["cache"] = (time.perf_counter() - started) * 1000
+                if cached is not None:
+                    outcomes[normalized_query] = RetrievalOutcome(
+                        contexts=[_context_from_cache(item) for item in cached],
+                        timings_ms=timings[normalized_query],
+                        cached=True,
+                    )
+        misses = [query for query in timings if query not in outcomes]
+        if not misses:
+            return [outcomes[normalized_query] for normalized_query in normalized]
 
-        chunks = (
+        shared: dict[str, float] = {}
+        query_vectors: dict[str, list[float]] = {}
+        semantic = self.semantic_cache
+        dense = mode in {RetrievalMode.DENSE, RetrievalMode.HYBRID}
+        if semantic is not None or dense:
+            started = time.perf_counter()
+            vectors = await self.embedder.embed(misses)
+            query_vectors = dict(zip(misses, vectors, strict=True))
+            shared["embed"] = (time.perf_counter() - started) * 1000
+        if semantic is not None:
+            for normalized_query in misses:
+                started = time.perf_counter()
+                hit = await semantic.get(
+                    workspace_id,
+                    query_vectors[normalized_query],
+                    top_k=top_k,
+                    variant=cache_variant,
+                    version=cache_version,
+                )
+                query_timings = timings[normalized_query]
+                query_timings["embed"] = shared["embed"]
+                query_timings["semantic_cache"] = (time.perf_counter() - started) * 1000
+                if hit is None:
+                    continue
+                # Pin the paraphrase too, so repeating it is an exact hit.
+                await semantic.result_cache.set(
+                    workspace_id,
+                    normalized_query,
+                    hit.items,
+                    top_k=top_k,
+                    variant=cache_variant,
+                    version=cache_version,
+                )
+                outcomes[normalized_query] = RetrievalOutcome(
+                    contexts=[_context_from_cache(item) for item in hit.items],
+                    timings_ms=query_timings,
+                    cached=True,
+                )
+        pending = {
+            normalized_query: self._tokens(normalized_query)
+            for normalized_query in misses
+            if normalized_query not in outcomes
+        }
+        if not pending:
+            return [outcomes[normalized_query] for normalized_query in normalized]
+
+        # State loads share the request session, so they run before the concurrent stage.
+        # With the Postgres lexical backend the graph is linked through concept metadata
+        # only, as there is no in-process index to intersect label postings with.
+        started = time.perf_counter()
+        lexical = mode != RetrievalMode.DENSE and any(pending.values())
+        in_process = lexical and self.lexical_backend == LexicalBackend.MEMORY
+        index: InvertedIndex | None = None
+        graph: ConceptGraph | None = None
+        if in_process:
+            index = await self.index_registry.get(db, workspace_id)
+        if lexical:
+            graph = await self.graph_registry.get(db, workspace_id, index)
+        shared["load"] = (time.perf_counter() - started) * 1000
+
+        # Filters are resolved up front through indexed predicates so every signal
+        # scores only in-scope chunks; SQL signals apply the same predicates inline.
+        candidates: CandidateSet | None = None
+        if filters is not None:
+            started = time.perf_counter()
+            candidates = await filters.resolve(db, workspace_id)
+            shared["filter"] = (time.perf_counter() - started) * 1000
+            if not candidates:
+                for normalized_query in pending:
+                    timings[normalized_query].update(shared)
+                    outcomes[normalized_query] = RetrievalOutcome(
+                        contexts=[], timings_ms=timings[normalized_query]
+                    )
+                return [outcomes[normalized_query] for normalized_query in normalized]
+
+        rankings: dict[str, list[tuple[UUID, float]]] = {}
+        for normalized_query, query_tokens in pending.items():
+            query_timings = timings[normalized_query]
+            query_timings.update(shared)
+            # An AsyncSession runs one statement at a time: database-backed signals take
+            # turns on it while in-process signals score concurrently.
+            session_lock = asyncio.Lock()
+            signals: dict[str, Awaitable[list[tuple[UUID, float]]]] = {}
+            if dense:
+                signals[DENSE_SIGNAL] = _holding(
+                    session_lock,
+                    self.dense_retriever.search(
+                        db,
+                        workspace_id,
+                        normalized_query,
+                        limit=candidate_limit,
+                        filters=filters,
+                        query_vector=query_vectors[normalized_query],
+                    ),
+                )
+            if lexical and not in_process and query_tokens:
+                signals[LEXICAL_SIGNAL] = _holding(
+                    session_lock,
+                    self.fulltext_retriever.search(
+                        db, workspace_id, normalized_query, limit=candidate_limit, filters=filters
+                    ),
+                )
+            if index is not None and query_tokens:
+                signals[LEXICAL_SIGNAL] = self._lexical_signal(
+                    index, query_tokens, candidate_limit, candidates
+                )
+            if graph is not None and len(graph) and query_tokens:
+                if index is None and filters is not None:
+                    # No index maps graph hits to sources: the filter checks them in SQL.
+                    signals[GRAPH_SIGNAL] = _holding(
+                        session_lock,
+                        self._filtered_graph_signal(
+                            db, workspace_id, graph, query_tokens, candidate_limit, filters
+                        ),
+                    )
+                else:
+                    signals[GRAPH_SIGNAL] = self._graph_signal(
+                        graph, query_tokens, candidate_limit, candidates, index
+                    )
+
+            results = await gather_signals(signals)
+            for name, result in results.items():
+                query_timings[name] = result.elapsed_ms
+
+            started = time.perf_counter()
+            scores = fuse(
+                {name: result.ranked for name, result in results.items()},
+                method=self.fusion_method,
+                k=settings.rag_rrf_k,
+                weights=self.signal_weights,
+            )
+            rankings[normalized_query] = heapq.nlargest(
+                first_stage_k, scores.items(), key=lambda item: item[1]
+            )
+            query_timings["fusion"] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        rows_by_id = await self._fetch_rows(
+            db, {chunk_id for ranked in rankings.values() for chunk_id, _ in ranked}
+        )
+        hydrate_ms = (time.perf_counter() - started) * 1000
+
+        for normalized_query, ranked in rankings.items():
+            query_timings = timings[normalized_query]
+            if not ranked:
+                outcomes[normalized_query] = RetrievalOutcome(contexts=[], timings_ms=query_timings)
+                continue
+            query_timings["hydrate"] = hydrate_ms
+            contexts = self._contexts(workspace_id, ranked, rows_by_id, candidates)
+
+            cacheable = True
+            if self.reranker is not None:
+                reranked = await rerank_contexts(
+                    self.reranker,
+                    normalized_query,
+                    contexts,
+                    top_k=top_k,
+                    budget_ms=settings.rag_rerank_budget_ms,
+                )
+                contexts = reranked.contexts
+                query_timings["rerank"] = reranked.elapsed_ms
+                # A budget fallback is a degraded answer; don't pin it in the cache.
+                cacheable = reranked.applied
+
+            if self.result_cache is not None and cacheable:
+                await self.result_cache.set(
+                    workspace_id,
+                    normalized_query,
+                    [_context_to_cache(item) for item in contexts],
+                    top_k=top_k,
+                    variant=cache_variant,
+                    version=cache_version,
+                )
+                if self.semantic_cache is not None and normalized_query in query_vectors:
+                    self.semantic_cache.add(
+                        workspace_id,
+                        normalized_query,
+                        query_vectors[normalized_query],
+                        top_k=top_k,
+                        variant=cache_variant,
+                    )
+            outcomes[normalized_query] = RetrievalOutcome(
+                contexts=contexts, timings_ms=query_timings
+            )
+        return [outcomes[normalized_query] for normalized_query in normalized]
+
+    async def _fetch_rows(
+        self,
+        db: AsyncSession,
+        chunk_ids: set[UUID],
+    ) -> dict[UUID, tuple[KnowledgeChunk, KnowledgeSource]]:
+        if not chunk_ids:
+            return {}
+        rows = (
             await db.execute(
                 select(KnowledgeChunk, KnowledgeSource)
                 .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
-                .where(KnowledgeSource.workspace_id == workspace_id)
-                .order_by(KnowledgeSource.created_at.desc(), KnowledgeChunk.chunk_index.asc())
-                .limit(200)
+                .where(KnowledgeChunk.id.in_(chunk_ids))
             )
         ).all()
+        return {chunk.id: (chunk, source) for chunk, source in rows}
 
-        concept_bonus = await self._concept_bonus(db, workspace_id, normalized_query)
-
-        scored: list[RetrievedContext] = []
-        for chunk, source in chunks:
-            score = self._chunk_score(normalized_query, chunk.content)
-            score += concept_bonus
-            if score <= 0:
+    def _contexts(
+        self,
+        workspace_id: UUID,
+        ranked: list[tuple[UUID, float]],
+        rows_by_id: dict[UUID, tuple[KnowledgeChunk, KnowledgeSource]],
+        candidates: CandidateSet | None = None,
+    ) -> list[RetrievedContext]:
+        selected: list[RetrievedContext] = []
+        for chunk_id, score in ranked:
+            row = rows_by_id.get(chunk_id)
+            if row is None:
+                # Deleted since the index was loaded; drop it until the next refresh.
+                self.index_registry.remove_chunk(workspace_id, chunk_id)
+                continue
+            chunk, source = row
+            if candidates is not None and not candidates.allows(chunk.id, source.id):
                 continue
-            scored.append(
+            selected.append(
                 RetrievedContext(
                     chunk_id=chunk.id,
                     source_id=source.id,
                     source_title=source.title,
                     content=chunk.content,
                     score=score,
-                    citation_index=0,
+                    citation_index=len(selected) + 1,
+                    chunk_index=chunk.chunk_index,
                 )
             )
+        return selected
 
-        scored.sort(key=lambda item: item.score, reverse=True)
-        selected = scored[:top_k]
-
-        return [
-            RetrievedContext(
-                chunk_id=item.chunk_id,
-                source_id=item.source_id,
-                source_title=item.source_title,
-                content=item.content,
-                score=item.score,
-                citation_index=index,
-            )
-            for index, item in enumerate(selected, start=1)
-        ]
+    async def _lexical_signal(
+        self,
+        index: InvertedIndex,
+        query_tokens: list[str],
+        limit: int,
+        candidates: CandidateSet | None = None,
+    ) -> list[tuple[UUID, float]]:
+        return self.scorer.top_k(index, query_tokens, limit, candidates)
+
+    def _graph_scores(self, graph: ConceptGraph, query_tokens: list[str]) -> dict[UUID, float]:
+        seeds = graph.seeds(query_tokens)
+        if not seeds:
+            return {}
+        activation = graph.activate(
+            seeds,
+            hops=settings.rag_graph_hops,
+            max_frontier=settings.rag_max_query_concepts,
+        )
+        return graph.chunk_scores(activation)
+
+    async def _graph_signal(
+        self,
+        graph: ConceptGraph,
+        query_tokens: list[str],
+        limit: int,
+        candidates: CandidateSet | None = None,
+        index: InvertedIndex | None = None,
+    ) -> list[tuple[UUID, float]]:
+        scores = self._graph_scores(graph, query_tokens)
+        if candidates is not None:
+            scores = {
+                chunk_id: score
+                for chunk_id, score in scores.items()
+                if candidates.allows(chunk_id, _source_of(index, chunk_id))
+            }
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
 
-    async def _concept_bonus(
+    async def _filtered_graph_signal(
         self,
         db: AsyncSession,
         workspace_id: UUID,
-        query: str,
-    ) -> float:
-        tokens = self._tokens(query)
-        if not tokens:
-            return 0.0
-
-        concepts = (
-            await db.scalars(
-                select(ConceptNode)
-                .where(ConceptNode.workspace_id == workspace_id)
-                .limit(400)
-            )
-        ).all()
-        matches = 0
-        for concept in concepts:
-            hay = f"{concept.concept_key} {concept.label}".lower()
-            if any(token in hay for token in tokens):
-                matches += 1
-        if matches == 0:
-            return 0.0
-        return min(0.35, 0.05 * matches)
-
-    def _chunk_score(self, query: str, content: str) -> float:
-        query_tokens = self._tokens(query)
-        if not query_tokens:
-            return 0.0
-
-        content_lower = content.lower()
-        hits = sum(1 for token in query_tokens if token in content_lower)
-        if hits == 0:
-            return 0.0
-
-        density = hits / max(len(query_tokens), 1)
-        length_penalty = 0.0 if len(content) <= 2000 else 0.05
-        return max(0.0, density - length_penalty)
+        graph: ConceptGraph,
+        query_tokens: list[str],
+        limit: int,
+        filters: RetrievalFilter,
+    ) -> list[tuple[UUID, float]]:
+        """Graph hits in score order, admitted by the filter one batch at a time.
+
+        Only the activated chunks are ever sent to the database, and scanning stops
+        once ``limit`` of them are in scope.
+        """
+        ranked = sorted(
+            self._graph_scores(graph, query_tokens).items(),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        batch_size = max(limit, 1) * 2
+        admitted: list[tuple[UUID, float]] = []
+        for offset in range(0, len(ranked), batch_size):
+            batch = ranked[offset : offset + batch_size]
+            allowed = await filters.admit(db, workspace_id, [chunk_id for chunk_id, _ in batch])
+            admitted.extend(item for item in batch if item[0] in allowed)
+            if len(admitted) >= limit:
+                break
+        return admitted[:limit]
 
     def _tokens(self, text: str) -> list[str]:
-        words = [word.strip(".,:;!?()[]{}\"'") for word in text.lower().split()]
-        return [word for word in words if len(word) > 2]
+        return tokenize(text)
+
 
+def context_snippets(
+    query: str,
+    contexts: Iterable[RetrievedContext],
+    *,
+    max_chars: int = 240,
+) -> list[Snippet]:
+    """Best-matching window of each context for the query's lexical tokens."""
+    query_tokens = tokenize(query)
+    return [extract_snippet(item.content, query_tokens, max_chars=max_chars) for item in contexts]
 
-def render_cited_answer(query: str, contexts: Iterable[RetrievedContext]) -> str:
+
+def render_cited_answer(
+    query: str,
+    contexts: Iterable[RetrievedContext],
+    *,
+    snippets: Sequence[Snippet] | None = None,
+    snippet_chars: int = 240,
+) -> str:
     context_list = list(contexts)
     if not context_list:
         return (
@@ -132,8 +571,11 @@ def render_cited_answer(query: str, contexts: Iterable[RetrievedContext]) -> str
             "Try uploading more sources or broadening your prompt."
         )
 
+    if snippets is None:
+        snippets = context_snippets(query, context_list, max_chars=snippet_chars)
+
     summary_lines = [f"RAG notes for: {query}"]
-    for item in context_list:
+    for item, snippet in zip(context_list, snippets, strict=True):
         source_title = item.source_title or "Untitled source"
-        summary_lines.append(f"[{item.citation_index}] {source_title}: {item.content[:240]}")
+        summary_lines.append(f"[{item.citation_index}] {source_title}: {snippet.highlighted()}")
     return "\n".join(summary_lines)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from creatory_core.db.models import KnowledgeChunk, KnowledgeSource
+from creatory_core.rag.workspace_cache import WorkspaceCache
+
+_STRIP_CHARS = ".,:;!?()[]{}\"'"
+_EMPTY_POSTINGS: Mapping[UUID, int] = {}
+_WORD_PATTERN = re.compile(r"\S+")
+
+CONTENT_FIELD = "content"
+TITLE_FIELD = "title"
+INDEX_FIELDS = (CONTENT_FIELD, TITLE_FIELD)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase lexical tokens shared by indexing and querying."""
+    words = [word.strip(_STRIP_CHARS) for word in text.lower().split()]
+    return [word for word in words if len(word) > 2]
+
+
+def token_spans(text: str) -> list[tuple[str, int, int]]:
+    """``tokenize`` with character offsets: (token, start, end) into the original text."""
+    spans: list[tuple[str, int, int]] = []
+    for match in _WORD_PATTERN.finditer(text):
+        word = match.group()
+        stripped = word.strip(_STRIP_CHARS)
+        if len(stripped) <= 2:
+            continue
+        start = match.start() + word.index(stripped)
+        spans.append((stripped.lower(), start, start + len(stripped)))
+    return spans
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedChunk:
+    source_id: UUID
+    char_length: int
+    lengths: dict[str, int]
+    terms: tuple[str, ...]
+
+
+class InvertedIndex:
+    """Per-field token -> {chunk_id: term frequency} postings for a single workspace.
+
+    Document frequencies and per-field length totals are maintained on every add and
+    remove, so BM25 statistics never need to be recomputed at query time.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[str, dict[UUID, int]]] = {
+            field: {} for field in INDEX_FIELDS
+        }
+        self._document_frequency: dict[str, int] = {}
+        self._total_lengths: dict[str, int] = dict.fromkeys(INDEX_FIELDS, 0)
+        self._chunks: dict[UUID, IndexedChunk] = {}
+        self._source_chunks: dict[UUID, set[UUID]] = {}
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, chunk_id: object) -> bool:
+        return chunk_id in self._chunks
+
+    @property
+    def version(self) -> int:
+        """Incremented on every add and remove; lets derived structures detect staleness."""
+        return self._version
+
+    def add(
+        self,
+        chunk_id: UUID,
+        source_id: UUID,
+        content: str,
+        *,
+        title: str | None = None,
+        token_count: int | None = None,
+    ) -> None:
+        if chunk_id in self._chunks:
+            self.remove(chunk_id)
+
+        field_tokens = {CONTENT_FIELD: tokenize(content), TITLE_FIELD: tokenize(title or "")}
+        lengths: dict[str, int] = {}
+        terms: set[str] = set()
+        for field, tokens in field_tokens.items():
+            frequencies: dict[str, int] = {}
+            for token in tokens:
+                frequencies[token] = frequencies.get(token, 0) + 1
+
+            field_postings = self._postings[field]
+            for token, frequency in frequencies.items():
+                field_postings.setdefault(token, {})[chunk_id] = frequency
+            terms.update(frequencies)
+            lengths[field] = len(tokens)
+
+        if token_count is not None and token_count > 0:
+            lengths[CONTENT_FIELD] = token_count
+
+        for token in terms:
+            self._document_frequency[token] = self._document_frequency.get(token, 0) + 1
+        for field, length in lengths.items():
+            self._total_lengths[field] += length
+
+        self._chunks[chunk_id] = IndexedChunk(
+            source_id=source_id,
+            char_length=len(content),
+            lengths=lengths,
+            terms=tuple(terms),
+        )
+        self._source_chunks.setdefault(source_id, set()).add(chunk_id)
+        self._version += 1
+
+    def remove(self, chunk_id: UUID) -> None:
+        chunk = self._chunks.pop(chunk_id, None)
+        if chunk is None:
+            return
+        source_chunks = self._source_chunks.get(chunk.source_id)
+        if source_chunks is not None:
+            source_chunks.discard(chunk_id)
+            if not source_chunks:
+                del self._source_chunks[chunk.source_id]
+
+        for token in chunk.terms:
+            for field_postings in self._postings.values():
+                postings = field_postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del field_postings[token]
+
+            remaining = self._document_frequency.get(token, 0) - 1
+            if remaining > 0:
+                self._document_frequency[token] = remaining
+            else:
+                self._document_frequency.pop(token, None)
+
+        for field, length in chunk.lengths.items():
+            self._total_lengths[field] -= length
+        self._version += 1
+
+    def postings(self, token: str, field: str = CONTENT_FIELD) -> Mapping[UUID, int]:
+        return self._postings[field].get(token, _EMPTY_POSTINGS)
+
+    def field_postings(self, field: str = CONTENT_FIELD) -> Mapping[str, Mapping[UUID, int]]:
+        return self._postings[field]
+
+    def document_frequency(self, token: str) -> int:
+        return self._document_frequency.get(token, 0)
+
+    def average_length(self, field: str = CONTENT_FIELD) -> float:
+        if not self._chunks:
+            return 0.0
+        return self._total_lengths[field] / len(self._chunks)
+
+    def chunk(self, chunk_id: UUID) -> IndexedChunk | None:
+        return self._chunks.get(chunk_id)
+
+    def chunk_ids(self) -> Iterable[UUID]:
+        return self._chunks.keys()
+
+    def source_chunk_ids(self, source_id: UUID) -> Collection[UUID]:
+        return self._source_chunks.get(source_id, ())
+
+
+class WorkspaceIndexRegistry:
+    """Lazily loads one inverted index per workspace and keeps it current on writes.
+
+    Writes made through this process are applied incrementally. Indexes are rebuilt
+    in the background after ``refresh_seconds`` so chunks written by other API
+    workers become visible; only the ``max_workspaces`` most recently queried
+    workspaces are kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_seconds: float = 300.0,
+        max_workspaces: int = 256,
+        load_batch_size: int = 1000,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self._load_batch_size = load_batch_size
+        self._indexes = WorkspaceCache(
+            refresh_seconds=refresh_seconds,
+            max_workspaces=max_workspaces,
+            session_factory=session_factory,
+        )
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    async def get(self, db: AsyncSession, workspace_id: UUID) -> InvertedIndex:
+        return await self._indexes.get(
+            db, workspace_id, lambda session: self._load(session, workspace_id)
+        )
+
+    def add_chunk(self, source: KnowledgeSource, chunk: KnowledgeChunk) -> None:
+        # Not loaded yet: the first query will read this chunk from the database.
+        self._indexes.record(
+            source.workspace_id,
+            lambda index: index.add(
+                chunk.id,
+                chunk.source_id,
+                chunk.content,
+                title=source.title,
+                token_count=chunk.token_count,
+            ),
+        )
+
+    def remove_chunk(self, workspace_id: UUID, chunk_id: UUID) -> None:
+        self._indexes.record(workspace_id, lambda index: index.remove(chunk_id))
+
+    def invalidate(self, workspace_id: UUID) -> None:
+        self._indexes.invalidate(workspace_id)
+
+    async def _load(self, db: AsyncSession, workspace_id: UUID) -> InvertedIndex:
+        index = InvertedIndex()
+        result = await db.stream(
+            select(
+                KnowledgeChunk.id,
+                KnowledgeChunk.source_id,
+                KnowledgeChunk.content,
+                KnowledgeChunk.token_count,
+                KnowledgeSource.title,
+            )
+            .join(KnowledgeSource, KnowledgeChunk.source_id == KnowledgeSource.id)
+            .where(KnowledgeSource.workspace_id == workspace_id)
+            .execution_options(yield_per=self._load_batch_size)
+        )
+        async for chunk_id, source_id, content, token_count, title in result:
+            index.add(chunk_id, source_id, content, title=title, token_count=token_count)
+        return index
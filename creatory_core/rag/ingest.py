@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import enum
+import hashlib
+import logging
+import uuid
+from collections import defaultdict, deque
+from collections.abc import AsyncIterable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import Update, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from creatory_core.db.models import (
+    ChunkEmbedding,
+    IngestStatus,
+    KnowledgeChunk,
+    KnowledgeSource,
+)
+from creatory_core.rag.cache import QueryResultCache
+from creatory_core.rag.concepts import release_chunk_concepts
+from creatory_core.rag.embeddings import Embedder
+from creatory_core.rag.fulltext import workspace_search_config
+from creatory_core.rag.index import WorkspaceIndexRegistry
+
+logger = logging.getLogger("creatory.rag.ingest")
+
+
+class IngestMode(str, enum.Enum):
+    APPEND = "append"
+    REPLACE = "replace"
+
+
+@dataclass(frozen=True)
+class ChunkInput:
+    content: str
+    token_count: int | None = None
+    metadata_json: dict = field(default_factory=dict)
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ChunkDiff:
+    """Multiset match of incoming chunks against a source's stored content hashes."""
+
+    def __init__(self, existing: Iterable[tuple[uuid.UUID, str | None]]) -> None:
+        self._unmatched: defaultdict[str | None, deque[uuid.UUID]] = defaultdict(deque)
+        for chunk_id, chunk_hash in existing:
+            self._unmatched[chunk_hash].append(chunk_id)
+
+    def match(
+        self,
+        batch: Sequence[ChunkInput],
+        start_index: int,
+    ) -> tuple[list[dict], list[ChunkInput], list[int]]:
+        """Split a batch into renumbered existing rows and fresh chunks with their indexes."""
+        kept: list[dict] = []
+        fresh: list[ChunkInput] = []
+        fresh_indexes: list[int] = []
+        for offset, chunk in enumerate(batch):
+            matches = self._unmatched.get(content_hash(chunk.content))
+            if matches:
+                kept.append(
+                    {
+                        "id": matches.popleft(),
+                        "chunk_index": start_index + offset,
+                        "metadata_json": chunk.metadata_json,
+                    }
+                )
+            else:
+                fresh.append(chunk)
+                fresh_indexes.append(start_index + offset)
+        return kept, fresh, fresh_indexes
+
+    def stale(self) -> list[uuid.UUID]:
+        return [chunk_id for chunk_ids in self._unmatched.values() for chunk_id in chunk_ids]
+
+
+@dataclass
+class ReingestResult:
+    first_chunk_index: int | None = None
+    inserted: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+
+async def reserve_chunk_indexes(db: AsyncSession, source_id: uuid.UUID, count: int) -> int:
+    """Atomically claim ``count`` consecutive chunk indexes and return the first one.
+
+    A single ``UPDATE ... RETURNING`` on the source row replaces per-chunk
+    ``max(chunk_index) + 1`` lookups, which raced on the unique constraint.
+    """
+    next_index = await db.scalar(
+        update(KnowledgeSource)
+        .where(KnowledgeSource.id == source_id)
+        .values(next_chunk_index=KnowledgeSource.next_chunk_index + count)
+        .returning(KnowledgeSource.next_chunk_index)
+    )
+    return int(next_index) - count
+
+
+def claim_statement(source_id: uuid.UUID, *, stale_before: datetime) -> Update:
+    """Mark a source ``embedding`` unless another ingest holds it; returns its id if claimed.
+
+    A source is held while it is queued or embedding with a claim newer than
+    ``stale_before``, or while a re-ingest transaction has its row locked (``SKIP
+    LOCKED`` refuses instead of waiting for it).
+    """
+    busy = KnowledgeSource.ingest_status.in_(
+        [IngestStatus.PENDING.value, IngestStatus.EMBEDDING.value]
+    )
+    claimable = (
+        select(KnowledgeSource.id)
+        .where(
+            KnowledgeSource.id == source_id,
+            or_(
+                ~busy,
+                KnowledgeSource.ingest_claimed_at.is_(None),
+                KnowledgeSource.ingest_claimed_at < stale_before,
+            ),
+        )
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(KnowledgeSource)
+        .where(KnowledgeSource.id == claimable)
+        .values(
+            ingest_status=IngestStatus.EMBEDDING.value,
+            ingest_claimed_at=datetime.now(UTC),
+        )
+        .returning(KnowledgeSource.id)
+    )
+
+
+async def claim_source(
+    db: AsyncSession,
+    source_id: uuid.UUID,
+    *,
+    stale_after_seconds: float,
+) -> bool:
+    """Atomically claim a source for one ingest; ``False`` if another one holds it.
+
+    A claim older than ``stale_after_seconds`` is taken over, so a source left
+    ``embedding`` by a crashed ingest does not refuse new ones forever.
+    """
+    stale_before = datetime.now(UTC) - timedelta(seconds=stale_after_seconds)
+    claimed = await db.scalar(claim_statement(source_id, stale_before=stale_before))
+    await db.commit()
+    return claimed is not None
+
+
+class ChunkIngestPipeline:
+    """Embeds chunks in fixed-size batches and bulk-writes chunks plus embeddings.
+
+    Each batch is one embedder call, one multi-row insert into ``knowledge_chunks``
+    and one into ``chunk_embeddings`` (asyncpg executemany is rewritten into
+    multi-row ``VALUES`` by SQLAlchemy's insertmanyvalues).
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        batch_size: int = 64,
+        index_registry: WorkspaceIndexRegistry | None = None,
+        result_cache: QueryResultCache | None = None,
+    ) -> None:
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.index_registry = index_registry
+        self.result_cache = result_cache
+
+    async def write_batch(
+        self,
+        db: AsyncSession,
+        source: KnowledgeSource,
+        chunks: Sequence[ChunkInput],
+        *,
+        start_index: int,
+    ) -> list[KnowledgeChunk]:
+        indexes = range(start_index, start_index + len(chunks))
+        return await self._insert_chunks(db, source, chunks, indexes)
+
+    async def embed_reusing(
+        self,
+        db: AsyncSession,
+        contents: Sequence[str],
+        hashes: Sequence[str],
+    ) -> list[list[float]]:
+        """Embed ``contents``, copying vectors already stored for identical content.
+
+        Only content whose hash has no ``chunk_embeddings`` row for the current model
+        reaches the embedder, so re-uploads and repeated boilerplate cost nothing.
+        """
+        stored = dict(
+            (
+                await db.execute(
+                    select(ChunkEmbedding.content_hash, ChunkEmbedding.embedding)
+                    .where(
+                        ChunkEmbedding.model_name == self.embedder.model_name,
+                        ChunkEmbedding.content_hash.in_(set(hashes)),
+                    )
+                    .distinct(ChunkEmbedding.content_hash)
+                )
+            ).all()
+        )
+        missing = list(dict.fromkeys(h for h in hashes if h not in stored))
+        if missing:
+            first_content = dict(zip(hashes, contents, strict=True))
+            vectors = await self.embedder.embed([first_content[h] for h in missing])
+            stored.update(zip(missing, vectors, strict=True))
+        return [stored[h] for h in hashes]
+
+    async def _insert_chunks(
+        self,
+        db: AsyncSession,
+        source: KnowledgeSource,
+        chunks: Sequence[ChunkInput],
+        indexes: Iterable[int],
+    ) -> list[KnowledgeChunk]:
+        if not chunks:
+            return []
+
+        hashes = [content_hash(chunk.content) for chunk in chunks]
+        vectors = await self.embed_reusing(db, [chunk.content for chunk in chunks], hashes)
+        search_config = await workspace_search_config(db, source.workspace_id)
+        chunk_rows = [
+            {
+                "id": uuid.uuid4(),
+                "source_id": source.id,
+                "chunk_index": chunk_index,
+                "content": chunk.content,
+                "content_hash": chunk_hash,
+                "token_count": chunk.token_count,
+                "metadata_json": chunk.metadata_json,
+                "search_config": search_config,
+            }
+            for chunk, chunk_index, chunk_hash in zip(chunks, indexes, hashes, strict=True)
+        ]
+        written = (
+            await db.scalars(insert(KnowledgeChunk).returning(KnowledgeChunk), chunk_rows)
+        ).all()
+
+        await db.execute(
+            insert(ChunkEmbedding),
+            [
+                {
+                    "chunk_id": row["id"],
+                    "model_name": self.embedder.model_name,
+                    "embedding": vector,
+                    "content_hash": row["content_hash"],
+                }
+                for row, vector in zip(chunk_rows, vectors, strict=True)
+            ],
+        )
+        return list(written)
+
+    async def run(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        source_id: uuid.UUID,
+        chunks: Sequence[ChunkInput],
+        *,
+        start_index: int,
+    ) -> None:
+        """Queued-job entry point: pending -> embedding -> ready.
+
+        A failure puts the source back to ``pending`` and re-raises, so the job queue
+        retries it; the job's dead-letter handler marks the source failed. Chunk
+        indexes already written by an earlier, interrupted delivery of the same job are
+        skipped, so a redelivered job finishes the ingest instead of failing on the
+        unique ``(source_id, chunk_index)`` constraint.
+        """
+        async with session_factory() as db:
+            source = await db.get(KnowledgeSource, source_id)
+            if source is None:
+                logger.warning(
+                    "ingest skipped, source missing", extra={"source_id": str(source_id)}
+                )
+                return
+
+            await self._start_embedding(db, source)
+
+            try:
+                written = set(
+                    await db.scalars(
+                        select(KnowledgeChunk.chunk_index).where(
+                            KnowledgeChunk.source_id == source_id,
+                            KnowledgeChunk.chunk_index >= start_index,
+                            KnowledgeChunk.chunk_index < start_index + len(chunks),
+                        )
+                    )
+                )
+                pending = [
+                    (start_index + offset, chunk)
+                    for offset, chunk in enumerate(chunks)
+                    if start_index + offset not in written
+                ]
+                for start in range(0, len(pending), self.batch_size):
+                    indexes, batch = zip(*pending[start : start + self.batch_size], strict=True)
+                    rows = await self._insert_chunks(db, source, batch, indexes)
+                    await self._commit_and_publish(db, source, rows)
+            except Exception:
+                logger.exception("ingest failed", extra={"source_id": str(source_id)})
+                await self._mark_status(db, source_id, IngestStatus.PENDING)
+                raise
+
+            source.ingest_status = IngestStatus.READY.value
+            await db.commit()
+
+    async def ingest_stream(
+        self,
+        db: AsyncSession,
+        source: KnowledgeSource,
+        batches: AsyncIterable[Sequence[ChunkInput]],
+    ) -> tuple[int | None, int]:
+        """Write chunk batches as they arrive; returns (first chunk index, chunks written).
+
+        Indexes are reserved per batch, so memory is bounded by one batch regardless of
+        the stream length. The source is marked failed and the error re-raised if the
+        stream or a write fails; batches committed before that point are kept.
+        """
+        await self._start_embedding(db, source)
+
+        first_index: int | None = None
+        written = 0
+        try:
+            async for batch in batches:
+                if not batch:
+                    continue
+                start_index = await reserve_chunk_indexes(db, source.id, len(batch))
+                if first_index is None:
+                    first_index = start_index
+                # Committed with the batch, so a long upload keeps its claim fresh.
+                source.ingest_claimed_at = datetime.now(UTC)
+                await self._write_and_publish(db, source, batch, start_index=start_index)
+                written += len(batch)
+        except Exception:
+            logger.exception("stream ingest failed", extra={"source_id": str(source.id)})
+            await self._mark_failed(db, source.id)
+            raise
+
+        source.ingest_status = IngestStatus.READY.value
+        await db.commit()
+        return first_index, written
+
+    async def reingest_stream(
+        self,
+        db: AsyncSession,
+        source: KnowledgeSource,
+        batches: AsyncIterable[Sequence[ChunkInput]],
+    ) -> ReingestResult:
+        """Replace a source's chunks with a new version, touching only what changed.
+
+        New chunks are matched to existing ones by content hash (as a multiset, so
+        repeated paragraphs still count). Matches keep their row and embedding and are
+        only renumbered; unmatched chunks are inserted (reusing any stored vector for
+        the same content); existing chunks left unmatched are deleted at the end.
+
+        The whole replacement is one transaction: readers keep seeing the old chunks
+        until it commits, and a failed or abandoned stream rolls back to them, so the
+        old and new versions are never live together. The source row stays locked
+        meanwhile, which makes other claims on it fail fast. Memory stays bounded by
+        one batch; the workspace's in-process index is reloaded after the commit.
+        """
+        diff = ChunkDiff(
+            (
+                await db.execute(
+                    select(KnowledgeChunk.id, KnowledgeChunk.content_hash)
+                    .where(KnowledgeChunk.source_id == source.id)
+                    .order_by(KnowledgeChunk.chunk_index)
+                )
+            ).all()
+        )
+
+        await self._start_embedding(db, source)
+
+        result = ReingestResult()
+        try:
+            async for batch in batches:
+                if not batch:
+                    continue
+                start_index = await reserve_chunk_indexes(db, source.id, len(batch))
+                if result.first_chunk_index is None:
+                    result.first_chunk_index = start_index
+
+                # Renumber into the freshly reserved block, which sits above every
+                # existing index, so the (source_id, chunk_index) constraint never clashes.
+                kept, fresh, fresh_indexes = diff.match(batch, start_index)
+                if kept:
+                    await db.execute(update(KnowledgeChunk), kept)
+                written = await self._insert_chunks(db, source, fresh, fresh_indexes)
+                result.unchanged += len(kept)
+                result.inserted += len(written)
+
+            stale = diff.stale()
+            if stale:
+                await release_chunk_concepts(db, stale)
+                await db.execute(delete(KnowledgeChunk).where(KnowledgeChunk.id.in_(stale)))
+            result.deleted = len(stale)
+            source.ingest_status = IngestStatus.READY.value
+            await db.commit()
+        except Exception:
+            logger.exception("reingest failed", extra={"source_id": str(source.id)})
+            # Rolls the staged replacement back; the previous chunks stay as they were.
+            await self._mark_failed(db, source.id)
+            raise
+
+        if self.index_registry is not None:
+            self.index_registry.invalidate(source.workspace_id)
+        if self.result_cache is not None:
+            await self.result_cache.invalidate_workspace(source.workspace_id)
+        return result
+
+    async def _write_and_publish(
+        self,
+        db: AsyncSession,
+        source: KnowledgeSource,
+        batch: Sequence[ChunkInput],
+        *,
+        start_index: int,
+    ) -> None:
+        written = await self.write_batch(db, source, batch, start_index=start_index)
+        await self._commit_and_publish(db, source, written)
+
+    async def _commit_and_publish(
+        self,
+        db: AsyncSession,
+        source: KnowledgeSource,
+        written: Sequence[KnowledgeChunk],
+    ) -> None:
+        await db.commit()
+        self._publish(source, written)
+        if self.result_cache is not None:
+            await self.result_cache.invalidate_workspace(source.workspace_id)
+
+    def _publish(self, source: KnowledgeSource, written: Sequence[KnowledgeChunk]) -> None:
+        if self.index_registry is not None:
+            for chunk in written:
+                self.index_registry.add_chunk(source, chunk)
+
+    async def _start_embedding(self, db: AsyncSession, source: KnowledgeSource) -> None:
+        source.ingest_status = IngestStatus.EMBEDDING.value
+        source.ingest_claimed_at = datetime.now(UTC)
+        await db.commit()
+
+    async def _mark_failed(self, db: AsyncSession, source_id: uuid.UUID) -> None:
+        await self._mark_status(db, source_id, IngestStatus.FAILED)
+
+    async def _mark_status(
+        self,
+        db: AsyncSession,
+        source_id: uuid.UUID,
+        ingest_status: IngestStatus,
+    ) -> None:
+        await db.rollback()
+        await db.execute(
+            update(KnowledgeSource)
+            .where(KnowledgeSource.id == source_id)
+            .values(ingest_status=ingest_status.value)
+        )
+        await db.commit()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from creatory_core.providers.base import ProviderSpec
+from creatory_core.rag.chunking import TokenCounter, count_tokens
+from creatory_core.rag.hybrid import RetrievedContext
+
+
+@dataclass(frozen=True)
+class PackedPassage:
+    source_id: UUID
+    source_title: str | None
+    chunk_ids: tuple[UUID, ...]
+    content: str
+    score: float
+    token_count: int
+    citation_index: int = 0
+
+    def header(self) -> str:
+        return f"[{self.citation_index}] {self.source_title or 'Untitled source'}"
+
+
+@dataclass(frozen=True)
+class PackedContext:
+    passages: list[PackedPassage]
+    token_budget: int
+    tokens_used: int
+    dropped_chunk_ids: list[UUID] = field(default_factory=list)
+
+    def render(self) -> str:
+        return "\n\n".join(f"{item.header()}\n{item.content}" for item in self.passages)
+
+
+def context_token_budget(
+    spec: ProviderSpec | None,
+    *,
+    max_tokens: int,
+    window_share: float,
+) -> int:
+    """Tokens of retrieved context to send: a share of the model window, capped."""
+    if spec is None or spec.context_window_tokens is None:
+        return max_tokens
+    return max(0, min(max_tokens, int(spec.context_window_tokens * window_share)))
+
+
+def merge_overlapping(left: str, right: str) -> str:
+    """Join neighbouring chunks, dropping the overlap the chunker repeated in ``right``."""
+    first_word = right.split(maxsplit=1)[0] if right.strip() else ""
+    if first_word:
+        position = left.find(first_word)
+        while position != -1:
+            tail = left[position:]
+            if right.startswith(tail):
+                return left + right[len(tail) :]
+            position = left.find(first_word, position + 1)
+    return f"{left}\n\n{right}"
+
+
+@dataclass
+class _Unit:
+    members: list[RetrievedContext]
+    content: str
+    tokens: int
+
+    @property
+    def score(self) -> float:
+        return sum(item.score for item in self.members)
+
+    @property
+    def density(self) -> float:
+        return self.score / max(self.tokens, 1)
+
+
+def _dedupe(contexts: Sequence[RetrievedContext]) -> list[RetrievedContext]:
+    best: dict[str, RetrievedContext] = {}
+    for item in contexts:
+        key = " ".join(item.content.split())
+        current = best.get(key)
+        if current is None or item.score > current.score:
+            best[key] = item
+    return list(best.values())
+
+
+def _neighbour_runs(contexts: Sequence[RetrievedContext]) -> list[list[RetrievedContext]]:
+    by_source: dict[UUID, list[RetrievedContext]] = {}
+    for item in contexts:
+        by_source.setdefault(item.source_id, []).append(item)
+
+    runs: list[list[RetrievedContext]] = []
+    for items in by_source.values():
+        items.sort(key=lambda item: (item.chunk_index is None, item.chunk_index or 0))
+        run = [items[0]]
+        for item in items[1:]:
+            previous = run[-1].chunk_index
+            if previous is not None and item.chunk_index == previous + 1:
+                run.append(item)
+            else:
+                runs.append(run)
+                run = [item]
+        runs.append(run)
+    return runs
+
+
+def pack_contexts(
+    contexts: Sequence[RetrievedContext],
+    *,
+    token_budget: int,
+    token_counter: TokenCounter | None = None,
+) -> PackedContext:
+    """Fit retrieved chunks into ``token_budget`` prompt tokens.
+
+    Identical chunks are deduplicated, consecutive ``chunk_index`` neighbours from one
+    source are merged (dropping the chunker's repeated overlap), passages contained in
+    another are dropped, and the rest are packed greedily by score per token. A merged
+    run that does not fit is split back into its chunks before being given up on.
+    """
+    count = token_counter or count_tokens
+
+    def unit(members: list[RetrievedContext]) -> _Unit:
+        content = members[0].content
+        for item in members[1:]:
+            content = merge_overlapping(content, item.content)
+        title = members[0].source_title or "Untitled source"
+        # Header line "[n] title" plus separators is charged to the passage.
+        return _Unit(members=members, content=content, tokens=count(content) + count(title) + 4)
+
+    units = [unit(run) for run in _neighbour_runs(_dedupe(contexts))]
+    units = [
+        item
+        for item in units
+        if not any(
+            other is not item
+            and item.content in other.content
+            and (len(other.content), other.score) > (len(item.content), item.score)
+            for other in units
+        )
+    ]
+
+    heap = [(-item.density, -item.score, order, item) for order, item in enumerate(units)]
+    heapq.heapify(heap)
+    order = len(heap)
+    chosen: list[_Unit] = []
+    dropped: list[UUID] = []
+    remaining = token_budget
+    while heap:
+        _, _, _, item = heapq.heappop(heap)
+        if item.tokens <= remaining:
+            chosen.append(item)
+            remaining -= item.tokens
+        elif len(item.members) > 1:
+            for member in item.members:
+                single = unit([member])
+                heapq.heappush(heap, (-single.density, -single.score, order, single))
+                order += 1
+        else:
+            dropped.append(item.members[0].chunk_id)
+
+    packed_ids = {member.chunk_id for item in chosen for member in item.members}
+    dropped.extend(
+        item.chunk_id
+        for item in contexts
+        if item.chunk_id not in packed_ids and item.chunk_id not in dropped
+    )
+    chosen.sort(key=lambda item: item.score, reverse=True)
+    passages = [
+        PackedPassage(
+            source_id=item.members[0].source_id,
+            source_title=item.members[0].source_title,
+            chunk_ids=tuple(member.chunk_id for member in item.members),
+            content=item.content,
+            score=item.score,
+            token_count=item.tokens,
+            citation_index=rank,
+        )
+        for rank, item in enumerate(chosen, 1)
+    ]
+    return PackedContext(
+        passages=passages,
+        token_budget=token_budget,
+        tokens_used=token_budget - remaining,
+        dropped_chunk_ids=dropped,
+    )
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Protocol
+
+from creatory_core.rag.index import tokenize
+
+if TYPE_CHECKING:
+    from creatory_core.rag.hybrid import RetrievedContext
+
+logger = logging.getLogger("creatory.rag.rerank")
+
+# Passages scored between yields to the event loop, so a rerank budget can cancel
+# the pure-Python scorer mid-way instead of waiting for it to finish.
+_PASSAGES_PER_YIELD = 32
+
+
+class Reranker(Protocol):
+    name: str
+
+    async def score(self, query: str, passages: Sequence[str]) -> list[float]: ...
+
+
+class TermOverlapReranker:
+    """Deterministic query/passage scorer: term coverage plus in-order bigram matches.
+
+    Cheap enough to run on every query and stable across runs, which makes it the
+    stand-in for tests and for deployments without a model. Scoring yields to the
+    event loop every few passages, so ``rerank_contexts`` can cut it short.
+    """
+
+    name = "overlap"
+
+    async def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return [0.0] * len(passages)
+        query_terms = set(query_tokens)
+        query_bigrams = set(itertools.pairwise(query_tokens))
+
+        scores: list[float] = []
+        for position, passage in enumerate(passages):
+            if position and not position % _PASSAGES_PER_YIELD:
+                await asyncio.sleep(0)
+            tokens = tokenize(passage)
+            terms = set(tokens)
+            coverage = len(query_terms & terms) / len(query_terms)
+            bigrams = len(query_bigrams & set(itertools.pairwise(tokens)))
+            # Length prior keeps a long passage from winning on coverage alone.
+            scores.append(coverage + 0.5 * bigrams - 0.01 * math.log1p(len(tokens)))
+        return scores
+
+
+class CrossEncoderReranker:
+    """Local cross-encoder scored in a worker thread; needs the ``rerank`` extra."""
+
+    name = "cross-encoder"
+
+    def __init__(self, model_name: str) -> None:
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError as exc:  # pragma: no cover - depends on optional extra
+            raise RuntimeError(
+                "Cross-encoder reranking requires 'sentence-transformers': "
+                "pip install creatory[rerank]"
+            ) from exc
+        self.model_name = model_name
+        self._model = CrossEncoder(model_name)
+
+    async def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        pairs = [(query, passage) for passage in passages]
+        scores = await asyncio.to_thread(self._model.predict, pairs)
+        return [float(value) for value in scores]
+
+
+@dataclass(frozen=True)
+class RerankOutcome:
+    contexts: list[RetrievedContext]
+    applied: bool
+    elapsed_ms: float
+
+
+async def rerank_contexts(
+    reranker: Reranker,
+    query: str,
+    contexts: Sequence[RetrievedContext],
+    *,
+    top_k: int,
+    budget_ms: float,
+) -> RerankOutcome:
+    """Reorder first-stage candidates by reranker score within ``budget_ms``.
+
+    When the budget expires or the reranker fails, the first-stage order is kept so
+    reranking can only add bounded latency, never an error. Ties keep first-stage
+    order; citation indexes are renumbered for the returned slice.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    reordered = list(contexts)
+    applied = False
+    if contexts:
+        try:
+            scores = await asyncio.wait_for(
+                reranker.score(query, [item.content for item in contexts]),
+                timeout=budget_ms / 1000,
+            )
+        except TimeoutError:
+            logger.warning(
+                "rerank budget exceeded", extra={"reranker": reranker.name, "budget_ms": budget_ms}
+            )
+        except Exception:
+            logger.exception("rerank failed", extra={"reranker": reranker.name})
+        else:
+            order = sorted(range(len(contexts)), key=lambda position: -scores[position])
+            reordered = [replace(contexts[position], score=scores[position]) for position in order]
+            applied = True
+
+    selected = [
+        replace(item, citation_index=rank) for rank, item in enumerate(reordered[:top_k], 1)
+    ]
+    return RerankOutcome(
+        contexts=selected,
+        applied=applied,
+        elapsed_ms=(loop.time() - started) * 1000,
+    )
+
+
+def build_reranker(name: str, *, model_name: str) -> Reranker | None:
+    if name == "overlap":
+        return TermOverlapReranker()
+    if name == "cross-encoder":
+        return CrossEncoderReranker(model_name)
+    return None
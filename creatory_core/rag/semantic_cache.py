@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import math
+import random
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from creatory_core.rag.cache import CacheStats, QueryResultCache
+
+_EntryKey = tuple[str, int, str]
+_BucketKey = tuple[str, int, int]
+
+
+def _sparse_unit(vector: Sequence[float]) -> dict[int, float] | None:
+    """Non-zero components scaled to unit length; ``None`` for an all-zero vector."""
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0.0:
+        return None
+    return {position: value / norm for position, value in enumerate(vector) if value}
+
+
+def _dot(left: dict[int, float], right: dict[int, float]) -> float:
+    if len(right) < len(left):
+        left, right = right, left
+    return sum(value * right.get(position, 0.0) for position, value in left.items())
+
+
+class HyperplaneHasher:
+    """Random-hyperplane LSH: one signature bit per plane, set when the vector is above it.
+
+    Vectors at cosine similarity ``s`` agree on each bit with probability
+    ``1 - arccos(s) / pi``, so near-duplicates share a signature or differ in a bit.
+    Planes are drawn from a seeded RNG so every process hashes identically.
+    """
+
+    def __init__(self, dimensions: int, *, bits: int = 12, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        self.dimensions = dimensions
+        self.bits = bits
+        self._planes = [[rng.gauss(0.0, 1.0) for _ in range(dimensions)] for _ in range(bits)]
+
+    def signature(self, vector: dict[int, float]) -> int:
+        signature = 0
+        for bit, plane in enumerate(self._planes):
+            if sum(value * plane[position] for position, value in vector.items()) >= 0.0:
+                signature |= 1 << bit
+        return signature
+
+    def probes(self, signature: int) -> Iterator[int]:
+        """The signature's own bucket, then every bucket one bit flip away."""
+        yield signature
+        for bit in range(self.bits):
+            yield signature ^ (1 << bit)
+
+
+@dataclass
+class _Entry:
+    vector: dict[int, float]
+    bucket: _BucketKey
+
+
+class SemanticQueryIndex:
+    """One workspace's answered queries, bucketed by LSH signature with LRU eviction.
+
+    Buckets are partitioned by cache variant and ``top_k`` so a neighbour is only
+    returned when its cached answer was produced under the same retrieval settings.
+    """
+
+    def __init__(self, hasher: HyperplaneHasher, *, max_entries: int = 256) -> None:
+        self.hasher = hasher
+        self.max_entries = max_entries
+        self._entries: OrderedDict[_EntryKey, _Entry] = OrderedDict()
+        self._buckets: dict[_BucketKey, set[_EntryKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, query: str, vector: dict[int, float], *, top_k: int, variant: str) -> None:
+        key = (variant, top_k, query)
+        self.remove(key)
+        bucket = (variant, top_k, self.hasher.signature(vector))
+        self._entries[key] = _Entry(vector=vector, bucket=bucket)
+        self._buckets.setdefault(bucket, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self.remove(next(iter(self._entries)))
+
+    def remove(self, key: _EntryKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        members = self._buckets[entry.bucket]
+        members.discard(key)
+        if not members:
+            del self._buckets[entry.bucket]
+
+    def touch(self, key: _EntryKey) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def nearest(
+        self,
+        vector: dict[int, float],
+        *,
+        top_k: int,
+        variant: str,
+        threshold: float,
+    ) -> list[tuple[_EntryKey, float]]:
+        """Probed entries at or above ``threshold`` cosine similarity, best first."""
+        matches: list[tuple[_EntryKey, float]] = []
+        for signature in self.hasher.probes(self.hasher.signature(vector)):
+            for key in self._buckets.get((variant, top_k, signature), ()):
+                similarity = _dot(vector, self._entries[key].vector)
+                if similarity >= threshold:
+                    matches.append((key, similarity))
+        matches.sort(key=lambda item: -item[1])
+        return matches
+
+
+@dataclass(frozen=True)
+class SemanticHit:
+    query: str
+    similarity: float
+    items: list[dict[str, Any]]
+
+
+class SemanticQueryCache:
+    """Answers a query with the cached results of an earlier query that embeds nearby.
+
+    The in-process index only maps query embeddings to previously answered query
+    text; the results themselves stay in the exact ``QueryResultCache``. A neighbour
+    whose exact entry has expired or been invalidated by a knowledge write is dropped
+    on lookup, so semantic hits follow the same TTL and version rules as exact hits.
+    """
+
+    def __init__(
+        self,
+        result_cache: QueryResultCache,
+        *,
+        threshold: float = 0.92,
+        max_entries: int = 256,
+        max_workspaces: int = 1024,
+        bits: int = 12,
+    ) -> None:
+        self.result_cache = result_cache
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_workspaces = max_workspaces
+        self.bits = bits
+        self.stats = CacheStats(backend="semantic")
+        self._indexes: OrderedDict[UUID, SemanticQueryIndex] = OrderedDict()
+        self._hashers: dict[int, HyperplaneHasher] = {}
+
+    @property
+    def entries(self) -> int:
+        return sum(len(index) for index in self._indexes.values())
+
+    def workspace_entries(self, workspace_id: UUID) -> int:
+        index = self._indexes.get(workspace_id)
+        return len(index) if index is not None else 0
+
+    def _index(self, workspace_id: UUID, dimensions: int) -> SemanticQueryIndex:
+        index = self._indexes.get(workspace_id)
+        if index is None:
+            hasher = self._hashers.get(dimensions)
+            if hasher is None:
+                hasher = self._hashers[dimensions] = HyperplaneHasher(dimensions, bits=self.bits)
+            index = self._indexes[workspace_id] = SemanticQueryIndex(
+                hasher, max_entries=self.max_entries
+            )
+            while len(self._indexes) > self.max_workspaces:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(workspace_id)
+        return index
+
+    async def get(
+        self,
+        workspace_id: UUID,
+        vector: Sequence[float],
+        *,
+        top_k: int,
+        variant: str = "",
+        version: int | None = None,
+    ) -> SemanticHit | None:
+        unit = _sparse_unit(vector)
+        index = self._indexes.get(workspace_id)
+        if unit is None or index is None or index.hasher.dimensions != len(vector):
+            self.stats.record(workspace_id, hit=False)
+            return None
+        for key, similarity in index.nearest(
+            unit, top_k=top_k, variant=variant, threshold=self.threshold
+        ):
+            query = key[2]
+            items = await self.result_cache.peek(
+                workspace_id, query, top_k=top_k, variant=variant, version=version
+            )
+            if items is None:
+                index.remove(key)
+                continue
+            index.touch(key)
+            self.stats.record(workspace_id, hit=True)
+            return SemanticHit(query=query, similarity=similarity, items=items)
+        self.stats.record(workspace_id, hit=False)
+        return None
+
+    def add(
+        self,
+        workspace_id: UUID,
+        query: str,
+        vector: Sequence[float],
+        *,
+        top_k: int,
+        variant: str = "",
+    ) -> None:
+        unit = _sparse_unit(vector)
+        if unit is None:
+            return
+        index = self._index(workspace_id, len(vector))
+        if index.hasher.dimensions != len(vector):
+            # The embedder changed; earlier embeddings are not comparable.
+            del self._indexes[workspace_id]
+            index = self._index(workspace_id, len(vector))
+        index.add(query, unit, top_k=top_k, variant=variant)
+
+    def invalidate_workspace(self, workspace_id: UUID) -> None:
+        self._indexes.pop(workspace_id, None)
+
+
+def build_semantic_cache(
+    result_cache: QueryResultCache | None,
+    *,
+    enabled: bool,
+    threshold: float,
+    max_entries: int,
+) -> SemanticQueryCache | None:
+    if not enabled or result_cache is None:
+        return None
+    return SemanticQueryCache(result_cache, threshold=threshold, max_entries=max_entries)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from creatory_core.rag.index import token_spans
+
+ELLIPSIS = "…"
+
+
+@dataclass(frozen=True)
+class Snippet:
+    """A window of a chunk with query-term highlight spans relative to ``text``."""
+
+    text: str
+    start: int
+    end: int
+    source_length: int
+    highlights: tuple[tuple[int, int], ...] = ()
+
+    @property
+    def truncated_start(self) -> bool:
+        return self.start > 0
+
+    @property
+    def truncated_end(self) -> bool:
+        return self.end < self.source_length
+
+    def highlighted(self, *, open_mark: str = "**", close_mark: str = "**") -> str:
+        parts: list[str] = [ELLIPSIS] if self.truncated_start else []
+        cursor = 0
+        for start, end in self.highlights:
+            parts.extend((self.text[cursor:start], open_mark, self.text[start:end], close_mark))
+            cursor = end
+        parts.append(self.text[cursor:])
+        if self.truncated_end:
+            parts.append(ELLIPSIS)
+        return "".join(parts)
+
+
+def _best_window(
+    matches: list[tuple[str, int, int]],
+    max_chars: int,
+) -> tuple[int, int]:
+    """Indexes [first, last] of the match run covering the most distinct terms.
+
+    Two-pointer sweep over match offsets; ties go to the run with more hits, then the
+    earliest one.
+    """
+    best = (0, 0)
+    best_key = (0, 0)
+    counts: Counter[str] = Counter()
+    right = 0
+    for left in range(len(matches)):
+        right = max(right, left)
+        while right < len(matches) and matches[right][2] - matches[left][1] <= max_chars:
+            counts[matches[right][0]] += 1
+            right += 1
+        if right == left:
+            continue
+        key = (len(counts), right - left)
+        if key > best_key:
+            best_key, best = key, (left, right - 1)
+        token = matches[left][0]
+        counts[token] -= 1
+        if not counts[token]:
+            del counts[token]
+    return best
+
+
+def extract_snippet(
+    content: str,
+    query_tokens: Iterable[str],
+    *,
+    max_chars: int = 240,
+) -> Snippet:
+    terms = set(query_tokens)
+    matches = [span for span in token_spans(content) if span[0] in terms]
+
+    if matches:
+        first, last = _best_window(matches, max_chars)
+        focus_start, focus_end = matches[first][1], matches[last][2]
+    else:
+        focus_start = focus_end = 0
+
+    # Centre the matched run in the window, then snap both edges to whitespace.
+    slack = max(max_chars - (focus_end - focus_start), 0)
+    start = max(focus_start - slack // 2, 0)
+    end = min(start + max_chars, len(content))
+    start = max(end - max_chars, 0)
+    if start > 0:
+        boundary = content.find(" ", start, focus_start)
+        if boundary != -1:
+            start = boundary + 1
+    if end < len(content):
+        boundary = content.rfind(" ", max(focus_end, start), end)
+        if boundary != -1:
+            end = boundary
+
+    highlights = tuple(
+        (span_start - start, span_end - start)
+        for _, span_start, span_end in matches
+        if span_start >= start and span_end <= end
+    )
+    return Snippet(
+        text=content[start:end],
+        start=start,
+        end=end,
+        source_length=len(content),
+        highlights=highlights,
+    )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import codecs
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, Protocol, TypeVar
+
+from creatory_core.rag.chunking import StreamingChunker, TextChunk
+from creatory_core.rag.ingest import ChunkInput
+
+T = TypeVar("T")
+
+
+class StreamTooLargeError(ValueError):
+    pass
+
+
+class ByteCounter:
+    """Pass-through over a byte stream that tracks size and enforces an optional cap."""
+
+    def __init__(self, source: AsyncIterable[bytes], *, max_bytes: int | None = None) -> None:
+        self._source = source
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for piece in self._source:
+            self.bytes_read += len(piece)
+            if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+                raise StreamTooLargeError(f"stream exceeds {self.max_bytes} bytes")
+            yield piece
+
+
+class AsyncReader(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+async def read_pieces(reader: AsyncReader, piece_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Yield a file-like object's bytes in ``piece_size`` reads, e.g. a spooled upload."""
+    while piece := await reader.read(piece_size):
+        yield piece
+
+
+async def decode_utf8(pieces: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Incrementally decode UTF-8; multi-byte characters split across pieces survive."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    async for piece in pieces:
+        text = decoder.decode(piece)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _chunk_input(chunk: TextChunk) -> ChunkInput:
+    return ChunkInput(
+        content=chunk.content,
+        token_count=chunk.token_count,
+        metadata_json=chunk.metadata_json,
+    )
+
+
+async def chunk_text_stream(
+    pieces: AsyncIterable[str],
+    **options: Any,
+) -> AsyncIterator[ChunkInput]:
+    chunker = StreamingChunker(**options)
+    async for piece in pieces:
+        for chunk in chunker.feed(piece):
+            yield _chunk_input(chunk)
+    for chunk in chunker.finish():
+        yield _chunk_input(chunk)
+
+
+async def batched(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
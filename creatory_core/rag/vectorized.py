@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from creatory_core.rag.bm25 import BM25FScorer, BM25Parameters
+from creatory_core.rag.index import InvertedIndex
+
+if TYPE_CHECKING:
+    from creatory_core.rag.filters import CandidateSet
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on optional extra
+    np = None
+
+logger = logging.getLogger("creatory.rag.vectorized")
+
+
+class TermMatrix:
+    """Compressed sparse column snapshot of an ``InvertedIndex`` for one parameter set.
+
+    Column ``t`` holds, for every chunk containing token ``t``, its saturated BM25F
+    term weight ``tf' / (k1 + tf')``, where ``tf'`` is the field-weighted,
+    length-normalised pseudo frequency. Those values do not depend on the query,
+    so scoring is a gather of the query's columns, an ``idf`` scale and a sum.
+    """
+
+    def __init__(self, index: InvertedIndex, parameters: BM25Parameters) -> None:
+        self.version = index.version
+        self.built_at = time.monotonic()
+        self.chunk_ids: list[UUID] = list(index.chunk_ids())
+        # Keyed by the UUID's integer value: UUID.__hash__ is pure Python and would
+        # dominate build time on large indexes.
+        ordinals = {chunk_id.int: ordinal for ordinal, chunk_id in enumerate(self.chunk_ids)}
+        self.ordinals = ordinals
+        count = len(self.chunk_ids)
+
+        self.source_ordinals: dict[UUID, int] = {}
+        self.row_sources = np.fromiter(
+            (
+                self.source_ordinals.setdefault(
+                    index.chunk(chunk_id).source_id, len(self.source_ordinals)
+                )
+                for chunk_id in self.chunk_ids
+            ),
+            dtype=np.int32,
+            count=count,
+        )
+
+        inverse_norms = {}
+        for name, field_parameters in parameters.fields.items():
+            lengths = np.fromiter(
+                (index.chunk(chunk_id).lengths.get(name, 0) for chunk_id in self.chunk_ids),
+                dtype=np.float64,
+                count=count,
+            )
+            average_length = index.average_length(name) or 1.0
+            inverse_norms[name] = field_parameters.weight / (
+                1.0 - field_parameters.b + field_parameters.b * lengths / average_length
+            )
+
+        vocabulary = sorted(
+            {token for name in parameters.fields for token in index.field_postings(name)}
+        )
+        self.columns = {token: column for column, token in enumerate(vocabulary)}
+        document_frequency = np.fromiter(
+            (index.document_frequency(token) for token in vocabulary),
+            dtype=np.float64,
+            count=len(vocabulary),
+        )
+        self.idf = np.log(1.0 + (count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        # Flatten every field's postings into (column, row, weighted tf) triplets, then
+        # merge fields by summing duplicates of the same (column, row) cell.
+        cell_columns: list[int] = []
+        cell_rows: list[int] = []
+        cell_values: list[np.ndarray] = []
+        for name in parameters.fields:
+            field_rows: list[int] = []
+            field_frequencies: list[int] = []
+            for token, postings in index.field_postings(name).items():
+                cell_columns.extend([self.columns[token]] * len(postings))
+                field_rows.extend([ordinals[chunk_id.int] for chunk_id in postings])
+                field_frequencies.extend(postings.values())
+            rows = np.asarray(field_rows, dtype=np.int64)
+            cell_rows.extend(field_rows)
+            cell_values.append(
+                np.asarray(field_frequencies, dtype=np.float64) * inverse_norms[name][rows]
+            )
+
+        keys = np.asarray(cell_columns, dtype=np.int64) * max(count, 1) + np.asarray(
+            cell_rows, dtype=np.int64
+        )
+        cells, inverse = np.unique(keys, return_inverse=True)
+        pseudo = np.bincount(
+            inverse,
+            weights=np.concatenate(cell_values) if cell_values else None,
+            minlength=len(cells),
+        )
+        columns = cells // max(count, 1)
+
+        self.indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(vocabulary)), out=self.indptr[1:])
+        self.indices = (cells % max(count, 1)).astype(np.int32)
+        self.data = pseudo / (parameters.k1 + pseudo)
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def candidate_mask(self, candidates: CandidateSet) -> np.ndarray:
+        """Boolean row mask of the chunks a filtered query may score."""
+        allowed_sources = [
+            self.source_ordinals[source_id]
+            for source_id in candidates.source_ids
+            if source_id in self.source_ordinals
+        ]
+        mask = np.isin(self.row_sources, np.asarray(allowed_sources, dtype=np.int32))
+        if candidates.chunk_ids is not None:
+            rows = [
+                self.ordinals[chunk_id.int]
+                for chunk_id in candidates.chunk_ids
+                if chunk_id.int in self.ordinals
+            ]
+            chunk_mask = np.zeros(len(self.chunk_ids), dtype=bool)
+            chunk_mask[np.asarray(rows, dtype=np.int64)] = True
+            mask &= chunk_mask
+        return mask
+
+    def scores(
+        self,
+        query_tokens: Iterable[str],
+        candidates: CandidateSet | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Candidate ordinals and their scores for the query's tokens."""
+        columns = sorted({self.columns[token] for token in query_tokens if token in self.columns})
+        if not columns:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64)
+
+        slices = [slice(self.indptr[column], self.indptr[column + 1]) for column in columns]
+        gathered_rows = np.concatenate([self.indices[part] for part in slices])
+        gathered_values = np.concatenate(
+            [
+                self.data[part] * self.idf[column]
+                for part, column in zip(slices, columns, strict=True)
+            ]
+        )
+        if candidates is not None:
+            keep = self.candidate_mask(candidates)[gathered_rows]
+            gathered_rows, gathered_values = gathered_rows[keep], gathered_values[keep]
+        rows, inverse = np.unique(gathered_rows, return_inverse=True)
+        return rows, np.bincount(inverse, weights=gathered_values, minlength=len(rows))
+
+
+class VectorizedBM25FScorer(BM25FScorer):
+    """BM25F with NumPy: one sparse gather per query instead of per-posting Python work.
+
+    Building the ``TermMatrix`` is linear in the postings, so after the index changes
+    it is rebuilt in a worker thread, at most once per ``min_rebuild_seconds``, while
+    queries are answered by the reference scorer; results stay exact and the event
+    loop is never blocked by a build. Without a running loop (scripts, benchmarks) the
+    matrix is built inline. Scores match ``BM25FScorer``; needs the ``numpy`` extra.
+    """
+
+    def __init__(
+        self,
+        parameters: BM25Parameters | None = None,
+        *,
+        min_rebuild_seconds: float = 5.0,
+    ) -> None:
+        if np is None:
+            raise RuntimeError(
+                "Vectorized lexical scoring requires numpy: pip install creatory[numpy]"
+            )
+        super().__init__(parameters)
+        self.min_rebuild_seconds = min_rebuild_seconds
+        self._matrices: weakref.WeakKeyDictionary[InvertedIndex, TermMatrix] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._rebuilds: weakref.WeakKeyDictionary[InvertedIndex, asyncio.Task[None]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._rebuild_started: weakref.WeakKeyDictionary[InvertedIndex, float] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def matrix(self, index: InvertedIndex) -> TermMatrix | None:
+        """Current matrix for ``index``, or ``None`` while it is stale or being rebuilt."""
+        matrix = self._matrices.get(index)
+        if matrix is not None and matrix.version == index.version:
+            return matrix
+        started = self._rebuild_started.get(index)
+        if started is not None and time.monotonic() - started < self.min_rebuild_seconds:
+            return None
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._rebuild_started[index] = time.monotonic()
+            matrix = TermMatrix(index, self.parameters)
+            self._matrices[index] = matrix
+            return matrix
+        if index not in self._rebuilds:
+            self._rebuild_started[index] = time.monotonic()
+            self._rebuilds[index] = asyncio.create_task(self._rebuild(index))
+        return None
+
+    async def rebuilt(self, index: InvertedIndex) -> TermMatrix | None:
+        """Wait for an in-flight rebuild of ``index``; mainly for tests and warm-up."""
+        task = self._rebuilds.get(index)
+        if task is not None:
+            await task
+        return self._matrices.get(index)
+
+    async def _rebuild(self, index: InvertedIndex) -> None:
+        try:
+            # The index keeps taking writes on the loop while the thread reads it. A
+            # write mid-build either breaks the build or moves the version on; both
+            # discard the result and the next query schedules a fresh attempt.
+            matrix = await asyncio.to_thread(TermMatrix, index, self.parameters)
+        except (RuntimeError, KeyError, AttributeError):
+            logger.debug("term matrix build raced with an index write; retrying later")
+            return
+        finally:
+            self._rebuilds.pop(index, None)
+        if matrix.version == index.version:
+            self._matrices[index] = matrix
+
+    def score(
+        self,
+        index: InvertedIndex,
+        query_tokens: Iterable[str],
+        candidates: CandidateSet | None = None,
+    ) -> dict[UUID, float]:
+        if not len(index):
+            return {}
+        matrix = self.matrix(index)
+        if matrix is None:
+            return super().score(index, query_tokens, candidates)
+        rows, scores = matrix.scores(query_tokens, candidates)
+        return {
+            matrix.chunk_ids[ordinal]: float(score)
+            for ordinal, score in zip(rows.tolist(), scores.tolist(), strict=True)
+        }
+
+    def top_k(
+        self,
+        index: InvertedIndex,
+        query_tokens: Iterable[str],
+        limit: int,
+        candidates: CandidateSet | None = None,
+    ) -> list[tuple[UUID, float]]:
+        if not len(index) or limit <= 0:
+            return []
+        matrix = self.matrix(index)
+        if matrix is None:
+            return super().top_k(index, query_tokens, limit, candidates)
+        rows, scores = matrix.scores(query_tokens, candidates)
+        if len(scores) > limit:
+            selected = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            selected = np.arange(len(scores))
+        selected = selected[np.argsort(-scores[selected], kind="stable")]
+        return [
+            (matrix.chunk_ids[rows[position]], float(scores[position]))
+            for position in selected.tolist()
+        ]
+
+
+def build_lexical_scorer(name: str, parameters: BM25Parameters | None = None) -> BM25FScorer:
+    if name == "numpy":
+        return VectorizedBM25FScorer(parameters)
+    return BM25FScorer(parameters)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from creatory_core.db.session import get_session_factory
+
+logger = logging.getLogger("creatory.rag.workspace_cache")
+
+
+@dataclass
+class _Cached:
+    value: Any
+    loaded_at: float
+    tag: object = None
+
+
+@dataclass
+class _Load:
+    """Writes recorded while a load runs, replayed onto its result before it is kept."""
+
+    writes: list[Callable[[Any], None]] = field(default_factory=list)
+
+
+class WorkspaceCache:
+    """Per-workspace values for the ``max_workspaces`` most recently used workspaces.
+
+    A missing value is loaded inline on the caller's session, one load per workspace
+    at a time. A value older than ``refresh_seconds``, or built against another
+    ``tag``, is still returned while a background task reloads it on its own session,
+    so a refresh never stalls the requests of that workspace.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_seconds: float,
+        max_workspaces: int,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.max_workspaces = max(1, max_workspaces)
+        self._session_factory = session_factory
+        self._entries: OrderedDict[UUID, _Cached] = OrderedDict()
+        self._locks: dict[UUID, asyncio.Lock] = {}
+        self._loads: dict[UUID, _Load] = {}
+        self._refreshes: dict[UUID, asyncio.Task[None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        load: Callable[[AsyncSession], Awaitable[Any]],
+        *,
+        tag: object = None,
+    ) -> Any:
+        entry = self._entries.get(workspace_id)
+        if entry is not None:
+            self._entries.move_to_end(workspace_id)
+            if self._is_stale(entry, tag):
+                self._refresh_later(workspace_id, entry, load, tag)
+            return entry.value
+
+        lock = self._locks.setdefault(workspace_id, asyncio.Lock())
+        try:
+            async with lock:
+                entry = self._entries.get(workspace_id)
+                if entry is not None:
+                    return entry.value
+                return await self._load(db, workspace_id, load, tag)
+        finally:
+            if not lock.locked() and self._locks.get(workspace_id) is lock:
+                del self._locks[workspace_id]
+
+    def record(self, workspace_id: UUID, write: Callable[[Any], None]) -> None:
+        """Apply a write to the cached value, and to any value still being loaded."""
+        entry = self._entries.get(workspace_id)
+        if entry is not None:
+            write(entry.value)
+        pending = self._loads.get(workspace_id)
+        if pending is not None:
+            pending.writes.append(write)
+
+    def invalidate(self, workspace_id: UUID) -> None:
+        self._entries.pop(workspace_id, None)
+
+    def _is_stale(self, entry: _Cached, tag: object) -> bool:
+        if tag is not None and entry.tag is not tag:
+            return True
+        return time.monotonic() - entry.loaded_at > self.refresh_seconds
+
+    async def _load(
+        self,
+        db: AsyncSession,
+        workspace_id: UUID,
+        load: Callable[[AsyncSession], Awaitable[Any]],
+        tag: object,
+        replaces: _Cached | None = None,
+    ) -> Any:
+        pending = self._loads[workspace_id] = _Load()
+        try:
+            value = await load(db)
+            for write in pending.writes:
+                write(value)
+        finally:
+            if self._loads.get(workspace_id) is pending:
+                del self._loads[workspace_id]
+        if self._entries.get(workspace_id) is replaces:
+            # A refresh whose entry was invalidated or evicted meanwhile is dropped.
+            self._entries[workspace_id] = _Cached(value, time.monotonic(), tag)
+            self._entries.move_to_end(workspace_id)
+            while len(self._entries) > self.max_workspaces:
+                self._entries.popitem(last=False)
+        return value
+
+    def _refresh_later(
+        self,
+        workspace_id: UUID,
+        entry: _Cached,
+        load: Callable[[AsyncSession], Awaitable[Any]],
+        tag: object,
+    ) -> None:
+        if workspace_id in self._refreshes:
+            return
+        task = asyncio.create_task(self._refresh(workspace_id, entry, load, tag))
+        self._refreshes[workspace_id] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(workspace_id, None))
+
+    async def _refresh(
+        self,
+        workspace_id: UUID,
+        entry: _Cached,
+        load: Callable[[AsyncSession], Awaitable[Any]],
+        tag: object,
+    ) -> None:
+        session_factory = self._session_factory or get_session_factory()
+        try:
+            async with session_factory() as db:
+                await self._load(db, workspace_id, load, tag, replaces=entry)
+        except Exception:
+            # The stale value keeps serving; the next request past the deadline retries.
+            logger.exception("workspace refresh failed", extra={"workspace_id": str(workspace_id)})
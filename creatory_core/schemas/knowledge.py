@@ -1,3 +1,4 @@
+import enum
 from datetime import datetime
 from uuid import UUID
 
@@ -7,12 +8,25 @@ from creatory_core.db.models import SourceType
 from creatory_core.schemas.common import ORMBase
 
 
+class RetrievalMode(str, enum.Enum):
+    LEXICAL = "lexical"
+    DENSE = "dense"
+    HYBRID = "hybrid"
+
+
+class KnowledgeChunkingOptions(BaseModel):
+    max_tokens: int | None = Field(default=None, ge=16, le=4096)
+    overlap_tokens: int | None = Field(default=None, ge=0, le=1024)
+
+
 class KnowledgeSourceCreateRequest(BaseModel):
     workspace_id: UUID
     source_type: SourceType
     uri: str | None = None
     title: str | None = None
     metadata_json: dict = Field(default_factory=dict)
+    content: str | None = Field(default=None, min_length=1)
+    chunking: KnowledgeChunkingOptions = Field(default_factory=KnowledgeChunkingOptions)
 
 
 class KnowledgeSourceRead(ORMBase):
@@ -33,6 +47,27 @@ class KnowledgeChunkCreateRequest(BaseModel):
     metadata_json: dict = Field(default_factory=dict)
 
 
+class KnowledgeChunkBatchCreateRequest(BaseModel):
+    chunks: list[KnowledgeChunkCreateRequest] = Field(min_length=1, max_length=5000)
+
+
+class KnowledgeIngestAccepted(BaseModel):
+    source_id: UUID
+    ingest_status: str
+    chunks_queued: int
+    first_chunk_index: int
+
+
+class KnowledgeStreamIngestResult(BaseModel):
+    source_id: UUID
+    ingest_status: str
+    bytes_read: int
+    chunks_written: int
+    first_chunk_index: int | None = None
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+
+
 class KnowledgeChunkRead(ORMBase):
     id: UUID
     source_id: UUID
@@ -42,10 +77,38 @@ class KnowledgeChunkRead(ORMBase):
     metadata_json: dict
 
 
-class KnowledgeQueryRequest(BaseModel):
+class KnowledgeQueryFilters(BaseModel):
+    source_types: list[SourceType] = Field(default_factory=list)
+    source_ids: list[UUID] = Field(default_factory=list, max_length=500)
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    source_metadata: dict = Field(default_factory=dict)
+    chunk_metadata: dict = Field(default_factory=dict)
+    chunk_metadata_keys: list[str] = Field(default_factory=list)
+
+
+class KnowledgeQueryOptions(BaseModel):
     workspace_id: UUID
-    query: str = Field(min_length=1)
     top_k: int = Field(default=5, ge=1, le=20)
+    mode: RetrievalMode | None = None
+    snippet_chars: int = Field(default=240, ge=40, le=4000)
+    snippet_only: bool = False
+    filters: KnowledgeQueryFilters | None = None
+    provider_slug: str | None = Field(default=None, max_length=120)
+
+
+class KnowledgeQueryRequest(KnowledgeQueryOptions):
+    query: str = Field(min_length=1)
+
+
+class KnowledgeBatchQueryRequest(KnowledgeQueryOptions):
+    # The per-deployment cap (RAG_BATCH_MAX_QUERIES) is checked by the route.
+    queries: list[str] = Field(min_length=1)
+
+
+class KnowledgeHighlight(BaseModel):
+    start: int
+    end: int
 
 
 class KnowledgeCitation(BaseModel):
@@ -54,10 +117,51 @@ class KnowledgeCitation(BaseModel):
     source_id: UUID
     source_title: str | None = None
     score: float
-    content: str
+    content: str | None = None
+    snippet: str
+    snippet_start: int
+    snippet_end: int
+    highlights: list[KnowledgeHighlight] = Field(default_factory=list)
+
+
+class KnowledgePackedPassage(BaseModel):
+    index: int
+    source_id: UUID
+    source_title: str | None = None
+    chunk_ids: list[UUID]
+    score: float
+    token_count: int
+
+
+class KnowledgePackedContext(BaseModel):
+    provider_slug: str
+    token_budget: int
+    tokens_used: int
+    text: str
+    passages: list[KnowledgePackedPassage]
+    dropped_chunk_ids: list[UUID] = Field(default_factory=list)
 
 
 class KnowledgeQueryResponse(BaseModel):
     query: str
     answer_preview: str
     citations: list[KnowledgeCitation]
+    context: KnowledgePackedContext | None = None
+    timings_ms: dict[str, float] = Field(default_factory=dict)
+    cached: bool = False
+
+
+class KnowledgeBatchQueryResponse(BaseModel):
+    results: list[KnowledgeQueryResponse]
+
+
+class KnowledgeCacheStats(BaseModel):
+    enabled: bool
+    backend: str | None = None
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    semantic_enabled: bool = False
+    semantic_hits: int = 0
+    semantic_misses: int = 0
+    semantic_entries: int = 0
@@ -11,6 +11,7 @@ class ChatRunRequest(BaseModel):
     prompt: str = Field(min_length=1)
     assistant_agent_slug: str | None = Field(default=None, max_length=120)
     metadata_json: dict = Field(default_factory=dict)
+    knowledge_top_k: int = Field(default=0, ge=0, le=20)
 
 
 class ChatRunResponse(BaseModel):
@@ -20,6 +21,12 @@ class ChatRunResponse(BaseModel):
     tasks: list[TaskRead]
 
 
+class QueuedChatRunResponse(BaseModel):
+    job_id: str
+    user_message: MessageRead
+    agent_run: AgentRunRead
+
+
 class RunProgressEvent(BaseModel):
     run_id: UUID
     status: str
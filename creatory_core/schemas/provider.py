@@ -11,6 +11,7 @@ class ProviderRead(BaseModel):
     default_model: str | None = None
     default_endpoint: str | None = None
     supports_streaming: bool = False
+    context_window_tokens: int | None = None
     metadata: dict = Field(default_factory=dict)
 
 
@@ -104,3 +104,8 @@ class WorkflowRunStepRead(ORMBase):
 
 class WorkflowRunDetail(WorkflowRunRead):
     steps: list[WorkflowRunStepRead] = Field(default_factory=list)
+
+
+class QueuedWorkflowRunResponse(BaseModel):
+    job_id: str
+    workflow_run: WorkflowRunRead
@@ -5,10 +5,18 @@ from pydantic import BaseModel, Field
 
 from creatory_core.schemas.common import ORMBase
 
+SEARCH_CONFIG_PATTERN = r"^[a-z][a-z0-9_]*$"
+
 
 class WorkspaceCreateRequest(BaseModel):
     name: str = Field(min_length=1, max_length=120)
     slug: str | None = Field(default=None, max_length=120)
+    search_config: str | None = Field(default=None, max_length=63, pattern=SEARCH_CONFIG_PATTERN)
+
+
+class WorkspaceUpdateRequest(BaseModel):
+    name: str | None = Field(default=None, min_length=1, max_length=120)
+    search_config: str | None = Field(default=None, max_length=63, pattern=SEARCH_CONFIG_PATTERN)
 
 
 class WorkspaceRead(ORMBase):
@@ -16,6 +24,7 @@ class WorkspaceRead(ORMBase):
     name: str
     slug: str
     owner_id: UUID
+    search_config: str
     created_at: datetime
 
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import logging
+import re
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.core.config import settings
@@ -20,13 +25,19 @@ from creatory_core.db.models import (
     User,
 )
 from creatory_core.providers.router import route_for_task
+from creatory_core.rag.packing import PackedContext
 from creatory_core.schemas.orchestrator import ChatRunRequest
 from creatory_core.services.circuit_breaker import (
     CircuitBreakerConfig,
     assert_step_budget,
 )
+from creatory_core.services.run_events import RunEvent, RunEventBus, emit, get_run_event_bus
 from creatory_core.services.workspace_bootstrap import DIRECTOR_AGENT_SLUG
 
+logger = logging.getLogger("creatory.director")
+
+_PIECE_PATTERN = re.compile(r"\S+\s*|\s+")
+
 
 @dataclass
 class DirectorTurnResult:
@@ -103,145 +114,350 @@ def _assistant_text(prompt: str, thread_kind: ThreadKind, plan: list[str]) -> st
     return "\n".join(lines)
 
 
-async def run_director_turn(
-    db: AsyncSession,
-    current_user: User,
-    conversation: Conversation,
-    thread: Thread,
-    payload: ChatRunRequest,
-) -> DirectorTurnResult:
-    user_message = Message(
-        thread_id=thread.id,
-        role=MessageRole.USER,
-        content_json={
-            "text": payload.prompt,
-            "metadata": payload.metadata_json,
-        },
-        created_by=current_user.id,
-    )
-    db.add(user_message)
-    await db.flush()
-
-    agent = await _resolve_agent(db, conversation.workspace_id, payload.assistant_agent_slug)
-    if agent is None:
-        agent = Agent(
-            workspace_id=conversation.workspace_id,
-            slug=DIRECTOR_AGENT_SLUG,
-            display_name="Main Director Agent",
-            persona_prompt=(
-                "Coordinate creator workflows end-to-end. Plan tasks, orchestrate tools, and "
-                "keep human-in-the-loop checkpoints."
-            ),
-            config_json={"mode": "director"},
-            is_system=True,
-        )
-        db.add(agent)
-        await db.flush()
+def _stream_pieces(text: str) -> list[str]:
+    """Split text into word-sized deltas that concatenate back to the original."""
+    return _PIECE_PATTERN.findall(text)
 
-    run_started = datetime.now(UTC)
-    run = AgentRun(
-        conversation_id=conversation.id,
-        thread_id=thread.id,
-        agent_id=agent.id,
-        status=RunStatus.RUNNING,
-        input_json={
-            "prompt": payload.prompt,
-            "thread_kind": thread.kind.value,
-            "metadata": payload.metadata_json,
-        },
-        output_json={},
-        started_at=run_started,
-    )
-    db.add(run)
-    await db.flush()
 
-    plan = _build_plan(payload.prompt, thread.kind)
-    assert_step_budget(
-        requested_steps=len(plan),
-        config=CircuitBreakerConfig(max_steps=settings.circuit_breaker_max_steps),
-    )
-    routing = route_for_task(payload.prompt, prefer_local=False)
-
-    planning_task = Task(
-        agent_run_id=run.id,
-        task_type="planning",
-        status=RunStatus.SUCCEEDED,
-        input_json={"prompt": payload.prompt},
-        output_json={
-            "plan": plan,
-            "provider_routing": {
-                "draft_provider": routing.draft_provider,
-                "refine_provider": routing.refine_provider,
-                "reason": routing.reason,
+def _event_time() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def knowledge_json(knowledge: PackedContext | None) -> dict | None:
+    """The part of a packed context a turn records and hands to the draft task."""
+    if knowledge is None:
+        return None
+    return {
+        "context": knowledge.render(),
+        "token_budget": knowledge.token_budget,
+        "tokens_used": knowledge.tokens_used,
+        "chunk_ids": [str(chunk_id) for item in knowledge.passages for chunk_id in item.chunk_ids],
+    }
+
+
+class DirectorTurn:
+    """One Director turn, produced as a sequence of events.
+
+    ``start`` records the user message and the run; ``events`` then plans and drafts.
+    The tasks are committed before the first event so other readers see a running
+    turn; the finished assistant text is sent as ``text`` events, one word-sized
+    piece each (these are not provider tokens), and written once, together with the
+    final run status, at the end. A turn that stops early (an error or the client
+    going away) is recorded as failed instead of being left running. Every event is
+    also published on the run event bus, so ``/orchestration/runs/{id}/stream``
+    viewers follow the same turn.
+
+    A turn started as ``queued`` is executed later by the worker through ``resume``.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        conversation: Conversation,
+        thread: Thread,
+        payload: ChatRunRequest,
+        knowledge: dict | None = None,
+        event_bus: RunEventBus | None = None,
+    ) -> None:
+        self.db = db
+        self.conversation = conversation
+        self.thread = thread
+        self.payload = payload
+        self.knowledge = knowledge
+        self.event_bus = event_bus or get_run_event_bus()
+        self.user_message: Message | None = None
+        self.agent: Agent | None = None
+        self.run: AgentRun | None = None
+        self.result: DirectorTurnResult | None = None
+
+    async def start(
+        self,
+        current_user: User,
+        *,
+        status: RunStatus = RunStatus.RUNNING,
+    ) -> AgentRun:
+        """Add the user message and the run to the session; the caller commits."""
+        plan = _build_plan(self.payload.prompt, self.thread.kind)
+        assert_step_budget(
+            requested_steps=len(plan),
+            config=CircuitBreakerConfig(max_steps=settings.circuit_breaker_max_steps),
+        )
+        self.user_message = Message(
+            thread_id=self.thread.id,
+            role=MessageRole.USER,
+            content_json={
+                "text": self.payload.prompt,
+                "metadata": self.payload.metadata_json,
             },
-        },
-        started_at=run_started,
-        ended_at=datetime.now(UTC),
-    )
-    db.add(planning_task)
-    await db.flush()
-
-    content_task = Task(
-        agent_run_id=run.id,
-        parent_task_id=planning_task.id,
-        task_type="draft_content",
-        status=RunStatus.SUCCEEDED,
-        input_json={"plan": plan},
-        output_json={
-            "draft_kind": "quick_reply" if thread.kind == ThreadKind.QUICK else "structured_outline",
+            created_by=current_user.id,
+        )
+        self.db.add(self.user_message)
+        await self.db.flush()
+
+        self.agent = await self._agent()
+        input_json: dict = {
+            "prompt": self.payload.prompt,
+            "thread_kind": self.thread.kind.value,
+            "metadata": self.payload.metadata_json,
+            "user_message_id": str(self.user_message.id),
+        }
+        if self.knowledge is not None:
+            input_json["knowledge"] = self.knowledge
+        self.run = AgentRun(
+            conversation_id=self.conversation.id,
+            thread_id=self.thread.id,
+            agent_id=self.agent.id,
+            status=status,
+            input_json=input_json,
+            output_json={},
+            started_at=datetime.now(UTC) if status == RunStatus.RUNNING else None,
+        )
+        self.db.add(self.run)
+        await self.db.flush()
+        return self.run
+
+    @classmethod
+    async def resume(
+        cls,
+        db: AsyncSession,
+        run_id: UUID,
+        event_bus: RunEventBus | None = None,
+    ) -> DirectorTurn | None:
+        """Reload a queued (or previously interrupted) turn; ``None`` if nothing is left to do.
+
+        Tasks left behind by an earlier attempt are dropped and the turn restarts from
+        its plan, so a retried job never duplicates work.
+        """
+        run = await db.get(AgentRun, run_id)
+        if run is None or run.status in {RunStatus.SUCCEEDED, RunStatus.CANCELLED}:
+            return None
+        conversation = await db.get(Conversation, run.conversation_id)
+        thread = await db.get(Thread, run.thread_id)
+        agent = await db.get(Agent, run.agent_id)
+        user_message = await db.get(Message, UUID(run.input_json["user_message_id"]))
+        if conversation is None or thread is None or agent is None or user_message is None:
+            return None
+
+        await db.execute(delete(Task).where(Task.agent_run_id == run.id))
+        run.status = RunStatus.RUNNING
+        run.error_json = None
+        run.started_at = datetime.now(UTC)
+        run.ended_at = None
+
+        payload = ChatRunRequest(
+            prompt=run.input_json["prompt"],
+            metadata_json=run.input_json.get("metadata") or {},
+        )
+        turn = cls(db, conversation, thread, payload, run.input_json.get("knowledge"), event_bus)
+        turn.user_message, turn.agent, turn.run = user_message, agent, run
+        return turn
+
+    async def events(self) -> AsyncIterator[RunEvent]:
+        run, agent, user_message = self.run, self.agent, self.user_message
+        if run is None or agent is None or user_message is None:
+            raise RuntimeError("start() or resume() the turn before reading its events")
+        db, payload, thread = self.db, self.payload, self.thread
+        plan = _build_plan(payload.prompt, thread.kind)
+        routing = route_for_task(payload.prompt, prefer_local=False)
+        provider_routing = {
             "draft_provider": routing.draft_provider,
             "refine_provider": routing.refine_provider,
-        },
-        started_at=datetime.now(UTC),
-        ended_at=datetime.now(UTC),
-    )
-    db.add(content_task)
-
-    assistant_message = Message(
-        thread_id=thread.id,
-        role=MessageRole.ASSISTANT,
-        content_json={
-            "text": _assistant_text(payload.prompt, thread.kind, plan),
-            "plan": plan,
-            "agent": {
-                "id": str(agent.id),
-                "slug": agent.slug,
-                "display_name": agent.display_name,
-            },
-            "provider_routing": {
+            "reason": routing.reason,
+        }
+
+        run_started = run.started_at or datetime.now(UTC)
+        run.status = RunStatus.RUNNING
+        run.started_at = run_started
+        planning_task = Task(
+            agent_run_id=run.id,
+            task_type="planning",
+            status=RunStatus.SUCCEEDED,
+            input_json={"prompt": payload.prompt},
+            output_json={"plan": plan, "provider_routing": provider_routing},
+            started_at=run_started,
+            ended_at=datetime.now(UTC),
+        )
+        db.add(planning_task)
+        await db.flush()
+
+        content_input: dict = {"plan": plan}
+        if self.knowledge is not None:
+            content_input["knowledge"] = self.knowledge
+        content_task = Task(
+            agent_run_id=run.id,
+            parent_task_id=planning_task.id,
+            task_type="draft_content",
+            status=RunStatus.RUNNING,
+            input_json=content_input,
+            output_json={},
+            started_at=datetime.now(UTC),
+        )
+        db.add(content_task)
+        # Server defaults (ids, created_at) come back from the INSERTs, so nothing
+        # needs refreshing after the commits below.
+        await db.commit()
+
+        try:
+            yield await self._emit(
+                run,
+                "run",
+                {
+                    "run_id": str(run.id),
+                    "status": run.status.value,
+                    "stage": "start",
+                    "user_message_id": str(user_message.id),
+                    "at": _event_time(),
+                },
+            )
+            for task in (planning_task, content_task):
+                yield await self._emit(run, "task", _task_payload(task), task_id=task.id)
+
+            text = _assistant_text(payload.prompt, thread.kind, plan)
+            for index, piece in enumerate(_stream_pieces(text)):
+                yield await self._emit(
+                    run,
+                    "text",
+                    {"run_id": str(run.id), "index": index, "delta": piece},
+                    task_id=content_task.id,
+                )
+
+            assistant_message = Message(
+                thread_id=thread.id,
+                role=MessageRole.ASSISTANT,
+                content_json={
+                    "text": text,
+                    "plan": plan,
+                    "agent": {
+                        "id": str(agent.id),
+                        "slug": agent.slug,
+                        "display_name": agent.display_name,
+                    },
+                    "provider_routing": provider_routing,
+                },
+                created_by=None,
+            )
+            db.add(assistant_message)
+            await db.flush()
+
+            ended_at = datetime.now(UTC)
+            content_task.status = RunStatus.SUCCEEDED
+            content_task.output_json = {
+                "draft_kind": (
+                    "quick_reply" if thread.kind == ThreadKind.QUICK else "structured_outline"
+                ),
                 "draft_provider": routing.draft_provider,
                 "refine_provider": routing.refine_provider,
-                "reason": routing.reason,
+            }
+            content_task.ended_at = ended_at
+            run.status = RunStatus.SUCCEEDED
+            run.output_json = {
+                "assistant_message_id": str(assistant_message.id),
+                "plan": plan,
+                "provider_routing": provider_routing,
+                "tasks": ["planning", "draft_content"],
+            }
+            run.ended_at = ended_at
+            await db.commit()
+        except BaseException:
+            await self._fail(run, content_task)
+            raise
+
+        self.result = DirectorTurnResult(
+            user_message=user_message,
+            assistant_message=assistant_message,
+            agent_run=run,
+            tasks=[planning_task, content_task],
+        )
+        yield await self._emit(
+            run,
+            "message",
+            {
+                "run_id": str(run.id),
+                "message_id": str(assistant_message.id),
+                "role": assistant_message.role.value,
+                "at": _event_time(),
             },
-        },
-        created_by=None,
-    )
-    db.add(assistant_message)
-    await db.flush()
-
-    run.status = RunStatus.SUCCEEDED
-    run.output_json = {
-        "assistant_message_id": str(assistant_message.id),
-        "plan": plan,
-        "provider_routing": {
-            "draft_provider": routing.draft_provider,
-            "refine_provider": routing.refine_provider,
-            "reason": routing.reason,
-        },
-        "tasks": ["planning", "draft_content"],
+        )
+        yield await self._emit(
+            run, "task", _task_payload(content_task), task_id=content_task.id
+        )
+        yield await self._emit(run, "run", _final_payload(run.id, run.status))
+
+    async def _emit(
+        self,
+        run: AgentRun,
+        event_type: str,
+        payload: dict[str, Any],
+        *,
+        task_id: UUID | None = None,
+    ) -> RunEvent:
+        return await emit(self.event_bus, run.id, event_type, payload, task_id=task_id)
+
+    async def _agent(self) -> Agent:
+        workspace_id = self.conversation.workspace_id
+        agent = await _resolve_agent(self.db, workspace_id, self.payload.assistant_agent_slug)
+        if agent is None:
+            agent = Agent(
+                workspace_id=workspace_id,
+                slug=DIRECTOR_AGENT_SLUG,
+                display_name="Main Director Agent",
+                persona_prompt=(
+                    "Coordinate creator workflows end-to-end. Plan tasks, orchestrate tools, "
+                    "and keep human-in-the-loop checkpoints."
+                ),
+                config_json={"mode": "director"},
+                is_system=True,
+            )
+            self.db.add(agent)
+            await self.db.flush()
+        return agent
+
+    async def _fail(self, run: AgentRun, content_task: Task) -> None:
+        run_id = run.id
+        try:
+            await self.db.rollback()
+            ended_at = datetime.now(UTC)
+            error = {"reason": "turn interrupted before completion"}
+            run.status = RunStatus.FAILED
+            run.error_json = error
+            run.ended_at = ended_at
+            content_task.status = RunStatus.FAILED
+            content_task.error_json = error
+            content_task.ended_at = ended_at
+            await self.db.commit()
+        except Exception:
+            logger.exception(
+                "failed to record interrupted director turn", extra={"run_id": str(run_id)}
+            )
+        await emit(self.event_bus, run_id, "run", _final_payload(run_id, RunStatus.FAILED))
+
+
+def _final_payload(run_id: UUID, status: RunStatus) -> dict[str, Any]:
+    return {"run_id": str(run_id), "status": status.value, "stage": "final", "at": _event_time()}
+
+
+def _task_payload(task: Task) -> dict[str, Any]:
+    return {
+        "run_id": str(task.agent_run_id),
+        "task_id": str(task.id),
+        "task_type": task.task_type,
+        "status": task.status.value,
+        "at": _event_time(),
     }
-    run.ended_at = datetime.now(UTC)
-
-    await db.commit()
-    await db.refresh(user_message)
-    await db.refresh(assistant_message)
-    await db.refresh(run)
-    await db.refresh(planning_task)
-    await db.refresh(content_task)
-
-    return DirectorTurnResult(
-        user_message=user_message,
-        assistant_message=assistant_message,
-        agent_run=run,
-        tasks=[planning_task, content_task],
-    )
+
+
+async def run_director_turn(
+    db: AsyncSession,
+    current_user: User,
+    conversation: Conversation,
+    thread: Thread,
+    payload: ChatRunRequest,
+    knowledge: PackedContext | None = None,
+    event_bus: RunEventBus | None = None,
+) -> DirectorTurnResult:
+    turn = DirectorTurn(db, conversation, thread, payload, knowledge_json(knowledge), event_bus)
+    await turn.start(current_user)
+    async for _ in turn.events():
+        pass
+    assert turn.result is not None
+    return turn.result
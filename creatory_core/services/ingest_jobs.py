@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from creatory_core.core.config import settings
+from creatory_core.db.models import IngestStatus, KnowledgeIngestBatch, KnowledgeSource
+from creatory_core.rag.cache import build_query_cache
+from creatory_core.rag.embeddings import build_embedder
+from creatory_core.rag.ingest import ChunkIngestPipeline, ChunkInput
+from creatory_core.services.job_queue import Job, JobKind, JobQueueUnavailable, get_job_queue
+
+
+def build_ingest_pipeline() -> ChunkIngestPipeline:
+    """Pipeline for worker processes; new chunks reach API indexes on their next refresh."""
+    return ChunkIngestPipeline(
+        build_embedder(settings.rag_embedding_provider, model_name=settings.rag_embedding_model),
+        batch_size=settings.rag_embedding_batch_size,
+        result_cache=build_query_cache(
+            settings.rag_query_cache_backend,
+            redis_url=settings.redis_url,
+            ttl_seconds=settings.rag_query_cache_ttl_seconds,
+            max_entries=settings.rag_query_cache_max_entries,
+        ),
+    )
+
+
+def stage_ingest(
+    db: AsyncSession,
+    source: KnowledgeSource,
+    chunks: Sequence[ChunkInput],
+    *,
+    start_index: int,
+) -> KnowledgeIngestBatch:
+    """Add the chunks of one queued ingest to the session; the caller commits.
+
+    The chunk text stays in Postgres and the job carries only the batch id, so queue
+    payloads stay small and the ingest survives an API restart.
+    """
+    batch = KnowledgeIngestBatch(
+        id=uuid4(),
+        source_id=source.id,
+        start_index=start_index,
+        chunks_json=[asdict(chunk) for chunk in chunks],
+    )
+    db.add(batch)
+    return batch
+
+
+async def enqueue_ingest(batch: KnowledgeIngestBatch, *, workspace_id: UUID) -> Job:
+    """Hand a committed staged batch to the worker.
+
+    Raises ``JobQueueUnavailable`` if the queue cannot take the job; the caller then
+    owns the batch and should ``fail_unqueued_ingest`` it.
+    """
+    payload = {"source_id": str(batch.source_id), "batch_id": str(batch.id)}
+    try:
+        return await get_job_queue().enqueue(
+            JobKind.KNOWLEDGE_INGEST.value, payload, workspace_id=str(workspace_id)
+        )
+    except Exception as exc:
+        raise JobQueueUnavailable("Job queue unavailable; the chunks were not ingested") from exc
+
+
+async def fail_unqueued_ingest(
+    db: AsyncSession,
+    source: KnowledgeSource,
+    batch: KnowledgeIngestBatch,
+) -> None:
+    """Mark a source failed whose chunks never reached the queue, and drop the batch."""
+    source.ingest_status = IngestStatus.FAILED.value
+    await db.delete(batch)
+    await db.commit()
+
+
+class KnowledgeIngestHandler:
+    """Embeds and writes chunks staged by ``POST /knowledge/sources`` and ``chunks:batch``."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        pipeline: ChunkIngestPipeline | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.pipeline = pipeline or build_ingest_pipeline()
+
+    async def handle(self, job: Job) -> None:
+        batch_id = UUID(job.payload["batch_id"])
+        async with self.session_factory() as db:
+            batch = await db.get(KnowledgeIngestBatch, batch_id)
+            if batch is None:
+                # Finished by an earlier delivery, or the source was deleted meanwhile.
+                return
+            source_id, start_index = batch.source_id, batch.start_index
+            chunks = [ChunkInput(**chunk) for chunk in batch.chunks_json]
+        # Errors propagate, so the queue retries with backoff; the source is only
+        # marked failed once the job is dead-lettered.
+        await self.pipeline.run(self.session_factory, source_id, chunks, start_index=start_index)
+        await self._drop_batch(batch_id)
+
+    async def on_dead_letter(self, job: Job, error: str) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(KnowledgeSource)
+                .where(
+                    KnowledgeSource.id == UUID(job.payload["source_id"]),
+                    KnowledgeSource.ingest_status != IngestStatus.READY.value,
+                )
+                .values(ingest_status=IngestStatus.FAILED.value)
+            )
+            await db.commit()
+        await self._drop_batch(UUID(job.payload["batch_id"]))
+
+    async def _drop_batch(self, batch_id: UUID) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(KnowledgeIngestBatch).where(KnowledgeIngestBatch.id == batch_id)
+            )
+            await db.commit()
@@ -0,0 +1,865 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+import uuid
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from creatory_core.core.config import settings
+from creatory_core.db.models import AgentRun, RunStatus, WorkflowRun
+from creatory_core.services.job_scheduling import FairShareScheduler, JobMetrics
+
+logger = logging.getLogger("creatory.job_queue")
+
+_KEY_PREFIX = "creatory:jobs"
+LEASE_EXPIRED_ERROR = "lease expired before the job finished"
+
+
+class JobQueueUnavailable(RuntimeError):
+    pass
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot help; it is dead-lettered at once."""
+
+
+class JobKind(str, enum.Enum):
+    DIRECTOR_TURN = "director_turn"
+    WORKFLOW_RUN = "workflow_run"
+    KNOWLEDGE_INGEST = "knowledge_ingest"
+
+
+SHARED_PARTITION = "shared"
+
+
+def partition_of(workspace_id: str | None) -> str:
+    """Jobs are queued per workspace; jobs without one share a partition."""
+    return workspace_id or SHARED_PARTITION
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    kind: str
+    payload: dict[str, Any]
+    workspace_id: str | None = None
+    attempts: int = 0
+    enqueued_at: float = 0.0
+    available_at: float = 0.0
+    last_error: str | None = None
+
+    @property
+    def partition(self) -> str:
+        return partition_of(self.workspace_id)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> Job:
+        data = json.loads(raw)
+        data.pop("lease", None)
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A job handed to one consumer until ``deadline``; the ``token`` proves ownership."""
+
+    job: Job
+    token: str
+    deadline: float
+
+
+@dataclass(frozen=True)
+class QueueDepth:
+    ready: int
+    delayed: int
+    in_flight: int
+    dead: int
+
+
+@dataclass(frozen=True)
+class WorkspaceDepth:
+    ready: int
+    delayed: int
+    in_flight: int
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base_seconds: float,
+    max_seconds: float,
+    jitter: Callable[[], float] = random.random,
+) -> float:
+    """Exponential backoff with equal jitter: half the step is fixed, half is random."""
+    step = min(max_seconds, base_seconds * 2 ** max(attempt - 1, 0))
+    return step / 2 + jitter() * step / 2
+
+
+class JobQueue(Protocol):
+    name: str
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        *,
+        workspace_id: str | None = None,
+        delay_seconds: float = 0.0,
+    ) -> Job: ...
+
+    async def due_partitions(self) -> list[str]: ...
+
+    async def lease(
+        self,
+        partition: str,
+        *,
+        limit: int,
+        visibility_timeout: float,
+        max_in_flight: int = 0,
+    ) -> list[Lease]: ...
+
+    async def extend(self, lease: Lease, *, visibility_timeout: float) -> Lease | None: ...
+
+    async def ack(self, lease: Lease) -> bool: ...
+
+    async def retry(self, lease: Lease, *, delay_seconds: float, error: str) -> bool: ...
+
+    async def dead_letter(self, lease: Lease, *, error: str) -> bool: ...
+
+    async def depth(self) -> QueueDepth: ...
+
+    async def partition_depths(self) -> dict[str, WorkspaceDepth]: ...
+
+
+class InMemoryJobQueue:
+    """Process-local queue with the same lease semantics as Redis, for tests and dev.
+
+    Only consumers in the same process see its jobs, so the API runs a consumer
+    itself when this backend is configured.
+    """
+
+    name = "memory"
+
+    def __init__(self, *, clock: Callable[[], float] = time.time, max_dead: int = 1000) -> None:
+        self._clock = clock
+        self._jobs: dict[str, Job] = {}
+        self._ready: dict[str, list[tuple[float, int, str]]] = {}
+        self._ready_at: dict[str, float] = {}
+        self._in_flight: dict[str, tuple[float, str]] = {}
+        self._running: Counter[str] = Counter()
+        self._dead: deque[Job] = deque(maxlen=max_dead)
+        self._order = itertools.count()
+
+    def _schedule(self, job: Job, available_at: float) -> None:
+        self._jobs[job.id] = replace(job, available_at=available_at)
+        self._ready_at[job.id] = available_at
+        heap = self._ready.setdefault(job.partition, [])
+        heapq.heappush(heap, (available_at, next(self._order), job.id))
+
+    def _head(self, partition: str) -> float | None:
+        """When the partition's next job is due, dropping superseded heap entries."""
+        heap = self._ready.get(partition)
+        while heap and self._ready_at.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            self._ready.pop(partition, None)
+            return None
+        return heap[0][0]
+
+    def _release(self, job: Job) -> None:
+        del self._in_flight[job.id]
+        self._running[job.partition] -= 1
+        if self._running[job.partition] <= 0:
+            del self._running[job.partition]
+
+    def _recover_expired(self, now: float) -> None:
+        for job_id, (deadline, _) in list(self._in_flight.items()):
+            if deadline <= now:
+                job = self._jobs[job_id]
+                self._release(job)
+                self._schedule(replace(job, last_error=LEASE_EXPIRED_ERROR), now)
+
+    def _owns(self, lease: Lease) -> bool:
+        held = self._in_flight.get(lease.job.id)
+        return held is not None and held[1] == lease.token
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        *,
+        workspace_id: str | None = None,
+        delay_seconds: float = 0.0,
+    ) -> Job:
+        now = self._clock()
+        job = Job(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            payload=payload,
+            workspace_id=workspace_id,
+            enqueued_at=now,
+            available_at=now + delay_seconds,
+        )
+        self._schedule(job, job.available_at)
+        return job
+
+    async def due_partitions(self) -> list[str]:
+        now = self._clock()
+        self._recover_expired(now)
+        due: list[str] = []
+        for partition in list(self._ready):
+            head = self._head(partition)
+            if head is not None and head <= now:
+                due.append(partition)
+        return due
+
+    async def lease(
+        self,
+        partition: str,
+        *,
+        limit: int,
+        visibility_timeout: float,
+        max_in_flight: int = 0,
+    ) -> list[Lease]:
+        now = self._clock()
+        self._recover_expired(now)
+        if max_in_flight > 0:
+            limit = min(limit, max_in_flight - self._running[partition])
+        leases: list[Lease] = []
+        while len(leases) < limit and (head := self._head(partition)) is not None and head <= now:
+            _, _, job_id = heapq.heappop(self._ready[partition])
+            del self._ready_at[job_id]
+            job = replace(self._jobs[job_id], attempts=self._jobs[job_id].attempts + 1)
+            self._jobs[job_id] = job
+            token = uuid.uuid4().hex
+            deadline = now + visibility_timeout
+            self._in_flight[job_id] = (deadline, token)
+            self._running[partition] += 1
+            leases.append(Lease(job=job, token=token, deadline=deadline))
+        return leases
+
+    async def extend(self, lease: Lease, *, visibility_timeout: float) -> Lease | None:
+        if not self._owns(lease):
+            return None
+        deadline = self._clock() + visibility_timeout
+        self._in_flight[lease.job.id] = (deadline, lease.token)
+        return replace(lease, deadline=deadline)
+
+    async def ack(self, lease: Lease) -> bool:
+        if not self._owns(lease):
+            return False
+        self._release(lease.job)
+        del self._jobs[lease.job.id]
+        return True
+
+    async def retry(self, lease: Lease, *, delay_seconds: float, error: str) -> bool:
+        if not self._owns(lease):
+            return False
+        self._release(lease.job)
+        self._schedule(replace(lease.job, last_error=error), self._clock() + delay_seconds)
+        return True
+
+    async def dead_letter(self, lease: Lease, *, error: str) -> bool:
+        if not self._owns(lease):
+            return False
+        self._release(lease.job)
+        del self._jobs[lease.job.id]
+        self._dead.appendleft(replace(lease.job, last_error=error))
+        return True
+
+    async def depth(self) -> QueueDepth:
+        depths = (await self.partition_depths()).values()
+        return QueueDepth(
+            ready=sum(depth.ready for depth in depths),
+            delayed=sum(depth.delayed for depth in depths),
+            in_flight=len(self._in_flight),
+            dead=len(self._dead),
+        )
+
+    async def partition_depths(self) -> dict[str, WorkspaceDepth]:
+        now = self._clock()
+        ready: Counter[str] = Counter()
+        delayed: Counter[str] = Counter()
+        for job_id, available_at in self._ready_at.items():
+            partition = self._jobs[job_id].partition
+            if available_at <= now:
+                ready[partition] += 1
+            else:
+                delayed[partition] += 1
+        return {
+            partition: WorkspaceDepth(
+                ready=ready[partition],
+                delayed=delayed[partition],
+                in_flight=self._running[partition],
+            )
+            for partition in ready.keys() | delayed.keys() | self._running.keys()
+        }
+
+
+# Lua helpers shared by the scripts below. A job's partition is derived from its
+# workspace; each partition has its own ready sorted set scored by due time, and the
+# partition index holds every partition with queued jobs scored by its earliest one.
+_PARTITION_FUNCTIONS = (
+    f"local lease_expired_error = '{LEASE_EXPIRED_ERROR}'"
+    + """
+local function partition_of(job)
+  local workspace = job['workspace_id']
+  if type(workspace) ~= 'string' or workspace == '' then return 'shared' end
+  return workspace
+end
+local function reindex(prefix, index, partition)
+  local head = redis.call('ZRANGE', prefix .. partition, 0, 0, 'WITHSCORES')
+  if head[2] then
+    redis.call('ZADD', index, head[2], partition)
+  else
+    redis.call('ZREM', index, partition)
+  end
+end
+local function schedule(prefix, index, data, id, job, available_at)
+  local partition = partition_of(job)
+  job['lease'] = nil
+  job['available_at'] = tonumber(available_at)
+  redis.call('HSET', data, id, cjson.encode(job))
+  redis.call('ZADD', prefix .. partition, available_at, id)
+  redis.call('ZADD', index, 'LT', available_at, partition)
+end
+local function recover_expired(keys, now, prefix)
+  local expired = redis.call('ZRANGEBYSCORE', keys[1], '-inf', now)
+  for _, id in ipairs(expired) do
+    redis.call('ZREM', keys[1], id)
+    local raw = redis.call('HGET', keys[2], id)
+    if raw then
+      local job = cjson.decode(raw)
+      redis.call('HINCRBY', keys[3], partition_of(job), -1)
+      job['last_error'] = lease_expired_error
+      schedule(prefix, keys[4], keys[2], id, job, now)
+    end
+  end
+end
+"""
+)
+
+# KEYS: in_flight, data, running, index. ARGV: now, ready key prefix.
+_DUE_SCRIPT = (
+    _PARTITION_FUNCTIONS
+    + """
+recover_expired(KEYS, ARGV[1], ARGV[2])
+return redis.call('ZRANGEBYSCORE', KEYS[4], '-inf', ARGV[1])
+"""
+)
+
+# Expired leases are requeued first; then up to ``limit`` due jobs of one partition
+# (fewer if it already has ``max_in_flight`` running) move to the in-flight set with
+# their attempt counter bumped and a fresh lease token. Runs atomically in Redis.
+# KEYS: in_flight, data, running, index.
+# ARGV: now, limit, deadline, token, partition, max_in_flight, ready key prefix.
+_LEASE_SCRIPT = (
+    _PARTITION_FUNCTIONS
+    + """
+recover_expired(KEYS, ARGV[1], ARGV[7])
+local partition = ARGV[5]
+local ready = ARGV[7] .. partition
+local limit = tonumber(ARGV[2])
+local cap = tonumber(ARGV[6])
+if cap > 0 then
+  limit = math.min(limit, cap - tonumber(redis.call('HGET', KEYS[3], partition) or '0'))
+end
+local leased = {}
+if limit > 0 then
+  local ids = redis.call('ZRANGEBYSCORE', ready, '-inf', ARGV[1], 'LIMIT', 0, limit)
+  for i, id in ipairs(ids) do
+    redis.call('ZREM', ready, id)
+    local raw = redis.call('HGET', KEYS[2], id)
+    if raw then
+      local job = cjson.decode(raw)
+      job['attempts'] = (job['attempts'] or 0) + 1
+      job['lease'] = ARGV[4] .. ':' .. i
+      raw = cjson.encode(job)
+      redis.call('HSET', KEYS[2], id, raw)
+      redis.call('ZADD', KEYS[1], ARGV[3], id)
+      redis.call('HINCRBY', KEYS[3], partition, 1)
+      table.insert(leased, raw)
+    end
+  end
+end
+reindex(ARGV[7], KEYS[4], partition)
+return leased
+"""
+)
+
+# Every lease-holder operation first checks the token, so a consumer whose lease
+# expired (and was handed to another consumer) can no longer ack or requeue the job.
+# KEYS: in_flight, data, running, index, dead. ARGV: id, token, ...
+_OWNED_PREAMBLE = (
+    _PARTITION_FUNCTIONS
+    + """
+local raw = redis.call('HGET', KEYS[2], ARGV[1])
+if not raw then return 0 end
+local job = cjson.decode(raw)
+if job['lease'] ~= ARGV[2] or not redis.call('ZSCORE', KEYS[1], ARGV[1]) then return 0 end
+"""
+)
+
+_EXTEND_SCRIPT = (
+    _OWNED_PREAMBLE
+    + """
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+)
+
+_ACK_SCRIPT = (
+    _OWNED_PREAMBLE
+    + """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HINCRBY', KEYS[3], partition_of(job), -1)
+return 1
+"""
+)
+
+# ARGV: id, token, available_at, error, ready key prefix.
+_RETRY_SCRIPT = (
+    _OWNED_PREAMBLE
+    + """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HINCRBY', KEYS[3], partition_of(job), -1)
+job['last_error'] = ARGV[4]
+schedule(ARGV[5], KEYS[4], KEYS[2], ARGV[1], job, ARGV[3])
+return 1
+"""
+)
+
+# ARGV: id, token, error, max dead jobs kept.
+_DEAD_LETTER_SCRIPT = (
+    _OWNED_PREAMBLE
+    + """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HINCRBY', KEYS[3], partition_of(job), -1)
+job['lease'] = nil
+job['last_error'] = ARGV[3]
+redis.call('LPUSH', KEYS[5], cjson.encode(job))
+redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[4]) - 1)
+return 1
+"""
+)
+
+
+class RedisJobQueue:
+    """Durable queue shared by the API and every worker; needs the ``redis`` extra.
+
+    Jobs live in a hash. Each workspace has a ready sorted set scored by the time a
+    job becomes due, indexed by a sorted set of partitions; leased jobs sit in one
+    in-flight sorted set scored by lease deadline, with a per-workspace running count
+    for concurrency caps. A consumer that dies simply stops extending its leases, and
+    the next ``due_partitions`` or ``lease`` call requeues the jobs. Scripts build the
+    per-workspace keys themselves, which needs Redis 6.2+ and a non-clustered server.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        clock: Callable[[], float] = time.time,
+        max_dead: int = 1000,
+    ) -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - depends on optional extra
+            raise RuntimeError(
+                "Redis job queue requires the 'redis' package: pip install creatory[redis]"
+            ) from exc
+        self._client = redis_asyncio.from_url(redis_url, decode_responses=True)
+        self._clock = clock
+        self.max_dead = max_dead
+        self._ready_prefix = f"{_KEY_PREFIX}:ready:"
+        self._keys = [
+            f"{_KEY_PREFIX}:in_flight",
+            f"{_KEY_PREFIX}:data",
+            f"{_KEY_PREFIX}:running",
+            f"{_KEY_PREFIX}:partitions",
+            f"{_KEY_PREFIX}:dead",
+        ]
+        self._due = self._client.register_script(_DUE_SCRIPT)
+        self._lease = self._client.register_script(_LEASE_SCRIPT)
+        self._extend = self._client.register_script(_EXTEND_SCRIPT)
+        self._ack = self._client.register_script(_ACK_SCRIPT)
+        self._retry = self._client.register_script(_RETRY_SCRIPT)
+        self._dead_letter = self._client.register_script(_DEAD_LETTER_SCRIPT)
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        *,
+        workspace_id: str | None = None,
+        delay_seconds: float = 0.0,
+    ) -> Job:
+        now = self._clock()
+        job = Job(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            payload=payload,
+            workspace_id=workspace_id,
+            enqueued_at=now,
+            available_at=now + delay_seconds,
+        )
+        _, data, _, index, _ = self._keys
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(data, job.id, job.to_json())
+            pipe.zadd(self._ready_prefix + job.partition, {job.id: job.available_at})
+            pipe.zadd(index, {job.partition: job.available_at}, lt=True)
+            await pipe.execute()
+        return job
+
+    async def due_partitions(self) -> list[str]:
+        return list(await self._due(keys=self._keys[:4], args=[self._clock(), self._ready_prefix]))
+
+    async def lease(
+        self,
+        partition: str,
+        *,
+        limit: int,
+        visibility_timeout: float,
+        max_in_flight: int = 0,
+    ) -> list[Lease]:
+        now = self._clock()
+        deadline = now + visibility_timeout
+        leased = await self._lease(
+            keys=self._keys[:4],
+            args=[
+                now,
+                limit,
+                deadline,
+                uuid.uuid4().hex,
+                partition,
+                max_in_flight,
+                self._ready_prefix,
+            ],
+        )
+        leases: list[Lease] = []
+        for raw in leased:
+            token = json.loads(raw)["lease"]
+            leases.append(Lease(job=Job.from_json(raw), token=token, deadline=deadline))
+        return leases
+
+    async def extend(self, lease: Lease, *, visibility_timeout: float) -> Lease | None:
+        deadline = self._clock() + visibility_timeout
+        owned = await self._extend(keys=self._keys, args=[lease.job.id, lease.token, deadline])
+        return replace(lease, deadline=deadline) if owned else None
+
+    async def ack(self, lease: Lease) -> bool:
+        return bool(await self._ack(keys=self._keys, args=[lease.job.id, lease.token]))
+
+    async def retry(self, lease: Lease, *, delay_seconds: float, error: str) -> bool:
+        available_at = self._clock() + delay_seconds
+        return bool(
+            await self._retry(
+                keys=self._keys,
+                args=[lease.job.id, lease.token, available_at, error, self._ready_prefix],
+            )
+        )
+
+    async def dead_letter(self, lease: Lease, *, error: str) -> bool:
+        return bool(
+            await self._dead_letter(
+                keys=self._keys, args=[lease.job.id, lease.token, error, self.max_dead]
+            )
+        )
+
+    async def depth(self) -> QueueDepth:
+        depths = (await self.partition_depths()).values()
+        in_flight, _, _, _, dead = self._keys
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.zcard(in_flight)
+            pipe.llen(dead)
+            leased, dead_count = await pipe.execute()
+        return QueueDepth(
+            ready=sum(depth.ready for depth in depths),
+            delayed=sum(depth.delayed for depth in depths),
+            in_flight=leased,
+            dead=dead_count,
+        )
+
+    async def partition_depths(self) -> dict[str, WorkspaceDepth]:
+        _, _, running_key, index, _ = self._keys
+        now = self._clock()
+        partitions = await self._client.zrange(index, 0, -1)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(running_key)
+            for partition in partitions:
+                pipe.zcount(self._ready_prefix + partition, "-inf", now)
+                pipe.zcard(self._ready_prefix + partition)
+            running, *counts = await pipe.execute()
+        depths = {
+            partition: WorkspaceDepth(
+                ready=due,
+                delayed=total - due,
+                in_flight=max(int(running.get(partition, 0)), 0),
+            )
+            for partition, due, total in zip(partitions, counts[::2], counts[1::2], strict=True)
+        }
+        for partition, count in running.items():
+            if partition not in depths and int(count) > 0:
+                depths[partition] = WorkspaceDepth(ready=0, delayed=0, in_flight=int(count))
+        return depths
+
+
+class JobHandler(Protocol):
+    async def handle(self, job: Job) -> None: ...
+
+    async def on_dead_letter(self, job: Job, error: str) -> None: ...
+
+
+class JobConsumer:
+    """Leases jobs and runs them with at most ``concurrency`` in flight in this process.
+
+    Free slots are shared between workspaces by weighted fair share, one job at a time,
+    so a workspace with a deep backlog cannot starve one that queued a single job.
+    ``workspace_max_concurrency`` caps how many jobs of one workspace run at once
+    across all consumers; the queue enforces it when leasing.
+
+    While a handler runs, its lease is extended every third of the visibility timeout,
+    so only a crashed or stalled consumer lets a job become visible again. A failed
+    job is retried with exponential backoff until ``max_attempts``, then dead-lettered
+    and reported to its handler so the run it drives is not left queued. Expired
+    leases count as attempts too: a job redelivered after ``max_attempts`` (say, one
+    that keeps crashing its worker) is dead-lettered without running the handler.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, JobHandler],
+        *,
+        concurrency: int = 4,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        poll_seconds: float = 1.0,
+        workspace_max_concurrency: int = 0,
+        scheduler: FairShareScheduler | None = None,
+    ) -> None:
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.poll_seconds = poll_seconds
+        self.workspace_max_concurrency = workspace_max_concurrency
+        self.scheduler = scheduler or FairShareScheduler()
+        self.metrics = JobMetrics()
+        self._active: set[asyncio.Task[None]] = set()
+        self._slot_freed = asyncio.Event()
+
+    @property
+    def active(self) -> int:
+        return len(self._active)
+
+    async def poll_once(self) -> int:
+        """Fill the free slots in fair-share order; returns the jobs started."""
+        free = self.concurrency - len(self._active)
+        if free <= 0:
+            return 0
+        candidates = set(await self.queue.due_partitions())
+        started = 0
+        while started < free and candidates:
+            partition = self.scheduler.pick(candidates)
+            leases = await self.queue.lease(
+                partition,
+                limit=1,
+                visibility_timeout=self.visibility_timeout,
+                max_in_flight=self.workspace_max_concurrency,
+            )
+            if not leases:
+                # Drained or at its concurrency cap; other workspaces get the slot.
+                candidates.discard(partition)
+                continue
+            lease = leases[0]
+            self.scheduler.charge(partition)
+            leased_at = lease.deadline - self.visibility_timeout
+            self.metrics.observe_wait(partition, leased_at - lease.job.available_at)
+            task = asyncio.create_task(self._process(lease))
+            self._active.add(task)
+            task.add_done_callback(self._release)
+            started += 1
+        return started
+
+    async def report(self, *, top: int = 10) -> dict[str, Any]:
+        """Queue depth plus this consumer's counters and wait times, for logs and probes.
+
+        Per-workspace entries are limited to the ``top`` busiest and slowest workspaces.
+        """
+        depths = await self.queue.partition_depths()
+        busiest = sorted(depths.items(), key=lambda item: -(item[1].ready + item[1].in_flight))[
+            :top
+        ]
+        return {
+            "depth": asdict(await self.queue.depth()),
+            "depth_by_workspace": {partition: asdict(depth) for partition, depth in busiest},
+            "active": self.active,
+            **self.metrics.snapshot(top=top),
+        }
+
+    def _release(self, task: asyncio.Task[None]) -> None:
+        self._active.discard(task)
+        self._slot_freed.set()
+
+    async def drain(self) -> None:
+        while self._active:
+            await asyncio.gather(*self._active, return_exceptions=True)
+
+    async def run_forever(self) -> None:
+        try:
+            while True:
+                try:
+                    started = await self.poll_once()
+                except Exception:
+                    logger.exception("job lease failed")
+                    started = 0
+                if len(self._active) >= self.concurrency:
+                    self._slot_freed.clear()
+                    await self._slot_freed.wait()
+                elif not started:
+                    await asyncio.sleep(self.poll_seconds)
+        finally:
+            # Interrupted jobs are redelivered once their leases expire.
+            for task in self._active:
+                task.cancel()
+
+    async def _process(self, lease: Lease) -> None:
+        job = lease.job
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await self.queue.dead_letter(lease, error=f"no handler for job kind {job.kind!r}")
+            return
+        if job.attempts > self.max_attempts:
+            await self._give_up(handler, lease, job.last_error or LEASE_EXPIRED_ERROR)
+            return
+        heartbeat = asyncio.create_task(self._heartbeat(lease))
+        try:
+            await handler.handle(job)
+        except PermanentJobError as exc:
+            await self._give_up(handler, lease, str(exc))
+            return
+        except Exception as exc:
+            logger.exception("job failed", extra={"job_id": job.id, "attempt": job.attempts})
+            error = f"{type(exc).__name__}: {exc}"
+            if job.attempts >= self.max_attempts:
+                await self._give_up(handler, lease, error)
+            else:
+                self.metrics.retried += 1
+                delay = backoff_delay(
+                    job.attempts,
+                    base_seconds=self.retry_base_seconds,
+                    max_seconds=self.retry_max_seconds,
+                )
+                await self.queue.retry(lease, delay_seconds=delay, error=error)
+            return
+        finally:
+            heartbeat.cancel()
+        self.metrics.succeeded += 1
+        if not await self.queue.ack(lease):
+            logger.warning("job finished after its lease was lost", extra={"job_id": job.id})
+
+    async def _heartbeat(self, lease: Lease) -> None:
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                extended = await self.queue.extend(
+                    lease, visibility_timeout=self.visibility_timeout
+                )
+            except Exception:
+                logger.exception("job lease extension failed", extra={"job_id": lease.job.id})
+                continue
+            if extended is None:
+                logger.warning("job lease lost", extra={"job_id": lease.job.id})
+                return
+            lease = extended
+
+    async def _give_up(self, handler: JobHandler, lease: Lease, error: str) -> None:
+        self.metrics.dead_lettered += 1
+        await self.queue.dead_letter(lease, error=error)
+        try:
+            await handler.on_dead_letter(lease.job, error)
+        except Exception:
+            logger.exception("dead-letter hook failed", extra={"job_id": lease.job.id})
+
+
+def build_job_queue(backend: str, *, redis_url: str) -> JobQueue:
+    if backend == "redis":
+        return RedisJobQueue(redis_url)
+    return InMemoryJobQueue()
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    return build_job_queue(settings.job_queue_backend, redis_url=settings.redis_url)
+
+
+def build_job_consumer(handlers: dict[str, JobHandler]) -> JobConsumer:
+    return JobConsumer(
+        get_job_queue(),
+        handlers,
+        concurrency=settings.job_queue_concurrency,
+        visibility_timeout=settings.job_queue_visibility_timeout_seconds,
+        max_attempts=settings.job_queue_max_attempts,
+        retry_base_seconds=settings.job_queue_retry_base_seconds,
+        retry_max_seconds=settings.job_queue_retry_max_seconds,
+        poll_seconds=settings.job_queue_poll_seconds,
+        workspace_max_concurrency=settings.job_queue_workspace_max_concurrency,
+        scheduler=FairShareScheduler(settings.job_queue_workspace_weights),
+    )
+
+
+async def enqueue_run(
+    run: AgentRun | WorkflowRun,
+    kind: JobKind,
+    *,
+    workspace_id: uuid.UUID,
+) -> Job:
+    """Hand a committed ``queued`` run to the worker.
+
+    Raises ``JobQueueUnavailable`` if the queue cannot take the job; the caller then
+    owns the run and should ``fail_unqueued_run`` it.
+    """
+    try:
+        return await get_job_queue().enqueue(
+            kind.value, {"run_id": str(run.id)}, workspace_id=str(workspace_id)
+        )
+    except Exception as exc:
+        raise JobQueueUnavailable("Job queue unavailable; the run was not started") from exc
+
+
+async def fail_unqueued_run(db: AsyncSession, run: AgentRun | WorkflowRun) -> None:
+    """Mark a run failed whose job never reached the queue, so it is not left queued."""
+    reason = "job queue unavailable"
+    run.status = RunStatus.FAILED
+    run.ended_at = datetime.now(UTC)
+    if isinstance(run, AgentRun):
+        run.error_json = {"reason": reason}
+    else:
+        run.output_json = {**(run.output_json or {}), "error": reason}
+    await db.commit()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from typing import Any
+
+
+class FairShareScheduler:
+    """Weighted fair share across workspaces by stride scheduling.
+
+    Every workspace has a virtual ``pass``; starting one of its jobs advances it by
+    ``1 / weight`` and the next free slot goes to the backlogged workspace with the
+    lowest pass. A workspace returning from idle starts at the current virtual time
+    instead of its old, lower pass, so idleness cannot be saved up for a later burst.
+    """
+
+    def __init__(
+        self,
+        weights: dict[str, float] | None = None,
+        *,
+        default_weight: float = 1.0,
+        max_tracked: int = 4096,
+    ) -> None:
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self.max_tracked = max_tracked
+        self.virtual_time = 0.0
+        self._pass: dict[str, float] = {}
+
+    def weight(self, workspace: str) -> float:
+        return max(self.weights.get(workspace, self.default_weight), 1e-6)
+
+    def pick(self, candidates: Collection[str]) -> str | None:
+        """The candidate owed the next slot, or ``None`` when there are none."""
+        if not candidates:
+            return None
+        for workspace in candidates:
+            self._pass[workspace] = max(self._pass.get(workspace, 0.0), self.virtual_time)
+        chosen = min(candidates, key=lambda workspace: (self._pass[workspace], workspace))
+        self.virtual_time = self._pass[chosen]
+        if len(self._pass) > self.max_tracked:
+            self._prune(candidates)
+        return chosen
+
+    def charge(self, workspace: str) -> None:
+        start = max(self._pass.get(workspace, 0.0), self.virtual_time)
+        self._pass[workspace] = start + 1.0 / self.weight(workspace)
+
+    def _prune(self, keep: Collection[str]) -> None:
+        # Entries at or below virtual time would be raised to it anyway on return.
+        for workspace, value in list(self._pass.items()):
+            if value <= self.virtual_time and workspace not in keep:
+                del self._pass[workspace]
+
+
+@dataclass
+class WaitTimeStats:
+    """Time jobs spent due but not yet leased, over all jobs and a recent window."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    recent: deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.recent.append(seconds)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the recent window."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_seconds": round(self.mean_seconds, 3),
+            "p50_seconds": round(self.percentile(0.5), 3),
+            "p95_seconds": round(self.percentile(0.95), 3),
+            "max_seconds": round(self.max_seconds, 3),
+        }
+
+
+@dataclass
+class JobMetrics:
+    """Per-process consumer counters and lease wait times, overall and per workspace."""
+
+    started: int = 0
+    succeeded: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    wait: WaitTimeStats = field(default_factory=WaitTimeStats)
+    wait_by_workspace: dict[str, WaitTimeStats] = field(default_factory=dict)
+    max_workspaces: int = 1024
+
+    def observe_wait(self, workspace: str, seconds: float) -> None:
+        self.started += 1
+        self.wait.observe(seconds)
+        stats = self.wait_by_workspace.get(workspace)
+        if stats is None:
+            if len(self.wait_by_workspace) >= self.max_workspaces:
+                # Forget the least busy workspace; the overall stats still count it.
+                quietest, _ = min(self.wait_by_workspace.items(), key=lambda item: item[1].count)
+                del self.wait_by_workspace[quietest]
+            stats = self.wait_by_workspace[workspace] = WaitTimeStats()
+        stats.observe(seconds)
+
+    def totals(self) -> dict[str, Any]:
+        """Counters and overall wait times, without any per-workspace figures."""
+        return {
+            "started": self.started,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "wait": self.wait.snapshot(),
+        }
+
+    def snapshot(self, *, top: int = 10) -> dict[str, Any]:
+        """``totals`` plus the ``top`` workspaces by p95 wait."""
+        slowest = sorted(
+            self.wait_by_workspace.items(), key=lambda item: -item[1].percentile(0.95)
+        )[:top]
+        return {
+            **self.totals(),
+            "wait_by_workspace": {workspace: stats.snapshot() for workspace, stats in slowest},
+        }
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any, Protocol
+from uuid import UUID
+
+from creatory_core.core.config import settings
+
+logger = logging.getLogger("creatory.run_events")
+
+_KEY_PREFIX = "creatory:runs"
+
+
+@dataclass(frozen=True)
+class RunEvent:
+    """A run progress event, shaped like a ``TaskEvent`` row plus its stream position."""
+
+    run_id: UUID
+    event_type: str
+    payload: dict[str, Any]
+    task_id: UUID | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    id: str = ""
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.event_type == "run" and self.payload.get("stage") == "final"
+
+    def to_sse(self) -> str:
+        head = f"id: {self.id}\n" if self.id else ""
+        return f"{head}event: {self.event_type}\ndata: {json.dumps(self.payload)}\n\n"
+
+
+def _position(event_id: str | None) -> tuple[int, ...]:
+    """Sort key for stream ids: ``"7"`` in memory, ``"1718000000000-0"`` in Redis."""
+    if not event_id:
+        return (0,)
+    try:
+        return tuple(int(part) for part in event_id.split("-"))
+    except ValueError:
+        return (0,)
+
+
+class RunEventBus(Protocol):
+    name: str
+
+    async def publish(self, event: RunEvent) -> RunEvent: ...
+
+    async def history(self, run_id: UUID, *, after: str | None = None) -> list[RunEvent]: ...
+
+    def subscribe(
+        self,
+        run_id: UUID,
+        *,
+        after: str | None = None,
+        heartbeat_seconds: float | None = None,
+    ) -> AsyncIterator[RunEvent | None]: ...
+
+
+async def _follow(
+    backlog: list[RunEvent],
+    queue: asyncio.Queue[RunEvent],
+    *,
+    after: str | None,
+    heartbeat_seconds: float | None,
+) -> AsyncIterator[RunEvent | None]:
+    """Yield ``backlog`` then live events past ``after`` until the run's final event.
+
+    ``None`` is yielded after ``heartbeat_seconds`` without an event so callers can
+    keep idle connections alive.
+    """
+    cursor = _position(after)
+    for event in backlog:
+        cursor = _position(event.id)
+        yield event
+        if event.is_terminal:
+            return
+    while True:
+        try:
+            event = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+        except TimeoutError:
+            yield None
+            continue
+        if _position(event.id) <= cursor:
+            continue
+        cursor = _position(event.id)
+        yield event
+        if event.is_terminal:
+            return
+
+
+@dataclass
+class _MemoryChannel:
+    events: deque[RunEvent]
+    sequence: int = 0
+    subscribers: set[asyncio.Queue[RunEvent]] = field(default_factory=set)
+    finished_at: float | None = None
+
+
+class InMemoryRunEventBus:
+    """Process-local fan-out with bounded per-run history. Suitable for a single API worker."""
+
+    name = "memory"
+
+    def __init__(
+        self,
+        *,
+        max_events: int = 1000,
+        ttl_seconds: int = 3600,
+        max_runs: int = 4096,
+    ) -> None:
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+        self.max_runs = max_runs
+        self._channels: OrderedDict[UUID, _MemoryChannel] = OrderedDict()
+
+    def _channel(self, run_id: UUID) -> _MemoryChannel:
+        channel = self._channels.get(run_id)
+        if channel is None:
+            self._prune()
+            channel = self._channels[run_id] = _MemoryChannel(events=deque(maxlen=self.max_events))
+        self._channels.move_to_end(run_id)
+        return channel
+
+    def _prune(self) -> None:
+        expired_before = time.monotonic() - self.ttl_seconds
+        for run_id, channel in list(self._channels.items()):
+            finished = channel.finished_at is not None and channel.finished_at < expired_before
+            if finished and not channel.subscribers:
+                del self._channels[run_id]
+        while len(self._channels) >= self.max_runs:
+            self._channels.popitem(last=False)
+
+    async def publish(self, event: RunEvent) -> RunEvent:
+        channel = self._channel(event.run_id)
+        channel.sequence += 1
+        published = RunEvent(
+            run_id=event.run_id,
+            event_type=event.event_type,
+            payload=event.payload,
+            task_id=event.task_id,
+            created_at=event.created_at,
+            id=str(channel.sequence),
+        )
+        channel.events.append(published)
+        if published.is_terminal:
+            channel.finished_at = time.monotonic()
+        for queue in channel.subscribers:
+            queue.put_nowait(published)
+        return published
+
+    async def history(self, run_id: UUID, *, after: str | None = None) -> list[RunEvent]:
+        channel = self._channels.get(run_id)
+        if channel is None:
+            return []
+        cursor = _position(after)
+        return [event for event in channel.events if _position(event.id) > cursor]
+
+    async def subscribe(
+        self,
+        run_id: UUID,
+        *,
+        after: str | None = None,
+        heartbeat_seconds: float | None = None,
+    ) -> AsyncIterator[RunEvent | None]:
+        channel = self._channel(run_id)
+        cursor = _position(after)
+        # Copying the backlog and registering happen without an await in between, so
+        # no event can fall between the two.
+        backlog = [event for event in channel.events if _position(event.id) > cursor]
+        if channel.finished_at is not None and not backlog:
+            return
+        queue: asyncio.Queue[RunEvent] = asyncio.Queue()
+        channel.subscribers.add(queue)
+        try:
+            async for event in _follow(
+                backlog, queue, after=after, heartbeat_seconds=heartbeat_seconds
+            ):
+                yield event
+        finally:
+            channel.subscribers.discard(queue)
+
+
+@dataclass
+class _RedisChannel:
+    cursor: str
+    subscribers: set[asyncio.Queue[RunEvent]] = field(default_factory=set)
+    reader: asyncio.Task[None] | None = None
+
+
+class RedisRunEventBus:
+    """Redis-streams bus shared by every worker; needs the ``redis`` extra.
+
+    Each run is one capped stream with a TTL. A process runs a single blocking reader
+    per watched run and fans its events out to local subscribers, so the number of
+    Redis reads grows with watched runs, not with viewers.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        max_events: int = 1000,
+        ttl_seconds: int = 3600,
+        block_ms: int = 5000,
+    ) -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - depends on optional extra
+            raise RuntimeError(
+                "Redis run events require the 'redis' package: pip install creatory[redis]"
+            ) from exc
+        self._client = redis_asyncio.from_url(redis_url, decode_responses=True)
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+        self.block_ms = block_ms
+        self._channels: dict[UUID, _RedisChannel] = {}
+
+    @staticmethod
+    def _key(run_id: UUID) -> str:
+        return f"{_KEY_PREFIX}:{run_id}:events"
+
+    @staticmethod
+    def _decode(run_id: UUID, event_id: str, fields: dict[str, str]) -> RunEvent:
+        return RunEvent(
+            run_id=run_id,
+            event_type=fields["event_type"],
+            payload=json.loads(fields["payload"]),
+            task_id=UUID(fields["task_id"]) if fields.get("task_id") else None,
+            created_at=datetime.fromisoformat(fields["created_at"]),
+            id=event_id,
+        )
+
+    async def publish(self, event: RunEvent) -> RunEvent:
+        key = self._key(event.run_id)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                key,
+                {
+                    "event_type": event.event_type,
+                    "payload": json.dumps(event.payload),
+                    "task_id": str(event.task_id) if event.task_id else "",
+                    "created_at": event.created_at.isoformat(),
+                },
+                maxlen=self.max_events,
+                approximate=True,
+            )
+            pipe.expire(key, self.ttl_seconds)
+            event_id, _ = await pipe.execute()
+        return RunEvent(
+            run_id=event.run_id,
+            event_type=event.event_type,
+            payload=event.payload,
+            task_id=event.task_id,
+            created_at=event.created_at,
+            id=event_id,
+        )
+
+    async def _range(self, run_id: UUID, after: str, upto: str = "+") -> list[RunEvent]:
+        entries = await self._client.xrange(self._key(run_id), min=f"({after}", max=upto)
+        return [self._decode(run_id, event_id, fields) for event_id, fields in entries]
+
+    async def history(self, run_id: UUID, *, after: str | None = None) -> list[RunEvent]:
+        return await self._range(run_id, after or "0-0")
+
+    async def subscribe(
+        self,
+        run_id: UUID,
+        *,
+        after: str | None = None,
+        heartbeat_seconds: float | None = None,
+    ) -> AsyncIterator[RunEvent | None]:
+        start = after or "0-0"
+        queue: asyncio.Queue[RunEvent] = asyncio.Queue()
+        backlog: list[RunEvent] = []
+        channel = self._channels.get(run_id)
+        if channel is None:
+            # The new reader starts at this subscriber's position and delivers its backlog.
+            channel = self._channels[run_id] = _RedisChannel(cursor=start)
+            channel.subscribers.add(queue)
+            channel.reader = asyncio.create_task(self._read(run_id, channel))
+        else:
+            # Catch up to the shared reader, re-checking its cursor after every await.
+            upto = start
+            while _position(upto) < _position(channel.cursor):
+                target = channel.cursor
+                backlog.extend(await self._range(run_id, upto, target))
+                upto = target
+            channel.subscribers.add(queue)
+        try:
+            async for event in _follow(
+                backlog, queue, after=start, heartbeat_seconds=heartbeat_seconds
+            ):
+                yield event
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers and channel.reader is not None:
+                channel.reader.cancel()
+                if self._channels.get(run_id) is channel:
+                    del self._channels[run_id]
+
+    async def _read(self, run_id: UUID, channel: _RedisChannel) -> None:
+        key = self._key(run_id)
+        while channel.subscribers:
+            try:
+                response = await self._client.xread(
+                    {key: channel.cursor}, block=self.block_ms, count=100
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("run event read failed", extra={"run_id": str(run_id)})
+                await asyncio.sleep(1)
+                continue
+            for _, entries in response or []:
+                for event_id, fields in entries:
+                    event = self._decode(run_id, event_id, fields)
+                    channel.cursor = event_id
+                    for queue in channel.subscribers:
+                        queue.put_nowait(event)
+
+
+async def emit(
+    bus: RunEventBus,
+    run_id: UUID,
+    event_type: str,
+    payload: dict[str, Any],
+    *,
+    task_id: UUID | None = None,
+) -> RunEvent:
+    """Publish an event; a bus failure is logged and never fails the run itself."""
+    event = RunEvent(run_id=run_id, event_type=event_type, payload=payload, task_id=task_id)
+    try:
+        return await bus.publish(event)
+    except Exception:
+        logger.exception("run event publish failed", extra={"run_id": str(run_id)})
+        return event
+
+
+def build_run_event_bus(
+    backend: str,
+    *,
+    redis_url: str,
+    max_events: int,
+    ttl_seconds: int,
+) -> RunEventBus:
+    if backend == "redis":
+        return RedisRunEventBus(redis_url, max_events=max_events, ttl_seconds=ttl_seconds)
+    return InMemoryRunEventBus(max_events=max_events, ttl_seconds=ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_run_event_bus() -> RunEventBus:
+    return build_run_event_bus(
+        settings.run_events_backend,
+        redis_url=settings.redis_url,
+        max_events=settings.run_events_max_events,
+        ttl_seconds=settings.run_events_ttl_seconds,
+    )
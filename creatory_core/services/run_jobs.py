@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from creatory_core.db.models import AgentRun, RunStatus, WorkflowRun, WorkflowTemplate
+from creatory_core.rag.ingest import ChunkIngestPipeline
+from creatory_core.services.circuit_breaker import CircuitBreakerTriggered
+from creatory_core.services.director import DirectorTurn
+from creatory_core.services.ingest_jobs import KnowledgeIngestHandler
+from creatory_core.services.job_queue import Job, JobHandler, JobKind, PermanentJobError
+from creatory_core.services.run_events import RunEventBus, emit, get_run_event_bus
+from creatory_core.services.workflow_dag import WorkflowGraphError
+from creatory_core.services.workflow_runner import execute_workflow_run, resume_workflow_run
+
+_FINISHED = {RunStatus.SUCCEEDED, RunStatus.CANCELLED, RunStatus.WAITING_HUMAN}
+
+
+def _run_id(job: Job) -> UUID:
+    return UUID(job.payload["run_id"])
+
+
+class DirectorTurnHandler:
+    """Executes a Director turn queued by ``POST .../chat/queued``."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        event_bus: RunEventBus | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.event_bus = event_bus or get_run_event_bus()
+
+    async def handle(self, job: Job) -> None:
+        async with self.session_factory() as db:
+            turn = await DirectorTurn.resume(db, _run_id(job), self.event_bus)
+            if turn is None:
+                return
+            async for _ in turn.events():
+                pass
+
+    async def on_dead_letter(self, job: Job, error: str) -> None:
+        async with self.session_factory() as db:
+            run = await db.get(AgentRun, _run_id(job))
+            if run is None or run.status in _FINISHED:
+                return
+            run.status = RunStatus.FAILED
+            run.error_json = {"reason": "job abandoned after retries", "error": error}
+            run.ended_at = datetime.now(UTC)
+            await db.commit()
+        await emit(self.event_bus, run.id, "run", _final_payload(run))
+
+
+class WorkflowRunHandler:
+    """Executes a workflow run queued by ``POST /workflows/templates/{id}/run/queued``."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        event_bus: RunEventBus | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.event_bus = event_bus or get_run_event_bus()
+
+    async def handle(self, job: Job) -> None:
+        async with self.session_factory() as db:
+            workflow_run = await resume_workflow_run(db, _run_id(job))
+            if workflow_run is None:
+                return
+            template = await db.get(WorkflowTemplate, workflow_run.template_id)
+            if template is None:
+                raise PermanentJobError("workflow template no longer exists")
+            try:
+                await execute_workflow_run(db, template, workflow_run, self.event_bus)
+            except (CircuitBreakerTriggered, WorkflowGraphError) as exc:
+                # The run is already recorded as failed; a retry would fail the same way.
+                raise PermanentJobError(str(exc)) from exc
+
+    async def on_dead_letter(self, job: Job, error: str) -> None:
+        async with self.session_factory() as db:
+            workflow_run = await db.get(WorkflowRun, _run_id(job))
+            if workflow_run is None or workflow_run.status in _FINISHED:
+                return
+            workflow_run.status = RunStatus.FAILED
+            workflow_run.output_json = {**workflow_run.output_json, "error": error}
+            workflow_run.ended_at = workflow_run.ended_at or datetime.now(UTC)
+            await db.commit()
+        await emit(self.event_bus, workflow_run.id, "run", _final_payload(workflow_run))
+
+
+def _final_payload(run: AgentRun | WorkflowRun) -> dict:
+    return {
+        "run_id": str(run.id),
+        "status": run.status.value,
+        "stage": "final",
+        "at": datetime.now(UTC).isoformat(),
+    }
+
+
+def run_job_handlers(
+    session_factory: async_sessionmaker[AsyncSession],
+    event_bus: RunEventBus | None = None,
+    ingest_pipeline: ChunkIngestPipeline | None = None,
+) -> dict[str, JobHandler]:
+    return {
+        JobKind.DIRECTOR_TURN.value: DirectorTurnHandler(session_factory, event_bus),
+        JobKind.WORKFLOW_RUN.value: WorkflowRunHandler(session_factory, event_bus),
+        JobKind.KNOWLEDGE_INGEST.value: KnowledgeIngestHandler(session_factory, ingest_pipeline),
+    }
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from creatory_core.db.models import NodeType, RunStatus, WorkflowEdge, WorkflowNode
+
+
+class WorkflowGraphError(ValueError):
+    pass
+
+
+@dataclass
+class WorkflowGraph:
+    """Nodes of a template keyed by ``node_key``, with edges as adjacency lists.
+
+    ``order`` is a topological order that breaks ties by canvas position and then
+    key, so the schedule is deterministic and follows the editor left to right.
+    """
+
+    nodes: dict[str, WorkflowNode]
+    successors: dict[str, list[str]]
+    predecessors: dict[str, list[str]]
+    order: list[str]
+
+    @classmethod
+    def build(
+        cls,
+        nodes: Sequence[WorkflowNode],
+        edges: Sequence[WorkflowEdge],
+    ) -> WorkflowGraph:
+        by_key = {node.node_key: node for node in nodes}
+        ranked = sorted(
+            by_key,
+            key=lambda key: (
+                by_key[key].position_x is None,
+                by_key[key].position_x or 0,
+                key,
+            ),
+        )
+        pairs = [(edge.source_node_key, edge.target_node_key) for edge in edges]
+        if not pairs:
+            # Templates drawn without edges keep their original left-to-right sequence.
+            pairs = list(itertools.pairwise(ranked))
+
+        successors: dict[str, list[str]] = {key: [] for key in by_key}
+        predecessors: dict[str, list[str]] = {key: [] for key in by_key}
+        for source, target in dict.fromkeys(pairs):
+            unknown = [key for key in (source, target) if key not in by_key]
+            if unknown:
+                raise WorkflowGraphError(f"Edge references unknown node {unknown[0]!r}")
+            successors[source].append(target)
+            predecessors[target].append(source)
+
+        rank = {key: index for index, key in enumerate(ranked)}
+        indegree = {key: len(predecessors[key]) for key in by_key}
+        ready = [(rank[key], key) for key in by_key if indegree[key] == 0]
+        heapq.heapify(ready)
+        order: list[str] = []
+        while ready:
+            _, key = heapq.heappop(ready)
+            order.append(key)
+            for target in successors[key]:
+                indegree[target] -= 1
+                if indegree[target] == 0:
+                    heapq.heappush(ready, (rank[target], target))
+        if len(order) != len(by_key):
+            cyclic = sorted(key for key, remaining in indegree.items() if remaining)
+            raise WorkflowGraphError(f"Workflow edges form a cycle through {', '.join(cyclic)}")
+        return cls(nodes=by_key, successors=successors, predecessors=predecessors, order=order)
+
+
+@dataclass(frozen=True)
+class NodeOutcome:
+    status: RunStatus
+    output_json: dict[str, Any] = field(default_factory=dict)
+    error_json: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class NodeResult:
+    node_key: str
+    outcome: NodeOutcome
+    started_at: datetime
+    ended_at: datetime
+
+
+NodeRunner = Callable[[WorkflowNode, dict[str, dict[str, Any]]], Awaitable[NodeOutcome]]
+NodeCallback = Callable[[WorkflowNode], Awaitable[None]]
+ResultCallback = Callable[[NodeResult], Awaitable[None]]
+
+
+async def simulate_node(node: WorkflowNode, upstream: dict[str, dict[str, Any]]) -> NodeOutcome:
+    """Placeholder node execution: human gates pause, every other node succeeds."""
+    if node.type == NodeType.HUMAN_GATE:
+        return NodeOutcome(
+            status=RunStatus.WAITING_HUMAN,
+            output_json={
+                "message": "Awaiting creator confirmation before continuing.",
+                "human_gate": True,
+            },
+        )
+    return NodeOutcome(
+        status=RunStatus.SUCCEEDED,
+        output_json={
+            "message": f"Node {node.node_key} executed successfully",
+            "summary": {
+                "agentic": node.type in {NodeType.AGENT, NodeType.TOOL},
+                "config": node.config_json,
+            },
+        },
+    )
+
+
+@dataclass
+class DagRun:
+    results: list[NodeResult]
+    blocked: list[str]
+
+    @property
+    def status(self) -> RunStatus:
+        statuses = {result.outcome.status for result in self.results}
+        if RunStatus.FAILED in statuses:
+            return RunStatus.FAILED
+        if RunStatus.WAITING_HUMAN in statuses:
+            return RunStatus.WAITING_HUMAN
+        return RunStatus.SUCCEEDED
+
+
+class DagExecutor:
+    """Runs a ``WorkflowGraph`` with up to ``max_concurrency`` nodes at once.
+
+    A node starts once every predecessor has succeeded, so independent branches run
+    side by side. Nodes below a human gate wait for it; after a failure no new nodes
+    start, and the ones already running are allowed to finish. ``on_start`` and
+    ``on_finish`` are awaited from the scheduling coroutine only, never from node
+    tasks, so they may share one database session.
+    """
+
+    def __init__(
+        self,
+        graph: WorkflowGraph,
+        run_node: NodeRunner = simulate_node,
+        *,
+        max_concurrency: int = 4,
+        on_start: NodeCallback | None = None,
+        on_finish: ResultCallback | None = None,
+    ) -> None:
+        self.graph = graph
+        self.run_node = run_node
+        self.max_concurrency = max(1, max_concurrency)
+        self.on_start = on_start
+        self.on_finish = on_finish
+
+    async def _run(self, key: str, upstream: dict[str, dict[str, Any]]) -> NodeResult:
+        started_at = datetime.now(UTC)
+        try:
+            outcome = await self.run_node(self.graph.nodes[key], upstream)
+        except Exception as exc:
+            outcome = NodeOutcome(
+                status=RunStatus.FAILED,
+                error_json={"type": type(exc).__name__, "message": str(exc)},
+            )
+        return NodeResult(
+            node_key=key, outcome=outcome, started_at=started_at, ended_at=datetime.now(UTC)
+        )
+
+    async def run(self) -> DagRun:
+        graph = self.graph
+        rank = {key: index for index, key in enumerate(graph.order)}
+        waiting_on = {key: len(graph.predecessors[key]) for key in graph.nodes}
+        ready = [(rank[key], key) for key in graph.order if waiting_on[key] == 0]
+        outputs: dict[str, dict[str, Any]] = {}
+        results: list[NodeResult] = []
+        running: dict[asyncio.Task[NodeResult], str] = {}
+        halted = False
+        try:
+            while running or (ready and not halted):
+                while ready and not halted and len(running) < self.max_concurrency:
+                    _, key = heapq.heappop(ready)
+                    if self.on_start is not None:
+                        await self.on_start(graph.nodes[key])
+                    upstream = {source: outputs[source] for source in graph.predecessors[key]}
+                    running[asyncio.create_task(self._run(key, upstream))] = key
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda finished: rank[running[finished]]):
+                    del running[task]
+                    result = task.result()
+                    results.append(result)
+                    if self.on_finish is not None:
+                        await self.on_finish(result)
+                    if result.outcome.status == RunStatus.FAILED:
+                        halted = True
+                    elif result.outcome.status == RunStatus.SUCCEEDED:
+                        outputs[result.node_key] = result.outcome.output_json
+                        for target in graph.successors[result.node_key]:
+                            waiting_on[target] -= 1
+                            if waiting_on[target] == 0:
+                                heapq.heappush(ready, (rank[target], target))
+        finally:
+            for task in running:
+                task.cancel()
+
+        finished = {result.node_key for result in results}
+        return DagRun(
+            results=results,
+            blocked=[key for key in graph.order if key not in finished],
+        )
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import uuid
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from creatory_core.core.config import settings
 from creatory_core.db.models import (
-    NodeType,
     RunStatus,
+    WorkflowEdge,
     WorkflowNode,
     WorkflowRun,
     WorkflowRunStep,
@@ -19,104 +21,255 @@ from creatory_core.services.circuit_breaker import (
     CircuitBreakerTriggered,
     assert_step_budget,
 )
+from creatory_core.services.run_events import RunEvent, RunEventBus, emit, get_run_event_bus
+from creatory_core.services.workflow_dag import (
+    DagExecutor,
+    NodeResult,
+    NodeRunner,
+    WorkflowGraph,
+    WorkflowGraphError,
+    simulate_node,
+)
 
 
-async def run_workflow(
+def _run_payload(workflow_run: WorkflowRun, stage: str) -> dict:
+    return {
+        "run_id": str(workflow_run.id),
+        "status": workflow_run.status.value,
+        "stage": stage,
+        "at": datetime.now(UTC).isoformat(),
+    }
+
+
+def _step_payload(step: WorkflowRunStep) -> dict:
+    return {
+        "run_id": str(step.workflow_run_id),
+        "step_id": str(step.id),
+        "node_key": step.node_key,
+        "status": step.status.value,
+        "at": datetime.now(UTC).isoformat(),
+    }
+
+
+def stored_run_events(
+    workflow_run: WorkflowRun, steps: Sequence[WorkflowRunStep]
+) -> list[RunEvent]:
+    """Events for a finished run rebuilt from its rows, once the bus has dropped them."""
+
+    def event(event_type: str, payload: dict) -> RunEvent:
+        return RunEvent(run_id=workflow_run.id, event_type=event_type, payload=payload)
+
+    return [
+        event("run", _run_payload(workflow_run, "start")),
+        *(event("step", _step_payload(step)) for step in steps),
+        event("run", _run_payload(workflow_run, "final")),
+    ]
+
+
+async def create_workflow_run(
     db: AsyncSession,
     template: WorkflowTemplate,
     created_by,
     conversation_id,
     input_json: dict,
-) -> tuple[WorkflowRun, list[WorkflowRunStep]]:
-    now = datetime.now(UTC)
+    *,
+    status: RunStatus = RunStatus.RUNNING,
+) -> WorkflowRun:
+    """Add a run of ``template`` to the session; the caller commits or executes it."""
     workflow_run = WorkflowRun(
         template_id=template.id,
         conversation_id=conversation_id,
-        status=RunStatus.RUNNING,
+        status=status,
         input_json=input_json,
         output_json={},
-        started_at=now,
+        started_at=datetime.now(UTC) if status == RunStatus.RUNNING else None,
         created_by=created_by,
     )
     db.add(workflow_run)
     await db.flush()
+    return workflow_run
+
+
+async def resume_workflow_run(db: AsyncSession, workflow_run_id) -> WorkflowRun | None:
+    """Reload a queued or interrupted run for execution; ``None`` if nothing is left to do.
+
+    Only ``queued`` and ``running`` runs resume: a failed run stays failed, so a job
+    redelivered after the run was given up on cannot revive it. Steps left behind by
+    an earlier attempt are dropped so the run restarts cleanly.
+    """
+    workflow_run = await db.get(WorkflowRun, workflow_run_id)
+    if workflow_run is None or workflow_run.status not in {RunStatus.QUEUED, RunStatus.RUNNING}:
+        return None
+    await db.execute(
+        delete(WorkflowRunStep).where(WorkflowRunStep.workflow_run_id == workflow_run.id)
+    )
+    workflow_run.status = RunStatus.RUNNING
+    workflow_run.output_json = {}
+    workflow_run.started_at = datetime.now(UTC)
+    workflow_run.ended_at = None
+    await db.flush()
+    return workflow_run
+
+
+async def run_workflow(
+    db: AsyncSession,
+    template: WorkflowTemplate,
+    created_by,
+    conversation_id,
+    input_json: dict,
+    event_bus: RunEventBus | None = None,
+) -> tuple[WorkflowRun, list[WorkflowRunStep]]:
+    workflow_run = await create_workflow_run(db, template, created_by, conversation_id, input_json)
+    return await execute_workflow_run(db, template, workflow_run, event_bus)
+
+
+async def _fail_before_start(
+    db: AsyncSession,
+    workflow_run: WorkflowRun,
+    event_bus: RunEventBus,
+    output_json: dict,
+) -> None:
+    workflow_run.status = RunStatus.FAILED
+    workflow_run.output_json = output_json
+    workflow_run.ended_at = datetime.now(UTC)
+    await db.commit()
+    await db.refresh(workflow_run)
+    await emit(event_bus, workflow_run.id, "run", _run_payload(workflow_run, "final"))
+
+
+async def execute_workflow_run(
+    db: AsyncSession,
+    template: WorkflowTemplate,
+    workflow_run: WorkflowRun,
+    event_bus: RunEventBus | None = None,
+    *,
+    run_node: NodeRunner = simulate_node,
+) -> tuple[WorkflowRun, list[WorkflowRunStep]]:
+    """Execute the template's node graph, running independent branches concurrently.
+
+    Finished steps are buffered and inserted ``WORKFLOW_STEP_BATCH_SIZE`` at a time,
+    each batch committed so readers can follow progress; step events are published
+    as nodes start and finish.
+    """
+    event_bus = event_bus or get_run_event_bus()
+    workflow_run.status = RunStatus.RUNNING
+    workflow_run.started_at = workflow_run.started_at or datetime.now(UTC)
+    await emit(event_bus, workflow_run.id, "run", _run_payload(workflow_run, "start"))
 
     nodes = (
-        await db.scalars(
-            select(WorkflowNode)
-            .where(WorkflowNode.template_id == template.id)
-            .order_by(WorkflowNode.position_x.asc().nullslast(), WorkflowNode.node_key.asc())
-        )
+        await db.scalars(select(WorkflowNode).where(WorkflowNode.template_id == template.id))
+    ).all()
+    edges = (
+        await db.scalars(select(WorkflowEdge).where(WorkflowEdge.template_id == template.id))
     ).all()
-
-    steps: list[WorkflowRunStep] = []
-    run_status = RunStatus.SUCCEEDED
 
     try:
+        graph = WorkflowGraph.build(nodes, edges)
         assert_step_budget(
             requested_steps=len(nodes),
             config=CircuitBreakerConfig(max_steps=settings.circuit_breaker_max_steps),
         )
-    except CircuitBreakerTriggered as exc:
-        workflow_run.status = RunStatus.FAILED
-        workflow_run.output_json = {
-            "steps_completed": 0,
-            "steps_total": len(nodes),
-            "final_status": RunStatus.FAILED.value,
-        }
-        workflow_run.ended_at = datetime.now(UTC)
-        await db.commit()
-        await db.refresh(workflow_run)
-        raise exc
+    except WorkflowGraphError as exc:
+        await _fail_before_start(
+            db,
+            workflow_run,
+            event_bus,
+            {
+                "steps_completed": 0,
+                "steps_total": len(nodes),
+                "final_status": RunStatus.FAILED.value,
+                "error": str(exc),
+            },
+        )
+        raise
+    except CircuitBreakerTriggered:
+        await _fail_before_start(
+            db,
+            workflow_run,
+            event_bus,
+            {
+                "steps_completed": 0,
+                "steps_total": len(nodes),
+                "final_status": RunStatus.FAILED.value,
+            },
+        )
+        raise
+
+    steps: list[WorkflowRunStep] = []
+    pending: list[WorkflowRunStep] = []
+    step_ids = {key: uuid.uuid4() for key in graph.nodes}
 
-    for node in nodes:
-        step_started = datetime.now(UTC)
+    async def write_pending() -> None:
+        if pending:
+            db.add_all(pending)
+            await db.commit()
+            pending.clear()
+
+    async def on_start(node: WorkflowNode) -> None:
+        await emit(
+            event_bus,
+            workflow_run.id,
+            "step",
+            {
+                "run_id": str(workflow_run.id),
+                "step_id": str(step_ids[node.node_key]),
+                "node_key": node.node_key,
+                "status": RunStatus.RUNNING.value,
+                "at": datetime.now(UTC).isoformat(),
+            },
+        )
+
+    async def on_finish(result: NodeResult) -> None:
+        node = graph.nodes[result.node_key]
         step = WorkflowRunStep(
+            id=step_ids[node.node_key],
             workflow_run_id=workflow_run.id,
             node_key=node.node_key,
-            status=RunStatus.RUNNING,
-            input_json={"node": node.node_key, "type": node.type.value},
-            output_json={},
-            started_at=step_started,
+            status=result.outcome.status,
+            input_json={
+                "node": node.node_key,
+                "type": node.type.value,
+                "upstream": graph.predecessors[node.node_key],
+            },
+            output_json=result.outcome.output_json,
+            error_json=result.outcome.error_json,
+            started_at=result.started_at,
+            ended_at=result.ended_at,
             attempt=1,
         )
-        db.add(step)
-        await db.flush()
-
-        if node.type == NodeType.HUMAN_GATE:
-            step.status = RunStatus.WAITING_HUMAN
-            step.output_json = {
-                "message": "Awaiting creator confirmation before continuing.",
-                "human_gate": True,
-            }
-            step.ended_at = datetime.now(UTC)
-            run_status = RunStatus.WAITING_HUMAN
-            steps.append(step)
-            break
-
-        step.status = RunStatus.SUCCEEDED
-        step.output_json = {
-            "message": f"Node {node.node_key} executed successfully",
-            "summary": {
-                "agentic": node.type in {NodeType.AGENT, NodeType.TOOL},
-                "config": node.config_json,
-            },
-        }
-        step.ended_at = datetime.now(UTC)
         steps.append(step)
+        pending.append(step)
+        if len(pending) >= settings.workflow_step_batch_size:
+            await write_pending()
+        await emit(event_bus, workflow_run.id, "step", _step_payload(step))
+
+    dag_run = await DagExecutor(
+        graph,
+        run_node,
+        max_concurrency=settings.workflow_max_concurrency,
+        on_start=on_start,
+        on_finish=on_finish,
+    ).run()
 
+    run_status = dag_run.status
     workflow_run.status = run_status
-    workflow_run.output_json = {
+    output_json: dict = {
         "steps_completed": len(steps),
         "steps_total": len(nodes),
         "final_status": run_status.value,
     }
+    if dag_run.blocked:
+        output_json["blocked_nodes"] = dag_run.blocked
+    workflow_run.output_json = output_json
     if run_status != RunStatus.WAITING_HUMAN:
         workflow_run.ended_at = datetime.now(UTC)
 
+    db.add_all(pending)
     await db.commit()
     await db.refresh(workflow_run)
-    for step in steps:
-        await db.refresh(step)
+    # A run paused at a human gate ends its stream as well.
+    await emit(event_bus, workflow_run.id, "run", _run_payload(workflow_run, "final"))
 
+    rank = {key: index for index, key in enumerate(graph.order)}
+    steps.sort(key=lambda step: rank[step.node_key])
     return workflow_run, steps
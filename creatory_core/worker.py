@@ -1,24 +1,136 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.process import BaseProcess
 
 from creatory_core.core.config import settings
+from creatory_core.db.session import get_session_factory
+from creatory_core.rag.concepts import ConceptExtractionJob
+from creatory_core.services.job_queue import JobConsumer, build_job_consumer
+from creatory_core.services.run_jobs import run_job_handlers
 
 logger = logging.getLogger("creatory.worker")
 
 
-async def run_forever() -> None:
-    logger.info("agent orchestrator worker started", extra={"redis_url": settings.redis_url})
+async def _extract_concepts_forever(session_factory) -> None:
+    concept_job = ConceptExtractionJob(
+        batch_size=settings.rag_concept_batch_size,
+        max_phrases=settings.rag_concept_max_phrases,
+    )
     while True:
-        # Placeholder heartbeat loop for future queue-based orchestration.
-        await asyncio.sleep(15)
-        logger.info("worker heartbeat")
+        processed = 0
+        try:
+            async with session_factory() as db:
+                processed = (await concept_job.run_once(db)).chunks
+        except Exception:
+            logger.exception("concept extraction failed")
+
+        if processed < concept_job.batch_size:
+            # Caught up: wait for new chunks. A full batch means a backlog, so loop again.
+            await asyncio.sleep(settings.rag_concept_interval_seconds)
+            logger.info("worker heartbeat")
+
+
+async def _report_metrics_forever(consumer: JobConsumer, process_index: int) -> None:
+    while True:
+        await asyncio.sleep(settings.job_queue_metrics_interval_seconds)
+        try:
+            report = await consumer.report()
+        except Exception:
+            logger.exception("job queue metrics failed")
+            continue
+        logger.info("job queue metrics", extra={"process": process_index, **report})
+
+
+async def run_forever(process_index: int = 0) -> None:
+    logger.info(
+        "agent orchestrator worker started",
+        extra={"redis_url": settings.redis_url, "process": process_index},
+    )
+    session_factory = get_session_factory()
+    consumer = build_job_consumer(run_job_handlers(session_factory))
+    loops = [consumer.run_forever(), _report_metrics_forever(consumer, process_index)]
+    if process_index == 0:
+        # The extraction state row serializes runs anyway, so one process does it.
+        loops.append(_extract_concepts_forever(session_factory))
+    work = asyncio.gather(*loops)
+    # Cancelling on SIGTERM lets in-flight turns record themselves as interrupted.
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, work.cancel)
+    with contextlib.suppress(asyncio.CancelledError):
+        await work
+
+
+def _run_process(process_index: int) -> None:
+    logging.basicConfig(level=settings.log_level.upper())
+    asyncio.run(run_forever(process_index))
+
+
+def run_pool(
+    processes: int,
+    *,
+    restart_delay_seconds: float = 1.0,
+    shutdown_timeout_seconds: float = 30.0,
+) -> None:
+    """Run ``processes`` worker processes and restart any that exit until stopped.
+
+    Each process runs its own consumer with ``JOB_QUEUE_CONCURRENCY`` slots, so the
+    pool executes up to ``processes * JOB_QUEUE_CONCURRENCY`` jobs at once.
+    """
+    context = multiprocessing.get_context("spawn")
+    workers: dict[int, BaseProcess] = {}
+    stopping = False
+
+    def stop(signum: int, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    def start(process_index: int) -> None:
+        process = context.Process(
+            target=_run_process,
+            args=(process_index,),
+            name=f"creatory-worker-{process_index}",
+        )
+        process.start()
+        workers[process_index] = process
+
+    for process_index in range(processes):
+        start(process_index)
+    try:
+        while not stopping:
+            for process_index, process in list(workers.items()):
+                if not process.is_alive():
+                    logger.warning(
+                        "worker process exited; restarting",
+                        extra={"process": process_index, "exitcode": process.exitcode},
+                    )
+                    start(process_index)
+            time.sleep(restart_delay_seconds)
+    finally:
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
+        for process in workers.values():
+            process.join(timeout=shutdown_timeout_seconds)
 
 
 def main() -> None:
     logging.basicConfig(level=settings.log_level.upper())
-    asyncio.run(run_forever())
+    processes = settings.worker_processes
+    if processes > 1 and settings.job_queue_backend != "redis":
+        logger.warning("WORKER_PROCESSES > 1 needs JOB_QUEUE_BACKEND=redis; running one process")
+        processes = 1
+    if processes > 1:
+        run_pool(processes)
+    else:
+        asyncio.run(run_forever())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+ALTER TABLE knowledge_sources DROP CONSTRAINT IF EXISTS knowledge_sources_ingest_status_check;
+
+ALTER TABLE knowledge_sources
+ADD CONSTRAINT knowledge_sources_ingest_status_check
+CHECK (ingest_status IN ('pending', 'processing', 'embedding', 'ready', 'failed'));
@@ -0,0 +1 @@
+ALTER TABLE knowledge_sources DROP COLUMN IF EXISTS next_chunk_index;
@@ -0,0 +1,10 @@
+ALTER TABLE knowledge_sources ADD COLUMN IF NOT EXISTS next_chunk_index INT NOT NULL DEFAULT 0;
+
+UPDATE knowledge_sources AS ks
+SET next_chunk_index = chunks.next_index
+FROM (
+  SELECT source_id, MAX(chunk_index) + 1 AS next_index
+  FROM knowledge_chunks
+  GROUP BY source_id
+) AS chunks
+WHERE chunks.source_id = ks.id;
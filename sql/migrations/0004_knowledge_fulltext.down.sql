@@ -0,0 +1,7 @@
+DROP INDEX IF EXISTS idx_chunks_search_vector;
+
+ALTER TABLE knowledge_chunks DROP COLUMN IF EXISTS search_vector;
+
+ALTER TABLE knowledge_chunks DROP COLUMN IF EXISTS search_config;
+
+ALTER TABLE workspaces DROP COLUMN IF EXISTS search_config;
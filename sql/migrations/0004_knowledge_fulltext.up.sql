@@ -0,0 +1,8 @@
+ALTER TABLE workspaces ADD COLUMN IF NOT EXISTS search_config REGCONFIG NOT NULL DEFAULT 'simple';
+
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS search_config REGCONFIG NOT NULL DEFAULT 'simple';
+
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+  GENERATED ALWAYS AS (to_tsvector(search_config, content)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_search_vector ON knowledge_chunks USING GIN (search_vector);
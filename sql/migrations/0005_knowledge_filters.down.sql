@@ -0,0 +1,7 @@
+DROP INDEX IF EXISTS idx_chunks_metadata;
+
+DROP INDEX IF EXISTS idx_knowledge_sources_metadata;
+
+DROP INDEX IF EXISTS idx_knowledge_sources_workspace_created_at;
+
+DROP INDEX IF EXISTS idx_knowledge_sources_workspace_type;
@@ -0,0 +1,10 @@
+CREATE INDEX IF NOT EXISTS idx_knowledge_sources_workspace_type
+  ON knowledge_sources(workspace_id, source_type);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_sources_workspace_created_at
+  ON knowledge_sources(workspace_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_sources_metadata
+  ON knowledge_sources USING GIN (metadata_json);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_metadata ON knowledge_chunks USING GIN (metadata_json);
@@ -0,0 +1,3 @@
+DROP INDEX IF EXISTS idx_chunk_embeddings_model_hash;
+
+ALTER TABLE knowledge_chunks DROP COLUMN IF EXISTS content_hash;
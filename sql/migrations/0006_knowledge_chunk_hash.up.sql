@@ -0,0 +1,8 @@
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+UPDATE knowledge_chunks
+SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')
+WHERE content_hash IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_model_hash
+  ON chunk_embeddings(model_name, content_hash);
@@ -0,0 +1,13 @@
+DROP TABLE IF EXISTS concept_extraction_state;
+
+DROP TABLE IF EXISTS knowledge_chunk_concepts;
+
+ALTER TABLE concept_edges DROP CONSTRAINT IF EXISTS uq_concept_edges_pair;
+
+ALTER TABLE concept_edges DROP COLUMN IF EXISTS co_occurrences;
+
+ALTER TABLE concept_nodes DROP COLUMN IF EXISTS chunk_count;
+
+DROP INDEX IF EXISTS idx_chunks_ingest_seq;
+
+ALTER TABLE knowledge_chunks DROP COLUMN IF EXISTS ingest_seq;
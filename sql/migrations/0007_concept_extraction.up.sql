@@ -0,0 +1,34 @@
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS ingest_seq BIGINT
+  GENERATED BY DEFAULT AS IDENTITY;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_ingest_seq ON knowledge_chunks(ingest_seq);
+
+ALTER TABLE concept_nodes ADD COLUMN IF NOT EXISTS chunk_count INT NOT NULL DEFAULT 0;
+
+ALTER TABLE concept_edges ADD COLUMN IF NOT EXISTS co_occurrences INT NOT NULL DEFAULT 0;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'uq_concept_edges_pair'
+  ) THEN
+    ALTER TABLE concept_edges ADD CONSTRAINT uq_concept_edges_pair
+      UNIQUE (workspace_id, src_concept_id, dst_concept_id, relation_type);
+  END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS knowledge_chunk_concepts (
+  chunk_id UUID NOT NULL REFERENCES knowledge_chunks(id) ON DELETE CASCADE,
+  concept_id UUID NOT NULL REFERENCES concept_nodes(id) ON DELETE CASCADE,
+  weight DOUBLE PRECISION NOT NULL DEFAULT 1.0,
+  PRIMARY KEY (chunk_id, concept_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_concepts_concept ON knowledge_chunk_concepts(concept_id);
+
+CREATE TABLE IF NOT EXISTS concept_extraction_state (
+  job_name TEXT PRIMARY KEY,
+  last_chunk_seq BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
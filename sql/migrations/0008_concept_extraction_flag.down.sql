@@ -0,0 +1,6 @@
+ALTER TABLE concept_extraction_state
+  ADD COLUMN IF NOT EXISTS last_chunk_seq BIGINT NOT NULL DEFAULT 0;
+
+DROP INDEX IF EXISTS idx_chunks_concepts_pending;
+
+ALTER TABLE knowledge_chunks DROP COLUMN IF EXISTS concepts_extracted_at;
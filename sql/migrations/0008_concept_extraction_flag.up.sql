@@ -0,0 +1,16 @@
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS concepts_extracted_at TIMESTAMPTZ;
+
+UPDATE knowledge_chunks
+SET concepts_extracted_at = now()
+WHERE concepts_extracted_at IS NULL
+  AND EXISTS (
+    SELECT 1 FROM knowledge_chunk_concepts
+    WHERE knowledge_chunk_concepts.chunk_id = knowledge_chunks.id
+  );
+
+CREATE INDEX IF NOT EXISTS idx_chunks_concepts_pending
+  ON knowledge_chunks(ingest_seq)
+  WHERE concepts_extracted_at IS NULL;
+
+-- Chunks are now picked by flag, so the state row is only a lock.
+ALTER TABLE concept_extraction_state DROP COLUMN IF EXISTS last_chunk_seq;
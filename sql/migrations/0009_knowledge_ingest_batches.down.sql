@@ -0,0 +1 @@
+DROP TABLE IF EXISTS knowledge_ingest_batches;
@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS knowledge_ingest_batches (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  source_id UUID NOT NULL REFERENCES knowledge_sources(id) ON DELETE CASCADE,
+  start_index INTEGER NOT NULL,
+  chunks_json JSONB NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingest_batches_source ON knowledge_ingest_batches(source_id);
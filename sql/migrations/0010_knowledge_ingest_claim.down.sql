@@ -0,0 +1 @@
+ALTER TABLE knowledge_sources DROP COLUMN IF EXISTS ingest_claimed_at;
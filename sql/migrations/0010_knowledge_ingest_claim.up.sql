@@ -0,0 +1 @@
+ALTER TABLE knowledge_sources ADD COLUMN IF NOT EXISTS ingest_claimed_at TIMESTAMPTZ;
@@ -0,0 +1,519 @@
+"""Reproducible retrieval benchmark for ``creatory_core.rag``.
+
+Generates seeded synthetic workspaces (topic-clustered chunks, a concept per topic
+and a ring of related-topic edges), then measures every retrieval strategy:
+build time, memory, per-query p50/p95/p99 latency and recall@k against the
+topic ground truth. Results are written as stable, key-sorted JSON so runs from
+two releases can be diffed directly.
+
+In-process strategies (BM25F, vectorized BM25F, concept graph, RRF hybrid) need no
+database. ``--database-url`` additionally loads the corpus into a migrated
+Postgres (pgvector and full-text columns are Postgres-only, so SQLite is not
+supported) and benchmarks ``HybridRAGService`` end to end.
+
+    python tests/benchmarks/rag_benchmark.py --sizes 1k,10k,100k,1m --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from creatory_core.rag.bm25 import BM25FScorer
+from creatory_core.rag.fusion import reciprocal_rank_fusion
+from creatory_core.rag.graph import ConceptGraph, ConceptRecord, EdgeRecord, build_concept_graph
+from creatory_core.rag.index import InvertedIndex, tokenize
+
+SIZE_ALIASES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BACKGROUND_VOCABULARY = 20_000
+BACKGROUND_WORDS_PER_CHUNK = 40
+TOPIC_TERMS = 6
+
+Ranker = Callable[[list[str]], list[tuple[uuid.UUID, float]]]
+
+
+@dataclass(frozen=True)
+class SyntheticChunk:
+    id: uuid.UUID
+    source_id: uuid.UUID
+    topic: int
+    content: str
+
+
+@dataclass(frozen=True)
+class SyntheticQuery:
+    text: str
+    topic: int
+
+
+@dataclass
+class SyntheticCorpus:
+    size: int
+    seed: int
+    topic_terms: list[tuple[str, ...]]
+    chunks: list[SyntheticChunk]
+    concepts: list[ConceptRecord]
+    edges: list[EdgeRecord]
+    queries: list[SyntheticQuery]
+    chunks_by_topic: dict[int, set[uuid.UUID]] = field(default_factory=dict)
+
+
+def parse_sizes(raw: str) -> list[int]:
+    sizes = []
+    for item in raw.split(","):
+        item = item.strip().lower()
+        sizes.append(SIZE_ALIASES.get(item) or int(item))
+    return sizes
+
+
+def _seeded_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_corpus(size: int, *, seed: int = 7, query_count: int = 200) -> SyntheticCorpus:
+    """Deterministic corpus: same ``size`` and ``seed`` always yield the same chunks."""
+    rng = random.Random(f"{seed}:{size}")
+    topic_count = max(10, int(size**0.5))
+    chunks_per_source = 500
+
+    background = [f"word{index:05d}" for index in range(BACKGROUND_VOCABULARY)]
+    # Zipf-like background frequencies, as in natural text.
+    cumulative: list[float] = []
+    running = 0.0
+    for rank in range(1, BACKGROUND_VOCABULARY + 1):
+        running += 1.0 / rank
+        cumulative.append(running)
+
+    topic_terms = [
+        tuple(f"topic{topic:04d}term{term}" for term in range(TOPIC_TERMS))
+        for topic in range(topic_count)
+    ]
+
+    chunks: list[SyntheticChunk] = []
+    chunks_by_topic: dict[int, set[uuid.UUID]] = {topic: set() for topic in range(topic_count)}
+    source_id = _seeded_uuid(rng)
+    for position in range(size):
+        if position and position % chunks_per_source == 0:
+            source_id = _seeded_uuid(rng)
+        topic = rng.randrange(topic_count)
+        words = rng.choices(background, cum_weights=cumulative, k=BACKGROUND_WORDS_PER_CHUNK)
+        words.extend(rng.sample(topic_terms[topic], k=rng.randint(3, TOPIC_TERMS)))
+        rng.shuffle(words)
+        chunk = SyntheticChunk(
+            id=_seeded_uuid(rng),
+            source_id=source_id,
+            topic=topic,
+            content=" ".join(words),
+        )
+        chunks.append(chunk)
+        chunks_by_topic[topic].add(chunk.id)
+
+    concepts = [
+        ConceptRecord(
+            id=_seeded_uuid(rng),
+            concept_key=f"topic-{topic}",
+            label=" ".join(terms[:2]),
+        )
+        for topic, terms in enumerate(topic_terms)
+    ]
+    edges = [
+        EdgeRecord(
+            src_concept_id=concepts[topic].id,
+            dst_concept_id=concepts[(topic + 1) % topic_count].id,
+            weight=0.5,
+        )
+        for topic in range(topic_count)
+    ]
+
+    queries = []
+    for _ in range(query_count):
+        topic = rng.randrange(topic_count)
+        terms = rng.sample(topic_terms[topic], k=2)
+        terms.append(rng.choice(background[:200]))
+        queries.append(SyntheticQuery(text=" ".join(terms), topic=topic))
+
+    return SyntheticCorpus(
+        size=size,
+        seed=seed,
+        topic_terms=topic_terms,
+        chunks=chunks,
+        concepts=concepts,
+        edges=edges,
+        queries=queries,
+        chunks_by_topic=chunks_by_topic,
+    )
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def recall_at_k(retrieved: Sequence[uuid.UUID], relevant: set[uuid.UUID], k: int) -> float:
+    if not relevant:
+        return 0.0
+    hits = sum(1 for chunk_id in retrieved[:k] if chunk_id in relevant)
+    return hits / min(k, len(relevant))
+
+
+def _measured(build: Callable[[], Any]) -> tuple[Any, float, float]:
+    """Run ``build`` returning (result, elapsed ms, peak traced MiB)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = build()
+        elapsed = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def _latency_summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "p50": round(percentile(ordered, 0.50), 4),
+        "p95": round(percentile(ordered, 0.95), 4),
+        "p99": round(percentile(ordered, 0.99), 4),
+    }
+
+
+def run_queries(
+    corpus: SyntheticCorpus,
+    ranker: Ranker,
+    *,
+    top_k: int,
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    recalls: list[float] = []
+    for query in corpus.queries:
+        started = time.perf_counter()
+        ranked = ranker(tokenize(query.text))
+        latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(
+            recall_at_k(
+                [chunk_id for chunk_id, _ in ranked],
+                corpus.chunks_by_topic[query.topic],
+                top_k,
+            )
+        )
+    return {
+        "latency_ms": _latency_summary(latencies),
+        "recall_at_k": round(sum(recalls) / len(recalls), 4) if recalls else 0.0,
+    }
+
+
+def build_index(corpus: SyntheticCorpus) -> InvertedIndex:
+    index = InvertedIndex()
+    for chunk in corpus.chunks:
+        index.add(chunk.id, chunk.source_id, chunk.content)
+    return index
+
+
+def in_process_strategies(
+    index: InvertedIndex,
+    graph: ConceptGraph,
+    *,
+    top_k: int,
+    candidate_limit: int,
+) -> dict[str, tuple[Callable[[], Any], Ranker]]:
+    """Strategy name -> (prepare step measured as build cost, query function)."""
+    scorer = BM25FScorer()
+
+    def graph_rank(tokens: list[str]) -> list[tuple[uuid.UUID, float]]:
+        seeds = graph.seeds(tokens)
+        if not seeds:
+            return []
+        scores = graph.chunk_scores(graph.activate(seeds))
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:candidate_limit]
+
+    def hybrid_rank(tokens: list[str]) -> list[tuple[uuid.UUID, float]]:
+        fused = reciprocal_rank_fusion(
+            {
+                "lexical": scorer.top_k(index, tokens, candidate_limit),
+                "graph": graph_rank(tokens),
+            },
+            weights={"lexical": 1.0, "graph": 0.5},
+        )
+        return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    strategies: dict[str, tuple[Callable[[], Any], Ranker]] = {
+        "bm25f": (lambda: None, lambda tokens: scorer.top_k(index, tokens, top_k)),
+        "graph": (lambda: None, lambda tokens: graph_rank(tokens)[:top_k]),
+        "hybrid-rrf": (lambda: None, hybrid_rank),
+    }
+
+    try:
+        from creatory_core.rag.vectorized import VectorizedBM25FScorer
+
+        vectorized = VectorizedBM25FScorer()
+    except RuntimeError:
+        return strategies
+    strategies["bm25f-numpy"] = (
+        lambda: vectorized.matrix(index),
+        lambda tokens: vectorized.top_k(index, tokens, top_k),
+    )
+    return strategies
+
+
+def benchmark_in_process(corpus: SyntheticCorpus, *, top_k: int) -> list[dict[str, Any]]:
+    index, index_ms, index_mb = _measured(lambda: build_index(corpus))
+    graph, graph_ms, graph_mb = _measured(
+        lambda: build_concept_graph(corpus.concepts, corpus.edges, index)
+    )
+
+    results = []
+    strategies = in_process_strategies(index, graph, top_k=top_k, candidate_limit=top_k * 4)
+    for name, (prepare, ranker) in sorted(strategies.items()):
+        _, prepare_ms, prepare_mb = _measured(prepare)
+        results.append(
+            {
+                "size": corpus.size,
+                "strategy": name,
+                "build_ms": {
+                    "index": round(index_ms, 2),
+                    "graph": round(graph_ms, 2),
+                    "prepare": round(prepare_ms, 2),
+                },
+                "memory_mb": {
+                    "index": round(index_mb, 2),
+                    "graph": round(graph_mb, 2),
+                    "prepare": round(prepare_mb, 2),
+                },
+                **run_queries(corpus, ranker, top_k=top_k),
+            }
+        )
+    return results
+
+
+async def benchmark_postgres(
+    corpus: SyntheticCorpus,
+    database_url: str,
+    *,
+    top_k: int,
+    keep_data: bool = False,
+) -> list[dict[str, Any]]:
+    """Load ``corpus`` into a migrated database and time ``HybridRAGService.search``."""
+    from sqlalchemy import delete
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from creatory_core.db.models import (
+        ConceptEdge,
+        ConceptNode,
+        KnowledgeSource,
+        SourceType,
+        User,
+        Workspace,
+    )
+    from creatory_core.rag.embeddings import HashingEmbedder
+    from creatory_core.rag.hybrid import HybridRAGService, LexicalBackend, RetrievalMode
+    from creatory_core.rag.ingest import ChunkIngestPipeline, ChunkInput
+
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    embedder = HashingEmbedder()
+    pipeline = ChunkIngestPipeline(embedder, batch_size=500)
+
+    async with session_factory() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex}@example.invalid", password_hash="!")
+        db.add(user)
+        await db.flush()
+        workspace = Workspace(
+            name="rag-benchmark",
+            slug=f"rag-bench-{uuid.uuid4().hex[:12]}",
+            owner_id=user.id,
+        )
+        db.add(workspace)
+        await db.flush()
+
+        started = time.perf_counter()
+        sources: dict[uuid.UUID, KnowledgeSource] = {}
+        pending: list[SyntheticChunk] = []
+
+        async def flush_pending() -> None:
+            by_source: dict[uuid.UUID, list[SyntheticChunk]] = {}
+            for chunk in pending:
+                by_source.setdefault(chunk.source_id, []).append(chunk)
+            for source_id, items in by_source.items():
+                source = sources[source_id]
+                await pipeline.write_batch(
+                    db,
+                    source,
+                    [ChunkInput(content=item.content) for item in items],
+                    start_index=source.next_chunk_index,
+                )
+                source.next_chunk_index += len(items)
+            await db.commit()
+            pending.clear()
+
+        for chunk in corpus.chunks:
+            if chunk.source_id not in sources:
+                source = KnowledgeSource(
+                    id=chunk.source_id,
+                    workspace_id=workspace.id,
+                    source_type=SourceType.TEXT,
+                    title=f"synthetic source {len(sources)}",
+                    ingest_status="ready",
+                    next_chunk_index=0,
+                    created_by=user.id,
+                )
+                db.add(source)
+                sources[chunk.source_id] = source
+            pending.append(chunk)
+            if len(pending) >= pipeline.batch_size:
+                await flush_pending()
+        await flush_pending()
+
+        db.add_all(
+            ConceptNode(
+                id=concept.id,
+                workspace_id=workspace.id,
+                concept_key=concept.concept_key,
+                label=concept.label,
+                node_type="topic",
+            )
+            for concept in corpus.concepts
+        )
+        await db.flush()
+        db.add_all(
+            ConceptEdge(
+                workspace_id=workspace.id,
+                src_concept_id=edge.src_concept_id,
+                dst_concept_id=edge.dst_concept_id,
+                relation_type="related",
+                weight=edge.weight,
+            )
+            for edge in corpus.edges
+        )
+        await db.commit()
+        load_ms = (time.perf_counter() - started) * 1000
+        workspace_id, user_id = workspace.id, user.id
+
+    variants = {
+        "service-lexical-memory": (RetrievalMode.LEXICAL, LexicalBackend.MEMORY),
+        "service-lexical-postgres": (RetrievalMode.LEXICAL, LexicalBackend.POSTGRES),
+        "service-dense": (RetrievalMode.DENSE, LexicalBackend.MEMORY),
+        "service-hybrid": (RetrievalMode.HYBRID, LexicalBackend.MEMORY),
+    }
+    results = []
+    try:
+        for name, (mode, backend) in variants.items():
+            service = HybridRAGService(
+                embedder=embedder, default_mode=mode, lexical_backend=backend
+            )
+            service.result_cache = None
+            latencies: list[float] = []
+            recalls: list[float] = []
+            async with session_factory() as db:
+                # First query pays for loading the in-process index and graph.
+                started = time.perf_counter()
+                await service.search(db, workspace_id, corpus.queries[0].text, top_k=top_k)
+                warmup_ms = (time.perf_counter() - started) * 1000
+                for query in corpus.queries:
+                    started = time.perf_counter()
+                    outcome = await service.search(db, workspace_id, query.text, top_k=top_k)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    recalls.append(
+                        recall_at_k(
+                            [item.chunk_id for item in outcome.contexts],
+                            corpus.chunks_by_topic[query.topic],
+                            top_k,
+                        )
+                    )
+                    await db.rollback()
+            results.append(
+                {
+                    "size": corpus.size,
+                    "strategy": name,
+                    "build_ms": {"load": round(load_ms, 2), "warmup": round(warmup_ms, 2)},
+                    "latency_ms": _latency_summary(latencies),
+                    "recall_at_k": round(sum(recalls) / len(recalls), 4),
+                }
+            )
+    finally:
+        if not keep_data:
+            async with session_factory() as db:
+                await db.execute(delete(Workspace).where(Workspace.id == workspace_id))
+                await db.execute(delete(User).where(User.id == user_id))
+                await db.commit()
+        await engine.dispose()
+    return results
+
+
+def run_benchmark(
+    sizes: Sequence[int],
+    *,
+    seed: int = 7,
+    query_count: int = 200,
+    top_k: int = 10,
+    database_url: str | None = None,
+    keep_data: bool = False,
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    for size in sizes:
+        corpus = generate_corpus(size, seed=seed, query_count=query_count)
+        results.extend(benchmark_in_process(corpus, top_k=top_k))
+        if database_url:
+            results.extend(
+                asyncio.run(
+                    benchmark_postgres(corpus, database_url, top_k=top_k, keep_data=keep_data)
+                )
+            )
+    return {
+        "meta": {
+            "seed": seed,
+            "queries": query_count,
+            "top_k": top_k,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1k,10k", help="comma separated, e.g. 1k,10k,100k,1m")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--database-url", default=None, help="postgresql+asyncpg://...")
+    parser.add_argument("--keep-data", action="store_true")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON here, else stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        parse_sizes(args.sizes),
+        seed=args.seed,
+        query_count=args.queries,
+        top_k=args.top_k,
+        database_url=args.database_url,
+        keep_data=args.keep_data,
+    )
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is None:
+        sys.stdout.write(payload + "\n")
+    else:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
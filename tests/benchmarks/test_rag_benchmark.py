@@ -0,0 +1,26 @@
+from rag_benchmark import generate_corpus, parse_sizes, percentile, run_benchmark
+
+
+def test_generate_corpus_is_deterministic() -> None:
+    first = generate_corpus(300, seed=3, query_count=5)
+    second = generate_corpus(300, seed=3, query_count=5)
+    assert [chunk.id for chunk in first.chunks] == [chunk.id for chunk in second.chunks]
+    assert [query.text for query in first.queries] == [query.text for query in second.queries]
+    assert sum(len(ids) for ids in first.chunks_by_topic.values()) == 300
+
+
+def test_parse_sizes_and_percentile() -> None:
+    assert parse_sizes("1k,10k,250") == [1_000, 10_000, 250]
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.99) == 4.0
+
+
+def test_run_benchmark_reports_every_in_process_strategy() -> None:
+    report = run_benchmark([400], query_count=10, top_k=5)
+    strategies = {item["strategy"] for item in report["results"]}
+    assert {"bm25f", "graph", "hybrid-rrf"} <= strategies
+    for item in report["results"]:
+        assert set(item["latency_ms"]) == {"mean", "p50", "p95", "p99"}
+        assert 0.0 <= item["recall_at_k"] <= 1.0
+    lexical = next(item for item in report["results"] if item["strategy"] == "bm25f")
+    assert lexical["recall_at_k"] > 0.5
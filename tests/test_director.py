@@ -1,5 +1,5 @@
 from creatory_core.db.models import ThreadKind
-from creatory_core.services.director import _assistant_text, _build_plan
+from creatory_core.services.director import _assistant_text, _build_plan, _stream_pieces
 
 
 def test_build_plan_for_main_thread() -> None:
@@ -21,3 +21,10 @@ def test_assistant_text_quick_contains_recommendation() -> None:
 def test_assistant_text_main_contains_execution_plan() -> None:
     text = _assistant_text("Create launch plan", ThreadKind.MAIN, ["a", "b"])
     assert "Execution plan" in text
+
+
+def test_stream_pieces_rebuild_assistant_text() -> None:
+    text = _assistant_text("Create launch plan", ThreadKind.MAIN, ["a", "b"])
+    pieces = _stream_pieces(text)
+    assert len(pieces) > 10
+    assert "".join(pieces) == text
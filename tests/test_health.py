@@ -1,7 +1,9 @@
 import asyncio
+from types import SimpleNamespace
 
-from creatory_core.api.routes.health import live
+from creatory_core.api.routes.health import jobs, live
 from creatory_core.main import root
+from creatory_core.services.job_queue import InMemoryJobQueue, JobConsumer
 
 
 def test_root_status() -> None:
@@ -11,3 +13,15 @@ def test_root_status() -> None:
 
 def test_live_probe() -> None:
     assert asyncio.run(live()) == {"status": "ok"}
+
+
+def test_jobs_probe_reports_aggregates_only() -> None:
+    consumer = JobConsumer(InMemoryJobQueue(), {})
+    consumer.metrics.observe_wait("workspace-secret", 1.5)
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(job_consumer=consumer)))
+
+    payload = asyncio.run(jobs(request))
+
+    assert payload["consumer"]["started"] == 1
+    assert "wait_by_workspace" not in payload["consumer"]
+    assert "workspace-secret" not in repr(payload)
@@ -0,0 +1,364 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from creatory_core.db.models import AgentRun, RunStatus, WorkflowRun
+from creatory_core.services.job_queue import (
+    LEASE_EXPIRED_ERROR,
+    SHARED_PARTITION,
+    InMemoryJobQueue,
+    Job,
+    JobConsumer,
+    JobKind,
+    JobQueueUnavailable,
+    PermanentJobError,
+    QueueDepth,
+    backoff_delay,
+    enqueue_run,
+    fail_unqueued_run,
+)
+from creatory_core.services.job_scheduling import FairShareScheduler, WaitTimeStats
+from creatory_core.services.workflow_runner import resume_workflow_run
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lease_hands_each_job_to_one_consumer_until_acked() -> None:
+    queue = InMemoryJobQueue(clock=FakeClock())
+
+    async def scenario() -> None:
+        first = await queue.enqueue("director_turn", {"run_id": "a"})
+        await queue.enqueue("director_turn", {"run_id": "b"})
+
+        leases = await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+        assert [lease.job.id for lease in leases] == [first.id]
+        assert leases[0].job.attempts == 1
+        assert len(await queue.lease(SHARED_PARTITION, limit=5, visibility_timeout=30)) == 1
+        assert await queue.lease(SHARED_PARTITION, limit=5, visibility_timeout=30) == []
+
+        assert await queue.ack(leases[0])
+        depth = await queue.depth()
+        assert (depth.ready, depth.in_flight) == (0, 1)
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_redelivered_and_the_stale_token_rejected() -> None:
+    clock = FakeClock()
+    queue = InMemoryJobQueue(clock=clock)
+
+    async def scenario() -> None:
+        await queue.enqueue("workflow_run", {"run_id": "a"})
+        (stale,) = await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+
+        clock.now += 31
+        (fresh,) = await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+        assert fresh.job.id == stale.job.id
+        assert fresh.job.attempts == 2
+        assert not await queue.ack(stale)
+        assert await queue.extend(stale, visibility_timeout=30) is None
+        assert await queue.ack(fresh)
+
+    asyncio.run(scenario())
+
+
+def test_extended_lease_is_not_redelivered() -> None:
+    clock = FakeClock()
+    queue = InMemoryJobQueue(clock=clock)
+
+    async def scenario() -> None:
+        await queue.enqueue("workflow_run", {"run_id": "a"})
+        (lease,) = await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+        clock.now += 20
+        lease = await queue.extend(lease, visibility_timeout=30)
+        clock.now += 20
+        assert await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30) == []
+        assert await queue.ack(lease)
+
+    asyncio.run(scenario())
+
+
+def test_retry_delays_the_job_and_dead_letter_removes_it() -> None:
+    clock = FakeClock()
+    queue = InMemoryJobQueue(clock=clock)
+
+    async def scenario() -> None:
+        await queue.enqueue("director_turn", {"run_id": "a"})
+        (lease,) = await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+        assert await queue.retry(lease, delay_seconds=10, error="boom")
+        assert await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30) == []
+        assert (await queue.depth()).delayed == 1
+
+        clock.now += 10
+        (lease,) = await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+        assert lease.job.last_error == "boom"
+        assert await queue.dead_letter(lease, error="gave up")
+        depth = await queue.depth()
+        assert (depth.ready, depth.delayed, depth.in_flight, depth.dead) == (0, 0, 0, 1)
+
+    asyncio.run(scenario())
+
+
+def test_backoff_delay_doubles_up_to_the_cap() -> None:
+    delays = [
+        backoff_delay(attempt, base_seconds=2, max_seconds=20, jitter=lambda: 1.0)
+        for attempt in range(1, 6)
+    ]
+    assert delays == [2, 4, 8, 16, 20]
+    assert backoff_delay(3, base_seconds=2, max_seconds=20, jitter=lambda: 0.0) == 4
+
+
+class FlakyHandler:
+    def __init__(self, failures: int, error: type[Exception] = RuntimeError) -> None:
+        self.failures = failures
+        self.error = error
+        self.calls: list[int] = []
+        self.dead: list[str] = []
+
+    async def handle(self, job: Job) -> None:
+        self.calls.append(job.attempts)
+        if len(self.calls) <= self.failures:
+            raise self.error("not yet")
+
+    async def on_dead_letter(self, job: Job, error: str) -> None:
+        self.dead.append(error)
+
+
+def _consumer(queue: InMemoryJobQueue, handler: FlakyHandler, **options) -> JobConsumer:
+    return JobConsumer(
+        queue,
+        {"director_turn": handler},
+        retry_base_seconds=0,
+        retry_max_seconds=0,
+        **options,
+    )
+
+
+def test_consumer_retries_failed_jobs_until_they_succeed() -> None:
+    queue = InMemoryJobQueue()
+    handler = FlakyHandler(failures=2)
+    consumer = _consumer(queue, handler, max_attempts=5)
+
+    async def scenario() -> None:
+        await queue.enqueue("director_turn", {"run_id": "a"})
+        for _ in range(3):
+            assert await consumer.poll_once() == 1
+            await consumer.drain()
+        assert handler.calls == [1, 2, 3]
+        assert handler.dead == []
+        assert await queue.depth() == QueueDepth(ready=0, delayed=0, in_flight=0, dead=0)
+
+    asyncio.run(scenario())
+
+
+def test_consumer_dead_letters_after_max_attempts() -> None:
+    queue = InMemoryJobQueue()
+    handler = FlakyHandler(failures=10)
+    consumer = _consumer(queue, handler, max_attempts=2)
+
+    async def scenario() -> None:
+        await queue.enqueue("director_turn", {"run_id": "a"})
+        for _ in range(2):
+            await consumer.poll_once()
+            await consumer.drain()
+        assert await consumer.poll_once() == 0
+        assert handler.calls == [1, 2]
+        assert handler.dead == ["RuntimeError: not yet"]
+        assert (await queue.depth()).dead == 1
+
+    asyncio.run(scenario())
+
+
+def test_consumer_dead_letters_permanent_errors_without_retrying() -> None:
+    queue = InMemoryJobQueue()
+    handler = FlakyHandler(failures=1, error=PermanentJobError)
+    consumer = _consumer(queue, handler, max_attempts=5)
+
+    async def scenario() -> None:
+        await queue.enqueue("director_turn", {"run_id": "a"})
+        await consumer.poll_once()
+        await consumer.drain()
+        assert handler.calls == [1]
+        assert handler.dead == ["not yet"]
+
+    asyncio.run(scenario())
+
+
+def test_consumer_dead_letters_jobs_whose_leases_keep_expiring() -> None:
+    clock = FakeClock()
+    queue = InMemoryJobQueue(clock=clock)
+    handler = FlakyHandler(failures=0)
+    consumer = _consumer(queue, handler, max_attempts=2)
+
+    async def scenario() -> None:
+        await queue.enqueue("director_turn", {"run_id": "a"})
+        # Two workers crash mid-job: their leases expire without an ack or retry.
+        for _ in range(2):
+            await queue.lease(SHARED_PARTITION, limit=1, visibility_timeout=30)
+            clock.now += 31
+        assert await consumer.poll_once() == 1
+        await consumer.drain()
+        assert handler.calls == []
+        assert handler.dead == [LEASE_EXPIRED_ERROR]
+        assert await queue.depth() == QueueDepth(ready=0, delayed=0, in_flight=0, dead=1)
+
+    asyncio.run(scenario())
+
+
+def test_consumer_keeps_concurrency_bounded() -> None:
+    queue = InMemoryJobQueue()
+    release = asyncio.Event()
+    running: list[int] = []
+
+    class BlockingHandler:
+        async def handle(self, job: Job) -> None:
+            running.append(job.attempts)
+            await release.wait()
+
+        async def on_dead_letter(self, job: Job, error: str) -> None:
+            pass
+
+    consumer = JobConsumer(queue, {"workflow_run": BlockingHandler()}, concurrency=2)
+
+    async def scenario() -> None:
+        for index in range(5):
+            await queue.enqueue("workflow_run", {"run_id": str(index)})
+        assert await consumer.poll_once() == 2
+        assert await consumer.poll_once() == 0
+        await asyncio.sleep(0)
+        assert consumer.active == len(running) == 2
+        release.set()
+        await consumer.drain()
+        assert await consumer.poll_once() == 2
+        await consumer.drain()
+        assert (await queue.depth()).ready == 1
+
+    asyncio.run(scenario())
+
+
+def test_workspace_cap_limits_jobs_in_flight_per_workspace() -> None:
+    queue = InMemoryJobQueue(clock=FakeClock())
+
+    async def scenario() -> None:
+        for _ in range(3):
+            await queue.enqueue("workflow_run", {}, workspace_id="busy")
+        await queue.enqueue("workflow_run", {}, workspace_id="quiet")
+        assert sorted(await queue.due_partitions()) == ["busy", "quiet"]
+
+        leases = await queue.lease("busy", limit=3, visibility_timeout=30, max_in_flight=2)
+        assert len(leases) == 2
+        assert await queue.lease("busy", limit=1, visibility_timeout=30, max_in_flight=2) == []
+        depths = await queue.partition_depths()
+        assert (depths["busy"].ready, depths["busy"].in_flight) == (1, 2)
+
+        await queue.ack(leases[0])
+        assert len(await queue.lease("busy", limit=1, visibility_timeout=30, max_in_flight=2)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_fair_share_scheduler_interleaves_by_weight() -> None:
+    scheduler = FairShareScheduler({"paid": 2.0})
+    picks = []
+    for _ in range(6):
+        workspace = scheduler.pick({"free", "paid"})
+        scheduler.charge(workspace)
+        picks.append(workspace)
+    assert picks.count("paid") == 4
+    assert picks.count("free") == 2
+
+
+def test_fair_share_scheduler_does_not_bank_idle_time() -> None:
+    scheduler = FairShareScheduler()
+    for _ in range(10):
+        scheduler.charge(scheduler.pick({"busy"}))
+    picks = []
+    for _ in range(4):
+        workspace = scheduler.pick({"busy", "returning"})
+        scheduler.charge(workspace)
+        picks.append(workspace)
+    assert picks.count("returning") == 2
+
+
+def test_consumer_serves_small_workspaces_before_draining_a_backlog() -> None:
+    queue = InMemoryJobQueue()
+    order: list[str] = []
+
+    class RecordingHandler:
+        async def handle(self, job: Job) -> None:
+            order.append(job.workspace_id)
+
+        async def on_dead_letter(self, job: Job, error: str) -> None:
+            pass
+
+    consumer = JobConsumer(queue, {"director_turn": RecordingHandler()}, concurrency=2)
+
+    async def scenario() -> None:
+        for _ in range(20):
+            await queue.enqueue("director_turn", {}, workspace_id="noisy")
+        await queue.enqueue("director_turn", {}, workspace_id="small")
+        await consumer.poll_once()
+        await consumer.drain()
+        assert sorted(order) == ["noisy", "small"]
+        assert consumer.metrics.started == 2
+        assert consumer.metrics.wait.count == 2
+        report = await consumer.report()
+        assert report["depth"]["ready"] == 19
+        assert report["depth_by_workspace"]["noisy"]["ready"] == 19
+
+    asyncio.run(scenario())
+
+
+def test_wait_time_stats_percentiles() -> None:
+    stats = WaitTimeStats()
+    for seconds in range(1, 101):
+        stats.observe(float(seconds))
+    assert stats.percentile(0.5) == 50.0
+    assert stats.percentile(0.95) == 95.0
+    assert stats.snapshot()["max_seconds"] == 100.0
+
+
+class _Session:
+    def __init__(self, *rows) -> None:
+        self.rows = {row.id: row for row in rows}
+        self.commits = 0
+
+    async def get(self, model, row_id):
+        return self.rows.get(row_id)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def test_run_refused_by_the_queue_is_failed_not_left_queued(monkeypatch) -> None:
+    class DownQueue:
+        async def enqueue(self, *args, **kwargs) -> Job:
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr("creatory_core.services.job_queue.get_job_queue", DownQueue)
+    run = AgentRun(id=uuid4(), status=RunStatus.QUEUED)
+    db = _Session(run)
+
+    async def scenario() -> None:
+        with pytest.raises(JobQueueUnavailable):
+            await enqueue_run(run, JobKind.DIRECTOR_TURN, workspace_id=uuid4())
+        await fail_unqueued_run(db, run)
+
+    asyncio.run(scenario())
+    assert run.status == RunStatus.FAILED
+    assert run.error_json == {"reason": "job queue unavailable"}
+    assert db.commits == 1
+
+
+def test_failed_workflow_runs_are_not_resumed() -> None:
+    failed = WorkflowRun(id=uuid4(), status=RunStatus.FAILED, output_json={})
+    db = _Session(failed)
+    assert asyncio.run(resume_workflow_run(db, failed.id)) is None
+    assert failed.status == RunStatus.FAILED
@@ -0,0 +1,33 @@
+import asyncio
+from uuid import uuid4
+
+from creatory_core.rag.cache import InMemoryQueryCacheBackend, QueryResultCache
+from creatory_core.rag.hybrid import HybridRAGService, RetrievalMode
+
+
+def test_search_many_answers_cached_repeated_and_empty_queries_in_order() -> None:
+    workspace_id = uuid4()
+    cache = QueryResultCache(InMemoryQueryCacheBackend())
+    service = HybridRAGService(result_cache=cache, default_mode=RetrievalMode.LEXICAL)
+    chunk_id, source_id = uuid4(), uuid4()
+    item = {
+        "chunk_id": str(chunk_id),
+        "source_id": str(source_id),
+        "source_title": "Notes",
+        "content": "launch hook",
+        "score": 1.0,
+        "citation_index": 1,
+        "chunk_index": 0,
+    }
+    asyncio.run(cache.set(workspace_id, "launch hook", [item], top_k=5, variant="lexical"))
+
+    # Every query is answered from the cache or short-circuited: no session is needed.
+    outcomes = asyncio.run(
+        service.search_many(None, workspace_id, ["Launch Hook ", "   ", "launch hook"], top_k=5)
+    )
+
+    assert [len(outcome.contexts) for outcome in outcomes] == [1, 0, 1]
+    assert outcomes[0] is outcomes[2]
+    assert outcomes[0].cached
+    assert outcomes[0].contexts[0].chunk_id == chunk_id
+    assert cache.stats.hits == 1
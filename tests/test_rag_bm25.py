@@ -0,0 +1,26 @@
+from uuid import uuid4
+
+from creatory_core.rag.bm25 import BM25FScorer
+from creatory_core.rag.index import InvertedIndex
+
+
+def test_bm25_prefers_rare_terms_over_common_ones() -> None:
+    index = InvertedIndex()
+    rare, common = uuid4(), uuid4()
+    index.add(rare, uuid4(), "storyboard pacing notes")
+    index.add(common, uuid4(), "video notes")
+    for _ in range(5):
+        index.add(uuid4(), uuid4(), "video ideas")
+
+    scores = BM25FScorer().score(index, ["storyboard", "video"])
+    assert scores[rare] > scores[common]
+
+
+def test_bm25_title_matches_boost_chunk() -> None:
+    index = InvertedIndex()
+    titled, untitled = uuid4(), uuid4()
+    index.add(titled, uuid4(), "hook ideas for reels", title="Hook library")
+    index.add(untitled, uuid4(), "hook ideas for reels", title="Misc")
+
+    scores = BM25FScorer().score(index, ["hook"])
+    assert scores[titled] > scores[untitled]
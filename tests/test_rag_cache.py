@@ -0,0 +1,76 @@
+import asyncio
+from uuid import uuid4
+
+from creatory_core.rag.cache import CacheStats, InMemoryQueryCacheBackend, QueryResultCache
+
+
+def test_query_cache_normalises_query_and_counts_hits() -> None:
+    cache = QueryResultCache(InMemoryQueryCacheBackend(), ttl_seconds=60)
+    workspace_id = uuid4()
+
+    async def scenario() -> None:
+        assert await cache.get(workspace_id, "Hook ideas", top_k=5) is None
+        await cache.set(workspace_id, "Hook ideas", [{"chunk_id": "a"}], top_k=5)
+        assert await cache.get(workspace_id, "  hook   IDEAS ", top_k=5) == [{"chunk_id": "a"}]
+        assert await cache.get(workspace_id, "hook ideas", top_k=3) is None
+
+    asyncio.run(scenario())
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_query_cache_version_bump_invalidates_workspace_only() -> None:
+    cache = QueryResultCache(InMemoryQueryCacheBackend(), ttl_seconds=60)
+    changed, untouched = uuid4(), uuid4()
+
+    async def scenario() -> None:
+        await cache.set(changed, "q", [], top_k=5)
+        await cache.set(untouched, "q", [], top_k=5)
+        await cache.invalidate_workspace(changed)
+        assert await cache.get(changed, "q", top_k=5) is None
+        assert await cache.get(untouched, "q", top_k=5) == []
+
+    asyncio.run(scenario())
+
+
+def test_results_computed_across_a_write_are_stored_under_the_old_version() -> None:
+    cache = QueryResultCache(InMemoryQueryCacheBackend(), ttl_seconds=60)
+    workspace_id = uuid4()
+
+    async def scenario() -> None:
+        version = await cache.version(workspace_id)
+        assert await cache.get(workspace_id, "q", top_k=5, version=version) is None
+        # A knowledge write lands while the retrieval is still running.
+        await cache.invalidate_workspace(workspace_id)
+        await cache.set(workspace_id, "q", [{"chunk_id": "stale"}], top_k=5, version=version)
+        assert await cache.get(workspace_id, "q", top_k=5) is None
+
+    asyncio.run(scenario())
+
+
+def test_in_memory_backend_evicts_least_recently_used() -> None:
+    backend = InMemoryQueryCacheBackend(max_entries=2)
+
+    async def scenario() -> None:
+        await backend.set("a", "1", 60)
+        await backend.set("b", "2", 60)
+        await backend.get("a")
+        await backend.set("c", "3", 60)
+        assert await backend.get("b") is None
+        assert await backend.get("a") == "1"
+
+    asyncio.run(scenario())
+
+
+def test_cache_stats_are_kept_per_workspace_with_a_bound() -> None:
+    stats = CacheStats(backend="memory", max_workspaces=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    stats.record(first, hit=True)
+    stats.record(second, hit=False)
+    stats.record(first, hit=False)
+    stats.record(third, hit=True)
+
+    assert (stats.hits, stats.misses) == (2, 2)
+    assert (stats.for_workspace(first).hits, stats.for_workspace(first).misses) == (1, 1)
+    assert stats.for_workspace(third).hit_rate == 1.0
+    # The least recently active workspace is forgotten; the totals still count it.
+    assert stats.for_workspace(second).misses == 0
@@ -0,0 +1,59 @@
+from creatory_core.rag.chunking import StreamingChunker, chunk_stream, chunk_text
+
+
+def _words(count: int, prefix: str = "w") -> str:
+    return " ".join(f"{prefix}{index}" for index in range(count))
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+def test_chunk_text_windows_respect_max_tokens_and_overlap() -> None:
+    chunks = chunk_text(_words(25), max_tokens=10, overlap_tokens=3, token_counter=_count_words)
+    assert [chunk.token_count for chunk in chunks] == [10, 10, 10, 1 + 3]
+    assert chunks[1].content.split()[:3] == chunks[0].content.split()[-3:]
+    assert chunks[-1].content.split()[-1] == "w24"
+
+
+def test_headings_start_new_chunks_and_annotate_metadata() -> None:
+    text = "# Intro\n\nhello there\n\n## Pricing\n\nplans start small"
+    chunks = chunk_text(text, max_tokens=50, overlap_tokens=5, token_counter=_count_words)
+    assert [chunk.metadata_json for chunk in chunks] == [
+        {"heading": "Intro"},
+        {"heading": "Pricing"},
+    ]
+    assert chunks[1].content == "plans start small"
+
+
+def test_chunk_stream_matches_chunk_text_for_arbitrary_splits() -> None:
+    text = "# Notes\n\n" + "\n\n".join(_words(7, prefix=f"p{n}_") for n in range(6))
+    options = {"max_tokens": 12, "overlap_tokens": 2, "token_counter": _count_words}
+    pieces = [text[start : start + 5] for start in range(0, len(text), 5)]
+    assert list(chunk_stream(pieces, **options)) == chunk_text(text, **options)
+
+
+def test_streaming_chunker_bounds_pending_text_for_long_paragraphs() -> None:
+    chunker = StreamingChunker(
+        max_tokens=8, overlap_tokens=0, token_counter=_count_words, max_pending_chars=32
+    )
+    emitted = list(chunker.feed(_words(40) + " "))
+    assert emitted
+    assert len(chunker._pending) <= 32
+
+
+def test_streaming_chunker_hard_splits_text_without_spaces() -> None:
+    chunker = StreamingChunker(
+        max_tokens=50, overlap_tokens=0, token_counter=len, max_pending_chars=120
+    )
+    run = "".join(chr(0x4E00 + index % 500) for index in range(1000))
+    text = f"{run}\n\n{run}"
+    chunks = []
+    for start in range(0, len(text), 40):
+        chunks.extend(chunker.feed(text[start : start + 40]))
+        assert len(chunker._pending) <= 120
+    chunks.extend(chunker.finish())
+
+    assert max(chunk.token_count for chunk in chunks) <= 50
+    # Pieces of one cut word rejoin without spaces; only the paragraph break is lost.
+    assert "".join(chunk.content for chunk in chunks) == run + run
@@ -0,0 +1,78 @@
+from uuid import uuid4
+
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.dialects import postgresql
+
+from creatory_core.db.models import ConceptNode
+from creatory_core.rag.concepts import (
+    co_occurrence_pairs,
+    co_occurrence_weight,
+    edge_decrement_statement,
+    extract_key_phrases,
+    pending_chunks_statement,
+)
+
+
+def test_key_phrases_prefer_multi_word_terms() -> None:
+    text = (
+        "The retention curve drops after the hook. Fix the retention curve with a "
+        "stronger hook and a pattern interrupt at 30 seconds."
+    )
+    phrases = extract_key_phrases(text, max_phrases=4)
+
+    assert [phrase.key for phrase in phrases] == [
+        "retention-curve-drops",
+        "retention-curve",
+        "pattern-interrupt",
+        "stronger-hook",
+    ]
+    assert all(phrase.label == phrase.key.replace("-", " ") for phrase in phrases)
+
+
+def test_key_phrases_skip_stopwords_numbers_and_short_words() -> None:
+    phrases = extract_key_phrases("It is 2024 and we are on it.")
+    assert phrases == []
+
+
+def test_co_occurrence_pairs_are_ordered_and_counted_per_chunk() -> None:
+    a, b, c = uuid4(), uuid4(), uuid4()
+    pairs = co_occurrence_pairs([[a, b, c], [b, a], [c]])
+
+    ordered = tuple(sorted((a, b), key=str))
+    assert pairs[ordered] == 2
+    assert sum(pairs.values()) == 4
+    assert all(str(src) < str(dst) for src, dst in pairs)
+
+
+def test_co_occurrence_weight_is_ochiai() -> None:
+    assert co_occurrence_weight(2, 2, 2) == 1.0
+    assert co_occurrence_weight(1, 4, 1) == 0.5
+    assert co_occurrence_weight(0, 3, 3) == 0.0
+
+
+def test_chunk_count_update_compiles_to_update_from_values() -> None:
+    deltas = values(column("id"), column("delta", Integer), name="deltas").data([(uuid4(), 1)])
+    statement = (
+        update(ConceptNode)
+        .where(ConceptNode.id == deltas.c.id)
+        .values(chunk_count=ConceptNode.chunk_count + deltas.c.delta)
+        .returning(ConceptNode.id, ConceptNode.chunk_count)
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES" in sql
+    assert "RETURNING concept_nodes.id, concept_nodes.chunk_count" in sql
+
+
+def test_pending_chunks_are_selected_by_flag_not_sequence_watermark() -> None:
+    sql = str(pending_chunks_statement(50).compile(dialect=postgresql.dialect()))
+    assert "knowledge_chunks.concepts_extracted_at IS NULL" in sql
+    assert "ingest_seq >" not in sql
+    assert "ORDER BY knowledge_chunks.ingest_seq" in sql
+
+
+def test_released_chunks_are_subtracted_from_edge_co_occurrences() -> None:
+    statement = edge_decrement_statement([(uuid4(), uuid4(), 2)])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "SET co_occurrences=(concept_edges.co_occurrences - deltas.delta)" in sql
+    assert "concept_edges.relation_type = " in sql
+    assert "RETURNING concept_edges.id" in sql
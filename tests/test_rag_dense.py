@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from creatory_core.rag.dense import DenseRetriever
+from creatory_core.rag.embeddings import HashingEmbedder
+
+
+class _Result:
+    def __init__(self, rows: list) -> None:
+        self._rows = rows
+
+    def all(self) -> list:
+        return list(self._rows)
+
+
+class _Session:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+        self.statements: list[str] = []
+
+    async def execute(self, statement) -> _Result:
+        compiled = statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        self.statements.append(str(compiled))
+        return _Result(self.rows if len(self.statements) > 1 else [])
+
+
+def test_search_scans_iteratively_and_reports_short_results(caplog) -> None:
+    near, far = uuid4(), uuid4()
+    # A relaxed iterative scan may hand back rows slightly out of order.
+    session = _Session(
+        [SimpleNamespace(chunk_id=far, distance=0.4), SimpleNamespace(chunk_id=near, distance=0.1)]
+    )
+    retriever = DenseRetriever(HashingEmbedder(), probes=10)
+
+    with caplog.at_level(logging.INFO, logger="creatory.rag.dense"):
+        ranked = asyncio.run(retriever.search(session, uuid4(), "launch hook", limit=5))
+
+    assert [chunk_id for chunk_id, _ in ranked] == [near, far]
+    assert "'ivfflat.iterative_scan', 'relaxed_order'" in session.statements[0]
+    assert "knowledge_sources.workspace_id" in session.statements[1]
+    assert any(record.returned == 2 for record in caplog.records)
@@ -0,0 +1,26 @@
+import asyncio
+
+from creatory_core.rag.embeddings import HashingEmbedder, build_embedder
+
+
+def _cosine(left: list[float], right: list[float]) -> float:
+    return sum(a * b for a, b in zip(left, right, strict=True))
+
+
+def test_hashing_embedder_is_deterministic_and_normalised() -> None:
+    embedder = HashingEmbedder(dimensions=64)
+    first, second = asyncio.run(embedder.embed(["launch hook ideas", "launch hook ideas"]))
+    assert first == second
+    assert abs(_cosine(first, first) - 1.0) < 1e-9
+
+
+def test_hashing_embedder_places_shared_vocabulary_closer() -> None:
+    embedder = HashingEmbedder(dimensions=256)
+    query = embedder.embed_one("voice over script")
+    related = embedder.embed_one("script for the voice over")
+    unrelated = embedder.embed_one("thumbnail colour palette")
+    assert _cosine(query, related) > _cosine(query, unrelated)
+
+
+def test_build_embedder_defaults_to_hashing() -> None:
+    assert isinstance(build_embedder("hashing", model_name=""), HashingEmbedder)
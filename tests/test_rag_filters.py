@@ -0,0 +1,116 @@
+import asyncio
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from creatory_core.db.models import SourceType
+from creatory_core.rag.bm25 import BM25FScorer
+from creatory_core.rag.filters import CandidateSet, RetrievalFilter
+from creatory_core.rag.fulltext import PostgresFullTextRetriever
+from creatory_core.rag.hybrid import HybridRAGService
+from creatory_core.rag.index import InvertedIndex
+
+
+def test_filter_compiles_to_indexable_predicates() -> None:
+    filters = RetrievalFilter(
+        source_types=(SourceType.FILE,),
+        created_after=datetime(2026, 1, 1, tzinfo=UTC),
+        source_metadata={"channel": "youtube"},
+        chunk_metadata_keys=("heading",),
+    )
+    statement = PostgresFullTextRetriever().statement(uuid4(), "launch", limit=10, filters=filters)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "knowledge_sources.source_type IN" in sql
+    assert "knowledge_sources.created_at >=" in sql
+    assert "knowledge_sources.metadata_json @>" in sql
+    assert "knowledge_chunks.metadata_json ?&" in sql
+
+
+def test_empty_filter_has_no_predicates_or_cache_key() -> None:
+    filters = RetrievalFilter()
+    assert filters.is_empty
+    assert filters.cache_key() == ""
+
+
+def test_cache_key_ignores_argument_order() -> None:
+    first, second = uuid4(), uuid4()
+    assert (
+        RetrievalFilter(source_ids=(first, second)).cache_key()
+        == RetrievalFilter(source_ids=(second, first)).cache_key()
+    )
+    assert RetrievalFilter(source_ids=(first,)).cache_key() != (
+        RetrievalFilter(source_ids=(second,)).cache_key()
+    )
+
+
+def test_scorer_only_scores_candidate_sources() -> None:
+    index = InvertedIndex()
+    kept_source, dropped_source = uuid4(), uuid4()
+    kept_chunk, dropped_chunk = uuid4(), uuid4()
+    index.add(kept_chunk, kept_source, "launch hook checklist")
+    index.add(dropped_chunk, dropped_source, "launch hook hook hook")
+
+    candidates = CandidateSet(source_ids=frozenset({kept_source}))
+    ranked = BM25FScorer().top_k(index, ["launch", "hook"], 5, candidates)
+    assert [chunk_id for chunk_id, _ in ranked] == [kept_chunk]
+
+
+def test_candidate_chunk_ids_take_precedence_over_sources() -> None:
+    source_id, chunk_id = uuid4(), uuid4()
+    candidates = CandidateSet(source_ids=frozenset({source_id}), chunk_ids=frozenset())
+    assert not candidates
+    assert not candidates.allows(chunk_id, source_id)
+    narrowed = CandidateSet(source_ids=frozenset({source_id}), chunk_ids=frozenset({chunk_id}))
+    assert narrowed.allows(chunk_id, None)
+
+
+def test_scorer_walks_candidate_chunks_when_postings_are_longer() -> None:
+    index = InvertedIndex()
+    source_id = uuid4()
+    chunk_ids = [uuid4() for _ in range(5)]
+    for chunk_id in chunk_ids:
+        index.add(chunk_id, source_id, "launch hook checklist")
+
+    candidates = CandidateSet(source_ids=frozenset({source_id}), chunk_ids=frozenset(chunk_ids[:2]))
+    ranked = BM25FScorer().top_k(index, ["launch"], 5, candidates)
+    assert {chunk_id for chunk_id, _ in ranked} == set(chunk_ids[:2])
+
+
+def test_admit_checks_only_the_given_chunks() -> None:
+    filters = RetrievalFilter(source_types=(SourceType.FILE,), chunk_metadata_keys=("heading",))
+    statement = filters.admit_statement(uuid4(), [uuid4(), uuid4()])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "knowledge_chunks.id IN" in sql
+    assert "knowledge_sources.source_type IN" in sql
+    assert "knowledge_chunks.metadata_json ?&" in sql
+
+
+class _AdmitEven(RetrievalFilter):
+    def __init__(self, allowed: set) -> None:
+        super().__init__()
+        object.__setattr__(self, "allowed", allowed)
+        object.__setattr__(self, "batches", [])
+
+    async def admit(self, db, workspace_id, chunk_ids):
+        chunk_ids = list(chunk_ids)
+        self.batches.append(chunk_ids)
+        return frozenset(chunk_id for chunk_id in chunk_ids if chunk_id in self.allowed)
+
+
+def test_filtered_graph_signal_admits_hits_in_score_order_until_full() -> None:
+    chunk_ids = [uuid4() for _ in range(10)]
+    scores = {chunk_id: float(10 - position) for position, chunk_id in enumerate(chunk_ids)}
+    filters = _AdmitEven(set(chunk_ids[::2]))
+    service = HybridRAGService()
+    service._graph_scores = lambda graph, query_tokens: scores
+
+    ranked = asyncio.run(
+        service._filtered_graph_signal(None, uuid4(), None, ["launch"], 2, filters)
+    )
+
+    assert [chunk_id for chunk_id, _ in ranked] == [chunk_ids[0], chunk_ids[2]]
+    # Only the best-scored hits were sent to the database, never the whole scope.
+    assert filters.batches == [chunk_ids[:4]]
@@ -0,0 +1,16 @@
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from creatory_core.rag.fulltext import PostgresFullTextRetriever
+
+
+def test_fulltext_statement_ranks_and_limits_in_postgres() -> None:
+    statement = PostgresFullTextRetriever().statement(uuid4(), "launch hook", limit=20)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "knowledge_chunks.search_vector @@ websearch_to_tsquery(" in sql
+    assert "ts_rank_cd(knowledge_chunks.search_vector" in sql
+    assert "(SELECT workspaces.search_config" in sql
+    assert "DESC" in sql.split("ORDER BY", 1)[1]
+    assert "LIMIT" in sql
@@ -0,0 +1,44 @@
+import asyncio
+from uuid import uuid4
+
+from creatory_core.rag.fusion import gather_signals, reciprocal_rank_fusion, weighted_score_fusion
+
+
+def test_rrf_rewards_agreement_between_signals() -> None:
+    shared, lexical_only, dense_only = uuid4(), uuid4(), uuid4()
+    fused = reciprocal_rank_fusion(
+        {
+            "lexical": [(lexical_only, 9.0), (shared, 5.0)],
+            "dense": [(dense_only, 0.9), (shared, 0.8)],
+        }
+    )
+    assert max(fused, key=fused.__getitem__) == shared
+
+
+def test_rrf_weight_zero_disables_signal() -> None:
+    chunk = uuid4()
+    fused = reciprocal_rank_fusion({"graph": [(chunk, 1.0)]}, weights={"graph": 0.0})
+    assert fused == {}
+
+
+def test_weighted_fusion_normalises_each_signal() -> None:
+    first, second = uuid4(), uuid4()
+    fused = weighted_score_fusion(
+        {"lexical": [(first, 20.0), (second, 10.0)], "dense": [(second, 0.9)]},
+        weights={"lexical": 1.0, "dense": 1.0},
+    )
+    assert fused[first] == 1.0
+    assert fused[second] == 1.5
+
+
+def test_gather_signals_reports_timings() -> None:
+    chunk = uuid4()
+
+    async def signal() -> list:
+        await asyncio.sleep(0)
+        return [(chunk, 1.0)]
+
+    results = asyncio.run(gather_signals({"lexical": signal(), "dense": signal()}))
+    assert set(results) == {"lexical", "dense"}
+    assert results["lexical"].ranked == [(chunk, 1.0)]
+    assert results["dense"].elapsed_ms >= 0
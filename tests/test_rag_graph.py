@@ -0,0 +1,38 @@
+from uuid import uuid4
+
+from creatory_core.rag.graph import ConceptRecord, EdgeRecord, build_concept_graph
+from creatory_core.rag.index import InvertedIndex
+
+
+def _graph():
+    index = InvertedIndex()
+    hook_chunk, pacing_chunk, unrelated_chunk = uuid4(), uuid4(), uuid4()
+    index.add(hook_chunk, uuid4(), "a strong opening hook keeps viewers")
+    index.add(pacing_chunk, uuid4(), "edit pacing with jump cuts")
+    index.add(unrelated_chunk, uuid4(), "invoice the sponsor monthly")
+
+    hook = ConceptRecord(id=uuid4(), concept_key="opening-hook", label="opening hook")
+    pacing = ConceptRecord(id=uuid4(), concept_key="pacing", label="pacing")
+    graph = build_concept_graph(
+        [hook, pacing],
+        [EdgeRecord(src_concept_id=hook.id, dst_concept_id=pacing.id, weight=0.8)],
+        index,
+    )
+    return graph, hook_chunk, pacing_chunk, unrelated_chunk
+
+
+def test_graph_links_concepts_to_mentioning_chunks() -> None:
+    graph, hook_chunk, pacing_chunk, _ = _graph()
+    assert graph.concept_chunks == [(hook_chunk,), (pacing_chunk,)]
+    assert list(graph.indptr) == [0, 1, 2]
+
+
+def test_activation_spreads_over_edges_to_neighbour_chunks() -> None:
+    graph, hook_chunk, pacing_chunk, unrelated_chunk = _graph()
+    seeds = graph.seeds(["opening", "hook"])
+    activation = graph.activate(seeds, hops=1, decay=0.5)
+    scores = graph.chunk_scores(activation)
+
+    assert scores[hook_chunk] == 1.0
+    assert scores[pacing_chunk] == 0.4
+    assert unrelated_chunk not in scores
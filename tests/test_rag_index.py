@@ -0,0 +1,40 @@
+from uuid import uuid4
+
+from creatory_core.rag.index import InvertedIndex, tokenize
+
+
+def test_tokenize_strips_punctuation_and_short_words() -> None:
+    assert tokenize("The Hook, a CTA!") == ["the", "hook", "cta"]
+
+
+def test_inverted_index_tracks_term_frequencies() -> None:
+    index = InvertedIndex()
+    chunk_id = uuid4()
+    index.add(chunk_id, uuid4(), "hook hook value cta")
+    assert index.postings("hook") == {chunk_id: 2}
+    assert index.postings("missing") == {}
+    assert len(index) == 1
+
+
+def test_inverted_index_remove_drops_empty_postings() -> None:
+    index = InvertedIndex()
+    kept, removed = uuid4(), uuid4()
+    index.add(kept, uuid4(), "launch script")
+    index.add(removed, uuid4(), "launch teaser")
+    index.remove(removed)
+    assert index.postings("launch") == {kept: 1}
+    assert index.postings("teaser") == {}
+    assert removed not in index
+
+
+def test_inverted_index_maintains_bm25_statistics_incrementally() -> None:
+    index = InvertedIndex()
+    first, second = uuid4(), uuid4()
+    index.add(first, uuid4(), "launch plan", title="Launch notes", token_count=10)
+    index.add(second, uuid4(), "voice over script")
+    assert index.document_frequency("launch") == 1
+    assert index.average_length() == (10 + 3) / 2
+
+    index.remove(first)
+    assert index.document_frequency("launch") == 0
+    assert index.average_length() == 3
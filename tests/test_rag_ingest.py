@@ -0,0 +1,173 @@
+import asyncio
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from creatory_core.db.models import KnowledgeSource
+from creatory_core.rag.ingest import (
+    ChunkDiff,
+    ChunkIngestPipeline,
+    ChunkInput,
+    claim_statement,
+    content_hash,
+)
+from creatory_core.services.ingest_jobs import (
+    KnowledgeIngestHandler,
+    enqueue_ingest,
+    stage_ingest,
+)
+from creatory_core.services.job_queue import InMemoryJobQueue
+
+
+def test_chunk_diff_keeps_matching_content_and_renumbers_it() -> None:
+    intro, body = uuid4(), uuid4()
+    diff = ChunkDiff([(intro, content_hash("intro")), (body, content_hash("body"))])
+
+    kept, fresh, fresh_indexes = diff.match(
+        [ChunkInput("body"), ChunkInput("new section"), ChunkInput("intro")], 10
+    )
+
+    assert [(row["id"], row["chunk_index"]) for row in kept] == [(body, 10), (intro, 12)]
+    assert [chunk.content for chunk in fresh] == ["new section"]
+    assert fresh_indexes == [11]
+    assert diff.stale() == []
+
+
+def test_chunk_diff_matches_repeated_content_as_a_multiset() -> None:
+    first, second = uuid4(), uuid4()
+    diff = ChunkDiff([(first, content_hash("same")), (second, content_hash("same"))])
+
+    kept, fresh, _ = diff.match([ChunkInput("same")], 0)
+
+    assert [row["id"] for row in kept] == [first]
+    assert fresh == []
+    assert diff.stale() == [second]
+
+
+def test_chunk_diff_reports_removed_chunks_as_stale() -> None:
+    removed = uuid4()
+    diff = ChunkDiff([(removed, content_hash("old"))])
+    diff.match([ChunkInput("replacement")], 0)
+    assert diff.stale() == [removed]
+
+
+class _Session:
+    """Holds staged batches by id; enough of an AsyncSession for the ingest job."""
+
+    def __init__(self) -> None:
+        self.batches: dict = {}
+        self.executed: list = []
+
+    async def __aenter__(self) -> "_Session":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def add(self, batch) -> None:
+        self.batches[batch.id] = batch
+
+    async def get(self, model, batch_id):
+        return self.batches.get(batch_id)
+
+    async def execute(self, statement) -> None:
+        self.executed.append(statement)
+
+    async def commit(self) -> None:
+        return None
+
+
+def test_queued_ingest_job_references_the_staged_chunks(monkeypatch) -> None:
+    queue = InMemoryJobQueue()
+    monkeypatch.setattr("creatory_core.services.ingest_jobs.get_job_queue", lambda: queue)
+    db = _Session()
+    source = KnowledgeSource(id=uuid4(), workspace_id=uuid4())
+    chunks = [ChunkInput("intro", 1, {"heading": "Intro"}), ChunkInput("body", 1)]
+    runs: list[tuple] = []
+
+    class RecordingPipeline:
+        async def run(self, session_factory, source_id, chunks, *, start_index) -> None:
+            runs.append((source_id, chunks, start_index))
+
+    async def scenario() -> None:
+        batch = stage_ingest(db, source, chunks, start_index=7)
+        job = await enqueue_ingest(batch, workspace_id=source.workspace_id)
+        assert job.payload == {"source_id": str(source.id), "batch_id": str(batch.id)}
+        assert await queue.due_partitions() == [str(source.workspace_id)]
+        await KnowledgeIngestHandler(lambda: db, RecordingPipeline()).handle(job)
+
+    asyncio.run(scenario())
+    assert runs == [(source.id, chunks, 7)]
+    assert len(db.executed) == 1  # the staged batch is dropped once ingested
+
+
+def test_failed_ingest_is_left_to_the_queue_to_retry(monkeypatch) -> None:
+    queue = InMemoryJobQueue()
+    monkeypatch.setattr("creatory_core.services.ingest_jobs.get_job_queue", lambda: queue)
+    db = _Session()
+    source = KnowledgeSource(id=uuid4(), workspace_id=uuid4())
+
+    class FailingPipeline:
+        async def run(self, session_factory, source_id, chunks, *, start_index) -> None:
+            raise ConnectionError("embedder unavailable")
+
+    async def scenario() -> None:
+        batch = stage_ingest(db, source, [ChunkInput("intro")], start_index=0)
+        job = await enqueue_ingest(batch, workspace_id=source.workspace_id)
+        with pytest.raises(ConnectionError):
+            await KnowledgeIngestHandler(lambda: db, FailingPipeline()).handle(job)
+
+    asyncio.run(scenario())
+    assert db.executed == []  # the batch is kept for the retry
+
+
+def test_source_claim_refuses_busy_and_locked_sources_but_takes_over_stale_ones() -> None:
+    statement = claim_statement(uuid4(), stale_before=datetime.now(UTC))
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "knowledge_sources.ingest_status NOT IN" in sql
+    assert "knowledge_sources.ingest_claimed_at <" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING knowledge_sources.id" in sql
+
+
+def test_abandoned_reingest_rolls_back_instead_of_leaving_both_versions(monkeypatch) -> None:
+    calls: list[str] = []
+
+    class Rows:
+        def all(self) -> list:
+            return [(uuid4(), content_hash("old"))]
+
+    class Session:
+        async def execute(self, statement, params=None) -> Rows:
+            calls.append("execute")
+            return Rows()
+
+        async def commit(self) -> None:
+            calls.append("commit")
+
+        async def rollback(self) -> None:
+            calls.append("rollback")
+
+    class Pipeline(ChunkIngestPipeline):
+        async def _insert_chunks(self, db, source, chunks, indexes) -> list:
+            calls.append("insert")
+            return []
+
+    async def reserve(db, source_id, count) -> int:
+        return 0
+
+    async def batches():
+        yield [ChunkInput("new")]
+        raise ConnectionError("client went away")
+
+    monkeypatch.setattr("creatory_core.rag.ingest.reserve_chunk_indexes", reserve)
+    source = KnowledgeSource(id=uuid4(), workspace_id=uuid4())
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(Pipeline(None).reingest_stream(Session(), source, batches()))
+
+    # Nothing between the first write and the rollback was committed.
+    first_write = calls.index("insert")
+    assert "commit" not in calls[first_write : calls.index("rollback")]
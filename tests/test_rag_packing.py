@@ -0,0 +1,73 @@
+from uuid import uuid4
+
+from creatory_core.providers.service import get_provider_spec_or_none
+from creatory_core.rag.hybrid import RetrievedContext
+from creatory_core.rag.packing import context_token_budget, merge_overlapping, pack_contexts
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+def _context(content: str, *, source_id=None, chunk_index=None, score=1.0) -> RetrievedContext:
+    return RetrievedContext(
+        chunk_id=uuid4(),
+        source_id=source_id or uuid4(),
+        source_title="Notes",
+        content=content,
+        score=score,
+        citation_index=1,
+        chunk_index=chunk_index,
+    )
+
+
+def test_merge_overlapping_drops_repeated_overlap() -> None:
+    assert merge_overlapping("alpha beta gamma delta", "gamma delta epsilon") == (
+        "alpha beta gamma delta epsilon"
+    )
+    assert merge_overlapping("alpha beta", "gamma") == "alpha beta\n\ngamma"
+
+
+def test_pack_merges_adjacent_chunks_from_the_same_source() -> None:
+    source_id = uuid4()
+    contexts = [
+        _context("hook ideas for launch", source_id=source_id, chunk_index=3, score=0.9),
+        _context("for launch week schedule", source_id=source_id, chunk_index=4, score=0.8),
+        _context("unrelated thumbnails", chunk_index=0, score=0.1),
+    ]
+    packed = pack_contexts(contexts, token_budget=100, token_counter=_word_count)
+
+    merged = packed.passages[0]
+    assert merged.content == "hook ideas for launch week schedule"
+    assert merged.chunk_ids == (contexts[0].chunk_id, contexts[1].chunk_id)
+    assert [item.citation_index for item in packed.passages] == [1, 2]
+
+
+def test_pack_dedupes_identical_chunks_and_respects_the_budget() -> None:
+    contexts = [
+        _context("short dense answer", score=0.9),
+        _context("short dense answer", score=0.5),
+        _context(" ".join(["padding"] * 40), score=1.0),
+    ]
+    packed = pack_contexts(contexts, token_budget=10, token_counter=_word_count)
+
+    assert [item.content for item in packed.passages] == ["short dense answer"]
+    assert packed.passages[0].chunk_ids == (contexts[0].chunk_id,)
+    assert packed.tokens_used <= 10
+    assert set(packed.dropped_chunk_ids) == {contexts[1].chunk_id, contexts[2].chunk_id}
+
+
+def test_pack_splits_a_merged_run_that_does_not_fit() -> None:
+    source_id = uuid4()
+    contexts = [
+        _context("a b c d e f", source_id=source_id, chunk_index=0, score=0.9),
+        _context("g h i j k l", source_id=source_id, chunk_index=1, score=0.2),
+    ]
+    packed = pack_contexts(contexts, token_budget=12, token_counter=_word_count)
+    assert [item.chunk_ids for item in packed.passages] == [(contexts[0].chunk_id,)]
+
+
+def test_context_budget_uses_a_share_of_the_provider_window() -> None:
+    spec = get_provider_spec_or_none("ollama")
+    assert context_token_budget(spec, max_tokens=3000, window_share=0.25) == 2048
+    assert context_token_budget(None, max_tokens=3000, window_share=0.25) == 3000
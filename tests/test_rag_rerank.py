@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Sequence
+from uuid import uuid4
+
+from creatory_core.rag.hybrid import RetrievedContext
+from creatory_core.rag.rerank import TermOverlapReranker, build_reranker, rerank_contexts
+
+
+def _contexts(*contents: str) -> list[RetrievedContext]:
+    return [
+        RetrievedContext(
+            chunk_id=uuid4(),
+            source_id=uuid4(),
+            source_title=None,
+            content=content,
+            score=1.0 / rank,
+            citation_index=rank,
+        )
+        for rank, content in enumerate(contents, 1)
+    ]
+
+
+class _SlowReranker:
+    name = "slow"
+
+    async def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        await asyncio.sleep(1)
+        return [1.0] * len(passages)
+
+
+class _BrokenReranker:
+    name = "broken"
+
+    async def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        raise RuntimeError("model unavailable")
+
+
+def test_overlap_reranker_promotes_exact_phrase_matches() -> None:
+    contexts = _contexts(
+        "thumbnail colors and fonts",
+        "a retention curve for the launch video hook",
+        "launch hook ideas for the retention curve",
+    )
+    outcome = asyncio.run(
+        rerank_contexts(TermOverlapReranker(), "launch hook", contexts, top_k=2, budget_ms=500)
+    )
+
+    assert outcome.applied
+    assert [item.content for item in outcome.contexts][0] == contexts[2].content
+    assert [item.citation_index for item in outcome.contexts] == [1, 2]
+
+
+def test_rerank_falls_back_to_first_stage_order_when_budget_expires() -> None:
+    contexts = _contexts("first", "second", "third")
+    outcome = asyncio.run(
+        rerank_contexts(_SlowReranker(), "query", contexts, top_k=2, budget_ms=10)
+    )
+
+    assert not outcome.applied
+    assert [item.chunk_id for item in outcome.contexts] == [item.chunk_id for item in contexts[:2]]
+    assert outcome.elapsed_ms < 500
+
+
+def test_rerank_budget_cuts_the_overlap_reranker_short() -> None:
+    passage = " ".join(f"launch hook retention curve take{index}" for index in range(60))
+    contexts = _contexts(*([passage] * 4000))
+    reranker = TermOverlapReranker()
+
+    async def full_scoring_ms() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await reranker.score("launch hook", [item.content for item in contexts])
+        return (loop.time() - started) * 1000
+
+    full_ms = asyncio.run(full_scoring_ms())
+    outcome = asyncio.run(rerank_contexts(reranker, "launch hook", contexts, top_k=3, budget_ms=5))
+
+    assert not outcome.applied
+    assert [item.chunk_id for item in outcome.contexts] == [item.chunk_id for item in contexts[:3]]
+    assert outcome.elapsed_ms < full_ms / 2
+
+
+def test_rerank_falls_back_when_the_reranker_fails() -> None:
+    contexts = _contexts("first", "second")
+    outcome = asyncio.run(
+        rerank_contexts(_BrokenReranker(), "query", contexts, top_k=5, budget_ms=100)
+    )
+    assert not outcome.applied
+    assert [item.content for item in outcome.contexts] == ["first", "second"]
+
+
+def test_build_reranker_is_off_by_default() -> None:
+    assert build_reranker("off", model_name="unused") is None
+    assert isinstance(build_reranker("overlap", model_name="unused"), TermOverlapReranker)
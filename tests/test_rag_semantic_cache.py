@@ -0,0 +1,111 @@
+import asyncio
+from uuid import uuid4
+
+from creatory_core.rag.cache import InMemoryQueryCacheBackend, QueryResultCache
+from creatory_core.rag.embeddings import HashingEmbedder
+from creatory_core.rag.hybrid import HybridRAGService, RetrievalMode
+from creatory_core.rag.semantic_cache import (
+    HyperplaneHasher,
+    SemanticQueryCache,
+    SemanticQueryIndex,
+    _sparse_unit,
+)
+
+EMBEDDER = HashingEmbedder(dimensions=256)
+
+
+def _unit(text: str) -> dict[int, float]:
+    vector = _sparse_unit(EMBEDDER.embed_one(text))
+    assert vector is not None
+    return vector
+
+
+def _item(content: str) -> dict:
+    return {
+        "chunk_id": str(uuid4()),
+        "source_id": str(uuid4()),
+        "source_title": "Notes",
+        "content": content,
+        "score": 1.0,
+        "citation_index": 1,
+        "chunk_index": 0,
+    }
+
+
+def test_index_finds_paraphrase_within_partition_only() -> None:
+    index = SemanticQueryIndex(HyperplaneHasher(256), max_entries=8)
+    query = "best hook for launch video"
+    index.add(query, _unit(query), top_k=5, variant="a")
+
+    paraphrase = _unit("launch video: best hook?")
+    matches = index.nearest(paraphrase, top_k=5, variant="a", threshold=0.85)
+    assert [key[2] for key, _ in matches] == [query]
+    assert index.nearest(paraphrase, top_k=3, variant="a", threshold=0.9) == []
+    assert index.nearest(paraphrase, top_k=5, variant="b", threshold=0.9) == []
+    assert index.nearest(_unit("sponsor rates"), top_k=5, variant="a", threshold=0.9) == []
+
+
+def test_index_evicts_least_recently_used() -> None:
+    index = SemanticQueryIndex(HyperplaneHasher(256), max_entries=2)
+    for query in ("alpha hooks", "beta thumbnails", "gamma sponsors"):
+        index.add(query, _unit(query), top_k=5, variant="")
+
+    assert len(index) == 2
+    assert index.nearest(_unit("alpha hooks"), top_k=5, variant="", threshold=0.9) == []
+    assert index.nearest(_unit("gamma sponsors"), top_k=5, variant="", threshold=0.9)
+
+
+def test_semantic_cache_is_isolated_per_workspace_and_follows_invalidation() -> None:
+    async def scenario() -> None:
+        result_cache = QueryResultCache(InMemoryQueryCacheBackend())
+        cache = SemanticQueryCache(result_cache, threshold=0.9)
+        workspace_id, other_workspace = uuid4(), uuid4()
+        vector = EMBEDDER.embed_one("retention curve drops")
+        await result_cache.set(workspace_id, "retention curve drops", [_item("x")], top_k=5)
+        cache.add(workspace_id, "retention curve drops", vector, top_k=5)
+
+        hit = await cache.get(workspace_id, EMBEDDER.embed_one("drops retention curve"), top_k=5)
+        assert hit is not None and hit.query == "retention curve drops"
+        assert await cache.get(other_workspace, vector, top_k=5) is None
+
+        # A knowledge write bumps the exact cache version; the stale neighbour is dropped.
+        await result_cache.invalidate_workspace(workspace_id)
+        assert await cache.get(workspace_id, vector, top_k=5) is None
+        assert cache.entries == 0
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+        assert result_cache.stats.hits == 0
+
+    asyncio.run(scenario())
+
+
+def test_search_answers_paraphrase_from_semantic_cache() -> None:
+    workspace_id = uuid4()
+    result_cache = QueryResultCache(InMemoryQueryCacheBackend())
+    semantic = SemanticQueryCache(result_cache, threshold=0.9)
+    service = HybridRAGService(
+        result_cache=result_cache,
+        semantic_cache=semantic,
+        embedder=EMBEDDER,
+        default_mode=RetrievalMode.LEXICAL,
+    )
+    item = _item("open with the payoff")
+    asyncio.run(
+        result_cache.set(workspace_id, "how to hook viewers", [item], top_k=5, variant="lexical")
+    )
+    semantic.add(
+        workspace_id,
+        "how to hook viewers",
+        EMBEDDER.embed_one("how to hook viewers"),
+        top_k=5,
+        variant="lexical",
+    )
+
+    # Answered without a session: the paraphrase resolves to the cached neighbour.
+    (outcome,) = asyncio.run(service.search_many(None, workspace_id, ["Hook viewers: how to?"]))
+    assert outcome.cached
+    assert outcome.contexts[0].content == "open with the payoff"
+    assert "semantic_cache" in outcome.timings_ms
+
+    (repeat,) = asyncio.run(service.search_many(None, workspace_id, ["hook viewers: how to?"]))
+    assert repeat.cached
+    assert result_cache.stats.hits == 1
@@ -0,0 +1,33 @@
+from creatory_core.rag.index import token_spans, tokenize
+from creatory_core.rag.snippets import extract_snippet
+
+
+def test_token_spans_agree_with_tokenize() -> None:
+    text = "The Hook, a (CTA)! then more"
+    spans = token_spans(text)
+    assert [token for token, _, _ in spans] == tokenize(text)
+    assert [text[start:end] for _, start, end in spans] == ["The", "Hook", "CTA", "then", "more"]
+
+
+def test_extract_snippet_picks_window_covering_most_query_terms() -> None:
+    content = "hook " + "filler " * 60 + "the launch hook drives the cta today " + "padding " * 60
+    snippet = extract_snippet(content, ["hook", "cta"], max_chars=80)
+    assert len(snippet.text) <= 80
+    assert "launch hook drives the cta" in snippet.text
+    assert [snippet.text[start:end] for start, end in snippet.highlights] == ["hook", "cta"]
+    assert snippet.truncated_start and snippet.truncated_end
+
+
+def test_extract_snippet_highlighted_marks_terms_and_truncation() -> None:
+    content = "intro words " * 20 + "Pricing tiers explained"
+    snippet = extract_snippet(content, ["pricing"], max_chars=40)
+    rendered = snippet.highlighted()
+    assert "**Pricing**" in rendered
+    assert rendered.startswith("…")
+
+
+def test_extract_snippet_without_matches_returns_leading_window() -> None:
+    snippet = extract_snippet("short note", ["absent"])
+    assert snippet.text == "short note"
+    assert snippet.highlights == ()
+    assert not snippet.truncated_start and not snippet.truncated_end
@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+
+import pytest
+
+from creatory_core.rag.chunking import chunk_text
+from creatory_core.rag.streaming import (
+    ByteCounter,
+    StreamTooLargeError,
+    batched,
+    chunk_text_stream,
+    decode_utf8,
+    read_pieces,
+)
+
+
+async def _aiter(items: Iterable) -> AsyncIterator:
+    for item in items:
+        yield item
+
+
+async def _collect(items: AsyncIterator) -> list:
+    return [item async for item in items]
+
+
+def test_decode_utf8_handles_characters_split_across_pieces() -> None:
+    encoded = "café – naïve".encode()
+    pieces = [encoded[index : index + 1] for index in range(len(encoded))]
+    decoded = asyncio.run(_collect(decode_utf8(_aiter(pieces))))
+    assert "".join(decoded) == "café – naïve"
+
+
+def test_chunk_text_stream_matches_batch_chunking() -> None:
+    text = "# Notes\n\n" + "\n\n".join(" ".join(f"w{n}_{i}" for i in range(9)) for n in range(5))
+    encoded = text.encode()
+    pieces = [encoded[index : index + 7] for index in range(0, len(encoded), 7)]
+    options = {"max_tokens": 20, "overlap_tokens": 4}
+
+    streamed = asyncio.run(_collect(chunk_text_stream(decode_utf8(_aiter(pieces)), **options)))
+    expected = chunk_text(text, **options)
+    assert [(item.content, item.metadata_json) for item in streamed] == [
+        (item.content, item.metadata_json) for item in expected
+    ]
+
+
+def test_batched_yields_fixed_size_groups_and_remainder() -> None:
+    groups = asyncio.run(_collect(batched(_aiter(range(7)), 3)))
+    assert groups == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_byte_counter_enforces_limit() -> None:
+    counter = ByteCounter(_aiter([b"abc", b"def"]), max_bytes=4)
+    with pytest.raises(StreamTooLargeError):
+        asyncio.run(_collect(counter.__aiter__()))
+    assert counter.bytes_read == 6
+
+
+def test_read_pieces_reads_a_file_in_bounded_pieces() -> None:
+    class Reader:
+        def __init__(self, data: bytes) -> None:
+            self.data = data
+            self.sizes: list[int] = []
+
+        async def read(self, size: int = -1) -> bytes:
+            self.sizes.append(size)
+            piece, self.data = self.data[:size], self.data[size:]
+            return piece
+
+    reader = Reader(b"abcdefgh")
+    pieces = asyncio.run(_collect(read_pieces(reader, piece_size=3)))
+    assert pieces == [b"abc", b"def", b"gh"]
+    assert set(reader.sizes) == {3}
@@ -0,0 +1,98 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from creatory_core.rag.bm25 import BM25FScorer  # noqa: E402
+from creatory_core.rag.filters import CandidateSet  # noqa: E402
+from creatory_core.rag.index import InvertedIndex  # noqa: E402
+from creatory_core.rag.vectorized import VectorizedBM25FScorer  # noqa: E402
+
+
+def _index() -> InvertedIndex:
+    index = InvertedIndex()
+    documents = [
+        ("launch hook for the product video", "Launch plan"),
+        ("hook hook hook retention curve", None),
+        ("pricing page copy and launch checklist", "Pricing"),
+        ("thumbnail contrast tips", None),
+    ]
+    for content, title in documents:
+        index.add(uuid4(), uuid4(), content, title=title)
+    return index
+
+
+def test_vectorized_scores_match_reference_bm25f() -> None:
+    index = _index()
+    query = ["launch", "hook", "pricing"]
+    expected = BM25FScorer().score(index, query)
+    actual = VectorizedBM25FScorer().score(index, query)
+    assert actual.keys() == expected.keys()
+    for chunk_id, score in expected.items():
+        assert actual[chunk_id] == pytest.approx(score)
+
+
+def test_vectorized_top_k_orders_by_score() -> None:
+    index = _index()
+    query = ["launch", "hook"]
+    expected = BM25FScorer().top_k(index, query, 2)
+    actual = VectorizedBM25FScorer().top_k(index, query, 2)
+    assert [chunk_id for chunk_id, _ in actual] == [chunk_id for chunk_id, _ in expected]
+
+
+def test_vectorized_matrix_rebuilds_after_index_changes() -> None:
+    index = _index()
+    scorer = VectorizedBM25FScorer(min_rebuild_seconds=0.0)
+    assert scorer.score(index, ["storyboard"]) == {}
+
+    chunk_id = uuid4()
+    index.add(chunk_id, uuid4(), "storyboard frames")
+    assert chunk_id in scorer.score(index, ["storyboard"])
+    assert scorer.matrix(index).version == index.version
+
+
+def test_vectorized_scorer_stays_exact_while_rebuild_is_deferred() -> None:
+    index = _index()
+    scorer = VectorizedBM25FScorer(min_rebuild_seconds=3600.0)
+    scorer.score(index, ["launch"])
+
+    chunk_id = uuid4()
+    index.add(chunk_id, uuid4(), "storyboard frames")
+    assert scorer.matrix(index) is None
+    assert [item for item, _ in scorer.top_k(index, ["storyboard"], 5)] == [chunk_id]
+
+
+def test_vectorized_scorer_respects_candidate_set() -> None:
+    index = _index()
+    kept_source = uuid4()
+    kept_chunk = uuid4()
+    index.add(kept_chunk, kept_source, "launch hook storyboard")
+    candidates = CandidateSet(source_ids=frozenset({kept_source}))
+
+    scorer = VectorizedBM25FScorer(min_rebuild_seconds=0.0)
+    assert scorer.score(index, ["launch", "hook"], candidates).keys() == {kept_chunk}
+    assert [chunk_id for chunk_id, _ in scorer.top_k(index, ["launch"], 3, candidates)] == [
+        kept_chunk
+    ]
+
+
+def test_vectorized_matrix_is_built_off_the_event_loop() -> None:
+    index = _index()
+    scorer = VectorizedBM25FScorer(min_rebuild_seconds=0.0)
+    expected = BM25FScorer().score(index, ["launch", "hook"])
+
+    async def scenario() -> None:
+        # The first query is served by the reference scorer while the thread builds.
+        assert scorer.matrix(index) is None
+        assert scorer.score(index, ["launch", "hook"]) == pytest.approx(expected)
+        matrix = await scorer.rebuilt(index)
+        assert matrix is not None and matrix.version == index.version
+        assert scorer.matrix(index) is matrix
+
+        index.add(uuid4(), uuid4(), "storyboard frames")
+        assert scorer.matrix(index) is None
+        assert (await scorer.rebuilt(index)).version == index.version
+
+    asyncio.run(scenario())
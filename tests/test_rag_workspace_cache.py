@@ -0,0 +1,84 @@
+import asyncio
+from uuid import uuid4
+
+from creatory_core.rag.workspace_cache import WorkspaceCache
+
+
+class _Session:
+    async def __aenter__(self) -> "_Session":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+def test_stale_value_keeps_serving_while_it_reloads_in_the_background() -> None:
+    cache = WorkspaceCache(refresh_seconds=0, max_workspaces=4, session_factory=_Session)
+    workspace_id = uuid4()
+    release = asyncio.Event()
+    loads: list[str] = []
+
+    async def first_load(db) -> str:
+        loads.append("first")
+        return "v1"
+
+    async def slow_reload(db) -> str:
+        loads.append("reload")
+        await release.wait()
+        return "v2"
+
+    async def scenario() -> None:
+        assert await cache.get(_Session(), workspace_id, first_load) == "v1"
+        # Past the deadline the old value answers at once while one reload runs.
+        assert await cache.get(_Session(), workspace_id, slow_reload) == "v1"
+        assert await cache.get(_Session(), workspace_id, slow_reload) == "v1"
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.sleep(0.01)
+        assert await cache.get(_Session(), workspace_id, first_load) == "v2"
+
+    asyncio.run(scenario())
+    assert loads.count("reload") == 1
+
+
+def test_least_recently_used_workspaces_are_evicted() -> None:
+    cache = WorkspaceCache(refresh_seconds=60, max_workspaces=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+
+    async def load(db) -> list[str]:
+        return []
+
+    async def scenario() -> None:
+        await cache.get(_Session(), first, load)
+        await cache.get(_Session(), second, load)
+        await cache.get(_Session(), first, load)
+        await cache.get(_Session(), third, load)
+
+    asyncio.run(scenario())
+    assert len(cache) == 2
+    assert list(cache._entries) == [first, third]
+    assert cache._locks == {}
+
+
+def test_writes_during_a_reload_are_replayed_onto_the_new_value() -> None:
+    cache = WorkspaceCache(refresh_seconds=0, max_workspaces=4, session_factory=_Session)
+    workspace_id = uuid4()
+    release = asyncio.Event()
+
+    async def first_load(db) -> list[str]:
+        return ["a"]
+
+    async def slow_reload(db) -> list[str]:
+        await release.wait()
+        return ["a"]
+
+    async def scenario() -> list[str]:
+        await cache.get(_Session(), workspace_id, first_load)
+        await cache.get(_Session(), workspace_id, slow_reload)
+        await asyncio.sleep(0)
+        cache.record(workspace_id, lambda chunks: chunks.append("b"))
+        release.set()
+        await asyncio.sleep(0.01)
+        return await cache.get(_Session(), workspace_id, first_load)
+
+    assert asyncio.run(scenario()) == ["a", "b"]
@@ -0,0 +1,153 @@
+import asyncio
+from uuid import uuid4
+
+from creatory_core.api.sse import end_when_stored_run_ends
+from creatory_core.db.models import RunStatus
+from creatory_core.services.run_events import InMemoryRunEventBus, RunEvent, emit
+
+
+def _final(run_id) -> dict:
+    return {"run_id": str(run_id), "status": "succeeded", "stage": "final"}
+
+
+def test_subscribers_follow_live_events_until_the_final_run_event() -> None:
+    bus = InMemoryRunEventBus()
+    run_id = uuid4()
+
+    async def collect() -> list[str]:
+        return [event.event_type async for event in bus.subscribe(run_id)]
+
+    async def scenario() -> None:
+        await emit(bus, run_id, "run", {"stage": "start"})
+        viewers = [asyncio.create_task(collect()) for _ in range(3)]
+        await asyncio.sleep(0)
+        await emit(bus, run_id, "text", {"delta": "Hi"})
+        await emit(bus, run_id, "run", _final(run_id))
+        assert await asyncio.gather(*viewers) == [["run", "text", "run"]] * 3
+
+    asyncio.run(scenario())
+
+
+def test_subscribe_resumes_after_last_event_id() -> None:
+    bus = InMemoryRunEventBus()
+    run_id = uuid4()
+
+    async def scenario() -> None:
+        first = await emit(bus, run_id, "task", {"step": 1})
+        await emit(bus, run_id, "task", {"step": 2})
+        await emit(bus, run_id, "run", _final(run_id))
+
+        resumed = [event async for event in bus.subscribe(run_id, after=first.id)]
+        assert [event.payload.get("step") for event in resumed] == [2, None]
+        assert [event.id for event in await bus.history(run_id, after=first.id)] == ["2", "3"]
+        # Nothing is left after the final event: the stream ends at once.
+        assert [event async for event in bus.subscribe(run_id, after=resumed[-1].id)] == []
+
+    asyncio.run(scenario())
+
+
+def test_idle_subscription_yields_heartbeats() -> None:
+    bus = InMemoryRunEventBus()
+    run_id = uuid4()
+
+    async def scenario() -> None:
+        events = bus.subscribe(run_id, heartbeat_seconds=0.01)
+        assert await anext(events) is None
+        await emit(bus, run_id, "run", _final(run_id))
+        event = await anext(events)
+        assert event is not None and event.is_terminal
+        await events.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_event_renders_as_sse_with_id() -> None:
+    event = RunEvent(run_id=uuid4(), event_type="text", payload={"delta": "Hi"}, id="7")
+    assert event.to_sse() == 'id: 7\nevent: text\ndata: {"delta": "Hi"}\n\n'
+
+
+def test_emit_survives_a_failing_bus() -> None:
+    class BrokenBus(InMemoryRunEventBus):
+        async def publish(self, event: RunEvent) -> RunEvent:
+            raise ConnectionError("redis down")
+
+    event = asyncio.run(emit(BrokenBus(), uuid4(), "run", {"stage": "start"}))
+    assert event.id == ""
+
+
+def test_idle_stream_ends_once_the_stored_run_has_finished() -> None:
+    # A run executing in another process never publishes to this process's bus.
+    bus = InMemoryRunEventBus()
+    run_id = uuid4()
+    statuses = iter([RunStatus.RUNNING, RunStatus.SUCCEEDED])
+
+    async def load_status() -> RunStatus:
+        return next(statuses)
+
+    async def scenario() -> list[RunEvent | None]:
+        events = bus.subscribe(run_id, heartbeat_seconds=0.001)
+        followed = end_when_stored_run_ends(events, run_id, load_status, check_seconds=0)
+        return [event async for event in followed]
+
+    events = asyncio.run(scenario())
+    assert events[:2] == [None, None]
+    assert events[-1].is_terminal
+    assert events[-1].payload["status"] == "succeeded"
+
+
+def test_chat_stream_closes_its_session_when_the_client_leaves_before_the_body(
+    monkeypatch,
+) -> None:
+    from creatory_core.api.routes import orchestration
+    from creatory_core.schemas.orchestrator import ChatRunRequest
+
+    class _Session:
+        closed = False
+
+        async def close(self) -> None:
+            self.closed = True
+
+    class _Turn:
+        def __init__(self, *args) -> None:
+            pass
+
+        async def start(self, current_user) -> None:
+            pass
+
+        async def events(self):
+            raise AssertionError("the body should never start")
+            yield
+
+    session = _Session()
+
+    async def member(*args):
+        return type("Conversation", (), {"id": uuid4()})()
+
+    async def no_knowledge(*args):
+        return None
+
+    monkeypatch.setattr(orchestration, "ensure_conversation_member", member)
+    monkeypatch.setattr(orchestration, "ensure_thread_in_conversation", member)
+    monkeypatch.setattr(orchestration, "_turn_knowledge", no_knowledge)
+    monkeypatch.setattr(orchestration, "get_session_factory", lambda: lambda: session)
+    monkeypatch.setattr(orchestration, "DirectorTurn", _Turn)
+
+    async def receive() -> dict:
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        # The client is gone before the response headers are written.
+        await asyncio.sleep(1)
+
+    async def scenario() -> None:
+        response = await orchestration.stream_chat_turn(
+            uuid4(),
+            uuid4(),
+            ChatRunRequest(prompt="Plan a launch video"),
+            current_user=type("User", (), {"id": uuid4()})(),
+            db=_Session(),
+        )
+        await response({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send)
+
+    asyncio.run(scenario())
+    assert session.closed
@@ -0,0 +1,151 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from creatory_core.db.models import (
+    NodeType,
+    RunStatus,
+    WorkflowEdge,
+    WorkflowNode,
+    WorkflowRun,
+    WorkflowRunStep,
+)
+from creatory_core.services.workflow_dag import (
+    DagExecutor,
+    NodeOutcome,
+    WorkflowGraph,
+    WorkflowGraphError,
+    simulate_node,
+)
+from creatory_core.services.workflow_runner import stored_run_events
+
+
+def _node(key: str, x: float | None = None, node_type: NodeType = NodeType.AGENT) -> WorkflowNode:
+    return WorkflowNode(node_key=key, type=node_type, config_json={}, position_x=x)
+
+
+def _edge(source: str, target: str) -> WorkflowEdge:
+    return WorkflowEdge(source_node_key=source, target_node_key=target, metadata_json={})
+
+
+def _video_graph() -> WorkflowGraph:
+    # script fans out to visuals and voice-over, which both feed the final edit.
+    return WorkflowGraph.build(
+        [_node("script", 0), _node("visuals", 1), _node("voice", 1), _node("edit", 2)],
+        [
+            _edge("script", "visuals"),
+            _edge("script", "voice"),
+            _edge("visuals", "edit"),
+            _edge("voice", "edit"),
+        ],
+    )
+
+
+def test_graph_orders_nodes_topologically_with_position_tie_breaks() -> None:
+    graph = _video_graph()
+    assert graph.order == ["script", "visuals", "voice", "edit"]
+    assert graph.predecessors["edit"] == ["visuals", "voice"]
+
+
+def test_graph_without_edges_keeps_the_left_to_right_sequence() -> None:
+    graph = WorkflowGraph.build([_node("b", 2), _node("a", 1), _node("c", None)], [])
+    assert graph.order == ["a", "b", "c"]
+    assert graph.predecessors["b"] == ["a"]
+
+
+def test_graph_rejects_cycles_and_unknown_nodes() -> None:
+    with pytest.raises(WorkflowGraphError, match="cycle"):
+        WorkflowGraph.build([_node("a"), _node("b")], [_edge("a", "b"), _edge("b", "a")])
+    with pytest.raises(WorkflowGraphError, match="unknown node 'ghost'"):
+        WorkflowGraph.build([_node("a")], [_edge("a", "ghost")])
+
+
+def test_independent_branches_run_concurrently() -> None:
+    running: set[str] = set()
+    overlaps: list[set[str]] = []
+
+    async def run_node(node: WorkflowNode, upstream: dict) -> NodeOutcome:
+        running.add(node.node_key)
+        overlaps.append(set(running))
+        await asyncio.sleep(0.01)
+        running.discard(node.node_key)
+        return NodeOutcome(status=RunStatus.SUCCEEDED, output_json={"from": sorted(upstream)})
+
+    dag_run = asyncio.run(DagExecutor(_video_graph(), run_node, max_concurrency=4).run())
+
+    assert {"visuals", "voice"} in overlaps
+    assert dag_run.status == RunStatus.SUCCEEDED
+    outputs = {result.node_key: result.outcome.output_json for result in dag_run.results}
+    assert outputs["edit"] == {"from": ["visuals", "voice"]}
+
+
+def test_concurrency_limit_serializes_branches() -> None:
+    peak = 0
+    running = 0
+
+    async def run_node(node: WorkflowNode, upstream: dict) -> NodeOutcome:
+        nonlocal peak, running
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return NodeOutcome(status=RunStatus.SUCCEEDED)
+
+    asyncio.run(DagExecutor(_video_graph(), run_node, max_concurrency=1).run())
+    assert peak == 1
+
+
+def test_human_gate_blocks_only_its_descendants() -> None:
+    graph = WorkflowGraph.build(
+        [
+            _node("script", 0),
+            _node("review", 1, NodeType.HUMAN_GATE),
+            _node("publish", 2),
+            _node("thumbnail", 1),
+        ],
+        [_edge("script", "review"), _edge("review", "publish"), _edge("script", "thumbnail")],
+    )
+    dag_run = asyncio.run(DagExecutor(graph, simulate_node).run())
+
+    statuses = {result.node_key: result.outcome.status for result in dag_run.results}
+    assert statuses["thumbnail"] == RunStatus.SUCCEEDED
+    assert statuses["review"] == RunStatus.WAITING_HUMAN
+    assert dag_run.blocked == ["publish"]
+    assert dag_run.status == RunStatus.WAITING_HUMAN
+
+
+def test_failed_node_stops_new_work_and_records_the_error() -> None:
+    finished: list[str] = []
+
+    async def run_node(node: WorkflowNode, upstream: dict) -> NodeOutcome:
+        if node.node_key == "visuals":
+            raise RuntimeError("render failed")
+        return NodeOutcome(status=RunStatus.SUCCEEDED)
+
+    async def on_finish(result) -> None:
+        finished.append(result.node_key)
+
+    dag_run = asyncio.run(
+        DagExecutor(_video_graph(), run_node, max_concurrency=1, on_finish=on_finish).run()
+    )
+
+    failed = next(result for result in dag_run.results if result.node_key == "visuals")
+    assert failed.outcome.error_json == {"type": "RuntimeError", "message": "render failed"}
+    assert finished == ["script", "visuals"]
+    assert dag_run.blocked == ["voice", "edit"]
+    assert dag_run.status == RunStatus.FAILED
+
+
+def test_stored_run_events_rebuild_a_finished_stream() -> None:
+    workflow_run = WorkflowRun(id=uuid4(), status=RunStatus.SUCCEEDED)
+    steps = [
+        WorkflowRunStep(id=uuid4(), workflow_run_id=workflow_run.id, node_key=key, status=status)
+        for key, status in [("script", RunStatus.SUCCEEDED), ("edit", RunStatus.SUCCEEDED)]
+    ]
+
+    events = stored_run_events(workflow_run, steps)
+
+    assert [event.event_type for event in events] == ["run", "step", "step", "run"]
+    assert [event.payload.get("node_key") for event in events[1:3]] == ["script", "edit"]
+    assert events[-1].is_terminal